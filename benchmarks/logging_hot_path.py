@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+"""
+Before/after benchmark for per-bar logging.
+
+Runs main.py on config/spy_1min_backtest.yaml twice per repetition: with
+the default logging profile, where the broker and market simulator log
+every bar at INFO, and with --quiet-hot-path, where those messages are
+logged at DEBUG and filtered out before they are formatted. Reports the
+best wall time and the number of lines written to the log file.
+
+The backtest runs in a temporary directory holding data/SPY.csv, which is
+where the bootstrap looks for the SPY data. The CSV is copied from --data
+(by default the bundled data/HEAD_1min.csv; any one-minute OHLCV file such
+as a full SPY history works), or synthetic one-minute bars are generated if
+that file does not exist.
+Analytics reporting is disabled so only the backtest itself is timed.
+
+Usage:
+    python benchmarks/logging_hot_path.py --repeat 3
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import subprocess
+import tempfile
+
+import yaml
+
+# Add the project root to the path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.data.generators.data_generator import create_ohlcv_data
+
+CONFIG = os.path.join(PROJECT_ROOT, 'config', 'spy_1min_backtest.yaml')
+MAIN = os.path.join(PROJECT_ROOT, 'main.py')
+
+
+def prepare(workdir, data_path, bars):
+    """
+    Write the backtest config and the SPY data into a working directory.
+
+    Args:
+        workdir (str): Directory the backtest runs in
+        data_path (str): CSV with the SPY bars (generated if missing)
+        bars (int): Number of synthetic bars when data_path does not exist
+
+    Returns:
+        str: Path of the config file
+    """
+    with open(CONFIG) as f:
+        config = yaml.safe_load(f)
+
+    os.makedirs(os.path.join(workdir, 'data'))
+    target = os.path.join(workdir, 'data', 'SPY.csv')
+    if os.path.exists(data_path):
+        shutil.copy(data_path, target)
+    else:
+        print(f"{data_path} not found, using {bars} synthetic bars")
+        create_ohlcv_data(bars, seed=42).to_csv(target, index=False)
+
+    # The CSV carries its own ISO timestamps
+    config['data']['sources'] = [{'symbol': 'SPY', 'file': os.path.join('data', 'SPY.csv')}]
+    config['data']['date_column'] = 'timestamp'
+    config['data']['date_format'] = None
+    config['analytics']['enabled'] = False
+
+    config_path = os.path.join(workdir, 'backtest.yaml')
+    with open(config_path, 'w') as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+def run(workdir, config_path, extra_args):
+    """
+    Run one backtest.
+
+    Args:
+        workdir (str): Directory the backtest runs in
+        config_path (str): Config file
+        extra_args (list): Additional main.py arguments
+
+    Returns:
+        tuple: (wall time in seconds, lines written to the log file)
+    """
+    log_file = os.path.join(workdir, 'run.log')
+    if os.path.exists(log_file):
+        os.remove(log_file)
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN, '--config', config_path, '--log-file', log_file] + extra_args,
+                   cwd=workdir, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+
+    with open(log_file) as f:
+        lines = sum(1 for _ in f)
+    return elapsed, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-bar logging cost of a 1-minute backtest')
+    parser.add_argument('--data', default=os.path.join(PROJECT_ROOT, 'data', 'HEAD_1min.csv'),
+                        help='1-minute CSV (timestamp, open, high, low, close, volume) replayed as SPY')
+    parser.add_argument('--bars', type=int, default=5000, help='Synthetic bars if --data is missing')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per profile (best is reported)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='logging_hot_path_')
+    try:
+        config_path = prepare(workdir, args.data, args.bars)
+        results = {}
+        for label, extra_args in (('default', []), ('--quiet-hot-path', ['--quiet-hot-path'])):
+            runs = [run(workdir, config_path, extra_args) for _ in range(args.repeat)]
+            results[label] = (min(t for t, _ in runs), runs[-1][1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    base_time, base_lines = results['default']
+    print(f"{'profile':<18}{'best time':>12}{'log lines':>12}")
+    for label, (elapsed, lines) in results.items():
+        print(f"{label:<18}{elapsed:>11.2f}s{lines:>12,}  ({base_time / elapsed:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
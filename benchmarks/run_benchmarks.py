@@ -0,0 +1,568 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the backtest and optimizer hot paths.
+
+Runs reproducible scenarios on synthetic random-walk bars from
+``src/data/generators/data_generator.py`` and reports the best and median
+wall time of each. A dataset is described by its total number of bars and
+the number of symbols they are spread over, so "100000x10" means ten
+symbols with 10,000 one-minute bars each.
+
+Scenarios:
+    data_load_csv          HistoricalDataHandler loading the CSV files (no caches)
+    data_load_binary       The same load from the binary cache beside each CSV
+    bar_replay             Replaying every bar through HistoricalDataHandler.update_bars
+    event_bus_publish      EventBus.publish of every bar to four subscribers
+    event_bus_compiled     The same with compiled dispatch
+    backtest               BacktestCoordinator.run with MovingAverageCrossover
+    grid_search            A 50-point GridSearch, one backtest per point
+    metrics                calculate_all_metrics on an equity curve with one point per bar
+    monte_carlo            MonteCarloSimulator.run_simulations on one trade per 100 bars
+
+Results are written as JSON and compared with a baseline from an earlier
+run, by default ``benchmarks/baseline.json``: every scenario that is slower
+than the baseline by more than the tolerance is reported and the script
+exits with status 1, so it can gate a deploy. Wall times are only comparable
+on the same machine, so the comparison is skipped with a warning when the
+baseline was recorded in a different environment (CPU count, Python and
+NumPy versions, platform). The committed baseline is the quick profile with
+the default seed on the reference machine; refresh it there with
+--save-baseline when the machine or an intended performance trade-off
+changes, or save a baseline of your own and pass it with --baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # quick profile, compared with the baseline
+    python benchmarks/run_benchmarks.py --profile full --output results.json --no-baseline
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json --no-baseline
+    python benchmarks/run_benchmarks.py --baseline other.json --tolerance 0.25
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to the path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.analytics.metrics.functional import calculate_all_metrics
+from src.analytics.robustness.monte_carlo import MonteCarloSimulator
+from src.core.event_system.event import Event
+from src.core.event_system.event_types import EventType
+from src.core.events.event_bus import EventBus
+from src.core.trade_repository import TradeRepository
+from src.data.binary_cache import read_csv_cached
+from src.data.generators.data_generator import create_ohlcv_data
+from src.data.historical_data_handler import HistoricalDataHandler
+from src.data.market_data_cache import get_market_data_cache
+from src.execution.backtest.backtest_coordinator import BacktestCoordinator
+from src.execution.broker.simulated_broker import SimulatedBroker
+from src.execution.order_manager import OrderManager
+from src.execution.portfolio import Portfolio
+from src.strategy.implementations.ma_crossover import MovingAverageCrossover
+from src.strategy.optimization.grid_search import GridSearch
+from src.strategy.optimization.parameter_space import IntegerParameter, ParameterSpace
+from src.strategy.strategy_adapters import StrategyAdapter
+
+logger = logging.getLogger('benchmarks')
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+INITIAL_CAPITAL = 100000.0
+
+# Dataset sizes (total bars) and symbol counts for each profile
+PROFILES = {
+    'quick': ((10000,), (1, 10)),
+    'standard': ((10000, 100000), (1, 10, 100)),
+    'full': ((10000, 100000, 1000000), (1, 10, 100)),
+}
+
+# Bars published per chunk in the event bus scenarios, to bound memory
+EVENT_CHUNK = 50000
+
+
+class Dataset:
+    """
+    Synthetic bars for one size and symbol count, written as CSV files.
+    """
+
+    def __init__(self, bars, symbols, data_dir, seed=42):
+        """
+        Generate the data, or reuse files generated earlier with the same seed.
+
+        Args:
+            bars (int): Total number of bars
+            symbols (int): Number of symbols the bars are spread over
+            data_dir (str): Directory for the CSV files
+            seed (int): Base random seed; symbol i uses seed + i
+        """
+        self.bars = bars
+        self.symbols = symbols
+        self.bars_per_symbol = bars // symbols
+        self.directory = os.path.join(data_dir, f"{bars}x{symbols}_seed{seed}")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.frames = {}
+        self.sources = []
+        for i in range(symbols):
+            symbol = f"SYM{i:03d}"
+            path = os.path.join(self.directory, f"{symbol}_1min.csv")
+            df = create_ohlcv_data(self.bars_per_symbol, seed=seed + i)
+            if not os.path.exists(path):
+                df.to_csv(path, index=False, date_format=DATE_FORMAT)
+            self.frames[symbol] = df
+            self.sources.append({'symbol': symbol, 'file': path})
+
+    @property
+    def label(self):
+        return f"{self.bars}x{self.symbols}"
+
+    def data_config(self, **overrides):
+        """
+        Build a data configuration for HistoricalDataHandler.
+
+        Args:
+            **overrides: Extra data configuration keys
+
+        Returns:
+            dict: Data configuration
+        """
+        config = {
+            'source_type': 'csv',
+            'date_column': 'timestamp',
+            'date_format': DATE_FORMAT,
+            'timeframe': '1min',
+            'sources': [dict(source) for source in self.sources],
+        }
+        config.update(overrides)
+        return config
+
+
+def _run_backtest(dataset, fast_period=10, slow_period=30):
+    """
+    Run one event-driven backtest of MovingAverageCrossover on a dataset.
+
+    Args:
+        dataset (Dataset): Bars to test on
+        fast_period (int): Fast moving average period
+        slow_period (int): Slow moving average period
+
+    Returns:
+        tuple: (results, bars replayed)
+    """
+    config = {'initial_capital': INITIAL_CAPITAL, 'data': dataset.data_config()}
+    event_bus = EventBus()
+    context = {
+        'event_bus': event_bus,
+        'trade_repository': TradeRepository(),
+        'config': config,
+    }
+    data_handler = HistoricalDataHandler('data_handler', config['data'])
+    data_handler.initialize(context)
+
+    strategy = MovingAverageCrossover('ma_crossover', fast_period=fast_period, slow_period=slow_period)
+    backtest = BacktestCoordinator('backtest', config)
+    backtest.add_component('data_handler', data_handler)
+    backtest.add_component('strategy', StrategyAdapter('strategy_adapter', strategy))
+    backtest.add_component('portfolio', Portfolio('portfolio', INITIAL_CAPITAL))
+    backtest.add_component('broker', SimulatedBroker('broker'))
+    backtest.add_component('order_manager', OrderManager('order_manager'))
+    backtest.initialize(context)
+    backtest.setup()
+
+    results = backtest.run()
+    return results, event_bus.get_stats()['event_counts'].get('BAR', 0)
+
+
+def _bar_events(dataset, start, stop):
+    """Build BAR events for rows [start, stop) of every symbol, in time order."""
+    events = []
+    for row in range(start, stop):
+        for symbol, df in dataset.frames.items():
+            events.append(Event(EventType.BAR, {
+                'symbol': symbol,
+                'timestamp': df['timestamp'].iat[row],
+                'open': df['open'].iat[row],
+                'high': df['high'].iat[row],
+                'low': df['low'].iat[row],
+                'close': df['close'].iat[row],
+                'volume': df['volume'].iat[row],
+            }))
+    return events
+
+
+def _synthetic_trades(dataset, hold=100):
+    """One round-trip trade per ``hold`` bars of each symbol."""
+    trades = []
+    for symbol, df in dataset.frames.items():
+        close = df['close'].to_numpy()
+        timestamps = df['timestamp']
+        for i, entry in enumerate(range(0, len(close) - hold, hold)):
+            exit_ = entry + hold
+            direction = 'BUY' if i % 2 == 0 else 'SELL'
+            sign = 1 if direction == 'BUY' else -1
+            trades.append({
+                'symbol': symbol,
+                'direction': direction,
+                'quantity': 100,
+                'entry_price': float(close[entry]),
+                'exit_price': float(close[exit_]),
+                'close_price': float(close[exit_]),
+                'entry_time': timestamps.iat[entry],
+                'exit_time': timestamps.iat[exit_],
+                'pnl': sign * 100 * float(close[exit_] - close[entry]),
+                'closed': True,
+            })
+    return trades
+
+
+def _equity_curve(dataset):
+    """Equity of an equal-weight buy-and-hold of every symbol, one point per bar."""
+    normalized = np.mean([df['close'].to_numpy() / df['close'].iat[0]
+                          for df in dataset.frames.values()], axis=0)
+    timestamps = next(iter(dataset.frames.values()))['timestamp']
+    return pd.DataFrame({'equity': INITIAL_CAPITAL * normalized},
+                        index=pd.DatetimeIndex(timestamps, name='timestamp'))
+
+
+# Each scenario takes a dataset and returns a zero-argument callable that
+# runs the measured work and returns the number of items it processed.
+
+def scenario_data_load_csv(dataset):
+    config = dataset.data_config(use_cache=False, binary_cache=False)
+
+    def run():
+        handler = HistoricalDataHandler('data_handler', config)
+        handler.initialize({'event_bus': EventBus()})
+        return sum(len(df) for df in handler.data.values())
+    return run
+
+
+def scenario_data_load_binary(dataset):
+    config = dataset.data_config(use_cache=False, binary_cache=True)
+    # Make sure the binary cache files exist before timing
+    for source in config['sources']:
+        read_csv_cached(source['file'], date_column='timestamp', date_format=DATE_FORMAT)
+
+    def run():
+        handler = HistoricalDataHandler('data_handler', config)
+        handler.initialize({'event_bus': EventBus()})
+        return sum(len(df) for df in handler.data.values())
+    return run
+
+
+def scenario_bar_replay(dataset):
+    config = dataset.data_config()
+
+    def run():
+        event_bus = EventBus()
+        received = []
+        event_bus.subscribe(EventType.BAR, received.append)
+        handler = HistoricalDataHandler('data_handler', config)
+        handler.initialize({'event_bus': event_bus})
+        while handler.update_bars():
+            pass
+        return len(received)
+    return run
+
+
+def _event_bus_scenario(dataset, **bus_kwargs):
+    def run():
+        bus = EventBus(**bus_kwargs)
+        counts = [0, 0, 0, 0]
+
+        def make_handler(i):
+            def handler(event):
+                counts[i] += 1
+            return handler
+
+        handlers = [make_handler(i) for i in range(len(counts))]
+        for handler in handlers:
+            bus.subscribe(EventType.BAR, handler)
+
+        # Events are built outside the timed section, a chunk at a time
+        elapsed = 0.0
+        for start in range(0, dataset.bars_per_symbol, EVENT_CHUNK):
+            events = _bar_events(dataset, start, min(start + EVENT_CHUNK, dataset.bars_per_symbol))
+            began = time.perf_counter()
+            for event in events:
+                bus.publish(event)
+            elapsed += time.perf_counter() - began
+        return counts[0], elapsed
+    return run
+
+
+def scenario_event_bus_publish(dataset):
+    return _event_bus_scenario(dataset)
+
+
+def scenario_event_bus_compiled(dataset):
+    return _event_bus_scenario(dataset, compiled_dispatch=True)
+
+
+def scenario_backtest(dataset):
+    def run():
+        _, bars = _run_backtest(dataset)
+        return bars
+    return run
+
+
+def scenario_grid_search(dataset):
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_period', 5, 50, step=5))
+    space.add_parameter(IntegerParameter('slow_period', 60, 100, step=10))
+
+    def objective(params):
+        results, _ = _run_backtest(dataset, params['fast_period'], params['slow_period'])
+        return results.get('statistics', {}).get('sharpe_ratio', 0.0)
+
+    def run():
+        search = GridSearch(space)
+        search.search(objective)
+        return len(search.results)
+    return run
+
+
+def scenario_metrics(dataset):
+    equity_curve = _equity_curve(dataset)
+    trades = _synthetic_trades(dataset)
+
+    def run():
+        calculate_all_metrics(equity_curve, trades)
+        return len(equity_curve)
+    return run
+
+
+def scenario_monte_carlo(dataset):
+    trades = _synthetic_trades(dataset)
+
+    def run():
+        np.random.seed(0)
+        simulator = MonteCarloSimulator(trades, initial_capital=INITIAL_CAPITAL, num_simulations=1000)
+        simulator.run_simulations()
+        return len(trades) * simulator.num_simulations
+    return run
+
+
+# name: (factory, unit of the item count, largest dataset in bars it runs on)
+SCENARIOS = {
+    'data_load_csv': (scenario_data_load_csv, 'bars', None),
+    'data_load_binary': (scenario_data_load_binary, 'bars', None),
+    'bar_replay': (scenario_bar_replay, 'bars', None),
+    'event_bus_publish': (scenario_event_bus_publish, 'events', None),
+    'event_bus_compiled': (scenario_event_bus_compiled, 'events', None),
+    'backtest': (scenario_backtest, 'bars', None),
+    'grid_search': (scenario_grid_search, 'backtests', 100000),
+    'metrics': (scenario_metrics, 'points', None),
+    'monte_carlo': (scenario_monte_carlo, 'trade paths', None),
+}
+
+
+def measure(run, repeat):
+    """
+    Time a scenario.
+
+    Args:
+        run (callable): Returns the item count, or (item count, seconds) when
+            it times itself
+        repeat (int): Number of timed runs
+
+    Returns:
+        dict: Best and median seconds, item count and items per second
+    """
+    times = []
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outcome = run()
+        elapsed = time.perf_counter() - start
+        if isinstance(outcome, tuple):
+            items, elapsed = outcome
+        else:
+            items = outcome
+        times.append(elapsed)
+
+    best = min(times)
+    return {
+        'seconds': best,
+        'median_seconds': statistics.median(times),
+        'runs': repeat,
+        'items': items,
+        'throughput': items / best if best > 0 else None,
+    }
+
+
+def result_key(result):
+    return f"{result['scenario']}[{result['dataset']}]"
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (list): Current results
+        baseline (list): Baseline results
+        tolerance (float): Allowed slowdown as a fraction of the baseline time
+
+    Returns:
+        tuple: (rows of (key, baseline seconds, current seconds, ratio), regressed keys)
+    """
+    previous = {result_key(result): result for result in baseline}
+    rows = []
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        if key not in previous:
+            continue
+        before = previous[key]['seconds']
+        ratio = result['seconds'] / before if before > 0 else float('inf')
+        rows.append((key, before, result['seconds'], ratio))
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+    return rows, regressions
+
+
+def environment():
+    """Describe the machine and revision the results were taken on."""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                  capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': revision or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+# Environment fields that must match for wall times to be comparable
+COMPARABLE_ENVIRONMENT = ('cpu_count', 'python', 'numpy', 'platform')
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def environment_mismatches(current, recorded):
+    """
+    List the environment fields in which two runs differ.
+
+    Args:
+        current (dict): Environment of this run
+        recorded (dict): Environment stored with the baseline
+
+    Returns:
+        list: (field, recorded value, current value) for every difference
+    """
+    return [(field, recorded.get(field), current.get(field)) for field in COMPARABLE_ENVIRONMENT
+            if recorded.get(field) != current.get(field)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backtest and optimizer benchmark suite')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick',
+                        help='Dataset sizes to run (default: quick)')
+    parser.add_argument('--bars', type=int, nargs='+', help='Total bars per dataset (overrides the profile)')
+    parser.add_argument('--symbols', type=int, nargs='+', help='Symbol counts (overrides the profile)')
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), help='Scenarios to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per scenario (default: 3)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the data (default: 42)')
+    parser.add_argument('--data-dir', help='Directory for generated data (default: a temporary directory)')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Compare with results saved earlier (default: benchmarks/baseline.json)')
+    parser.add_argument('--no-baseline', action='store_true', help='Skip the comparison with a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown against the baseline (default: 0.2 = 20%%)')
+    parser.add_argument('--save-baseline', help='Also write the results to this baseline file')
+    parser.add_argument('--all-sizes', action='store_true',
+                        help='Run every scenario on every dataset, ignoring per-scenario size limits')
+    args = parser.parse_args()
+
+    # Keep the components' own logging out of the measurements
+    logging.basicConfig(level=logging.ERROR)
+    logger.setLevel(logging.INFO)
+
+    sizes, symbol_counts = PROFILES[args.profile]
+    sizes = args.bars or sizes
+    symbol_counts = args.symbols or symbol_counts
+    scenarios = args.scenarios or list(SCENARIOS)
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='admf_bench_')
+    results = []
+    try:
+        for bars in sizes:
+            for symbols in symbol_counts:
+                if symbols > bars:
+                    continue
+                dataset = Dataset(bars, symbols, data_dir, seed=args.seed)
+                for name in scenarios:
+                    factory, unit, max_bars = SCENARIOS[name]
+                    if max_bars and bars > max_bars and not args.all_sizes:
+                        logger.info(f"Skipping {name} on {dataset.label} (limit {max_bars} bars)")
+                        continue
+                    # Each scenario starts without data cached by the one before
+                    get_market_data_cache().clear()
+                    measured = measure(factory(dataset), args.repeat)
+                    result = {'scenario': name, 'dataset': dataset.label, 'bars': bars,
+                              'symbols': symbols, 'unit': unit, **measured}
+                    results.append(result)
+                    logger.info(f"{result_key(result):36s} {measured['seconds']:9.3f}s "
+                                f"{measured['throughput'] or 0:14,.0f} {unit}/s")
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {'environment': environment(), 'repeat': args.repeat, 'seed': args.seed, 'results': results}
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Wrote {len(results)} results to {path}")
+    if not args.output and not args.save_baseline:
+        print(json.dumps(report, indent=2))
+
+    if args.no_baseline:
+        return
+    if not os.path.exists(args.baseline):
+        logger.warning(f"No baseline at {args.baseline}; create one with --save-baseline")
+        return
+    baseline = load_report(args.baseline)
+    mismatches = environment_mismatches(report['environment'], baseline.get('environment', {}))
+    if mismatches:
+        details = ', '.join(f"{field} {recorded!r} != {current!r}" for field, recorded, current in mismatches)
+        logger.warning(f"Not comparing with {args.baseline}: it was recorded in a different "
+                       f"environment ({details}); save a baseline on this machine with --save-baseline")
+        return
+    rows, regressions = compare(results, baseline['results'], args.tolerance)
+    print(f"\nComparison with {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for key, before, after, ratio in rows:
+        flag = '  REGRESSION' if key in regressions else ''
+        print(f"  {key:36s} {before:9.3f}s -> {after:9.3f}s ({ratio:5.2f}x){flag}")
+    if regressions:
+        print(f"{len(regressions)} scenario(s) slower than the baseline")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,7 +17,9 @@ import pandas as pd
 from datetime import datetime
 
 from src.core.system_init import Bootstrap
-from src.core.logging import configure_logging, get_logger
+from src.core.logging import (
+    configure_logging, get_logger, refresh_hot_path_loggers, set_hot_path_profile, PROFILE_PERFORMANCE
+)
 
 # Get logger - will be configured based on command line arguments
 logger = get_logger('main')
@@ -43,9 +45,15 @@ def main():
     parser.add_argument('--equity-file', help='Path to equity curve CSV file for analytics')
     parser.add_argument('--trades-file', help='Path to trades CSV file for analytics')
     parser.add_argument('--param-file', help='Parameter space file for optimization')
-    parser.add_argument('--method', choices=['grid', 'random', 'walk_forward'], 
+    parser.add_argument('--method', choices=['grid', 'random', 'walk_forward',
+                       'successive_halving', 'hyperband', 'bayesian'],
                        default='grid', help='Optimization method')
     parser.add_argument('--bars', type=int, help='Limit processing to specified number of bars (default: process all)')
+    parser.add_argument('--workers', type=int, help='Number of parallel workers for optimization (default: 1)')
+    parser.add_argument('--executor', choices=['serial', 'thread', 'process'],
+                       help='How optimization evaluates parameter combinations (default: process when --workers > 1)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Resume an interrupted optimization from its checkpoint journal in the output directory')
     
     # Logging options
     parser.add_argument('--verbose', action='store_true', help='Enable verbose logging (INFO level)')
@@ -54,6 +62,15 @@ def main():
                        help='Enable debug logging for specific module (can be used multiple times)')
     parser.add_argument('--log-file', help='Write logs to file')
     parser.add_argument('--quiet', action='store_true', help='Suppress console output')
+    parser.add_argument('--quiet-hot-path', action='store_true',
+                       help='Use the performance logging profile: per-bar messages are logged at DEBUG')
+    parser.add_argument('--async-logging', action='store_true',
+                       help='Write logs from a background thread in batches')
+    parser.add_argument('--log-max-bytes', type=int, default=0,
+                       help='Rotate the log file once it reaches this size in bytes')
+    parser.add_argument('--log-backup-count', type=int, default=0,
+                       help='Number of rotated log files to keep')
+    parser.add_argument('--log-compress', action='store_true', help='gzip rotated log files')
     
     # Parse arguments
     args = parser.parse_args()
@@ -64,18 +81,29 @@ def main():
             debug=args.debug,
             debug_modules=args.debug_modules,
             log_file=args.log_file,
-            console=not args.quiet
+            console=not args.quiet,
+            profile=PROFILE_PERFORMANCE if args.quiet_hot_path else None,
+            async_logging=args.async_logging,
+            max_bytes=args.log_max_bytes,
+            backup_count=args.log_backup_count,
+            compress=args.log_compress
         )
         
         # If verbose but not debug, set to INFO level
         if args.verbose and not args.debug:
             from src.core.logging.config import logging
             logger.setLevel(logging.INFO)
+            refresh_hot_path_loggers()
             
         # Load the config to determine mode
         with open(args.config, 'r') as f:
             config = yaml.safe_load(f)
         
+        # A logging profile in the config applies unless given on the command line
+        profile = (config.get('logging') or {}).get('profile')
+        if profile and not args.quiet_hot_path:
+            set_hot_path_profile(profile)
+        
         # Check mode and determine what to run
         mode = config.get('mode', 'backtest')
         
@@ -119,7 +147,8 @@ def run_trading_system(args):
     bootstrap = Bootstrap(
         config_files=[args.config],
         debug=args.debug,
-        log_file=args.log_file or "trading.log"
+        log_file=args.log_file or "trading.log",
+        async_logging=args.async_logging
     )
     
     # Store max bars limit in the bootstrap context if specified
@@ -210,7 +239,8 @@ def run_optimization(args):
     bootstrap = Bootstrap(
         config_files=[args.config],
         debug=args.debug,
-        log_file=args.log_file or "optimization.log"
+        log_file=args.log_file or "optimization.log",
+        async_logging=args.async_logging
     )
 
     # Store max bars limit in the bootstrap context if specified
@@ -243,7 +273,10 @@ def run_optimization(args):
         kwargs = {
             'method': args.method,
             'param_file': args.param_file,
-            'output_dir': args.output_dir
+            'output_dir': args.output_dir,
+            'workers': args.workers,
+            'executor': args.executor,
+            'resume': args.resume
         }
 
         # Add max_bars if specified
@@ -0,0 +1,266 @@
+"""
+Online (single-pass) performance metrics.
+
+MetricsAccumulator is fed one equity point or one closed trade at a time and
+keeps running statistics, so Sharpe, Sortino, Calmar, drawdown, profit factor
+and win rate can be read at any point of a run in O(1) instead of rebuilding a
+DataFrame from the full equity curve. The definitions follow the functional
+metrics in ``functional``: log returns, sample standard deviations and
+drawdowns measured from the running peak.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+
+class MetricsAccumulator:
+    """Running return, drawdown and trade statistics."""
+
+    def __init__(self, annualization_factor: int = 252, target_return: float = 0.0):
+        """
+        Initialize the accumulator.
+
+        Args:
+            annualization_factor: Periods per year used to annualize Sharpe and Sortino
+            target_return: Annual target return for the downside deviation
+        """
+        self.annualization_factor = annualization_factor
+        self.target_return = target_return
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all statistics."""
+        # Equity points
+        self.count = 0
+        self.initial_equity = None
+        self.equity = None
+        self.min_equity = None
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+        # Log returns (Welford) and returns below the target
+        self.return_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.downside_count = 0
+        self._downside_mean = 0.0
+        self._downside_m2 = 0.0
+
+        # Drawdowns
+        self.peak_equity = None
+        self.drawdown = 0.0
+        self.max_drawdown = 0.0
+        self._drawdown_sum = 0.0
+        self._drawdown_points = 0
+        self._drawdown_start = None
+        self.max_drawdown_duration = 0
+
+        # Closed trades
+        self.trade_count = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.current_consecutive_wins = 0
+        self.current_consecutive_losses = 0
+        self.max_consecutive_wins = 0
+        self.max_consecutive_losses = 0
+
+    def add_equity(self, equity: float, timestamp: Any = None) -> None:
+        """
+        Add an equity point.
+
+        Args:
+            equity: Portfolio equity
+            timestamp: Time of the point (used to annualize the return)
+        """
+        previous = self.equity
+        index = self.count
+        self.count += 1
+        self.equity = equity
+        if self.initial_equity is None:
+            self.initial_equity = equity
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        if self.min_equity is None or equity < self.min_equity:
+            self.min_equity = equity
+
+        if previous is not None and previous > 0 and equity > 0:
+            self._add_return(math.log(equity / previous))
+
+        # Drawdown from the running peak, like (cummax - equity) / cummax
+        if self.peak_equity is None or equity > self.peak_equity:
+            self.peak_equity = equity
+        drawdown = (self.peak_equity - equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+        self.drawdown = drawdown
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+        if drawdown > 0:
+            self._drawdown_sum += drawdown
+            self._drawdown_points += 1
+            if self._drawdown_start is None:
+                self._drawdown_start = index
+        elif self._drawdown_start is not None:
+            self.max_drawdown_duration = max(self.max_drawdown_duration, index - self._drawdown_start)
+            self._drawdown_start = None
+
+    def _add_return(self, value: float) -> None:
+        """Update the return moments with a log return."""
+        self.return_count += 1
+        delta = value - self._mean
+        self._mean += delta / self.return_count
+        self._m2 += delta * (value - self._mean)
+
+        if value < math.log(1 + self.target_return) / self.annualization_factor:
+            self.downside_count += 1
+            delta = value - self._downside_mean
+            self._downside_mean += delta / self.downside_count
+            self._downside_m2 += delta * (value - self._downside_mean)
+
+    def add_trade(self, pnl: Optional[float]) -> None:
+        """
+        Add a closed trade.
+
+        Args:
+            pnl: Realized PnL of the trade (None is ignored)
+        """
+        if pnl is None:
+            return
+        self.trade_count += 1
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_profit += pnl
+            self.current_consecutive_wins += 1
+            self.current_consecutive_losses = 0
+            self.max_consecutive_wins = max(self.max_consecutive_wins, self.current_consecutive_wins)
+        elif pnl < 0:
+            self.losing_trades += 1
+            self.gross_loss -= pnl
+            self.current_consecutive_losses += 1
+            self.current_consecutive_wins = 0
+            self.max_consecutive_losses = max(self.max_consecutive_losses, self.current_consecutive_losses)
+        else:
+            self.current_consecutive_wins = 0
+            self.current_consecutive_losses = 0
+
+    @property
+    def mean_return(self) -> float:
+        """Mean log return per period."""
+        return self._mean if self.return_count else 0.0
+
+    @property
+    def volatility(self) -> float:
+        """Sample standard deviation of log returns per period."""
+        if self.return_count < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.return_count - 1))
+
+    @property
+    def downside_deviation(self) -> float:
+        """Sample standard deviation of the log returns below the target."""
+        if self.downside_count < 2:
+            return 0.0
+        return math.sqrt(self._downside_m2 / (self.downside_count - 1))
+
+    @property
+    def total_return(self) -> float:
+        """Return from the first to the latest equity point."""
+        if self.count < 2 or not self.initial_equity:
+            return 0.0
+        return (self.equity - self.initial_equity) / self.initial_equity
+
+    @property
+    def annualized_return(self) -> float:
+        """Compounded annual return over the calendar days covered."""
+        if self.count < 2 or not self.initial_equity or self.equity <= 0:
+            return 0.0
+        try:
+            days = (self.last_timestamp - self.first_timestamp).days
+        except (TypeError, AttributeError):
+            return 0.0
+        if days < 1:
+            return 0.0
+        return math.exp(math.log(self.equity / self.initial_equity) / (days / 365.0)) - 1
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """Annualized Sharpe ratio of log returns (zero risk-free rate)."""
+        volatility = self.volatility
+        if volatility == 0:
+            return 0.0
+        return self._mean / volatility * math.sqrt(self.annualization_factor)
+
+    @property
+    def sortino_ratio(self) -> float:
+        """Annualized Sortino ratio; infinite without downside deviation."""
+        if self.return_count == 0:
+            return 0.0
+        downside = self.downside_deviation * math.sqrt(self.annualization_factor)
+        if downside == 0:
+            return float('inf')
+        return self._mean * self.annualization_factor / downside
+
+    @property
+    def calmar_ratio(self) -> float:
+        """Annualized return over maximum drawdown; infinite without drawdown."""
+        if self.count < 2:
+            return 0.0
+        if self.max_drawdown == 0:
+            return float('inf')
+        return self.annualized_return / self.max_drawdown
+
+    @property
+    def avg_drawdown(self) -> float:
+        """Mean drawdown over the points spent below the peak."""
+        return self._drawdown_sum / self._drawdown_points if self._drawdown_points else 0.0
+
+    @property
+    def drawdown_duration(self) -> int:
+        """Longest drawdown in points, including the current one."""
+        if self._drawdown_start is None:
+            return self.max_drawdown_duration
+        return max(self.max_drawdown_duration, self.count - 1 - self._drawdown_start)
+
+    @property
+    def win_rate(self) -> float:
+        """Share of closed trades with a profit."""
+        return self.winning_trades / self.trade_count if self.trade_count else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        """Gross profit over gross loss; infinite without losses."""
+        if self.gross_loss == 0:
+            return float('inf') if self.gross_profit > 0 else 0.0
+        return self.gross_profit / self.gross_loss
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get all metrics.
+
+        Returns:
+            Dict with return, risk, drawdown and trade metrics
+        """
+        return {
+            'total_return': self.total_return,
+            'annualized_return': self.annualized_return,
+            'sharpe_ratio': self.sharpe_ratio,
+            'sortino_ratio': self.sortino_ratio,
+            'calmar_ratio': self.calmar_ratio,
+            'mean_log_return': self.mean_return,
+            'volatility': self.volatility,
+            'downside_deviation': self.downside_deviation,
+            'max_drawdown': self.max_drawdown,
+            'avg_drawdown': self.avg_drawdown,
+            'max_drawdown_duration': self.drawdown_duration,
+            'trade_count': self.trade_count,
+            'winning_trades': self.winning_trades,
+            'losing_trades': self.losing_trades,
+            'win_rate': self.win_rate,
+            'gross_profit': self.gross_profit,
+            'gross_loss': self.gross_loss,
+            'profit_factor': self.profit_factor,
+            'max_consecutive_wins': self.max_consecutive_wins,
+            'max_consecutive_losses': self.max_consecutive_losses,
+            'current_consecutive_wins': self.current_consecutive_wins,
+            'current_consecutive_losses': self.current_consecutive_losses
+        }
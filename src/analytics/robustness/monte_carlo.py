@@ -3,6 +3,11 @@ Monte Carlo simulation for strategy robustness testing.
 
 This module provides functionality for testing strategy robustness through Monte Carlo
 simulations, including trade sequence bootstrapping and statistical analysis.
+
+By default simulations run in batches: each batch draws an
+(n_paths x n_trades) matrix of returns in one call and computes equity,
+drawdown and ratio metrics across the whole matrix with array operations.
+Only the per-path metrics are kept unless full equity paths are requested.
 """
 
 import numpy as np
@@ -15,6 +20,140 @@ from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+SIMULATION_METHODS = ("bootstrap", "block_bootstrap", "random_returns")
+DISTRIBUTIONS = ("normal", "lognormal", "t")
+ENGINES = ("vectorized", "loop")
+METRIC_NAMES = ("total_return", "annualized_return", "volatility",
+                "sharpe_ratio", "max_drawdown", "calmar_ratio")
+
+# Memory budget of one vectorized batch. calculate_path_metrics holds up to
+# BATCH_PEAK_MATRICES float64 matrices of the batch's shape at once (returns,
+# equity and two working matrices such as running peak and drawdown), so a
+# batch has this many cells in each matrix.
+DEFAULT_BATCH_BYTES = 64 * 1024 * 1024
+BATCH_PEAK_MATRICES = 4
+DEFAULT_BATCH_CELLS = DEFAULT_BATCH_BYTES // (8 * BATCH_PEAK_MATRICES)
+
+
+def simulate_returns(returns: np.ndarray, num_paths: int, method: str = "bootstrap",
+                     block_size: int = 5, distribution: str = "normal",
+                     rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Draw a matrix of simulated return sequences.
+    
+    Each row is one path with as many returns as the sample. The methods
+    match MonteCarloSimulator's per-path ones: 'bootstrap' samples returns
+    with replacement, 'block_bootstrap' samples overlapping blocks of
+    ``block_size`` consecutive returns, and 'random_returns' draws from a
+    distribution fitted to the sample's mean and standard deviation.
+    
+    Args:
+        returns: Sample of returns
+        num_paths: Number of paths (rows)
+        method: 'bootstrap', 'block_bootstrap' or 'random_returns'
+        block_size: Block length for 'block_bootstrap'
+        distribution: 'normal', 'lognormal' or 't' for 'random_returns'
+        rng: Random generator (default: a new unseeded one)
+        
+    Returns:
+        Array of shape (num_paths, len(returns))
+        
+    Raises:
+        ValueError: If the sample is empty or the method or distribution is unknown
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    if n == 0:
+        raise ValueError("No trade returns available for simulation")
+    rng = rng if rng is not None else np.random.default_rng()
+    
+    if method == "block_bootstrap" and n >= block_size:
+        # Sample block starts, then trim the concatenated blocks to n returns
+        num_blocks = n // block_size + 1
+        starts = rng.integers(0, n - block_size + 1, size=(num_paths, num_blocks))
+        indices = (starts[:, :, None] + np.arange(block_size)).reshape(num_paths, -1)[:, :n]
+        return returns[indices]
+    
+    if method in ("bootstrap", "block_bootstrap"):
+        # Too few returns for one block falls back to a plain bootstrap
+        return returns[rng.integers(0, n, size=(num_paths, n))]
+    
+    if method != "random_returns":
+        raise ValueError(f"Unknown simulation method: {method}")
+    
+    mean = returns.mean()
+    std = returns.std()
+    if distribution == "normal":
+        return rng.normal(mean, std, size=(num_paths, n))
+    if distribution == "lognormal":
+        # Adjust parameters for lognormal to match desired mean and std
+        loc = np.log(mean**2 / np.sqrt(std**2 + mean**2))
+        scale = np.sqrt(np.log(1 + std**2 / mean**2))
+        return rng.lognormal(loc, scale, size=(num_paths, n))
+    if distribution == "t":
+        # T distribution with 5 degrees of freedom, scaled per path to the sample's std
+        draws = rng.standard_t(5, size=(num_paths, n))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return draws * (std / draws.std(axis=1, keepdims=True)) + mean
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def calculate_path_metrics(returns: np.ndarray, initial_capital: float = 100000.0,
+                           keep_equity: bool = False) -> Tuple[Dict[str, np.ndarray], Optional[np.ndarray]]:
+    """
+    Calculate performance metrics for every path of a return matrix.
+    
+    Uses the same definitions as MonteCarloSimulator._calculate_metrics
+    (252 periods per year, zero risk-free rate), computed across all rows
+    at once.
+    
+    Args:
+        returns: Array of shape (num_paths, num_periods)
+        initial_capital: Starting equity of every path
+        keep_equity: Whether to return the equity paths
+        
+    Returns:
+        Tuple of (metric name -> array with one value per path, equity
+        paths of shape (num_paths, num_periods + 1) or None)
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    num_paths, num_periods = returns.shape
+    
+    # Compound in the same order as the per-path equity curve
+    growth = np.empty((num_paths, num_periods + 1))
+    growth[:, 0] = initial_capital
+    np.add(returns, 1.0, out=growth[:, 1:])
+    equity = np.cumprod(growth, axis=1, out=growth)
+    
+    # Working matrices are updated in place to bound peak memory
+    with np.errstate(invalid="ignore", divide="ignore"):
+        period_returns = np.divide(equity[:, 1:], equity[:, :-1])
+        period_returns -= 1
+        total_return = equity[:, -1] / equity[:, 0] - 1
+        annualized_return = (1 + total_return) ** (252 / num_periods) - 1
+        volatility = period_returns.std(axis=1) * np.sqrt(252)
+        del period_returns
+        
+        peak = np.maximum.accumulate(equity, axis=1)
+        drawdown = np.subtract(peak, equity)
+        drawdown /= peak
+        del peak
+        max_drawdown = np.maximum(drawdown.max(axis=1), 0.0)
+        del drawdown
+        
+        sharpe_ratio = np.where(volatility > 0, annualized_return / volatility, 0.0)
+        calmar_ratio = np.where(max_drawdown > 0, annualized_return / max_drawdown, 0.0)
+    
+    metrics = {
+        "total_return": total_return,
+        "annualized_return": annualized_return,
+        "volatility": volatility,
+        "sharpe_ratio": sharpe_ratio,
+        "max_drawdown": max_drawdown,
+        "calmar_ratio": calmar_ratio
+    }
+    return metrics, (equity if keep_equity else None)
+
 
 class MonteCarloSimulator:
     """
@@ -28,28 +167,67 @@ class MonteCarloSimulator:
                 equity_curve: pd.DataFrame = None,
                 initial_capital: float = 100000.0,
                 num_simulations: int = 1000, 
-                simulation_method: str = "bootstrap"):
+                simulation_method: str = "bootstrap",
+                engine: str = "vectorized",
+                batch_size: Optional[int] = None,
+                keep_paths: bool = False,
+                block_size: int = 5,
+                distribution: str = "normal",
+                random_state: Optional[int] = None):
         """
         Initialize Monte Carlo simulator.
         
         Args:
             trades: List of trade dictionaries
-            equity_curve: Equity curve as pandas DataFrame with DatetimeIndex
+            equity_curve: Equity curve as pandas DataFrame with DatetimeIndex;
+                its period returns are resampled when no trades are given
             initial_capital: Initial capital for simulations
             num_simulations: Number of simulations to run
             simulation_method: Method for simulation ('bootstrap', 'block_bootstrap', or 'random_returns')
+            engine: 'vectorized' to simulate in batches of paths, or 'loop' to
+                build each path's equity curve DataFrame one at a time
+            batch_size: Paths per batch for the vectorized engine (default:
+                as many as keep a batch within DEFAULT_BATCH_BYTES)
+            keep_paths: Whether to keep every equity path (needed for
+                get_equity_bands); the loop engine always keeps them in results
+            block_size: Block length for 'block_bootstrap'
+            distribution: Distribution for 'random_returns' ('normal', 'lognormal' or 't')
+            random_state: Seed for the vectorized engine (default: drawn from
+                numpy's global generator, so np.random.seed still applies)
+                
+        Raises:
+            ValueError: If the method, distribution or engine is unknown
         """
+        if simulation_method not in SIMULATION_METHODS:
+            raise ValueError(f"Unknown simulation method: {simulation_method}")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution}")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}, expected one of {ENGINES}")
+            
         self.trades = trades or []
         self.equity_curve = equity_curve
         self.initial_capital = initial_capital
         self.num_simulations = num_simulations
         self.simulation_method = simulation_method
+        self.engine = engine
+        self.batch_size = batch_size
+        self.keep_paths = keep_paths
+        self.block_size = block_size
+        self.distribution = distribution
+        self.random_state = random_state
         self.results = []
         self.metrics = {}
+        self.simulation_metrics = {}
+        self.equity_paths = None
+        self.trade_returns = []
+        self.trade_durations = []
         
         # Calculate trade returns if trades are provided
         if self.trades:
             self._calculate_trade_returns()
+        elif equity_curve is not None:
+            self._calculate_equity_returns()
     
     def _calculate_trade_returns(self) -> None:
         """Calculate percentage returns for each trade."""
@@ -88,6 +266,15 @@ class MonteCarloSimulator:
             else:
                 self.trade_durations.append(1.0)  # default to 1 day
     
+    def _calculate_equity_returns(self) -> None:
+        """Use the equity curve's period returns as the sample."""
+        if "equity" not in self.equity_curve.columns:
+            logger.warning("Equity curve has no 'equity' column, nothing to resample")
+            return
+        returns = self.equity_curve["equity"].pct_change().dropna()
+        self.trade_returns = returns.tolist()
+        self.trade_durations = [1.0] * len(self.trade_returns)
+    
     def bootstrap_trades(self, trade_returns: List[float] = None) -> List[float]:
         """
         Generate bootstrapped trade returns.
@@ -265,24 +452,35 @@ class MonteCarloSimulator:
         # Reset results
         self.results = []
         self.metrics = {}
+        self.simulation_metrics = {}
+        self.equity_paths = None
         
-        logger.info(f"Running {self.num_simulations} Monte Carlo simulations")
+        logger.info(f"Running {self.num_simulations} Monte Carlo simulations ({self.engine} engine)")
         
         # Start timing
         start_time = time.time()
         
-        # Run simulations
+        if self.engine == "vectorized":
+            self._run_vectorized(start_time)
+        else:
+            self._run_loop(start_time)
+        
+        # Calculate aggregate metrics
+        self._calculate_aggregate_metrics()
+        
+        return self._compile_results(time.time() - start_time)
+    
+    def _run_loop(self, start_time: float) -> None:
+        """Simulate one path at a time, keeping each equity curve in results."""
         for i in range(self.num_simulations):
             try:
                 # Generate simulated returns
                 if self.simulation_method == "bootstrap":
                     returns = self.bootstrap_trades()
                 elif self.simulation_method == "block_bootstrap":
-                    returns = self.block_bootstrap_trades()
-                elif self.simulation_method == "random_returns":
-                    returns = self.random_returns()
+                    returns = self.block_bootstrap_trades(self.block_size)
                 else:
-                    raise ValueError(f"Unknown simulation method: {self.simulation_method}")
+                    returns = self.random_returns(distribution=self.distribution)
                 
                 # Calculate equity curve
                 equity_df = self._calculate_equity_curve(returns)
@@ -305,57 +503,109 @@ class MonteCarloSimulator:
             except Exception as e:
                 logger.error(f"Error in simulation {i}: {e}")
         
-        # Calculate aggregate metrics
-        self._calculate_aggregate_metrics()
+        all_metrics = defaultdict(list)
+        for result in self.results:
+            for name, value in result["metrics"].items():
+                all_metrics[name].append(value)
+        self.simulation_metrics = {name: np.array(values) for name, values in all_metrics.items()}
+    
+    def _run_vectorized(self, start_time: float) -> None:
+        """Simulate paths in batches of return matrices, keeping only their metrics."""
+        if not self.trade_returns:
+            raise ValueError("No trade returns available for simulation")
+        
+        sample = np.asarray(self.trade_returns, dtype=np.float64)
+        if self.random_state is not None:
+            rng = np.random.default_rng(self.random_state)
+        else:
+            rng = np.random.default_rng(np.random.randint(0, 2**32, dtype=np.uint64))
+        
+        batch_size = self.batch_size or max(1, DEFAULT_BATCH_CELLS // (len(sample) + 1))
+        batches = defaultdict(list)
+        paths = []
+        completed = 0
+        
+        while completed < self.num_simulations:
+            num_paths = min(batch_size, self.num_simulations - completed)
+            returns = simulate_returns(sample, num_paths, self.simulation_method,
+                                       self.block_size, self.distribution, rng)
+            metrics, equity = calculate_path_metrics(returns, self.initial_capital, self.keep_paths)
+            for name, values in metrics.items():
+                batches[name].append(values)
+            if equity is not None:
+                paths.append(equity)
+            completed += num_paths
+            
+            elapsed = time.time() - start_time
+            logger.debug(f"Completed {completed}/{self.num_simulations} simulations, elapsed: {elapsed:.2f}s")
         
-        return self._compile_results()
+        self.simulation_metrics = {name: np.concatenate(values) for name, values in batches.items()}
+        if paths:
+            self.equity_paths = np.vstack(paths)
     
     def _calculate_aggregate_metrics(self) -> None:
         """Calculate aggregate metrics across all simulations."""
-        if not self.results:
+        if not self.simulation_metrics:
             return
             
-        # Extract metrics from all simulations
-        all_metrics = defaultdict(list)
-        
-        for result in self.results:
-            for name, value in result["metrics"].items():
-                all_metrics[name].append(value)
-        
         # Calculate statistics for each metric
         aggregate_metrics = {}
         
-        for name, values in all_metrics.items():
-            values_array = np.array(values)
-            
+        for name, values_array in self.simulation_metrics.items():
+            p5, p25, p75, p95 = np.percentile(values_array, [5, 25, 75, 95])
             aggregate_metrics[name] = {
                 "mean": np.mean(values_array),
                 "median": np.median(values_array),
                 "std": np.std(values_array),
                 "min": np.min(values_array),
                 "max": np.max(values_array),
-                "percentile_5": np.percentile(values_array, 5),
-                "percentile_25": np.percentile(values_array, 25),
-                "percentile_75": np.percentile(values_array, 75),
-                "percentile_95": np.percentile(values_array, 95)
+                "percentile_5": p5,
+                "percentile_25": p25,
+                "percentile_75": p75,
+                "percentile_95": p95
             }
         
         self.metrics = aggregate_metrics
     
-    def _compile_results(self) -> Dict[str, Any]:
+    def _compile_results(self, elapsed_time: float) -> Dict[str, Any]:
         """Compile simulation results into a summary dictionary."""
-        # Calculate elapsed time
-        elapsed_time = time.time() - (self.results[0]["equity_curve"].index[0] if self.results else time.time())
-        
-        # Compile final results
         return {
-            "num_simulations": len(self.results),
+            "num_simulations": self._num_completed(),
             "simulation_method": self.simulation_method,
             "initial_capital": self.initial_capital,
             "metrics": self.metrics,
             "elapsed_time": elapsed_time
         }
     
+    def _num_completed(self) -> int:
+        """Number of simulated paths with metrics."""
+        values = self.simulation_metrics.get("total_return")
+        return 0 if values is None else len(values)
+    
+    def get_equity_bands(self, percentiles: List[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """
+        Get percentile bands of equity across simulations at every step.
+        
+        Args:
+            percentiles: Percentiles (0-100) to compute
+            
+        Returns:
+            DataFrame with one row per step (0 is the initial capital) and a
+            'percentile_<p>' column per percentile
+            
+        Raises:
+            ValueError: If equity paths were not kept
+        """
+        if self.equity_paths is not None:
+            paths = self.equity_paths
+        elif self.engine == "loop" and self.results:
+            paths = np.vstack([r["equity_curve"]["equity"].values for r in self.results])
+        else:
+            raise ValueError("Equity paths were not kept; run with keep_paths=True")
+        
+        bands = np.percentile(paths, percentiles, axis=0)
+        return pd.DataFrame({f"percentile_{p:g}": band for p, band in zip(percentiles, bands)})
+    
     def get_confidence_intervals(self, metric_name: str, 
                                confidence_levels: List[float] = [0.95, 0.99]) -> Dict[str, Tuple[float, float]]:
         """
@@ -378,7 +628,7 @@ class MonteCarloSimulator:
             lower_percentile = (1 - confidence) / 2 * 100
             upper_percentile = (1 + confidence) / 2 * 100
             
-            metric_data = [result["metrics"][metric_name] for result in self.results]
+            metric_data = self.simulation_metrics[metric_name]
             lower = np.percentile(metric_data, lower_percentile)
             upper = np.percentile(metric_data, upper_percentile)
             
@@ -393,11 +643,10 @@ class MonteCarloSimulator:
         Returns:
             Probability of profit (0-1)
         """
-        if not self.results:
+        if not self._num_completed():
             return 0.0
             
-        profit_count = sum(1 for r in self.results if r["metrics"]["total_return"] > 0)
-        return profit_count / len(self.results)
+        return float(np.mean(self.simulation_metrics["total_return"] > 0))
     
     def get_probability_of_target_return(self, target_return: float) -> float:
         """
@@ -409,11 +658,10 @@ class MonteCarloSimulator:
         Returns:
             Probability of achieving target return (0-1)
         """
-        if not self.results:
+        if not self._num_completed():
             return 0.0
             
-        target_count = sum(1 for r in self.results if r["metrics"]["total_return"] >= target_return)
-        return target_count / len(self.results)
+        return float(np.mean(self.simulation_metrics["total_return"] >= target_return))
     
     def get_probability_of_max_drawdown(self, max_drawdown: float) -> float:
         """
@@ -425,11 +673,10 @@ class MonteCarloSimulator:
         Returns:
             Probability of exceeding threshold (0-1)
         """
-        if not self.results:
+        if not self._num_completed():
             return 0.0
             
-        count = sum(1 for r in self.results if r["metrics"]["max_drawdown"] >= max_drawdown)
-        return count / len(self.results)
+        return float(np.mean(self.simulation_metrics["max_drawdown"] >= max_drawdown))
     
     def get_worst_case_metrics(self, percentile: float = 0.05) -> Dict[str, float]:
         """
@@ -6,6 +6,9 @@ runs by providing a centralized mechanism for storing and resetting
 backtest state.
 """
 
+from src.core.equity_recorder import EquityRecorder
+
+
 class BacktestState:
     """
     Container for maintaining isolated backtest state.
@@ -27,7 +30,7 @@ class BacktestState:
         self.active_signals = {}  # symbol -> current signal direction
         
         # Performance metrics
-        self.equity_points = []
+        self.equity_points = EquityRecorder(columns=('equity', 'cash', 'market_value'))
         self.trade_history = []
         
         # Initialize logger
@@ -203,12 +206,7 @@ class BacktestState:
             cash (float): Cash balance
             market_value (float): Market value of positions
         """
-        self.equity_points.append({
-            'timestamp': timestamp,
-            'equity': equity,
-            'cash': cash,
-            'market_value': market_value
-        })
+        self.equity_points.record(timestamp, equity, cash, market_value)
         
     def add_trade_result(self, trade):
         """
@@ -224,7 +222,7 @@ class BacktestState:
         Get the equity curve.
         
         Returns:
-            list: Equity curve data points
+            EquityRecorder: Equity curve data points (indexable like a list of dicts)
         """
         return self.equity_points
         
@@ -243,7 +241,7 @@ class BacktestState:
         self.positions = {}
         self.active_trades = {}
         self.active_signals = {}
-        self.equity_points = []
+        self.equity_points.reset()
         self.trade_history = []
         
         self.logger.info("BacktestState reset to initial values")
@@ -10,7 +10,7 @@ import logging
 import sys
 from typing import Dict, List, Optional, Any
 
-from src.core.logging import configure_logging
+from src.core.logging import configure_logging, refresh_hot_path_loggers, PROFILE_PERFORMANCE
 
 def parse_args():
     """
@@ -64,6 +64,12 @@ def parse_args():
         help="Suppress console output",
         action="store_true"
     )
+    parser.add_argument(
+        "--quiet-hot-path",
+        help="Use the performance logging profile (per-bar messages at DEBUG)",
+        action="store_true",
+        dest="quiet_hot_path"
+    )
     
     return parser.parse_args()
 
@@ -79,12 +85,14 @@ def setup_logging(args):
         debug=args.debug,
         debug_modules=args.debug_modules,
         log_file=args.log_file,
-        console=not args.quiet
+        console=not args.quiet,
+        profile=PROFILE_PERFORMANCE if args.quiet_hot_path else None
     )
     
     # If verbose, but not debug, set INFO level
     if args.verbose and not args.debug:
         logging.getLogger().setLevel(logging.INFO)
+        refresh_hot_path_loggers()
 
 def main():
     """Main entry point for the application."""
@@ -10,6 +10,8 @@ import logging
 from abc import ABC
 from typing import Dict, Any, Optional
 
+from src.core.logging.hot_path import get_hot_path_logger
+
 class Component(ABC):
     """
     Base class for all components with proper lifecycle management.
@@ -33,6 +35,8 @@ class Component(ABC):
         self.context = None
         self.event_bus = None
         self.logger = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        # Level-gated logger for messages logged on every bar
+        self.hot_log = get_hot_path_logger(self.logger.name)
         
     def initialize(self, context: Dict[str, Any]) -> None:
         """
@@ -0,0 +1,292 @@
+"""
+Array-backed equity curve recording.
+
+Portfolios used to append a dict per bar to a list, which costs several
+hundred bytes per point and has to be converted to a DataFrame for every
+analysis. An EquityRecorder keeps timestamps as int64 nanoseconds and the
+values as one float64 array with a row per point, grown by doubling, so
+recording is amortized O(1) and ``to_dataframe()`` returns a view of the
+recorded rows without copying them.
+
+Long runs can keep a reduced copy in memory (every N points, or only points
+whose values changed) while every point is appended to a binary file on
+disk. The recorder still behaves like the list of dicts it replaces:
+``len()``, indexing, iteration and ``append(dict)`` work as before.
+"""
+
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Value columns recorded by portfolios
+DEFAULT_COLUMNS = ('equity', 'cash', 'positions_value')
+
+# Initial number of rows
+DEFAULT_CAPACITY = 1024
+
+# Rows written to the spill file at a time
+SPILL_CHUNK = 4096
+
+# Stored for points recorded without a timestamp
+NAT = np.iinfo(np.int64).min
+
+
+def worker_spill_path(path):
+    """
+    Give a configured spill file a name of its own in this process and thread.
+
+    Optimizations run many portfolios configured from the same file, on
+    threads or processes at once. A recorder truncates its file on reset and
+    appends to it while recording, so concurrent runs must not share one;
+    runs in the same thread follow each other and reuse a file.
+
+    Args:
+        path (str): Configured spill file, e.g. 'equity.bin'
+
+    Returns:
+        str: Path with a process and thread suffix, e.g. 'equity.1234-5678.bin';
+            None if path is None
+    """
+    if path is None:
+        return None
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid()}-{threading.get_ident()}{ext}"
+
+
+class EquityRecorder:
+    """
+    Growable, column-oriented store of equity points.
+    """
+
+    def __init__(self, columns=DEFAULT_COLUMNS, capacity=DEFAULT_CAPACITY, every=1, on_change=False,
+                 path=None):
+        """
+        Initialize the recorder.
+
+        Args:
+            columns (tuple): Names of the float value columns
+            capacity (int): Initial number of rows
+            every (int): Keep every N-th point in memory
+            on_change (bool): Keep a point in memory only if a value differs
+                from the previous point kept
+            path (str, optional): File every point is appended to, whatever
+                is kept in memory; read it back with read_full()
+
+        Raises:
+            ValueError: If every or capacity is not positive
+        """
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.columns = tuple(columns)
+        self.initial_capacity = capacity
+        self.every = every
+        self.on_change = on_change
+        self.path = path
+        self.dtype = np.dtype([('timestamp', np.int64)] + [(name, np.float64) for name in self.columns])
+        self.reset()
+
+    def reset(self):
+        """
+        Drop all points.
+
+        New arrays are allocated, so DataFrames returned earlier stay valid.
+        The spill file, if any, is truncated.
+        """
+        self._timestamps = np.empty(self.initial_capacity, dtype=np.int64)
+        self._values = np.empty((self.initial_capacity, len(self.columns)), dtype=np.float64)
+        self._size = 0
+        self.tz = None
+        self._tz_known = False
+        self.total_points = 0
+        self._latest = None
+        self._last_kept = None
+
+        self._spill = None
+        self._spilled = 0
+        if self.path is not None:
+            open(self.path, 'wb').close()
+            self._spill = np.empty(SPILL_CHUNK, dtype=self.dtype)
+
+    def record(self, timestamp, *values):
+        """
+        Record an equity point.
+
+        Args:
+            timestamp: Time of the point (datetime, pd.Timestamp or None)
+            *values (float): One value per column, in column order
+        """
+        ns = self._to_ns(timestamp)
+        self.total_points += 1
+        self._latest = (ns, values)
+
+        if self._spill is not None:
+            row = self._spill[self._spilled]
+            row[0] = ns
+            for i, value in enumerate(values, 1):
+                row[i] = value
+            self._spilled += 1
+            if self._spilled == SPILL_CHUNK:
+                self._flush_spill()
+
+        if (self.total_points - 1) % self.every:
+            return
+        if self.on_change and values == self._last_kept:
+            return
+        self._last_kept = values
+
+        size = self._size
+        if size == len(self._timestamps):
+            self._grow()
+        self._timestamps[size] = ns
+        self._values[size] = values
+        self._size = size + 1
+
+    def append(self, point):
+        """
+        Record an equity point given as a dict, like ``list.append``.
+
+        Args:
+            point (dict): 'timestamp' and the value columns (missing values are 0.0)
+        """
+        self.record(point.get('timestamp'), *(float(point.get(name, 0.0)) for name in self.columns))
+
+    def _grow(self):
+        """Double the capacity, keeping the recorded rows."""
+        capacity = 2 * len(self._timestamps)
+        timestamps = np.empty(capacity, dtype=np.int64)
+        values = np.empty((capacity, len(self.columns)), dtype=np.float64)
+        timestamps[:self._size] = self._timestamps[:self._size]
+        values[:self._size] = self._values[:self._size]
+        self._timestamps = timestamps
+        self._values = values
+
+    def _to_ns(self, timestamp):
+        """Convert a timestamp to int64 nanoseconds (UTC for tz-aware data)."""
+        if timestamp is None:
+            return NAT
+        ts = pd.Timestamp(timestamp)
+        if ts is pd.NaT:
+            return NAT
+        # The first timestamp decides whether the curve is tz-aware
+        if not self._tz_known:
+            self.tz = ts.tzinfo
+            self._tz_known = True
+        elif self.tz is None and ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        elif self.tz is not None and ts.tzinfo is None:
+            ts = ts.tz_localize(self.tz)
+        return ts.value
+
+    def _timestamp(self, ns):
+        """Convert stored nanoseconds back to a pd.Timestamp (None for missing)."""
+        if ns == NAT:
+            return None
+        return pd.Timestamp(int(ns), tz=self.tz)
+
+    def _flush_spill(self):
+        """Append the buffered points to the spill file."""
+        if self._spilled:
+            with open(self.path, 'ab') as f:
+                self._spill[:self._spilled].tofile(f)
+            self._spilled = 0
+
+    def flush(self):
+        """Write buffered points to the spill file."""
+        if self._spill is not None:
+            self._flush_spill()
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("equity point index out of range")
+        point = {'timestamp': self._timestamp(self._timestamps[index])}
+        point.update(zip(self.columns, self._values[index].tolist()))
+        return point
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __eq__(self, other):
+        if isinstance(other, EquityRecorder):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return len(other) == self._size and list(self) == other
+        return NotImplemented
+
+    @property
+    def nbytes(self):
+        """Bytes held by the timestamp and value arrays."""
+        return self._timestamps.nbytes + self._values.nbytes
+
+    @property
+    def latest(self):
+        """dict: Most recent point recorded, kept in memory or not (None if empty)."""
+        if self._latest is None:
+            return None
+        ns, values = self._latest
+        point = {'timestamp': self._timestamp(ns)}
+        point.update(zip(self.columns, (float(v) for v in values)))
+        return point
+
+    @property
+    def timestamps(self):
+        """np.ndarray: int64 nanosecond timestamps of the points in memory (a view)."""
+        return self._timestamps[:self._size]
+
+    def get(self, name):
+        """
+        Get a value column of the points in memory.
+
+        Args:
+            name (str): Column name
+
+        Returns:
+            np.ndarray: Column values (a view)
+        """
+        return self._values[:self._size, self.columns.index(name)]
+
+    def _frame(self, timestamps, values):
+        """Build a DataFrame indexed by timestamp over the given arrays."""
+        index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='timestamp')
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return pd.DataFrame(values, index=index, columns=list(self.columns), copy=False)
+
+    def to_dataframe(self):
+        """
+        Get the points in memory as a DataFrame indexed by timestamp.
+
+        The DataFrame shares the recorder's arrays; recording more points
+        does not change it.
+
+        Returns:
+            pd.DataFrame: One column per value column
+        """
+        return self._frame(self._timestamps[:self._size], self._values[:self._size])
+
+    def read_full(self):
+        """
+        Read every recorded point from the spill file.
+
+        Returns:
+            pd.DataFrame: All points, or the points in memory if there is no file
+        """
+        if self._spill is None:
+            return self.to_dataframe()
+        self.flush()
+        rows = np.fromfile(self.path, dtype=self.dtype)
+        values = np.empty((len(rows), len(self.columns)), dtype=np.float64)
+        for i, name in enumerate(self.columns):
+            values[:, i] = rows[name]
+        return self._frame(np.ascontiguousarray(rows['timestamp']), values)
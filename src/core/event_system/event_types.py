@@ -14,6 +14,7 @@ class EventType(Enum):
     # Market data events
     BAR = auto()           # Price bar event
     TICK = auto()          # Tick data event
+    TIME_SLICE = auto()    # All bars for one timestamp have been published
     
     # Signal events (from strategy to risk manager)
     SIGNAL = auto()        # Trading signal event
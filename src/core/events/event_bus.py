@@ -9,15 +9,19 @@ This implementation provides a full-featured pub/sub event system with:
 5. Comprehensive metrics for monitoring and debugging
 6. Event replay capabilities for debugging
 7. Backward compatibility with previous API
+8. Bounded event registry and deduplication memory for long backtests
+9. Compiled dispatch: cached handler tuples for high-volume publishing
 """
+import sys
 import logging
 import time
 import uuid
 import weakref
 import statistics
 from typing import Dict, List, Set, Tuple, Callable, Any, Optional, Union
-from datetime import datetime
-from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Mapping
 
 # Import directly from canonical sources
 from src.core.event_system.event_types import EventType
@@ -45,6 +49,16 @@ class EventBus:
     DEDUP_RULE = "rule"         # Deduplicate by rule_id for signals, order_id for orders/fills
     DEDUP_FULL = "full"         # Full deduplication based on event type rules
     
+    # Event registry retention policies
+    RETENTION_OFF = "off"       # Do not keep an event registry
+    RETENTION_RING = "ring"     # Keep the last registry_size events
+    RETENTION_TTL = "ttl"       # Keep events newer than registry_ttl in simulated time
+    RETENTION_ALL = "all"       # Keep every event (unbounded)
+    RETENTION_POLICIES = (RETENTION_OFF, RETENTION_RING, RETENTION_TTL, RETENTION_ALL)
+    
+    # Dedup key expiry at the end of the simulated day
+    EXPIRE_END_OF_DAY = "day"
+    
     # Default priorities
     DEFAULT_PRIORITY = 0
     HIGH_PRIORITY = -100        # Lower number = higher priority
@@ -55,7 +69,14 @@ class EventBus:
                  enable_metrics=False, 
                  enable_replay=False,
                  metrics_window_size=100,
-                 max_event_history=1000):
+                 max_event_history=1000,
+                 registry_retention=RETENTION_RING,
+                 registry_size=10000,
+                 registry_ttl=None,
+                 dedup_expiry=None,
+                 dedup_max_keys=None,
+                 compiled_dispatch=False,
+                 untracked_event_types=None):
         """
         Initialize the event bus.
         
@@ -65,6 +86,23 @@ class EventBus:
             enable_replay: Whether to enable event replay
             metrics_window_size: Number of events to keep metrics for
             max_event_history: Maximum number of events to keep for replay
+            registry_retention: Event registry retention policy (RETENTION_*)
+            registry_size: Number of events kept by the ring retention policy
+            registry_ttl: Age limit for the ttl retention policy, as a timedelta
+                or seconds of simulated time
+            dedup_expiry: Optional mapping of event type (or its name) to
+                EXPIRE_END_OF_DAY, a timedelta or seconds after which a
+                deduplication key is forgotten
+            dedup_max_keys: Optional limit on deduplication keys kept per
+                event type; the oldest keys are dropped first
+            compiled_dispatch: Whether to dispatch through cached per-event-type
+                handler tuples that are rebuilt only when subscriptions change
+            untracked_event_types: Event types (or names) that skip
+                deduplication and the event registry. Defaults to BAR with
+                compiled dispatch and to none otherwise
+            
+        Raises:
+            ValueError: If the retention policy or its settings are invalid
         """
         # Core subscriber registry - event_type -> [(priority, subscriber)]
         self.subscribers = {}
@@ -72,13 +110,43 @@ class EventBus:
         # Backward compatibility - handlers is an alias for subscribers
         self.handlers = self.subscribers
         
+        if registry_retention not in self.RETENTION_POLICIES:
+            raise ValueError(f"Unknown registry retention policy: {registry_retention}, "
+                             f"expected one of {self.RETENTION_POLICIES}")
+        if registry_retention == self.RETENTION_RING and (registry_size is None or registry_size < 1):
+            raise ValueError("Ring retention requires a positive registry_size")
+        if registry_retention == self.RETENTION_TTL and registry_ttl is None:
+            raise ValueError("TTL retention requires registry_ttl")
+        if registry_ttl == self.EXPIRE_END_OF_DAY:
+            raise ValueError("registry_ttl must be a timedelta or a number of seconds")
+        
         # Deduplication tracking
         self.deduplication_strategy = deduplication_strategy
-        self.processed_events = {}  # event_type -> {dedup_key: event_info}
+        self.processed_events = {}  # event_type -> OrderedDict{dedup_key: event_id}
+        self.dedup_expiry = {self._resolve_event_type(event_type): self._parse_expiry(expiry)
+                             for event_type, expiry in (dedup_expiry or {}).items()}
+        self.dedup_max_keys = dedup_max_keys
+        self._dedup_deadlines = {}  # event_type -> OrderedDict{dedup_key: expiry time}
         
         # Event tracking
         self.event_counts = defaultdict(int)
-        self.event_registry = {}  # event_id -> event_info
+        self.event_registry = OrderedDict()  # event_id -> event_info
+        self.registry_retention = registry_retention
+        self.registry_size = registry_size
+        self.registry_ttl = self._parse_expiry(registry_ttl) if registry_ttl is not None else None
+        
+        # Simulated clock, advanced from event timestamps when retention depends on time
+        self._tracks_time = registry_retention == self.RETENTION_TTL or bool(self.dedup_expiry)
+        self._clock = None
+        self.memory_counters = defaultdict(int)
+        
+        # Compiled dispatch - event_type -> ((handler_or_ref, is_weak), ...)
+        self.compiled_dispatch = compiled_dispatch
+        self._dispatch_cache = {}
+        if untracked_event_types is None:
+            untracked_event_types = (EventType.BAR,) if compiled_dispatch else ()
+        self.untracked_event_types = frozenset(self._resolve_event_type(event_type)
+                                               for event_type in untracked_event_types)
         
         # Metrics
         self.enable_metrics = enable_metrics
@@ -101,7 +169,40 @@ class EventBus:
         self.batched_events = []
         
         logger.info(f"EventBus initialized with deduplication_strategy={deduplication_strategy}, "
-                   f"enable_metrics={enable_metrics}, enable_replay={enable_replay}")
+                   f"enable_metrics={enable_metrics}, enable_replay={enable_replay}, "
+                   f"registry_retention={registry_retention}, compiled_dispatch={compiled_dispatch}")
+    
+    @classmethod
+    def from_config(cls, config=None) -> 'EventBus':
+        """
+        Create an event bus from an 'event_bus' configuration section.
+        
+        Recognised keys are deduplication_strategy, enable_metrics,
+        enable_replay, metrics_window_size, max_event_history, retention,
+        registry_size, registry_ttl, dedup_expiry, dedup_max_keys,
+        compiled_dispatch and untracked_event_types.
+        
+        Args:
+            config: Configuration dictionary (None for defaults)
+            
+        Returns:
+            EventBus: Configured event bus
+        """
+        config = config or {}
+        return cls(
+            deduplication_strategy=config.get('deduplication_strategy', cls.DEDUP_FULL),
+            enable_metrics=config.get('enable_metrics', False),
+            enable_replay=config.get('enable_replay', False),
+            metrics_window_size=config.get('metrics_window_size', 100),
+            max_event_history=config.get('max_event_history', 1000),
+            registry_retention=config.get('retention', cls.RETENTION_RING),
+            registry_size=config.get('registry_size', 10000),
+            registry_ttl=config.get('registry_ttl'),
+            dedup_expiry=config.get('dedup_expiry'),
+            dedup_max_keys=config.get('dedup_max_keys'),
+            compiled_dispatch=config.get('compiled_dispatch', False),
+            untracked_event_types=config.get('untracked_event_types')
+        )
     
     #-----------------------------------------------------------------------
     # Core Pub/Sub Methods
@@ -121,6 +222,8 @@ class EventBus:
             
         # Check if handler is already registered to prevent duplicates
         for _, existing_handler in self.subscribers[event_type]:
+            if isinstance(existing_handler, weakref.WeakMethod):
+                existing_handler = existing_handler()
             if existing_handler == handler:
                 return
             
@@ -138,9 +241,11 @@ class EventBus:
         
         # Sort handlers by priority (lower number = higher priority)
         self.subscribers[event_type].sort(key=lambda x: x[0])
+        self._dispatch_cache.pop(event_type, None)
         
-        handler_name = getattr(handler, '__name__', str(handler))
-        logger.debug(f"Subscribed {handler_name} to {event_type.name} with priority {priority}")
+        if logger.isEnabledFor(logging.DEBUG):
+            handler_name = getattr(handler, '__name__', str(handler))
+            logger.debug(f"Subscribed {handler_name} to {event_type.name} with priority {priority}")
     
     def unsubscribe(self, event_type: EventType, handler: Callable) -> bool:
         """
@@ -182,6 +287,7 @@ class EventBus:
         
         # Update handlers list
         self.subscribers[event_type] = filtered_handlers
+        self._dispatch_cache.pop(event_type, None)
         
         # If all handlers are removed, delete the event type entry
         if not self.subscribers[event_type]:
@@ -213,7 +319,8 @@ class EventBus:
         
         # Check if event is already consumed
         if event.is_consumed():
-            logger.debug(f"Skipping already consumed event with ID: {event_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Skipping already consumed event with ID: {event_id}")
             return 0
             
         try:
@@ -224,27 +331,38 @@ class EventBus:
             
         # Metrics: Record event start time
         start_time = time.time() if self.enable_metrics else None
+        
+        # Advance the simulated clock before any time-based expiry
+        if self._tracks_time:
+            self._advance_clock(event)
+        
+        # Untracked event types go straight to their handlers
+        tracked = event_type not in self.untracked_event_types
             
         # Get deduplication key if available and enabled
         dedup_key = None
-        if self.deduplication_strategy != self.DEDUP_NONE:
+        if tracked and self.deduplication_strategy != self.DEDUP_NONE:
             dedup_key = self._get_dedup_key(event)
         
         # Check for duplicate if we have a key
         if dedup_key and self._is_duplicate(event_type, dedup_key):
-            # Use lower log level to reduce noise
-            logger.debug(f"BLOCKED: Duplicate event {event_type.name} with key: {dedup_key}")
-            # Only print all dedup keys in DEBUG mode to reduce log verbosity
-            if logger.getEffectiveLevel() <= logging.DEBUG and event_type in self.processed_events:
-                keys = sorted(list(self.processed_events[event_type].keys()))
-                logger.debug(f"All dedup keys for {event_type.name}: {keys}")
+            # Only log the blocked event and all dedup keys in DEBUG mode to reduce overhead
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"BLOCKED: Duplicate event {event_type.name} with key: {dedup_key}")
+                if event_type in self.processed_events:
+                    keys = sorted(list(self.processed_events[event_type].keys()))
+                    logger.debug(f"All dedup keys for {event_type.name}: {keys}")
             return 0
             
         # Track the event
-        self._track_event(event)
+        if tracked:
+            self._track_event(event)
             
         # Process the event
-        handlers_called = self._process_event(event, start_time)
+        if self.compiled_dispatch:
+            handlers_called = self._dispatch_compiled(event, event_type)
+        else:
+            handlers_called = self._process_event(event, start_time)
         
         # Record as processed if we have a dedup key
         if dedup_key:
@@ -505,16 +623,21 @@ class EventBus:
         """Reset the event bus state for a new session."""
         # Clear subscribers for testing consistency
         self.subscribers.clear()
+        self._dispatch_cache.clear()
         
         # Clear all other state
         if hasattr(self, 'processed_events'):
             self.processed_events.clear()
+        self._dedup_deadlines.clear()
         
         self.event_counts.clear()
         
         if hasattr(self, 'event_registry'):
             self.event_registry.clear()
         
+        self._clock = None
+        self.memory_counters.clear()
+        
         # Reset metrics
         if self.enable_metrics:
             self.reset_metrics()
@@ -572,7 +695,8 @@ class EventBus:
             'replay_enabled': self.enable_replay,
             'replay_history_size': len(self.event_history) if self.event_history else 0,
             'batch_mode': self.batch_mode,
-            'batched_events': len(self.batched_events) if self.batch_mode else 0
+            'batched_events': len(self.batched_events) if self.batch_mode else 0,
+            'memory': self.get_memory_stats()
         }
         
         # Include metrics if enabled
@@ -581,6 +705,32 @@ class EventBus:
             
         return stats
     
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """
+        Get the size of the event registry and deduplication state.
+        
+        Byte counts are shallow container sizes and only meant for watching
+        growth over a run, not for exact accounting.
+        
+        Returns:
+            Dict: Entry counts, eviction counters and approximate sizes
+        """
+        dedup_keys = sum(len(keys) for keys in self.processed_events.values())
+        container_bytes = sys.getsizeof(self.event_registry)
+        container_bytes += sum(sys.getsizeof(keys) for keys in self.processed_events.values())
+        container_bytes += sum(sys.getsizeof(deadlines) for deadlines in self._dedup_deadlines.values())
+        
+        return {
+            'registry_retention': self.registry_retention,
+            'registry_entries': len(self.event_registry),
+            'registry_evicted': self.memory_counters['registry_evicted'],
+            'dedup_keys': dedup_keys,
+            'dedup_expired': self.memory_counters['dedup_expired'],
+            'dedup_evicted': self.memory_counters['dedup_evicted'],
+            'replay_history_size': len(self.event_history) if self.event_history else 0,
+            'container_bytes': container_bytes
+        }
+    
     #-----------------------------------------------------------------------
     # Backward Compatibility Methods
     #-----------------------------------------------------------------------
@@ -690,7 +840,8 @@ class EventBus:
                 # Use rule_id for signal deduplication
                 rule_id = data.get('rule_id')
                 if rule_id:
-                    logger.debug(f"Signal dedup key (rule_id): {rule_id}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Signal dedup key (rule_id): {rule_id}")
                     return rule_id
             elif event_type == EventType.ORDER:
                 # Use rule_id or order_id for order deduplication
@@ -699,13 +850,15 @@ class EventBus:
                 
                 dedup_key = rule_id or order_id
                 if dedup_key:
-                    logger.debug(f"Order dedup key: {dedup_key}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Order dedup key: {dedup_key}")
                     return dedup_key
             elif event_type == EventType.FILL:
                 # Use order_id for fill deduplication
                 order_id = data.get('order_id')
                 if order_id:
-                    logger.debug(f"Fill dedup key (order_id): {order_id}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Fill dedup key (order_id): {order_id}")
                     return order_id
         
         # Default: use event ID
@@ -724,6 +877,9 @@ class EventBus:
         """
         if event_type not in self.processed_events:
             return False
+        
+        if event_type in self._dedup_deadlines:
+            self._expire_dedup_keys(event_type)
             
         # Check if key exists in processed events
         return dedup_key in self.processed_events[event_type]
@@ -732,20 +888,51 @@ class EventBus:
         """
         Record an event as processed.
         
+        Only the key and the ID of the event that claimed it are kept; the
+        payload is not copied.
+        
         Args:
             event_type: Event type
             dedup_key: Deduplication key
             event: Event to record
         """
-        if event_type not in self.processed_events:
-            self.processed_events[event_type] = {}
+        keys = self.processed_events.get(event_type)
+        if keys is None:
+            keys = self.processed_events[event_type] = OrderedDict()
             
-        # Store the event with its key
-        self.processed_events[event_type][dedup_key] = {
-            'event_id': event.get_id(),
-            'timestamp': getattr(event, 'timestamp', datetime.now()),
-            'data': getattr(event, 'data', {}).copy() if hasattr(event, 'data') else {}
-        }
+        keys[dedup_key] = event.get_id()
+        
+        expiry = self.dedup_expiry.get(event_type)
+        if expiry is not None and self._clock is not None:
+            deadlines = self._dedup_deadlines.setdefault(event_type, OrderedDict())
+            deadlines[dedup_key] = self._expiry_time(self._clock, expiry)
+            deadlines.move_to_end(dedup_key)
+        
+        if self.dedup_max_keys is not None:
+            while len(keys) > self.dedup_max_keys:
+                oldest, _ = keys.popitem(last=False)
+                self._dedup_deadlines.get(event_type, {}).pop(oldest, None)
+                self.memory_counters['dedup_evicted'] += 1
+    
+    def _expire_dedup_keys(self, event_type: EventType) -> None:
+        """
+        Drop deduplication keys whose expiry time has passed.
+        
+        Args:
+            event_type: Event type to expire keys for
+        """
+        if self._clock is None:
+            return
+            
+        deadlines = self._dedup_deadlines[event_type]
+        keys = self.processed_events.get(event_type, {})
+        while deadlines:
+            dedup_key, deadline = next(iter(deadlines.items()))
+            if deadline > self._clock:
+                break
+            deadlines.popitem(last=False)
+            if keys.pop(dedup_key, None) is not None:
+                self.memory_counters['dedup_expired'] += 1
         
     def _track_event(self, event: Event) -> None:
         """
@@ -754,16 +941,118 @@ class EventBus:
         Args:
             event: Event to track
         """
+        if self.registry_retention == self.RETENTION_OFF:
+            return
+            
         # Get or create event ID
         event_id = event.get_id()
+        timestamp = self._clock if self._tracks_time else getattr(event, 'timestamp', None)
             
         # Store in registry with timestamp and consumption state
         self.event_registry[event_id] = {
             'type': event.get_type(),
-            'timestamp': getattr(event, 'timestamp', datetime.now()),
+            'timestamp': timestamp or datetime.now(),
             'data': getattr(event, 'data', {}).copy() if hasattr(event, 'data') else {},
             'consumed': event.is_consumed()
         }
+        self.event_registry.move_to_end(event_id)
+        
+        # Apply the retention policy
+        if self.registry_retention == self.RETENTION_RING:
+            while len(self.event_registry) > self.registry_size:
+                self.event_registry.popitem(last=False)
+                self.memory_counters['registry_evicted'] += 1
+        elif self.registry_retention == self.RETENTION_TTL and self._clock is not None:
+            cutoff = self._clock - self.registry_ttl
+            while self.event_registry:
+                oldest = next(iter(self.event_registry.values()))
+                if oldest['timestamp'] >= cutoff:
+                    break
+                self.event_registry.popitem(last=False)
+                self.memory_counters['registry_evicted'] += 1
+    
+    def _advance_clock(self, event: Event) -> None:
+        """
+        Move the simulated clock forward to an event's time.
+        
+        Market events carry their simulated time in data['timestamp']; the
+        event's own creation time is used when that is missing. The clock
+        never moves backwards.
+        
+        Args:
+            event: Event being published
+        """
+        data = getattr(event, 'data', None)
+        event_time = data.get('timestamp') if isinstance(data, Mapping) else None
+        if not isinstance(event_time, datetime):
+            event_time = getattr(event, 'timestamp', None)
+        if not isinstance(event_time, datetime):
+            return
+            
+        try:
+            if self._clock is None or event_time > self._clock:
+                self._clock = event_time
+        except TypeError:
+            # Mixed naive and timezone-aware timestamps cannot be ordered
+            logger.debug(f"Ignoring event time {event_time} that cannot be compared with {self._clock}")
+    
+    @staticmethod
+    def _expiry_time(now: datetime, expiry) -> datetime:
+        """
+        Get the time at which a key recorded at ``now`` expires.
+        
+        Args:
+            now: Simulated time the key was recorded
+            expiry: EXPIRE_END_OF_DAY or a timedelta
+            
+        Returns:
+            datetime: Expiry time
+        """
+        if expiry == EventBus.EXPIRE_END_OF_DAY:
+            return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        return now + expiry
+    
+    @classmethod
+    def _parse_expiry(cls, expiry):
+        """
+        Normalise an expiry setting to EXPIRE_END_OF_DAY or a timedelta.
+        
+        Args:
+            expiry: EXPIRE_END_OF_DAY, a timedelta or a number of seconds
+            
+        Returns:
+            Union[str, timedelta]: Normalised expiry
+            
+        Raises:
+            ValueError: If the expiry is not understood
+        """
+        if expiry == cls.EXPIRE_END_OF_DAY or isinstance(expiry, timedelta):
+            return expiry
+        if isinstance(expiry, (int, float)) and not isinstance(expiry, bool) and expiry > 0:
+            return timedelta(seconds=expiry)
+        raise ValueError(f"Invalid expiry: {expiry!r}, expected '{cls.EXPIRE_END_OF_DAY}', "
+                         f"a timedelta or a positive number of seconds")
+    
+    @staticmethod
+    def _resolve_event_type(event_type) -> EventType:
+        """
+        Resolve an event type given as an EventType or its name.
+        
+        Args:
+            event_type: EventType or name such as 'SIGNAL'
+            
+        Returns:
+            EventType: Resolved event type
+            
+        Raises:
+            ValueError: If the name is not a known event type
+        """
+        if isinstance(event_type, EventType):
+            return event_type
+        try:
+            return EventType[str(event_type).upper()]
+        except KeyError:
+            raise ValueError(f"Unknown event type: {event_type}")
         
     def _process_event(self, event: Event, start_time=None) -> int:
         """
@@ -794,13 +1083,15 @@ class EventBus:
         subscribers_copy = list(self.subscribers[event_type])
         dead_refs = []
         
-        logger.debug(f"Processing {event_type.name} event (ID: {event.get_id()})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Processing {event_type.name} event (ID: {event.get_id()})")
         
         # Process each subscriber
         for priority, subscriber_ref in subscribers_copy:
             # Check if event is consumed
             if event.is_consumed():
-                logger.debug(f"Event {event_type.name} consumed, skipping remaining subscribers")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Event {event_type.name} consumed, skipping remaining subscribers")
                 break
                 
             try:
@@ -852,6 +1143,86 @@ class EventBus:
                 s for s in self.subscribers[event_type]
                 if s[1] not in dead_refs
             ]
+            self._dispatch_cache.pop(event_type, None)
+            
+        return handlers_called
+    
+    def _compile_handlers(self, event_type: EventType) -> Tuple[Tuple[Callable, bool], ...]:
+        """
+        Build and cache the dispatch tuple for an event type.
+        
+        Handlers stay weak references where they were subscribed as such;
+        each entry records whether it needs to be resolved before calling.
+        
+        Args:
+            event_type: Event type to compile handlers for
+            
+        Returns:
+            Tuple: (handler_or_ref, is_weak) pairs in priority order
+        """
+        handlers = tuple(
+            (subscriber_ref, isinstance(subscriber_ref, weakref.ReferenceType))
+            for _, subscriber_ref in self.subscribers.get(event_type, ())
+        )
+        self._dispatch_cache[event_type] = handlers
+        return handlers
+    
+    def _dispatch_compiled(self, event: Event, event_type: EventType) -> int:
+        """
+        Deliver an event through the cached handler tuple for its type.
+        
+        Behaves like _process_event - priority order, consumption, handler
+        errors and metrics are handled the same way - without copying the
+        subscriber list or formatting log messages per event.
+        
+        Args:
+            event: Event to deliver
+            event_type: Type of the event
+            
+        Returns:
+            int: Number of handlers called
+        """
+        self.event_counts[event_type] += 1
+        if self.enable_metrics:
+            self.metrics['events_since_last'][event_type] += 1
+            
+        handlers = self._dispatch_cache.get(event_type)
+        if handlers is None:
+            handlers = self._compile_handlers(event_type)
+            
+        handlers_called = 0
+        found_dead = False
+        
+        for subscriber_ref, is_weak in handlers:
+            if event.consumed:
+                break
+                
+            subscriber = subscriber_ref() if is_weak else subscriber_ref
+            if subscriber is None:
+                found_dead = True
+                continue
+                
+            handler_start = time.time() if self.enable_metrics else None
+            try:
+                subscriber(event)
+                handlers_called += 1
+                
+                if handler_start:
+                    key = (event_type, id(subscriber_ref))
+                    self.metrics['handler_times'][key].append(time.time() - handler_start)
+                    
+            except TypeError as te:
+                handler_name = getattr(subscriber, '__name__', str(subscriber))
+                if "missing 1 required positional argument" in str(te):
+                    logger.error(f"Handler {handler_name} has incorrect signature: {te}")
+                else:
+                    logger.error(f"Error in handler {handler_name}: {te}", exc_info=True)
+            except Exception as e:
+                handler_name = getattr(subscriber, '__name__', str(subscriber))
+                logger.error(f"Error in handler {handler_name}: {e}", exc_info=True)
+                
+        if found_dead:
+            self._clean_subscribers()
             
         return handlers_called
         
@@ -888,7 +1259,9 @@ class EventBus:
                     s for s in self.subscribers[event_type]
                     if s[1] not in dead_refs
                 ]
+                self._dispatch_cache.pop(event_type, None)
                 
             # Remove empty subscriber lists
             if not self.subscribers[event_type]:
                 del self.subscribers[event_type]
+                self._dispatch_cache.pop(event_type, None)
@@ -13,6 +13,24 @@ from .config import (
     EXECUTION_PREFIX,
     ANALYTICS_PREFIX
 )
+from .async_sink import (
+    AsyncLogSink,
+    BatchedFileHandler,
+    start_async_logging,
+    stop_async_logging,
+    get_async_sink,
+    worker_log_queue,
+    install_worker_logging
+)
+from .hot_path import (
+    HotPathLogger,
+    get_hot_path_logger,
+    refresh_hot_path_loggers,
+    set_hot_path_profile,
+    get_hot_path_profile,
+    PROFILE_DEFAULT,
+    PROFILE_PERFORMANCE
+)
 
 __all__ = [
     'configure_logging',
@@ -23,5 +41,19 @@ __all__ = [
     'STRATEGY_PREFIX',
     'RISK_PREFIX',
     'EXECUTION_PREFIX',
-    'ANALYTICS_PREFIX'
+    'ANALYTICS_PREFIX',
+    'HotPathLogger',
+    'get_hot_path_logger',
+    'refresh_hot_path_loggers',
+    'set_hot_path_profile',
+    'get_hot_path_profile',
+    'PROFILE_DEFAULT',
+    'PROFILE_PERFORMANCE',
+    'AsyncLogSink',
+    'BatchedFileHandler',
+    'start_async_logging',
+    'stop_async_logging',
+    'get_async_sink',
+    'worker_log_queue',
+    'install_worker_logging'
 ]
\ No newline at end of file
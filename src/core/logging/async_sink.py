@@ -0,0 +1,351 @@
+"""
+Asynchronous log sink.
+
+With the handlers attached by configure_logging, every logging call writes
+to the console and the log file before it returns, so a backtest or an
+optimization waits on disk I/O for each message. An AsyncLogSink moves the
+writing to a background thread:
+
+1. The root logger only gets a QueueHandler, which puts records on a queue
+2. A listener thread takes records off the queue and passes them to the
+   real handlers, flushing them once per batch rather than once per record
+3. BatchedFileHandler writes a batch with a single write call and can
+   rotate the file by size, gzip-compressing the rotated files
+4. Worker processes of a process pool install a QueueHandler for a
+   multiprocessing queue (see worker_log_queue and install_worker_logging),
+   so their records reach the same listener and the log file has a single
+   writer
+
+Use start_async_logging() to switch the current handlers to a sink, or
+configure_logging(async_logging=True). stop_async_logging() drains the
+queue; it is also registered to run at exit.
+"""
+
+import atexit
+import gzip
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+from logging.handlers import QueueHandler
+from typing import Any, List, Optional
+
+from .hot_path import refresh_hot_path_loggers
+
+# Records handled before the handlers are flushed
+DEFAULT_BATCH_SIZE = 512
+
+# Stops listener and forwarder threads
+_STOP = None
+
+_active_sink: Optional["AsyncLogSink"] = None
+_atexit_registered = False
+
+
+class BatchedFileHandler(logging.Handler):
+    """
+    File handler that buffers formatted records and writes them in batches.
+
+    The buffer is written when it holds batch_size records and whenever the
+    handler is flushed. With max_bytes set the file is rotated like
+    RotatingFileHandler's: app.log becomes app.log.1, app.log.1 becomes
+    app.log.2 and so on, up to backup_count files.
+    """
+
+    def __init__(self, filename: str, mode: str = 'a', encoding: Optional[str] = 'utf-8',
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_bytes: int = 0,
+                 backup_count: int = 0, compress: bool = False):
+        """
+        Initialize the handler.
+
+        Args:
+            filename: Log file path
+            mode: Mode the file is first opened with ('a' or 'w')
+            encoding: File encoding
+            batch_size: Records buffered before they are written
+            max_bytes: Rotate the file once it reaches this size (0: never)
+            backup_count: Rotated files kept; with 0 the file is truncated
+                instead
+            compress: gzip rotated files (app.log.1.gz, ...)
+
+        Raises:
+            ValueError: If batch_size is not positive
+        """
+        super().__init__()
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self._buffer: List[str] = []
+        self.stream = open(self.baseFilename, mode, encoding=encoding)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer a record, writing the buffer once it is full."""
+        try:
+            self._buffer.append(self.format(record))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Write the buffered records to the file."""
+        with self.lock:
+            if not self._buffer or self.stream is None:
+                return
+            data = '\n'.join(self._buffer) + '\n'
+            self._buffer.clear()
+            self.stream.write(data)
+            self.stream.flush()
+            if self.max_bytes > 0 and self.stream.tell() >= self.max_bytes:
+                self.do_rollover()
+
+    def _backup_name(self, index: int) -> str:
+        name = f"{self.baseFilename}.{index}"
+        return name + '.gz' if self.compress else name
+
+    def do_rollover(self) -> None:
+        """Rotate the log file and open a new one."""
+        self.stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self._backup_name(index)
+                if os.path.exists(source):
+                    os.replace(source, self._backup_name(index + 1))
+            if self.compress:
+                with open(self.baseFilename, 'rb') as src, gzip.open(self._backup_name(1), 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.baseFilename)
+            else:
+                os.replace(self.baseFilename, self._backup_name(1))
+        self.stream = open(self.baseFilename, 'w', encoding=self.encoding)
+
+    def close(self) -> None:
+        """Write the buffered records and close the file."""
+        with self.lock:
+            try:
+                self.flush()
+            finally:
+                if self.stream is not None:
+                    self.stream.close()
+                    self.stream = None
+                super().close()
+
+
+class _LocalQueueHandler(QueueHandler):
+    """
+    QueueHandler for a queue read in the same process.
+
+    The record does not have to be pickled, so rather than copying it and
+    formatting it as QueueHandler does, only its message is resolved (the
+    arguments may change after the call returns).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class AsyncLogSink:
+    """
+    Background thread that passes queued records to a set of handlers.
+    """
+
+    def __init__(self, handlers: List[logging.Handler], batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the sink.
+
+        Args:
+            handlers: Handlers records are passed to; the sink owns them
+                and closes them when stopped
+            batch_size: Records handled before the handlers are flushed
+        """
+        self.handlers = list(handlers)
+        self.batch_size = batch_size
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._process_queue = None
+        self._listener: Optional[threading.Thread] = None
+        self._forwarder: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the listener thread."""
+        if self._listener is None:
+            self._listener = threading.Thread(target=self._listen, name='log-sink', daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        """Handle records until stopped, flushing after each batch."""
+        get = self.queue.get
+        get_nowait = self.queue.get_nowait
+        while True:
+            record = get()
+            count = 0
+            # Take whatever else is queued, up to a batch
+            while record is not _STOP:
+                self.handle(record)
+                count += 1
+                if count >= self.batch_size:
+                    break
+                try:
+                    record = get_nowait()
+                except queue.Empty:
+                    break
+            self._flush_handlers()
+            if record is _STOP:
+                return
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Pass a record to every handler whose level it meets.
+
+        Args:
+            record: Log record
+        """
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+
+    def worker_queue(self) -> Any:
+        """
+        Get the queue worker processes send their records to.
+
+        The multiprocessing queue is created on first use, together with a
+        thread that forwards its records to the listener.
+
+        Returns:
+            multiprocessing.Queue: Queue for install_worker_logging
+        """
+        if self._process_queue is None:
+            self._process_queue = multiprocessing.Queue()
+            self._forwarder = threading.Thread(target=self._forward, name='log-sink-forwarder', daemon=True)
+            self._forwarder.start()
+        return self._process_queue
+
+    def _forward(self) -> None:
+        """Move records from worker processes to the listener's queue."""
+        while True:
+            try:
+                record = self._process_queue.get()
+            except (EOFError, OSError):
+                return
+            if record is _STOP:
+                return
+            self.queue.put(record)
+
+    def stop(self) -> None:
+        """Handle every queued record, stop the threads and close the handlers."""
+        if self._forwarder is not None:
+            self._process_queue.put(_STOP)
+            self._forwarder.join()
+            self._forwarder = None
+            self._process_queue.close()
+            self._process_queue = None
+        if self._listener is not None:
+            self.queue.put(_STOP)
+            self._listener.join()
+            self._listener = None
+        for handler in self.handlers:
+            handler.close()
+
+
+def start_async_logging(handlers: Optional[List[logging.Handler]] = None,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncLogSink:
+    """
+    Write the root logger's records from a background thread.
+
+    Args:
+        handlers: Handlers to write with (default: the root logger's
+            current handlers, which are moved to the sink)
+        batch_size: Records handled before the handlers are flushed
+
+    Returns:
+        AsyncLogSink: The running sink
+    """
+    global _active_sink, _atexit_registered
+    stop_async_logging()
+
+    root = logging.getLogger()
+    if handlers is None:
+        handlers = root.handlers[:]
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    sink = AsyncLogSink(handlers, batch_size)
+    sink.start()
+    root.addHandler(_LocalQueueHandler(sink.queue))
+    _active_sink = sink
+
+    if not _atexit_registered:
+        atexit.register(stop_async_logging)
+        _atexit_registered = True
+    return sink
+
+
+def stop_async_logging() -> None:
+    """Stop the active sink, if any, after it has written every queued record."""
+    global _active_sink
+    sink, _active_sink = _active_sink, None
+    if sink is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler) and handler.queue is sink.queue:
+            root.removeHandler(handler)
+    sink.stop()
+
+
+def get_async_sink() -> Optional[AsyncLogSink]:
+    """
+    Get the active sink.
+
+    Returns:
+        AsyncLogSink: Running sink, or None if logging is synchronous
+    """
+    return _active_sink
+
+
+def worker_log_queue() -> Any:
+    """
+    Get the queue worker processes should log to.
+
+    Returns:
+        multiprocessing.Queue: Queue of the active sink, or None if there
+        is no active sink
+    """
+    return _active_sink.worker_queue() if _active_sink is not None else None
+
+
+def install_worker_logging(log_queue: Any, level: int) -> None:
+    """
+    Send a worker process's records to the parent's sink.
+
+    Replaces the root logger's handlers, including any inherited from the
+    parent by fork, with a QueueHandler for the given queue.
+
+    Args:
+        log_queue: Queue returned by worker_log_queue() in the parent
+        level: Root logger level
+    """
+    global _active_sink
+    # A sink inherited by fork has no listener thread in this process
+    _active_sink = None
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    refresh_hot_path_loggers()
@@ -6,6 +6,8 @@ This module provides centralized logging configuration with features for:
 2. Setting module-specific log levels
 3. Directing logs to files or console
 4. Supporting debug mode for additional verbosity
+5. Selecting the logging profile for per-bar messages (see hot_path)
+6. Writing logs from a background thread (see async_sink)
 """
 
 import logging
@@ -13,6 +15,9 @@ import os
 import sys
 from typing import Dict, Optional, List, Set, Any
 
+from .async_sink import DEFAULT_BATCH_SIZE, BatchedFileHandler, start_async_logging, stop_async_logging
+from .hot_path import refresh_hot_path_loggers, set_hot_path_profile
+
 # Default logs directory
 DEFAULT_LOGS_DIR = "logs"
 
@@ -98,6 +103,7 @@ class LoggingConfig:
                     if logger_name.startswith(module):
                         logging.getLogger(logger_name).setLevel(logging.INFO)
             self.debug_modules.clear()
+        refresh_hot_path_loggers()
     
     def configure_logging(self, log_file: Optional[str] = None) -> None:
         """
@@ -142,6 +148,7 @@ class LoggingConfig:
         for module_prefix, level in self.module_levels.items():
             if module_prefix != "root":
                 logging.getLogger(module_prefix).setLevel(level)
+        refresh_hot_path_loggers()
     
     def set_module_level(self, module: str, level: int) -> None:
         """
@@ -153,6 +160,7 @@ class LoggingConfig:
         """
         self.module_levels[module] = level
         logging.getLogger(module).setLevel(level)
+        refresh_hot_path_loggers()
     
     def get_module_level(self, module: str) -> int:
         """
@@ -197,7 +205,12 @@ logging_config = LoggingConfig()
 def configure_logging(debug: bool = False, 
                      debug_modules: Optional[List[str]] = None,
                      log_file: Optional[str] = None,
-                     console: bool = True) -> None:
+                     console: bool = True,
+                     profile: Optional[str] = None,
+                     async_logging: bool = False,
+                     max_bytes: int = 0,
+                     backup_count: int = 0,
+                     compress: bool = False) -> None:
     """
     Configure the logging system.
     
@@ -206,8 +219,15 @@ def configure_logging(debug: bool = False,
         debug_modules: List of module prefixes to enable debug for
         log_file: Optional file path for logging
         console: Whether to log to console
+        profile: Optional logging profile; 'performance' logs per-bar
+            messages at DEBUG instead of INFO
+        async_logging: Write logs from a background thread, in batches
+        max_bytes: Rotate the log file once it reaches this size (0: never)
+        backup_count: Number of rotated log files to keep
+        compress: gzip rotated log files
     """
     # Reset existing logging configuration
+    stop_async_logging()
     root_logger = logging.getLogger()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
@@ -228,7 +248,13 @@ def configure_logging(debug: bool = False,
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir, exist_ok=True)
             
-        file_handler = logging.FileHandler(log_file)
+        if async_logging or max_bytes > 0:
+            # Written by the sink's thread in batches, or record by record when synchronous
+            file_handler = BatchedFileHandler(log_file, batch_size=DEFAULT_BATCH_SIZE if async_logging else 1,
+                                              max_bytes=max_bytes, backup_count=backup_count,
+                                              compress=compress)
+        else:
+            file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
         root_logger.addHandler(file_handler)
     
@@ -256,6 +282,16 @@ def configure_logging(debug: bool = False,
     
     if debug_modules:
         logging_config.debug_modules = set(debug_modules)
+    
+    # Move the handlers to a background thread
+    if async_logging:
+        start_async_logging()
+    
+    # Apply the profile and the new levels to hot-path loggers
+    if profile is not None:
+        set_hot_path_profile(profile)
+    else:
+        refresh_hot_path_loggers()
 
 def get_logger(name: str) -> logging.Logger:
     """
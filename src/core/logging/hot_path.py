@@ -0,0 +1,190 @@
+"""
+Logging for code that runs on every bar.
+
+The broker, market simulator and portfolios log on every bar. With standard
+logger calls each message is an f-string formatted before the logger decides
+whether it is enabled, so a backtest pays for thousands of messages that are
+filtered out. HotPathLogger wraps a module logger with:
+
+1. Enabled flags (debug_enabled, info_enabled, ...) computed once and
+   refreshed by configure_logging, so a disabled call costs one attribute test
+2. Lazy %-style formatting: arguments are only formatted for emitted records
+3. hot() for per-bar messages, logged at INFO by default and at DEBUG under
+   the 'performance' profile (--quiet-hot-path)
+4. every() and once_per_day() for repeated messages, which log the first and
+   every Nth occurrence, or once per simulated day
+
+Levels changed without configure_logging (e.g. logger.setLevel) are picked up
+after refresh_hot_path_loggers().
+"""
+
+import logging
+from typing import Any, Dict, Hashable
+
+# Logging profiles
+PROFILE_DEFAULT = "default"
+PROFILE_PERFORMANCE = "performance"
+PROFILES = (PROFILE_DEFAULT, PROFILE_PERFORMANCE)
+
+# Level of per-bar messages under each profile
+HOT_PATH_LEVELS = {
+    PROFILE_DEFAULT: logging.INFO,
+    PROFILE_PERFORMANCE: logging.DEBUG,
+}
+
+_profile = PROFILE_DEFAULT
+_loggers: Dict[str, "HotPathLogger"] = {}
+
+
+class HotPathLogger:
+    """
+    Level-gated, lazily formatting wrapper around a standard logger.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the wrapper.
+
+        Args:
+            name: Logger name (typically __name__)
+        """
+        self.logger = logging.getLogger(name)
+        self._counts: Dict[Hashable, int] = {}
+        self._days: Dict[Hashable, Any] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Recompute the enabled flags from the logger's effective level."""
+        is_enabled = self.logger.isEnabledFor
+        self.debug_enabled = is_enabled(logging.DEBUG)
+        self.info_enabled = is_enabled(logging.INFO)
+        self.warning_enabled = is_enabled(logging.WARNING)
+        self.hot_level = HOT_PATH_LEVELS[_profile]
+        self.hot_enabled = is_enabled(self.hot_level)
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log a DEBUG message if enabled."""
+        if self.debug_enabled:
+            self.logger.debug(msg, *args, stacklevel=2)
+
+    def info(self, msg: str, *args: Any) -> None:
+        """Log an INFO message if enabled."""
+        if self.info_enabled:
+            self.logger.info(msg, *args, stacklevel=2)
+
+    def warning(self, msg: str, *args: Any) -> None:
+        """Log a WARNING message if enabled."""
+        if self.warning_enabled:
+            self.logger.warning(msg, *args, stacklevel=2)
+
+    def hot(self, msg: str, *args: Any) -> None:
+        """
+        Log a per-bar message at the profile's hot-path level.
+
+        Args:
+            msg: Message with %-style placeholders
+            *args: Placeholder values, formatted only if the message is logged
+        """
+        if self.hot_enabled:
+            self.logger.log(self.hot_level, msg, *args, stacklevel=2)
+
+    def every(self, key: Hashable, n: int, level: int, msg: str, *args: Any) -> bool:
+        """
+        Log the first and every n-th occurrence of a message.
+
+        Args:
+            key: Identifies the message being counted
+            n: Sampling interval
+            level: Logging level
+            msg: Message with %-style placeholders
+            *args: Placeholder values
+
+        Returns:
+            bool: True if this occurrence was logged
+        """
+        count = self._counts.get(key, 0) + 1
+        self._counts[key] = count
+        if (count - 1) % n or not self.logger.isEnabledFor(level):
+            return False
+        if count > 1:
+            msg = f"{msg} (occurrence %d)"
+            args = args + (count,)
+        self.logger.log(level, msg, *args, stacklevel=2)
+        return True
+
+    def once_per_day(self, key: Hashable, timestamp: Any, level: int, msg: str, *args: Any) -> bool:
+        """
+        Log a message at most once per simulated day.
+
+        Args:
+            key: Identifies the message
+            timestamp: Simulated time of the occurrence (datetime-like)
+            level: Logging level
+            msg: Message with %-style placeholders
+            *args: Placeholder values
+
+        Returns:
+            bool: True if this occurrence was logged
+        """
+        day = timestamp.date() if hasattr(timestamp, 'date') else timestamp
+        if self._days.get(key) == day:
+            return False
+        self._days[key] = day
+        if not self.logger.isEnabledFor(level):
+            return False
+        self.logger.log(level, msg, *args, stacklevel=2)
+        return True
+
+    def reset_counters(self) -> None:
+        """Forget the occurrences counted by every() and once_per_day()."""
+        self._counts.clear()
+        self._days.clear()
+
+
+def get_hot_path_logger(name: str) -> HotPathLogger:
+    """
+    Get the hot-path logger for a module.
+
+    Args:
+        name: Logger name (typically __name__)
+
+    Returns:
+        HotPathLogger: Shared wrapper for the named logger
+    """
+    hot_logger = _loggers.get(name)
+    if hot_logger is None:
+        hot_logger = _loggers[name] = HotPathLogger(name)
+    return hot_logger
+
+
+def refresh_hot_path_loggers() -> None:
+    """Recompute the enabled flags of every hot-path logger."""
+    for hot_logger in _loggers.values():
+        hot_logger.refresh()
+
+
+def set_hot_path_profile(profile: str) -> None:
+    """
+    Select the logging profile for per-bar messages.
+
+    Args:
+        profile: 'default' (per-bar messages at INFO) or 'performance' (at DEBUG)
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    global _profile
+    if profile not in HOT_PATH_LEVELS:
+        raise ValueError(f"Unknown logging profile: {profile}, expected one of {PROFILES}")
+    _profile = profile
+    refresh_hot_path_loggers()
+
+
+def get_hot_path_profile() -> str:
+    """
+    Get the logging profile for per-bar messages.
+
+    Returns:
+        str: Current profile
+    """
+    return _profile
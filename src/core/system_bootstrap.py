@@ -6,6 +6,7 @@ import importlib.util
 from typing import Dict, Any, Tuple
 
 from src.core.config.config import Config
+from src.core.logging import refresh_hot_path_loggers
 from src.core.di.container import Container
 from src.core.events.event_bus import EventBus
 from src.core.events.event_manager import EventManager
@@ -90,7 +91,7 @@ class Bootstrap:
     def _setup_event_system(self, container, config):
         """Set up the event system components."""
         # Create the event bus - already has native deduplication
-        event_bus = EventBus()
+        event_bus = EventBus.from_config(config.get_section("event_bus"))
         event_manager = EventManager(event_bus)
         
         container.register_instance("event_bus", event_bus)
@@ -502,6 +503,9 @@ class Bootstrap:
         logging.getLogger("matplotlib").setLevel(logging.WARNING)  # Reduce matplotlib noise
         logging.getLogger("urllib3").setLevel(logging.WARNING)    # Reduce urllib3 noise
         
+        # Per-bar loggers cache their enabled levels
+        refresh_hot_path_loggers()
+        
         logger.info(f"Logging initialized at level {logging.getLevelName(root_logger.level)}")
         logger.info(f"Log file: {self.log_file}")
         
@@ -13,6 +13,8 @@ from typing import Dict, Any, Tuple, Optional, List
 from src.core.configuration.config import Config
 from src.core.dependency_injection.container import Container
 from src.core.event_system.event_bus import EventBus
+from src.core.logging.async_sink import BatchedFileHandler, start_async_logging
+from src.core.logging.hot_path import refresh_hot_path_loggers
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,8 @@ class Bootstrap:
                  env_prefix: str = "ADMF_", 
                  log_level: int = logging.INFO,
                  log_file: str = "main.log", 
-                 debug: bool = False):
+                 debug: bool = False,
+                 async_logging: bool = False):
         """
         Initialize bootstrap.
         
@@ -41,12 +44,14 @@ class Bootstrap:
             log_level: Logging level
             log_file: Log file path
             debug: Enable debug mode
+            async_logging: Write logs from a background thread
         """
         self.config_files = config_files or []
         self.env_prefix = env_prefix
         self.log_level = log_level
         self.log_file = log_file
         self.debug = debug
+        self.async_logging = async_logging
         
         # Context for additional options
         self.context: Dict[str, Any] = {}
@@ -104,27 +109,41 @@ class Bootstrap:
         
     def _setup_logging(self) -> None:
         """Set up logging system."""
-        # Create handlers
-        handlers = [
-            logging.StreamHandler(),
-            logging.FileHandler(self.log_file, mode='w')
-        ]
-        
-        # Configure basic logging
-        logging.basicConfig(
-            level=self.log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=handlers
-        )
-        
-        # Set up root logger
+        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         root_logger = logging.getLogger()
         
+        # Like basicConfig, leave logging alone if it is already configured
+        if self.async_logging and not root_logger.handlers:
+            handlers = [
+                logging.StreamHandler(),
+                BatchedFileHandler(self.log_file, mode='w')
+            ]
+            for handler in handlers:
+                handler.setFormatter(logging.Formatter(log_format))
+            root_logger.setLevel(self.log_level)
+            start_async_logging(handlers)
+        else:
+            # Create handlers
+            handlers = [
+                logging.StreamHandler(),
+                logging.FileHandler(self.log_file, mode='w')
+            ]
+            
+            # Configure basic logging
+            logging.basicConfig(
+                level=self.log_level,
+                format=log_format,
+                handlers=handlers
+            )
+        
         # Enable debug mode if requested
         if self.debug:
             root_logger.setLevel(logging.DEBUG)
             logger.debug("Debug mode enabled")
             
+        # Levels changed here are not seen by hot-path loggers until refreshed
+        refresh_hot_path_loggers()
+            
         logger.info(f"Logging initialized at level {logging.getLevelName(root_logger.level)}")
         logger.info(f"Log file: {self.log_file}")
         
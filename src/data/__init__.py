@@ -12,6 +12,7 @@ from .data_handler_base import DataHandlerBase
 from .registry import ComponentRegistry
 from .factory import ComponentFactory
 from .historical_data_handler import HistoricalDataHandler
+from .market_data_cache import MarketDataCache, get_market_data_cache
 
 # Import data sources
 from .sources.csv_handler import CSVDataSource
@@ -38,6 +39,8 @@ __all__ = [
     'ComponentRegistry',
     'ComponentFactory',
     'HistoricalDataHandler',
+    'MarketDataCache',
+    'get_market_data_cache',
     'CSVDataSource',
     'Resampler',
     'Normalizer',
@@ -0,0 +1,262 @@
+"""
+Columnar bar storage for fast historical replay.
+
+A BarStore holds one symbol's bars as contiguous NumPy arrays (timestamps as
+int64 nanoseconds, OHLCV as float64 and any extra columns as-is) so that the
+replay loop can walk an integer cursor instead of doing pandas row access
+for every bar.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_types import Bar, Timeframe
+
+
+class BarStore:
+    """
+    Column-oriented, read-only store of bars for a single symbol.
+
+    Columns keep the order of the source DataFrame so that rows built from
+    the store match ``df.iloc[i].to_dict()``.
+    """
+
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, timestamps, columns, tz=None):
+        """
+        Initialize the store from prepared arrays.
+
+        Args:
+            timestamps (np.ndarray): int64 nanosecond timestamps (UTC for tz-aware data)
+            columns (dict): Ordered mapping of column name to NumPy array
+            tz: Timezone of the original timestamps, or None if naive
+        """
+        self.timestamps = timestamps
+        self.columns = columns
+        self.tz = tz
+        self._column_names = tuple(columns.keys())
+        self._column_arrays = tuple(columns.values())
+        self._numeric = tuple(arr.dtype.kind in 'biuf' for arr in self._column_arrays)
+        self._optional = tuple((name, columns[name]) for name in Bar.OPTIONAL_FIELDS if name in columns)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build a store from a DataFrame with a 'timestamp' column.
+
+        Args:
+            df (pd.DataFrame): Bar data sorted by timestamp
+
+        Returns:
+            BarStore: Columnar copy of the data
+        """
+        if df is None or len(df) == 0:
+            names = [] if df is None else [c for c in df.columns if c != 'timestamp']
+            return cls(np.empty(0, dtype=np.int64),
+                       {name: np.empty(0, dtype=object) for name in names})
+
+        ts = df['timestamp']
+        if not pd.api.types.is_datetime64_any_dtype(ts):
+            ts = pd.to_datetime(ts)
+        index = pd.DatetimeIndex(ts).as_unit('ns')
+        tz = index.tz
+        # asi8 is UTC-based for tz-aware data, which is what pd.Timestamp(ns, tz=tz) expects
+        timestamps = index.asi8
+
+        columns = {}
+        for name in df.columns:
+            if name == 'timestamp':
+                continue
+            values = df[name].to_numpy()
+            if name in cls.PRICE_COLUMNS:
+                try:
+                    values = values.astype(np.float64)
+                except (TypeError, ValueError):
+                    pass
+            columns[name] = np.ascontiguousarray(values)
+
+        return cls(np.ascontiguousarray(timestamps), columns, tz)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self):
+        """Total bytes held by the timestamp and column arrays."""
+        return self.timestamps.nbytes + sum(arr.nbytes for arr in self._column_arrays)
+
+    def freeze(self):
+        """
+        Make the underlying arrays read-only so the store can be shared.
+
+        Returns:
+            BarStore: This store
+        """
+        self.timestamps.flags.writeable = False
+        for arr in self._column_arrays:
+            arr.flags.writeable = False
+        return self
+
+    def slice(self, start, stop, extra_columns=None):
+        """
+        Get a store over rows [start, stop) that shares this store's arrays.
+
+        Args:
+            start (int): First row index
+            stop (int): End row index (exclusive)
+            extra_columns (dict, optional): Constant columns to append, e.g. {'_split': 'train'}
+
+        Returns:
+            BarStore: Store backed by array views
+        """
+        columns = {name: arr[start:stop] for name, arr in self.columns.items()}
+        for name, value in (extra_columns or {}).items():
+            columns[name] = np.full(stop - start, value, dtype=object)
+        return BarStore(self.timestamps[start:stop], columns, self.tz)
+
+    def timestamp_at(self, idx):
+        """
+        Get the timestamp at an index as a pandas Timestamp.
+
+        Args:
+            idx (int): Row index
+
+        Returns:
+            pd.Timestamp: Timestamp of the row
+        """
+        return pd.Timestamp(int(self.timestamps[idx]), tz=self.tz)
+
+    def to_ns(self, value):
+        """
+        Convert a timestamp-like value to the store's int64 nanosecond scale.
+
+        Args:
+            value: datetime, string or pd.Timestamp
+
+        Returns:
+            int: Nanoseconds comparable with ``self.timestamps``
+        """
+        ts = pd.Timestamp(value)
+        if self.tz is not None and ts.tzinfo is None:
+            ts = ts.tz_localize(self.tz)
+        elif self.tz is None and ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        return ts.value
+
+    def row(self, idx):
+        """
+        Get a row as a dictionary of native Python values.
+
+        Args:
+            idx (int): Row index
+
+        Returns:
+            dict: Row data including 'timestamp'
+        """
+        row = {'timestamp': pd.Timestamp(int(self.timestamps[idx]), tz=self.tz)}
+        for name, arr, numeric in zip(self._column_names, self._column_arrays, self._numeric):
+            value = arr[idx]
+            row[name] = value.item() if numeric else value
+        return row
+
+    def get(self, name, default=None):
+        """
+        Get a column array by name.
+
+        Args:
+            name (str): Column name ('timestamp' returns the int64 ns array)
+            default: Value returned when the column does not exist
+
+        Returns:
+            np.ndarray: Column values
+        """
+        if name == 'timestamp':
+            return self.timestamps
+        return self.columns.get(name, default)
+
+    def bar(self, idx, symbol, timeframe=Timeframe.DAY_1):
+        """
+        Build a Bar object for a row.
+
+        Args:
+            idx (int): Row index
+            symbol (str): Symbol of the bar
+            timeframe (Timeframe): Timeframe of the bar
+
+        Returns:
+            Bar: Bar at the given index
+        """
+        columns = self.columns
+        volume = columns.get('volume')
+        extra = None
+        if self._optional:
+            extra = {name: arr[idx].item() if arr.dtype.kind in 'biuf' else arr[idx]
+                     for name, arr in self._optional}
+        return Bar(
+            timestamp=pd.Timestamp(int(self.timestamps[idx]), tz=self.tz),
+            symbol=symbol,
+            open=float(columns['open'][idx]),
+            high=float(columns['high'][idx]),
+            low=float(columns['low'][idx]),
+            close=float(columns['close'][idx]),
+            volume=float(volume[idx]) if volume is not None else 0.0,
+            timeframe=timeframe,
+            extra=extra
+        )
+
+    def bars(self, start, stop, symbol, timeframe=Timeframe.DAY_1):
+        """
+        Build Bar objects for the half-open index range [start, stop).
+
+        Args:
+            start (int): First row index
+            stop (int): End row index (exclusive)
+            symbol (str): Symbol of the bars
+            timeframe (Timeframe): Timeframe of the bars
+
+        Returns:
+            List[Bar]: Bars in the range
+        """
+        start = max(0, start)
+        stop = min(len(self), stop)
+        if start >= stop:
+            return []
+
+        index = pd.DatetimeIndex(self.timestamps[start:stop].view('datetime64[ns]'))
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        columns = self.columns
+        opens = columns['open'][start:stop].tolist()
+        highs = columns['high'][start:stop].tolist()
+        lows = columns['low'][start:stop].tolist()
+        closes = columns['close'][start:stop].tolist()
+        volume = columns.get('volume')
+        volumes = volume[start:stop].astype(np.float64).tolist() if volume is not None else [0.0] * (stop - start)
+
+        # Optional fields as in bar(): Python scalars for numeric columns
+        extras = [None] * (stop - start)
+        if self._optional:
+            names = [name for name, _ in self._optional]
+            values = [arr[start:stop].tolist() if arr.dtype.kind in 'biuf' else list(arr[start:stop])
+                      for _, arr in self._optional]
+            extras = [dict(zip(names, row)) for row in zip(*values)]
+
+        return [
+            Bar(timestamp=ts, symbol=symbol, open=float(o), high=float(h), low=float(l),
+                close=float(c), volume=float(v), timeframe=timeframe, extra=extra)
+            for ts, o, h, l, c, v, extra in zip(index, opens, highs, lows, closes, volumes, extras)
+        ]
+
+    def searchsorted(self, value, side='left'):
+        """
+        Find the insertion index of a timestamp.
+
+        Args:
+            value: Timestamp-like value
+            side (str): 'left' or 'right', as in numpy.searchsorted
+
+        Returns:
+            int: Insertion index
+        """
+        return int(np.searchsorted(self.timestamps, self.to_ns(value), side=side))
@@ -0,0 +1,438 @@
+"""
+Binary on-disk cache for CSV market data.
+
+Parsing CSV text (and especially ``pd.to_datetime`` with an explicit format)
+dominates start-up on large minute files. The first time a CSV is read its
+columns are written beside it as memory-mappable ``.npy`` files in a
+``<file>.cache`` directory; later reads load the arrays directly as long as
+the source file's mtime and size are unchanged.
+
+Parsed timestamp columns are cached as separate variants keyed by column,
+format and error mode, so readers with different parsing options can share
+one cache directory.
+
+Prebuild caches for every CSV under a directory with:
+
+    python -m src.data.binary_cache data/ --date-column timestamp --date-format "%Y-%m-%d %H:%M:%S"
+"""
+
+import os
+import json
+import glob
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.cache'
+META_FILE = 'meta.json'
+
+
+def cache_dir_for(file_path):
+    """
+    Get the cache directory for a source file.
+
+    Args:
+        file_path (str): Path to the CSV file
+
+    Returns:
+        str: Path of the cache directory beside the file
+    """
+    return file_path + CACHE_SUFFIX
+
+
+def parse_timestamps(values, date_format=None, errors='raise'):
+    """
+    Parse a column of timestamps.
+
+    Args:
+        values (pd.Series): Raw timestamp values
+        date_format (str): Expected strftime format, or None to infer
+        errors (str): 'raise' falls back to format inference if the format
+            does not match; 'coerce' turns unparseable values into NaT
+
+    Returns:
+        pd.Series: Parsed datetime values
+    """
+    if errors == 'coerce':
+        return pd.to_datetime(values, format=date_format, errors='coerce')
+    try:
+        return pd.to_datetime(values, format=date_format)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values)
+
+
+def read_csv_cached(file_path, date_column=None, date_format=None, date_errors='raise',
+                    nrows=None, use_cache=True):
+    """
+    Read a CSV file through its binary cache.
+
+    The result matches ``pd.read_csv(file_path)`` with ``date_column`` parsed
+    by ``parse_timestamps``. The cache is written on first use and rebuilt
+    whenever the source file changes.
+
+    Args:
+        file_path (str): Path to the CSV file
+        date_column (str or list): Timestamp column, or candidates of which the first present is used
+        date_format (str): Timestamp format, or None to infer
+        date_errors (str): Error mode passed to parse_timestamps
+        nrows (int, optional): Only return the first ``nrows`` rows
+        use_cache (bool): Set to False to bypass the cache entirely
+
+    Returns:
+        pd.DataFrame: Parsed data
+    """
+    if not use_cache:
+        df = pd.read_csv(file_path, nrows=nrows)
+        column = _resolve_column(df.columns, date_column)
+        if column is not None:
+            df[column] = parse_timestamps(df[column], date_format, date_errors)
+        return df
+
+    cache = _BinaryCache(file_path)
+    df = cache.load(nrows)
+    if df is None:
+        df = pd.read_csv(file_path)
+        cache.write(df)
+        if nrows is not None:
+            df = df.iloc[:nrows]
+
+    column = _resolve_column(df.columns, date_column)
+    if column is not None:
+        parsed = cache.load_parsed(column, date_format, date_errors, nrows)
+        if parsed is None:
+            # Parse the full column so the cached variant serves any row limit
+            full = cache.load(None) if nrows is not None else df
+            source = full[column] if full is not None else df[column]
+            full_parsed = parse_timestamps(source, date_format, date_errors)
+            cache.write_parsed(column, date_format, date_errors, full_parsed)
+            parsed = full_parsed.iloc[:nrows] if nrows is not None else full_parsed
+        df[column] = parsed.set_axis(df.index)
+    return df
+
+
+def build_cache(file_path, date_column=None, date_format=None, date_errors='raise'):
+    """
+    Build (or refresh) the binary cache for one CSV file.
+
+    Args:
+        file_path (str): Path to the CSV file
+        date_column (str or list): Timestamp column(s) to pre-parse
+        date_format (str): Timestamp format, or None to infer
+        date_errors (str): Error mode passed to parse_timestamps
+
+    Returns:
+        bool: True if the cache is valid after the call
+    """
+    read_csv_cached(file_path, date_column, date_format, date_errors)
+    return _BinaryCache(file_path).is_valid()
+
+
+def build_caches(root, date_column=('timestamp', 'date'), date_format=None, date_errors='raise'):
+    """
+    Build binary caches for every CSV file under a directory.
+
+    Args:
+        root (str): Directory to scan recursively (or a single CSV file)
+        date_column (str or list): Timestamp column(s) to pre-parse
+        date_format (str): Timestamp format, or None to infer
+        date_errors (str): Error mode passed to parse_timestamps
+
+    Returns:
+        dict: File path to True/False build status
+    """
+    if os.path.isfile(root):
+        paths = [root]
+    else:
+        paths = sorted(glob.glob(os.path.join(root, '**', '*.csv'), recursive=True))
+
+    results = {}
+    for path in paths:
+        try:
+            results[path] = build_cache(path, date_column, date_format, date_errors)
+        except Exception as e:
+            logger.warning(f"Could not build binary cache for {path}: {e}")
+            results[path] = False
+    return results
+
+
+def invalidate_cache(file_path):
+    """
+    Delete the binary cache of a CSV file.
+
+    Args:
+        file_path (str): Path to the CSV file
+
+    Returns:
+        bool: True if a cache directory was removed
+    """
+    cache_dir = cache_dir_for(file_path)
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return True
+    return False
+
+
+def _resolve_column(columns, date_column):
+    """Get the first requested date column present in ``columns``."""
+    if date_column is None:
+        return None
+    candidates = [date_column] if isinstance(date_column, str) else list(date_column)
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+    return None
+
+
+def _source_signature(file_path):
+    stat = os.stat(file_path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _variant_id(column, date_format, date_errors):
+    key = json.dumps([column, date_format, date_errors])
+    return hashlib.md5(key.encode('utf-8')).hexdigest()[:16]
+
+
+def _encode_series(series):
+    """
+    Convert a Series to an array that np.save can store without pickling.
+
+    Returns:
+        tuple: (array, spec dict) or (None, None) if the dtype is unsupported
+    """
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        tz = getattr(series.dt, 'tz', None)
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None) if tz is not None else series
+        return values.to_numpy(), {'kind': 'datetime', 'dtype': str(values.dtype),
+                                   'tz': str(tz) if tz is not None else None}
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return series.to_numpy(), {'kind': 'numeric', 'dtype': str(dtype)}
+    if pd.api.types.is_string_dtype(dtype) or dtype == object:
+        mask = series.isna().to_numpy()
+        if dtype == object and not all(isinstance(v, str) for v in series[~mask]):
+            return None, None
+        values = series.fillna('').to_numpy(dtype=str)
+        return values, {'kind': 'string', 'dtype': str(dtype), 'has_nulls': bool(mask.any()),
+                        'mask': mask if mask.any() else None}
+    return None, None
+
+
+def _decode_array(values, spec):
+    """Rebuild a Series from a stored array and its spec."""
+    kind = spec['kind']
+    if kind == 'datetime':
+        series = pd.Series(np.asarray(values))
+        if spec.get('tz'):
+            series = series.dt.tz_localize('UTC').dt.tz_convert(spec['tz'])
+        return series
+    if kind == 'numeric':
+        return pd.Series(np.array(values))
+    series = pd.Series(np.asarray(values), dtype=spec['dtype'])
+    return series
+
+
+class _BinaryCache:
+    """Reader/writer for one ``<file>.cache`` directory."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.cache_dir = cache_dir_for(file_path)
+        self.meta_path = os.path.join(self.cache_dir, META_FILE)
+        self._meta = None
+
+    def _read_meta(self):
+        if self._meta is None:
+            try:
+                with open(self.meta_path, 'r') as f:
+                    self._meta = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return self._meta
+
+    def is_valid(self):
+        """Check that the cache exists and matches the current source file."""
+        meta = self._read_meta()
+        if meta is None or meta.get('version') != CACHE_VERSION:
+            return False
+        try:
+            return meta.get('source') == _source_signature(self.file_path)
+        except OSError:
+            return False
+
+    def _load_array(self, name, nrows):
+        values = np.load(os.path.join(self.cache_dir, name), mmap_mode='r', allow_pickle=False)
+        return values[:nrows] if nrows is not None else values
+
+    def _load_series(self, spec, nrows):
+        series = _decode_array(self._load_array(spec['file'], nrows), spec)
+        if spec.get('mask_file'):
+            mask = self._load_array(spec['mask_file'], nrows)
+            series[np.asarray(mask)] = None
+        return series
+
+    def load(self, nrows=None):
+        """
+        Load the raw columns.
+
+        Returns:
+            pd.DataFrame: Cached data, or None if the cache is missing or stale
+        """
+        if not self.is_valid():
+            return None
+        try:
+            columns = {spec['name']: self._load_series(spec, nrows) for spec in self._meta['columns']}
+            return pd.DataFrame(columns)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable binary cache {self.cache_dir}: {e}")
+            return None
+
+    def load_parsed(self, column, date_format, date_errors, nrows=None):
+        """
+        Load a cached parsed timestamp column.
+
+        Returns:
+            pd.Series: Parsed values, or None if this variant is not cached
+        """
+        if not self.is_valid():
+            return None
+        spec = self._meta.get('parsed', {}).get(_variant_id(column, date_format, date_errors))
+        if spec is None:
+            return None
+        try:
+            return self._load_series(spec, nrows)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable parsed column in {self.cache_dir}: {e}")
+            return None
+
+    def write(self, df):
+        """
+        Write the raw columns of a freshly read CSV.
+
+        Failures (unsupported dtypes, read-only directories) are logged and
+        leave the source to be parsed again next time.
+        """
+        try:
+            signature = _source_signature(self.file_path)
+            parent = os.path.dirname(os.path.abspath(self.cache_dir))
+            tmp_dir = tempfile.mkdtemp(prefix='.tmp_', dir=parent)
+        except OSError as e:
+            logger.debug(f"Not writing binary cache for {self.file_path}: {e}")
+            return False
+
+        try:
+            specs = []
+            for i, name in enumerate(df.columns):
+                values, spec = _encode_series(df[name])
+                if values is None:
+                    logger.info(f"Not caching {self.file_path}: column {name} has unsupported dtype {df[name].dtype}")
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    return False
+                spec = self._save(tmp_dir, f"c{i}", values, spec)
+                spec['name'] = name
+                specs.append(spec)
+
+            meta = {'version': CACHE_VERSION, 'source': signature, 'rows': len(df),
+                    'columns': specs, 'parsed': {}}
+            with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+                json.dump(meta, f)
+
+            # Replace any previous cache; another process may have won the race
+            if os.path.isdir(self.cache_dir):
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, self.cache_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return False
+            self._meta = meta
+            logger.info(f"Wrote binary cache for {self.file_path} ({len(df)} rows)")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to write binary cache for {self.file_path}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+    def write_parsed(self, column, date_format, date_errors, parsed):
+        """Add a parsed timestamp column variant to a valid cache."""
+        if not self.is_valid():
+            return False
+        values, spec = _encode_series(parsed.reset_index(drop=True))
+        if values is None or spec['kind'] != 'datetime':
+            return False
+        try:
+            variant = _variant_id(column, date_format, date_errors)
+            spec = self._save(self.cache_dir, f"p_{variant}", values, spec)
+            spec.update({'column': column, 'format': date_format, 'errors': date_errors})
+
+            meta = dict(self._meta)
+            meta['parsed'] = dict(meta.get('parsed', {}))
+            meta['parsed'][variant] = spec
+            fd, tmp_meta = tempfile.mkstemp(prefix='.meta_', dir=self.cache_dir)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta, self.meta_path)
+            self._meta = meta
+            return True
+        except OSError as e:
+            logger.debug(f"Not caching parsed column {column} for {self.file_path}: {e}")
+            return False
+
+    @staticmethod
+    def _save(directory, stem, values, spec):
+        """Save an encoded array (and its null mask) and return the spec to store in meta."""
+        spec = dict(spec)
+        mask = spec.pop('mask', None)
+        np.save(os.path.join(directory, stem + '.npy'), np.ascontiguousarray(values), allow_pickle=False)
+        spec['file'] = stem + '.npy'
+        if mask is not None:
+            np.save(os.path.join(directory, stem + '_mask.npy'), mask, allow_pickle=False)
+            spec['mask_file'] = stem + '_mask.npy'
+        return spec
+
+
+def main(argv=None):
+    """
+    Prebuild binary caches from the command line.
+
+    Args:
+        argv (list, optional): Command-line arguments
+
+    Returns:
+        int: Exit code
+    """
+    parser = argparse.ArgumentParser(description='Prebuild binary caches for CSV market data')
+    parser.add_argument('paths', nargs='*', default=['data'], help='Directories or CSV files (default: data)')
+    parser.add_argument('--date-column', action='append', dest='date_columns',
+                        help='Timestamp column to pre-parse (can be used multiple times; default: timestamp, date)')
+    parser.add_argument('--date-format', help='Timestamp format (default: inferred)')
+    parser.add_argument('--clear', action='store_true', help='Delete existing caches instead of building them')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    date_columns = args.date_columns or ['timestamp', 'date']
+
+    failed = 0
+    for root in args.paths:
+        if args.clear:
+            paths = [root] if os.path.isfile(root) else glob.glob(os.path.join(root, '**', '*.csv'), recursive=True)
+            removed = sum(invalidate_cache(path) for path in paths)
+            print(f"Removed {removed} binary caches under {root}")
+            continue
+        for path, ok in build_caches(root, date_columns, args.date_format).items():
+            print(f"{'ok    ' if ok else 'FAILED'} {path}")
+            failed += 0 if ok else 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
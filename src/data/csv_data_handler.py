@@ -16,6 +16,7 @@ from src.core.component import Component
 from src.core.event_system import Event, EventType
 from src.data.data_handler import DataHandler
 from src.data.data_types import Bar, Tick, Timeframe
+from src.data.binary_cache import read_csv_cached
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +32,8 @@ class CSVDataHandler(DataHandler):
                  filename_pattern='{symbol}_{timeframe}.csv',
                  date_column='timestamp', 
                  date_format='%Y-%m-%d %H:%M:%S',
-                 column_map=None):
+                 column_map=None,
+                 use_binary_cache=True):
         """
         Initialize the CSV data handler.
         
@@ -42,12 +44,14 @@ class CSVDataHandler(DataHandler):
             date_column: Column containing dates
             date_format: Format of dates in CSV
             column_map: Map of CSV columns to standard column names
+            use_binary_cache: Read CSV files through their on-disk binary cache
         """
         super().__init__(name)
         self.data_dir = data_dir
         self.filename_pattern = filename_pattern
         self.date_column = date_column
         self.date_format = date_format
+        self.use_binary_cache = use_binary_cache
         self.column_map = column_map or {
             'open': ['open', 'Open', 'OPEN'],
             'high': ['high', 'High', 'HIGH'],
@@ -103,19 +107,14 @@ class CSVDataHandler(DataHandler):
                     success = False
                     continue
                 
-                # Read CSV file
-                df = pd.read_csv(filename)
+                # Read CSV file, converting the date column to datetime
+                # (invalid dates become NaT)
+                df = read_csv_cached(filename, self.date_column, self.date_format,
+                                     date_errors='coerce', use_cache=self.use_binary_cache)
                 self.logger.info(f"Loaded {len(df)} rows for {symbol}")
                 
                 # Process date column
                 if self.date_column in df.columns:
-                    # Convert date column to datetime
-                    df[self.date_column] = pd.to_datetime(
-                        df[self.date_column], 
-                        format=self.date_format,
-                        errors='coerce'  # Replace invalid dates with NaT
-                    )
-                    
                     # Drop rows with invalid dates
                     df = df.dropna(subset=[self.date_column])
                     
@@ -245,7 +244,7 @@ class CSVDataHandler(DataHandler):
             idx = self.current_index.get(symbol, 0)
             
             if idx >= len(bars):
-                self.logger.debug(f"Reached end of data for {symbol} at index {idx}")
+                self.hot_log.debug("Reached end of data for %s at index %d", symbol, idx)
                 continue
                 
             # Get the current bar
@@ -254,12 +253,10 @@ class CSVDataHandler(DataHandler):
             
             # Emit bar event if event bus is set
             if self.event_bus:
-                # Convert bar to dict and print for debugging (set to debug level)
-                bar_dict = bar.to_dict()
-                self.logger.debug(f"Emitting bar event for {symbol} at {bar.timestamp}: {bar_dict}")
+                self.hot_log.debug("Emitting bar event for %s at %s: %s", symbol, bar.timestamp, bar)
                 
                 self.emit_bar_event(bar)
-                self.logger.debug(f"Emitted bar event for {symbol} at {bar.timestamp}")
+                self.hot_log.debug("Emitted bar event for %s at %s", symbol, bar.timestamp)
             else:
                 self.logger.warning(f"Event bus not set, cannot emit bar event for {symbol}")
             
@@ -267,7 +264,7 @@ class CSVDataHandler(DataHandler):
             self.current_index[symbol] = idx + 1
             
             if idx % 100 == 0:  # Only log occasionally to avoid flooding
-                self.logger.info(f"Updated bar for {symbol}: {bar.timestamp}, index {idx}/{len(bars)}")
+                self.hot_log.hot("Updated bar for %s: %s, index %d/%d", symbol, bar.timestamp, idx, len(bars))
         
         return any_bars_updated
     
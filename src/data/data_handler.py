@@ -133,8 +133,8 @@ class DataHandler(Component, ABC):
             logger.warning("Cannot emit bar event: event bus not set")
             return
             
-        # Create bar event
-        event = Event(EventType.BAR, bar.to_dict())
+        # The bar itself is the event data
+        event = Event(EventType.BAR, bar)
         
         # Publish event
         self.event_bus.publish(event)
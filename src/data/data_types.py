@@ -5,6 +5,7 @@ This module defines the standard data types used across the system,
 including bar data, tick data, and other market data structures.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
@@ -38,6 +39,19 @@ class Timeframe(Enum):
         Raises:
             ValueError: If string is invalid
         """
+        if isinstance(timeframe_str, cls):
+            return timeframe_str
+        # Strings already seen resolve with one lookup
+        cached = _TIMEFRAME_LOOKUP.get(timeframe_str)
+        if cached is not None:
+            return cached
+        timeframe = cls._parse(timeframe_str)
+        _TIMEFRAME_LOOKUP[timeframe_str] = timeframe
+        return timeframe
+    
+    @classmethod
+    def _parse(cls, timeframe_str: str) -> 'Timeframe':
+        """Parse a timeframe string without the lookup cache."""
         # Map of string representations to enum values
         mapping = {
             'tick': cls.TICK,
@@ -111,20 +125,7 @@ class Timeframe(Enum):
         Returns:
             str: String representation
         """
-        mapping = {
-            self.TICK: 'tick',
-            self.SECOND: '1s',
-            self.MINUTE_1: '1m',
-            self.MINUTE_5: '5m',
-            self.MINUTE_15: '15m',
-            self.MINUTE_30: '30m',
-            self.HOUR_1: '1h',
-            self.HOUR_4: '4h',
-            self.DAY_1: '1d',
-            self.WEEK_1: '1w',
-            self.MONTH_1: '1M'
-        }
-        return mapping[self]
+        return _TIMEFRAME_STRINGS[self]
         
     def to_seconds(self) -> int:
         """
@@ -153,27 +154,152 @@ class Timeframe(Enum):
         }
         return mapping[self]
 
-@dataclass
-class Bar:
+
+_TIMEFRAME_STRINGS = {
+    Timeframe.TICK: 'tick',
+    Timeframe.SECOND: '1s',
+    Timeframe.MINUTE_1: '1m',
+    Timeframe.MINUTE_5: '5m',
+    Timeframe.MINUTE_15: '15m',
+    Timeframe.MINUTE_30: '30m',
+    Timeframe.HOUR_1: '1h',
+    Timeframe.HOUR_4: '4h',
+    Timeframe.DAY_1: '1d',
+    Timeframe.WEEK_1: '1w',
+    Timeframe.MONTH_1: '1M'
+}
+
+# Timeframe strings resolved by from_string
+_TIMEFRAME_LOOKUP = {}
+
+
+class Bar(Mapping):
     """
-    OHLCV bar data with timestamp.
+    Immutable OHLCV bar with timestamp.
     
-    This class represents a standard OHLCV (Open, High, Low, Close, Volume)
-    bar with a timestamp.
+    A data handler creates one Bar per row and publishes it as the BAR event
+    data, so every consumer reads the same object instead of converting it
+    again. Fields are attributes (``bar.close``). For handlers written against
+    bar dictionaries the bar is also a read-only mapping (``bar['close']``,
+    ``bar.get('volume')``) with the keys of ``to_dict()``, where 'timeframe'
+    is the string form.
     """
-    timestamp: datetime
-    symbol: str
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float = 0
-    timeframe: Union[Timeframe, str] = Timeframe.DAY_1
+    __slots__ = ('timestamp', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'timeframe', 'extra')
+    
+    FIELDS = ('timestamp', 'symbol', 'open', 'high', 'low', 'close', 'volume', 'timeframe')
+    
+    # Optional columns carried in ``extra`` when a source has them
+    OPTIONAL_FIELDS = ('adj_close', 'period')
+    
+    def __init__(self, timestamp: datetime, symbol: str, open: float, high: float, low: float,
+                 close: float, volume: float = 0, timeframe: Union[Timeframe, str] = Timeframe.DAY_1,
+                 extra: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the bar.
+        
+        Args:
+            timestamp: Bar time
+            symbol: Instrument symbol
+            open: Open price
+            high: High price
+            low: Low price
+            close: Close price
+            volume: Traded volume
+            timeframe: Timeframe enum or its string representation
+            extra: Optional fields such as 'adj_close'
+        """
+        if timeframe.__class__ is not Timeframe:
+            timeframe = Timeframe.from_string(timeframe)
+        setter = object.__setattr__
+        setter(self, 'timestamp', timestamp)
+        setter(self, 'symbol', symbol)
+        setter(self, 'open', open)
+        setter(self, 'high', high)
+        setter(self, 'low', low)
+        setter(self, 'close', close)
+        setter(self, 'volume', volume)
+        setter(self, 'timeframe', timeframe)
+        setter(self, 'extra', extra or None)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Bar is immutable, use replace() to change '{name}'")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Bar is immutable, cannot delete '{name}'")
+    
+    def __reduce__(self):
+        return (self.__class__, (self.timestamp, self.symbol, self.open, self.high, self.low,
+                                 self.close, self.volume, self.timeframe, self.extra))
+    
+    def __repr__(self) -> str:
+        return (f"Bar(timestamp={self.timestamp!r}, symbol={self.symbol!r}, open={self.open!r}, "
+                f"high={self.high!r}, low={self.low!r}, close={self.close!r}, volume={self.volume!r}, "
+                f"timeframe={self.timeframe})")
+    
+    # Read-only mapping view
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in _BAR_FIELDS:
+            if key == 'timeframe':
+                return _TIMEFRAME_STRINGS[self.timeframe]
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
     
-    def __post_init__(self):
-        """Convert timeframe string to enum if needed."""
-        if isinstance(self.timeframe, str):
-            self.timeframe = Timeframe.from_string(self.timeframe)
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a field by name, like ``dict.get``.
+        
+        Args:
+            key: Field name
+            default: Value returned for unknown fields
+            
+        Returns:
+            Field value or default
+        """
+        if key in _BAR_FIELDS:
+            if key == 'timeframe':
+                return _TIMEFRAME_STRINGS[self.timeframe]
+            return getattr(self, key)
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+    
+    def __contains__(self, key) -> bool:
+        return key in _BAR_FIELDS or (self.extra is not None and key in self.extra)
+    
+    def __iter__(self):
+        yield from self.FIELDS
+        if self.extra is not None:
+            yield from self.extra
+    
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self.extra) if self.extra is not None else 0)
+    
+    def copy(self) -> 'Bar':
+        """
+        Return the bar itself; bars cannot change. Use to_dict() for a mutable copy.
+        
+        Returns:
+            Bar: This bar
+        """
+        return self
+    
+    def replace(self, **changes) -> 'Bar':
+        """
+        Create a bar with some fields changed.
+        
+        Args:
+            **changes: New field values
+            
+        Returns:
+            Bar: New bar
+        """
+        fields = {name: getattr(self, name) for name in self.FIELDS}
+        fields['extra'] = self.extra
+        fields.update(changes)
+        return self.__class__(**fields)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -182,7 +308,7 @@ class Bar:
         Returns:
             Dict: Dictionary representation
         """
-        return {
+        result = {
             'timestamp': self.timestamp,
             'symbol': self.symbol,
             'open': self.open,
@@ -190,8 +316,11 @@ class Bar:
             'low': self.low,
             'close': self.close,
             'volume': self.volume,
-            'timeframe': self.timeframe.to_string()
+            'timeframe': _TIMEFRAME_STRINGS[self.timeframe]
         }
+        if self.extra is not None:
+            result.update(self.extra)
+        return result
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Bar':
@@ -199,19 +328,18 @@ class Bar:
         Create a Bar from a dictionary.
         
         Args:
-            data: Dictionary with bar data
+            data: Dictionary with bar data; keys other than the bar fields
+                are kept in ``extra``
             
         Returns:
             Bar: Bar instance
         """
-        # Copy the dictionary to avoid modifying the original
-        data_copy = data.copy()
-        
-        # Convert timeframe string to enum if needed
-        if 'timeframe' in data_copy and isinstance(data_copy['timeframe'], str):
-            data_copy['timeframe'] = Timeframe.from_string(data_copy['timeframe'])
-            
-        return cls(**data_copy)
+        fields = {name: data[name] for name in cls.FIELDS if name in data}
+        extra = {name: value for name, value in data.items() if name not in _BAR_FIELDS}
+        return cls(extra=extra, **fields)
+
+
+_BAR_FIELDS = frozenset(Bar.FIELDS)
 
 @dataclass
 class Tick:
@@ -342,6 +342,48 @@ def create_multi_regime_data(symbol, start_date, regime_blocks, output_dir="./da
     
     return df
 
+def create_ohlcv_data(periods, start_date="2023-01-01", freq="1min", base_price=100,
+                      daily_vol=0.01, seed=None):
+    """
+    Create random-walk OHLCV bars at a fixed frequency.
+    
+    Bars are built the same way as in create_multi_regime_data, but with
+    array operations, so millions of bars can be generated quickly (e.g. for
+    benchmarks).
+    
+    Args:
+        periods: Number of bars
+        start_date: Timestamp of the first bar
+        freq: Bar frequency as a pandas offset alias
+        base_price: Starting price
+        daily_vol: Volatility of each bar's return
+        seed: Random seed
+        
+    Returns:
+        DataFrame with timestamp, open, high, low, close and volume columns
+    """
+    close = np.maximum(0.1, create_random_data(periods, base_price=base_price,
+                                               daily_vol=daily_vol, seed=seed))
+    
+    # Same OHLC relationship and volume model as create_multi_regime_data
+    bar_range = close * np.random.uniform(0.005, 0.015, periods)
+    high = close + bar_range / 2
+    low = np.maximum(0.01, close - bar_range / 2)
+    open_ = low + np.random.random(periods) * bar_range
+    
+    price_change = np.abs(np.diff(close, prepend=close[:1]))
+    volume_factor = 1.0 + np.minimum(5.0, 5.0 * price_change / np.maximum(0.1, close))
+    volume = np.maximum(1, np.random.exponential(100000, periods) * volume_factor).astype(np.int64)
+    
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start_date, periods=periods, freq=freq),
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    })
+
 def generate_multi_regime_data(output_dir="./data", start_date="2023-01-01", plot=False, seed=42):
     """
     Generate multi-regime test data for multiple symbols.
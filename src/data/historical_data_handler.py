@@ -6,6 +6,7 @@ to support the optimization framework.
 """
 
 import os
+import numpy as np
 import pandas as pd
 import logging
 from src.core.component import Component
@@ -13,6 +14,10 @@ from src.core.events.event_types import Event, EventType
 from src.core.data_model import Bar as CoreBar
 from src.data.data_types import Bar, Timeframe
 from src.data.time_series_splitter import TimeSeriesSplitter
+from src.data.bar_store import BarStore
+from src.data.replay_scheduler import MergeScheduler
+from src.data.market_data_cache import get_market_data_cache, split_ranges
+from src.data.binary_cache import read_csv_cached, parse_timestamps
 from src.data.data_handler import DataHandler
 from typing import Dict, List, Optional, Tuple, Any, Union
 from datetime import datetime
@@ -42,6 +47,13 @@ class HistoricalDataHandler(DataHandler):
         self.data_splits = {}
         self.current_split = None
         self.current_indices = {}
+        self._bar_stores = {}
+        self._time_range_cache = {}
+        self._scheduler = None
+        self._scheduler_key = ()
+        self._scheduler_size = 0
+        self._cache_entries = {}
+        self._window = None
         
         # Set default timeframe from config or use DAY_1
         timeframe_str = data_config.get('timeframe', 'DAY_1')
@@ -92,8 +104,10 @@ class HistoricalDataHandler(DataHandler):
         if not self.event_bus:
             raise ValueError("HistoricalDataHandler requires event_bus in context")
             
-        # Load data from sources
+        # Load data from sources; re-initializing keeps the active split
+        active_split = self.current_split
         self._load_data()
+        self._restore_split(active_split)
         
     def _load_data(self):
         """Load data from configured sources."""
@@ -102,7 +116,7 @@ class HistoricalDataHandler(DataHandler):
         for source in data_sources:
             symbol = source.get('symbol')
             file_path = source.get('file')
-            date_format = source.get('date_format', '%Y-%m-%d')
+            date_format = source.get('date_format', self.data_config.get('date_format', '%Y-%m-%d'))
             
             if not symbol or not file_path:
                 raise ValueError(f"Invalid data source configuration: {source}")
@@ -164,75 +178,26 @@ class HistoricalDataHandler(DataHandler):
                 if hasattr(self, 'shared_context') and self.shared_context:
                     max_bars = max_bars or self.shared_context.get('max_bars')
 
-                # Load data with nrows limit if max_bars is specified
-                if max_bars:
-                    self.logger.info(f"Loading limited data: {max_bars} rows for {file_path}")
-                    df = pd.read_csv(file_path, nrows=max_bars)
-                else:
-                    df = pd.read_csv(file_path)
-
-                # Convert date columns to datetime
-                date_col = source.get('date_column', 'date')
-                if date_col in df.columns:
-                    df[date_col] = pd.to_datetime(df[date_col], format=date_format)
-                    # Rename to standard 'timestamp' column
-                    df.rename(columns={date_col: 'timestamp'}, inplace=True)
-                
-                # Check for alternative column names and rename them to match expected format
-                column_mappings = {
-                    'Date': 'timestamp',
-                    'Time': 'time',
-                    'Open': 'open',
-                    'High': 'high',
-                    'Low': 'low',
-                    'Close': 'close',
-                    'Volume': 'volume'
-                }
-                
-                # Apply mappings (case-insensitive)
-                for src_col, dst_col in column_mappings.items():
-                    # Check for exact match first
-                    if src_col in df.columns and dst_col not in df.columns:
-                        df.rename(columns={src_col: dst_col}, inplace=True)
-                    # Then try case-insensitive match
-                    else:
-                        for col in df.columns:
-                            if col.lower() == src_col.lower() and dst_col not in df.columns:
-                                df.rename(columns={col: dst_col}, inplace=True)
-                                break
-                
-                # Ensure required columns exist
-                required_columns = ['timestamp', 'open', 'high', 'low', 'close']
-                missing_columns = [col for col in required_columns if col not in df.columns]
-                
-                if missing_columns:
-                    # Try to convert from possible legacy column names
-                    for legacy, standard in CoreBar.LEGACY_MAPPINGS.items():
-                        if legacy in df.columns and standard not in df.columns:
-                            df.rename(columns={legacy: standard}, inplace=True)
-                    
-                    # Check if we still have missing columns
-                    missing_columns = [col for col in required_columns if col not in df.columns]
-                    if missing_columns:
-                        # Log the issue and try additional transformations
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Missing required columns: {missing_columns}")
-                        logger.warning(f"Available columns: {list(df.columns)}")
-                        
-                        # Try harder case-insensitive matching
-                        for req_col in missing_columns:
-                            for col in df.columns:
-                                if col.lower() == req_col.lower() or req_col.lower() in col.lower():
-                                    logger.info(f"Mapping '{col}' to '{req_col}'")
-                                    df.rename(columns={col: req_col}, inplace=True)
-                                    break
-                
-                # Sort data by timestamp
-                df.sort_values('timestamp', inplace=True)
-                
-                # Store data
+                # Reuse an already parsed copy of this source if one is cached
+                date_col = source.get('date_column', self.data_config.get('date_column', 'date'))
+                cache = get_market_data_cache() if self.data_config.get('use_cache', True) else None
+                cache_key = cache.make_key(file_path, date_format, date_col, max_bars) if cache else None
+                entry = cache.get(cache_key) if cache else None
+
+                if entry is None:
+                    df = self._read_source(file_path, date_format, date_col, max_bars)
+                    if cache:
+                        entry = cache.put(cache_key, df, BarStore.from_dataframe(df))
+
+                if entry is not None:
+                    # Each run gets its own view and cursors over the shared data
+                    df = entry.view()
+                    self._bar_stores[(symbol, None)] = (df, entry.store)
+                    self._cache_entries[symbol] = (df, entry)
+
+                # Store data and build its columnar store for replay
                 self.data[symbol] = df
+                self.get_bar_store(symbol)
 
                 # Initialize current index
                 self.current_indices[symbol] = -1
@@ -248,6 +213,90 @@ class HistoricalDataHandler(DataHandler):
         if not self.data:
             raise ValueError("No data loaded")
 
+    def _read_source(self, file_path, date_format, date_col, max_bars=None):
+        """
+        Read and normalize one CSV source.
+
+        Args:
+            file_path (str): Path to the CSV file
+            date_format (str): Timestamp format
+            date_col (str): Name of the timestamp column in the file
+            max_bars (int, optional): Maximum number of rows to read
+
+        Returns:
+            pd.DataFrame: Data with standard column names, sorted by timestamp
+        """
+        # Load data with nrows limit if max_bars is specified
+        if max_bars:
+            self.logger.info(f"Loading limited data: {max_bars} rows for {file_path}")
+
+        # Read through the binary cache beside the file; this also parses the date column
+        df = read_csv_cached(file_path, date_column=date_col, date_format=date_format,
+                             nrows=max_bars or None, use_cache=self.data_config.get('binary_cache', True))
+
+        # Rename date column to standard 'timestamp' column
+        if date_col in df.columns:
+            df.rename(columns={date_col: 'timestamp'}, inplace=True)
+        
+        # Check for alternative column names and rename them to match expected format
+        column_mappings = {
+            'Date': 'timestamp',
+            'Time': 'time',
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Volume': 'volume'
+        }
+        
+        # Apply mappings (case-insensitive)
+        for src_col, dst_col in column_mappings.items():
+            # Check for exact match first
+            if src_col in df.columns and dst_col not in df.columns:
+                df.rename(columns={src_col: dst_col}, inplace=True)
+            # Then try case-insensitive match
+            else:
+                for col in df.columns:
+                    if col.lower() == src_col.lower() and dst_col not in df.columns:
+                        df.rename(columns={col: dst_col}, inplace=True)
+                        break
+        
+        # Ensure required columns exist
+        required_columns = ['timestamp', 'open', 'high', 'low', 'close']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        
+        if missing_columns:
+            # Try to convert from possible legacy column names
+            for legacy, standard in CoreBar.LEGACY_MAPPINGS.items():
+                if legacy in df.columns and standard not in df.columns:
+                    df.rename(columns={legacy: standard}, inplace=True)
+            
+            # Check if we still have missing columns
+            missing_columns = [col for col in required_columns if col not in df.columns]
+            if missing_columns:
+                # Log the issue and try additional transformations
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.warning(f"Missing required columns: {missing_columns}")
+                logger.warning(f"Available columns: {list(df.columns)}")
+                
+                # Try harder case-insensitive matching
+                for req_col in missing_columns:
+                    for col in df.columns:
+                        if col.lower() == req_col.lower() or req_col.lower() in col.lower():
+                            logger.info(f"Mapping '{col}' to '{req_col}'")
+                            df.rename(columns={col: req_col}, inplace=True)
+                            break
+        
+        # The columnar store needs real datetimes, not timestamp strings
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = parse_timestamps(df['timestamp'], date_format)
+
+        # Sort data by timestamp
+        df.sort_values('timestamp', inplace=True)
+
+        return df
+
     def _split_data(self, df, symbol):
         """
         Split data into train and test sets based on configuration.
@@ -290,6 +339,16 @@ class HistoricalDataHandler(DataHandler):
         if hasattr(self, 'shared_context') and self.shared_context:
             max_bars = max_bars or self.shared_context.get('max_bars')
 
+        # Reuse split ranges computed by an earlier run over the same cached data
+        split_key = ('split_data', split_method, split_value, max_bars)
+        cached_splits = self._cached_splits(symbol, split_key)
+        if cached_splits is not None:
+            self.data_splits[symbol].update(cached_splits)
+            self.current_split = 'train'
+            logger.info(f"Reused cached split for {symbol}: train={len(cached_splits['train'])} rows, "
+                        f"test={len(cached_splits['test'])} rows")
+            return self.data_splits[symbol]
+
         # Limit data if max_bars is specified
         if max_bars and len(df) > max_bars:
             logger.info(f"Limiting data to {max_bars} bars before splitting")
@@ -380,8 +439,60 @@ class HistoricalDataHandler(DataHandler):
                 # Update the test set in the data_splits
                 self.data_splits[symbol]['test'] = test_df
 
+        self._remember_splits(symbol, split_key)
         return self.data_splits[symbol]
             
+    def _cached_splits(self, symbol, split_key):
+        """
+        Rebuild a symbol's splits from index ranges held in the shared cache.
+
+        Args:
+            symbol (str): Symbol to rebuild splits for
+            split_key (tuple): Split configuration key
+
+        Returns:
+            dict: Split name to DataFrame, or None if nothing is cached
+        """
+        cached = self._cache_entries.get(symbol)
+        if cached is None or cached[0] is not self.data.get(symbol):
+            return None
+        df, entry = cached
+        ranges = entry.splits.get(split_key)
+        if ranges is None:
+            return None
+
+        splits = {}
+        for split_name, (start, stop, tagged) in ranges.items():
+            split_df = df.iloc[start:stop].reset_index(drop=True)
+            extra_columns = None
+            if tagged:
+                split_df['_split'] = split_name
+                extra_columns = {'_split': split_name}
+            splits[split_name] = split_df
+            self._bar_stores[(symbol, split_name)] = (split_df, entry.store.slice(start, stop, extra_columns))
+        return splits
+
+    def _remember_splits(self, symbol, split_key):
+        """
+        Record a symbol's freshly computed splits as index ranges in the shared cache.
+
+        Args:
+            symbol (str): Symbol whose splits were computed
+            split_key (tuple): Split configuration key
+        """
+        cached = self._cache_entries.get(symbol)
+        if cached is None or cached[0] is not self.data.get(symbol):
+            return
+        splits = self.data_splits.get(symbol, {})
+        ranges = split_ranges(cached[1].store.timestamps,
+                              {name: self.get_bar_store(symbol, name) for name in splits})
+        if ranges is None:
+            return
+        cached[1].splits[split_key] = {
+            name: (start, stop, '_split' in splits[name].columns)
+            for name, (start, stop) in ranges.items()
+        }
+
     def setup_train_test_split(self, method="ratio", train_ratio=0.7, test_ratio=0.3,
                             split_date=None, train_periods=None, test_periods=None):
         """
@@ -400,6 +511,7 @@ class HistoricalDataHandler(DataHandler):
         import logging
         logger = logging.getLogger(__name__)
 
+        self._window = None
         try:
             # Check for max_bars limit before splitting
             max_bars = self.data_config.get('max_bars')
@@ -420,7 +532,17 @@ class HistoricalDataHandler(DataHandler):
 
             # Split each symbol's data
             self.data_splits = {}
+            split_key = ('train_test_split', method, train_ratio, test_ratio, str(split_date),
+                         train_periods, test_periods, max_bars)
             for symbol, df in self.data.items():
+                # Reuse split ranges computed by an earlier run over the same cached data
+                cached_splits = self._cached_splits(symbol, split_key)
+                if cached_splits is not None:
+                    self.data_splits[symbol] = cached_splits
+                    logger.info(f"Reused cached split for {symbol}: train={len(cached_splits['train'])} rows, "
+                                f"test={len(cached_splits['test'])} rows")
+                    continue
+
                 # Apply max_bars limit if specified - do this BEFORE splitting
                 if max_bars and len(df) > max_bars:
                     logger.info(f"Limiting data to {max_bars} bars before splitting for {symbol}")
@@ -494,6 +616,8 @@ class HistoricalDataHandler(DataHandler):
                     logger.info(f"Train period: {train_df_fixed.iloc[0]['timestamp'] if len(train_df_fixed) > 0 else None} to {train_df_fixed.iloc[-1]['timestamp'] if len(train_df_fixed) > 0 else None}")
                     logger.info(f"Test period: {test_df_fixed.iloc[0]['timestamp'] if len(test_df_fixed) > 0 else None} to {test_df_fixed.iloc[-1]['timestamp'] if len(test_df_fixed) > 0 else None}")
 
+                self._remember_splits(symbol, split_key)
+
             # Reset current indices
             self.current_indices = {symbol: -1 for symbol in self.data.keys()}
 
@@ -616,7 +740,294 @@ class HistoricalDataHandler(DataHandler):
                             logger.warning(f"DATA OVERLAP DETECTED: {symbol} {split_name} and {previous_split} sets overlap in time!")
                             logger.warning(f"  {split_name}: {split_min} to {split_max}")
                             logger.warning(f"  {previous_split}: {prev_min} to {prev_max}")
-        
+
+    def create_walk_forward_windows(self, window_size, step_size, test_size=None,
+                                    window_type='rolling', unit='days'):
+        """
+        Compute walk-forward train/test windows over the loaded data.
+
+        Windows are anchored at the first bar, so the windows of a longer
+        dataset start with the windows of a shorter one. Only windows whose
+        test period lies entirely within the data are returned. Each window
+        records its half-open time boundaries and, per symbol, the integer
+        row ranges of its train and test periods.
+
+        Args:
+            window_size (int): Train plus test length of a window
+            step_size (int): Distance between consecutive windows
+            test_size (int, optional): Test length (default: 20% of window_size)
+            window_type (str): 'rolling' (fixed train length) or 'expanding'
+                (train always starts at the first bar)
+            unit (str): 'days' for calendar days or 'bars' for timestamps of the
+                merged bar timeline
+
+        Returns:
+            list: Window dicts with window_idx, train_start, train_end,
+                test_start, test_end (end boundaries exclusive) and ranges,
+                a mapping of symbol to {'train': (start, stop), 'test': (start, stop)}
+
+        Raises:
+            ValueError: If the sizes, window type or unit are invalid
+        """
+        if window_type not in ('rolling', 'expanding'):
+            raise ValueError(f"Invalid window type: {window_type}, expected 'rolling' or 'expanding'")
+        if unit not in ('days', 'bars'):
+            raise ValueError(f"Invalid window unit: {unit}, expected 'days' or 'bars'")
+        if test_size is None:
+            test_size = max(1, int(window_size * 0.2))
+        if step_size < 1 or test_size < 1 or window_size <= test_size:
+            raise ValueError(f"Invalid walk-forward sizes: window_size={window_size}, "
+                             f"step_size={step_size}, test_size={test_size}")
+
+        stores = {symbol: self.get_bar_store(symbol) for symbol in self.data.keys()}
+        stores = {symbol: store for symbol, store in stores.items() if store is not None and len(store)}
+        if not stores:
+            return []
+        timeline = np.unique(np.concatenate([store.timestamps for store in stores.values()]))
+        tz = next(iter(stores.values())).tz
+        # The last bar covers one bar period, so a window may end just after it
+        period = int(np.diff(timeline).min()) if len(timeline) > 1 else 1
+        end_ns = int(timeline[-1]) + period
+        train_size = window_size - test_size
+
+        if unit == 'days':
+            day = 86400 * 10**9
+            origin = int(timeline[0])
+
+            def boundaries(offset):
+                return [origin + (offset + size) * day for size in (0, train_size, window_size)]
+        else:
+            def boundaries(offset):
+                positions = (offset, offset + train_size, offset + window_size)
+                return [int(timeline[p]) if p < len(timeline) else end_ns for p in positions]
+
+        windows = []
+        offset = 0
+        while True:
+            window_start, train_end, test_end = boundaries(offset)
+            if test_end > end_ns or (unit == 'bars' and offset + window_size > len(timeline)):
+                break
+            train_start = boundaries(0)[0] if window_type == 'expanding' else window_start
+            bounds = [pd.Timestamp(ns, tz=tz) for ns in (train_start, train_end, test_end)]
+            ranges = {}
+            for symbol, store in stores.items():
+                first, middle, last = np.searchsorted(store.timestamps, [train_start, train_end, test_end])
+                ranges[symbol] = {'train': (int(first), int(middle)), 'test': (int(middle), int(last))}
+            windows.append({
+                'window_idx': len(windows),
+                'train_start': bounds[0],
+                'train_end': bounds[1],
+                'test_start': bounds[1],
+                'test_end': bounds[2],
+                'ranges': ranges
+            })
+            offset += step_size
+
+        logger.info(f"Created {len(windows)} {window_type} walk-forward windows "
+                    f"(window={window_size}, step={step_size}, test={test_size} {unit})")
+        return windows
+
+    def setup_window_split(self, window):
+        """
+        Make a walk-forward window's train and test periods the active splits.
+
+        The splits are row slices of the loaded data found by binary search
+        on the window's time boundaries, and their bar stores share the
+        arrays of the full stores, so nothing is copied or reloaded.
+
+        Args:
+            window (dict): Window from create_walk_forward_windows
+        """
+        self.data_splits = {}
+        for symbol, df in self.data.items():
+            store = self.get_bar_store(symbol)
+            first, middle, last = (store.searchsorted(window[key])
+                                   for key in ('train_start', 'test_start', 'test_end'))
+            splits = {}
+            for split_name, (start, stop) in (('train', (first, middle)), ('test', (middle, last))):
+                split_df = df.iloc[start:stop].reset_index(drop=True)
+                splits[split_name] = split_df
+                self._bar_stores[(symbol, split_name)] = (split_df, store.slice(start, stop))
+            self.data_splits[symbol] = splits
+            logger.info(f"Window {window.get('window_idx')} for {symbol}: "
+                        f"train={middle - first} rows, test={last - middle} rows")
+
+        # Start the train split from its first bar; reloading keeps the window
+        self._window = window
+        self.current_indices = {symbol: -1 for symbol in self.data.keys()}
+        self.current_split = None
+        self.set_active_split('train')
+
+    def get_bar_store(self, symbol, split_name=None):
+        """
+        Get the columnar bar store for a symbol.
+
+        Stores are built once per DataFrame and rebuilt only when the
+        underlying DataFrame object is replaced.
+
+        Args:
+            symbol (str): Symbol to get the store for
+            split_name (str, optional): Split name, or None for full data
+
+        Returns:
+            BarStore: Columnar store, or None if no data is available
+        """
+        if split_name:
+            df = self.data_splits.get(symbol, {}).get(split_name)
+        else:
+            df = self.data.get(symbol)
+        if df is None:
+            return None
+
+        key = (symbol, split_name)
+        cached = self._bar_stores.get(key)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+
+        store = BarStore.from_dataframe(df)
+        self._bar_stores[key] = (df, store)
+        return store
+
+    def _active_stores(self, strict=False):
+        """
+        Get the bar stores replay should walk for the active split.
+
+        Args:
+            strict (bool): Raise KeyError if a symbol lacks the active split
+
+        Returns:
+            dict: Symbol to BarStore mapping
+        """
+        if not self.current_split:
+            return {symbol: self.get_bar_store(symbol) for symbol in self.data.keys()}
+
+        stores = {}
+        for symbol in self.data.keys():
+            if symbol in self.data_splits and self.current_split in self.data_splits[symbol]:
+                stores[symbol] = self.get_bar_store(symbol, self.current_split)
+            elif strict:
+                raise KeyError(f"Split '{self.current_split}' not available for {symbol}")
+        return stores
+
+    def _time_range_ns(self, store):
+        """
+        Get the explicit split time range on a store's nanosecond scale.
+
+        Args:
+            store (BarStore): Store whose timestamp scale to use
+
+        Returns:
+            tuple: (min_ns, max_ns), or None if no time range is set
+        """
+        time_range = getattr(self, '_split_time_range', None)
+        if time_range is None:
+            return None
+        cache_key = (id(time_range), store.tz)
+        cached = self._time_range_cache.get(cache_key)
+        if cached is None or cached[0] is not time_range:
+            cached = (time_range, (store.to_ns(time_range[0]), store.to_ns(time_range[1])))
+            self._time_range_cache[cache_key] = cached
+        return cached[1]
+
+    def _get_scheduler(self, strict=False):
+        """
+        Get the merge scheduler for the active split, rebuilding it when needed.
+
+        The scheduler is rebuilt whenever the data, splits, cursors or time
+        range objects are replaced (e.g. by set_active_split or reset).
+
+        Args:
+            strict (bool): Raise KeyError if a symbol lacks the active split
+
+        Returns:
+            MergeScheduler: Scheduler positioned at the current cursors
+        """
+        key = (self.current_split, self.data, self.data_splits, self.current_indices,
+               getattr(self, '_split_time_range', None))
+        cached_key = self._scheduler_key
+        if (self._scheduler is not None and len(self.data) == self._scheduler_size and
+                all(a is b for a, b in zip(key, cached_key))):
+            return self._scheduler
+
+        self._scheduler = MergeScheduler(self._active_stores(strict=strict), self.current_indices)
+        self._scheduler_key = key
+        self._scheduler_size = len(self.data)
+        return self._scheduler
+
+    def _replay_step(self, enforce_range=False, strict=False):
+        """
+        Publish the bars at the next timestamp of the active split.
+
+        Each bar is built once from the store as an immutable Bar and that
+        object is the BAR event data every subscriber reads.
+
+        Args:
+            enforce_range (bool): Skip bars outside ``_split_time_range``
+            strict (bool): Raise KeyError if a symbol lacks the active split
+
+        Returns:
+            bool: True if a timestamp was published, False if data is exhausted
+        """
+        indices = self.current_indices
+        scheduler = self._get_scheduler(strict=strict)
+
+        while True:
+            ts_ns, entries = scheduler.pop_slice()
+            if ts_ns is None:
+                # If no next timestamp found, we're done
+                return False
+
+            # Rebuild if cursors or stores were changed behind the scheduler's back
+            stores = scheduler.stores
+            if any(indices.get(symbol, -1) + 1 != idx or
+                   self.get_bar_store(symbol, self.current_split) is not stores[symbol]
+                   for symbol, idx in entries):
+                self._scheduler = None
+                scheduler = self._get_scheduler(strict=strict)
+                continue
+
+            if enforce_range:
+                in_range = []
+                for symbol, idx in entries:
+                    time_range = self._time_range_ns(stores[symbol])
+                    if time_range is not None and (ts_ns < time_range[0] or ts_ns > time_range[1]):
+                        # The symbol stays parked at this bar; it is not re-queued
+                        logger.warning(f"Skipping bar at {stores[symbol].timestamp_at(idx)} outside of "
+                                       f"{self.current_split} time range {self._split_time_range[0]} "
+                                       f"to {self._split_time_range[1]}")
+                        continue
+                    in_range.append((symbol, idx))
+                if not in_range:
+                    continue
+                entries = in_range
+            break
+
+        timeframe = getattr(self, 'timeframe', Timeframe.DAY_1)
+
+        # Publish bars for all symbols with data at this timestamp
+        published = []
+        for symbol, idx in entries:
+            bar = stores[symbol].bar(idx, symbol, timeframe)
+
+            # Store the current bar for time range validation
+            self.current_bar = bar
+
+            self.event_bus.publish(Event(EventType.BAR, bar))
+
+            indices[symbol] = idx
+            scheduler.advance(symbol, idx)
+            published.append(bar)
+
+        # Notify once per timestamp, after every bar at that timestamp is out
+        if self.event_bus.has_subscribers(EventType.TIME_SLICE):
+            self.event_bus.publish(Event(EventType.TIME_SLICE, {
+                'timestamp': published[-1].timestamp,
+                'symbols': [bar.symbol for bar in published],
+                'bars': published
+            }))
+
+        return True
+
     def update(self):
         """
         Update by moving to the next data point.
@@ -653,59 +1064,7 @@ class HistoricalDataHandler(DataHandler):
         Returns:
             bool: True if more data is available, False otherwise
         """
-        # Find the earliest next bar across all symbols
-        next_timestamp = None
-        next_symbol = None
-        
-        for symbol, df in self.data.items():
-            current_idx = self.current_indices[symbol]
-            
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-                
-                # If this is the earliest timestamp, or we haven't found any yet
-                if next_timestamp is None or timestamp < next_timestamp:
-                    next_timestamp = timestamp
-                    next_symbol = symbol
-                    
-        # If no next timestamp found, we're done
-        if next_timestamp is None:
-            return False
-            
-        # Publish bars for all symbols with data at this timestamp
-        for symbol, df in self.data.items():
-            current_idx = self.current_indices[symbol]
-            
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-                
-                # If this bar is at the current timestamp, publish it
-                if timestamp == next_timestamp:
-                    bar_data = df.iloc[next_idx].to_dict()
-                    
-                    # Add symbol to the bar data (required by CoreBar.from_dict)
-                    bar_data['symbol'] = symbol
-                    
-                    # Standardize field names
-                    bar_data = CoreBar.from_dict(bar_data)
-
-                    # CRITICAL FIX: Store the current bar for time range validation
-                    self.current_bar = bar_data
-
-                    # Publish the bar
-                    self.event_bus.publish(Event(
-                        EventType.BAR,
-                        bar_data
-                    ))
-
-                    # Update current index
-                    self.current_indices[symbol] = next_idx
-                    
-        return True
+        return self._replay_step()
         
     def _update_split_data(self):
         """
@@ -714,61 +1073,7 @@ class HistoricalDataHandler(DataHandler):
         Returns:
             bool: True if more data is available, False otherwise
         """
-        # Find the earliest next bar across all symbols
-        next_timestamp = None
-        next_symbol = None
-        
-        for symbol in self.data.keys():
-            df = self.data_splits[symbol][self.current_split]
-            current_idx = self.current_indices[symbol]
-            
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-                
-                # If this is the earliest timestamp, or we haven't found any yet
-                if next_timestamp is None or timestamp < next_timestamp:
-                    next_timestamp = timestamp
-                    next_symbol = symbol
-                    
-        # If no next timestamp found, we're done
-        if next_timestamp is None:
-            return False
-            
-        # Publish bars for all symbols with data at this timestamp
-        for symbol in self.data.keys():
-            df = self.data_splits[symbol][self.current_split]
-            current_idx = self.current_indices[symbol]
-            
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-                
-                # If this bar is at the current timestamp, publish it
-                if timestamp == next_timestamp:
-                    bar_data = df.iloc[next_idx].to_dict()
-                    
-                    # Add symbol to the bar data (required by CoreBar.from_dict)
-                    bar_data['symbol'] = symbol
-                    
-                    # Standardize field names
-                    bar_data = CoreBar.from_dict(bar_data)
-
-                    # CRITICAL FIX: Store the current bar for time range validation
-                    self.current_bar = bar_data
-
-                    # Publish the bar
-                    self.event_bus.publish(Event(
-                        EventType.BAR,
-                        bar_data
-                    ))
-
-                    # Update current index
-                    self.current_indices[symbol] = next_idx
-                    
-        return True
+        return self._replay_step(strict=True)
         
     def get_data(self, symbol=None):
         """
@@ -797,26 +1102,23 @@ class HistoricalDataHandler(DataHandler):
         # If we have split data and an active split, use that
         if hasattr(self, 'current_split') and self.current_split and self.data_splits:
             for symbol in self.data_splits.keys():
-                # Get the dataframe for this symbol's active split
-                df = self.data_splits[symbol].get(self.current_split)
-                if df is not None and len(df) > 0:
-                    # Get the index in this dataframe
+                # Get the store for this symbol's active split
+                store = self.get_bar_store(symbol, self.current_split)
+                if store is not None and len(store) > 0:
+                    # Return timestamp at current index, or the last one as fallback
                     current_idx = self.current_indices.get(symbol, -1)
-                    if current_idx >= 0 and current_idx < len(df):
-                        # Return timestamp at current index
-                        return df.iloc[current_idx]['timestamp']
-                    elif len(df) > 0:
-                        # Return the last timestamp as fallback
-                        return df.iloc[-1]['timestamp']
+                    if 0 <= current_idx < len(store):
+                        return store.timestamp_at(current_idx)
+                    return store.timestamp_at(len(store) - 1)
         
         # Fallback to using the full data
-        for symbol, df in self.data.items():
-            if len(df) > 0:
+        for symbol in self.data.keys():
+            store = self.get_bar_store(symbol)
+            if len(store) > 0:
                 current_idx = self.current_indices.get(symbol, -1)
-                if current_idx >= 0 and current_idx < len(df):
-                    return df.iloc[current_idx]['timestamp']
-                else:
-                    return df.iloc[-1]['timestamp']
+                if 0 <= current_idx < len(store):
+                    return store.timestamp_at(current_idx)
+                return store.timestamp_at(len(store) - 1)
         
         # Last resort - import datetime and return current time
         from datetime import datetime
@@ -833,34 +1135,23 @@ class HistoricalDataHandler(DataHandler):
         Returns:
             float: Latest price or None if not available
         """
-        # Check if we're using split data
+        # Check if we're using split data, then fall back to full data
+        stores = []
         if hasattr(self, 'current_split') and self.current_split and self.data_splits:
-            if symbol in self.data_splits:
-                df = self.data_splits[symbol].get(self.current_split)
-                if df is not None and len(df) > 0:
-                    # Get the current index for this symbol
-                    current_idx = self.current_indices.get(symbol, -1)
-                    
-                    # If the index is valid, return the close price at that index
-                    if current_idx >= 0 and current_idx < len(df):
-                        return df.iloc[current_idx]['close']
-                    elif len(df) > 0:
-                        # Return the last close price as fallback
-                        return df.iloc[-1]['close']
-        
-        # Fallback to using full data
+            stores.append(self.get_bar_store(symbol, self.current_split))
         if symbol in self.data:
-            df = self.data[symbol]
-            if len(df) > 0:
-                # Get the current index for this symbol
-                current_idx = self.current_indices.get(symbol, -1)
-                
-                # If the index is valid, return the close price at that index
-                if current_idx >= 0 and current_idx < len(df):
-                    return df.iloc[current_idx]['close']
-                elif len(df) > 0:
-                    # Return the last close price as fallback
-                    return df.iloc[-1]['close']
+            stores.append(self.get_bar_store(symbol))
+
+        for store in stores:
+            if store is None or len(store) == 0:
+                continue
+            closes = store.get('close')
+            # If the index is valid, return the close price at that index,
+            # otherwise the last close price as fallback
+            current_idx = self.current_indices.get(symbol, -1)
+            if 0 <= current_idx < len(store):
+                return closes[current_idx]
+            return closes[-1]
         
         # No price available
         return None
@@ -968,12 +1259,16 @@ class HistoricalDataHandler(DataHandler):
             else:
                 self.timeframe = timeframe
         
+        # Loading re-splits the data, which resets the active split to 'train'
+        active_split = self.current_split
+
         # We'll use the existing _load_data method which is called in initialize,
         # but we need to make sure it's been called at least once
         if not self.data:
             logger.info("Data not yet loaded, calling _load_data")
             try:
                 self._load_data()
+                self._restore_split(active_split)
                 return True
             except Exception as e:
                 logger.error(f"Error loading data: {e}")
@@ -1007,14 +1302,27 @@ class HistoricalDataHandler(DataHandler):
                         df = df[df['timestamp'] <= end_date]
                     self.data[symbol] = df
         
-        # Set up train/test split with default parameters
-        if hasattr(self, 'setup_train_test_split'):
+        # Re-apply the active walk-forward window, or set up the default train/test split
+        if self._window is not None:
+            self.setup_window_split(self._window)
+        elif hasattr(self, 'setup_train_test_split'):
             try:
                 self.setup_train_test_split()
             except Exception as e:
                 logger.warning(f"Error setting up train/test split: {e}")
+        self._restore_split(active_split)
         
         return success
+
+    def _restore_split(self, split_name):
+        """
+        Re-activate a split that was active before the data was reloaded.
+
+        Args:
+            split_name (str): Split to re-activate, or None
+        """
+        if split_name and split_name != self.current_split and self.data_splits:
+            self.set_active_split(split_name)
         
     def get_latest_bar(self, symbol: str) -> Optional[Bar]:
         """
@@ -1026,28 +1334,14 @@ class HistoricalDataHandler(DataHandler):
         Returns:
             Optional[Bar]: Latest bar or None if not available
         """
-        if symbol not in self.data or len(self.data[symbol]) == 0:
+        store = self._latest_store(symbol)
+        if store is None:
             return None
             
-        # Get the current index for this symbol
+        # If the current index is valid, return the bar at that index
         idx = self.current_indices.get(symbol, -1)
-        
-        # If index is valid, return the bar at that index
-        if idx >= 0 and idx < len(self.data[symbol]):
-            row = self.data[symbol].iloc[idx]
-            # Convert to Bar object
-            bar_data = row.to_dict()
-            bar_data['symbol'] = symbol
-            return Bar(
-            timestamp=bar_data['timestamp'],
-            symbol=bar_data['symbol'],
-            open=float(bar_data['open']),
-            high=float(bar_data['high']),
-            low=float(bar_data['low']),
-            close=float(bar_data['close']),
-            volume=float(bar_data.get('volume', 0)),
-            timeframe=getattr(self, 'timeframe', Timeframe.DAY_1)
-        )
+        if 0 <= idx < len(store):
+            return store.bar(idx, symbol, getattr(self, 'timeframe', Timeframe.DAY_1))
         
         # If no valid index, return None
         return None
@@ -1063,38 +1357,16 @@ class HistoricalDataHandler(DataHandler):
         Returns:
             List[Bar]: List of bars (may be empty)
         """
-        if symbol not in self.data or len(self.data[symbol]) == 0:
+        store = self._latest_store(symbol)
+        if store is None:
             return []
             
         # Get the current index for this symbol
         idx = self.current_indices.get(symbol, -1)
-        
-        # Calculate range to get
-        start_idx = max(0, idx - n + 1)
-        end_idx = idx + 1  # exclusive end
-        
-        # If start_idx is negative, return empty list
-        if idx < 0 or start_idx >= len(self.data[symbol]):
+        if idx < 0:
             return []
             
-        # Convert rows to Bar objects
-        bars = []
-        for i in range(start_idx, end_idx):
-            row = self.data[symbol].iloc[i]
-            bar_data = row.to_dict()
-            bar_data['symbol'] = symbol
-            bars.append(Bar(
-                timestamp=bar_data['timestamp'],
-                symbol=bar_data['symbol'],
-                open=float(bar_data['open']),
-                high=float(bar_data['high']),
-                low=float(bar_data['low']),
-                close=float(bar_data['close']),
-                volume=float(bar_data.get('volume', 0)),
-                timeframe=getattr(self, 'timeframe', Timeframe.DAY_1)
-            ))
-            
-        return bars
+        return store.bars(idx - n + 1, idx + 1, symbol, getattr(self, 'timeframe', Timeframe.DAY_1))
         
     def get_all_bars(self, symbol: str) -> List[Bar]:
         """
@@ -1109,23 +1381,29 @@ class HistoricalDataHandler(DataHandler):
         if symbol not in self.data or len(self.data[symbol]) == 0:
             return []
             
-        # Convert all rows to Bar objects
-        bars = []
-        for _, row in self.data[symbol].iterrows():
-            bar_data = row.to_dict()
-            bar_data['symbol'] = symbol
-            bars.append(Bar(
-                timestamp=bar_data['timestamp'],
-                symbol=bar_data['symbol'],
-                open=float(bar_data['open']),
-                high=float(bar_data['high']),
-                low=float(bar_data['low']),
-                close=float(bar_data['close']),
-                volume=float(bar_data.get('volume', 0)),
-                timeframe=getattr(self, 'timeframe', Timeframe.DAY_1)
-            ))
-            
-        return bars
+        store = self.get_bar_store(symbol)
+        return store.bars(0, len(store), symbol, getattr(self, 'timeframe', Timeframe.DAY_1))
+
+    def _latest_store(self, symbol):
+        """
+        Get the store that current indices point into for a symbol.
+
+        Args:
+            symbol (str): Symbol to get the store for
+
+        Returns:
+            BarStore: Store of the active split (or full data), or None if empty
+        """
+        if symbol not in self.data:
+            return None
+        store = None
+        if self.current_split:
+            store = self.get_bar_store(symbol, self.current_split)
+        if store is None:
+            store = self.get_bar_store(symbol)
+        if store is None or len(store) == 0:
+            return None
+        return store
         
     def update_bars(self):
         """
@@ -1138,91 +1416,18 @@ class HistoricalDataHandler(DataHandler):
         self.current_bar = None
 
         # CRITICAL FIX: Use the appropriate data source based on whether we're using a split
-        if hasattr(self, 'current_split') and self.current_split:
-            # Use split data
-            data_source = {}
-            for symbol in self.data.keys():
-                if symbol in self.data_splits and self.current_split in self.data_splits[symbol]:
-                    data_source[symbol] = self.data_splits[symbol][self.current_split]
-        else:
-            # Use full data
-            data_source = self.data
-
-        # Find the earliest next bar across all symbols
-        next_timestamp = None
-        next_symbol = None
-
-        for symbol, df in data_source.items():
-            current_idx = self.current_indices[symbol]
-
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-
-                # CRITICAL FIX: If we have a split time range, ensure the timestamp is within it
-                if hasattr(self, '_split_time_range') and self.current_split:
-                    min_time, max_time = self._split_time_range
-                    if timestamp < min_time or timestamp > max_time:
-                        logger.warning(f"Skipping bar at {timestamp} outside of {self.current_split} time range {min_time} to {max_time}")
-                        continue  # Skip this bar since it's outside our time range
-
-                # If this is the earliest timestamp, or we haven't found any yet
-                if next_timestamp is None or timestamp < next_timestamp:
-                    next_timestamp = timestamp
-                    next_symbol = symbol
-
-        # If no next timestamp found, we're done
-        if next_timestamp is None:
-            return False
-            
-        # Publish bars for all symbols with data at this timestamp
-        for symbol, df in data_source.items():
-            current_idx = self.current_indices[symbol]
-
-            # Check if there's more data for this symbol
-            if current_idx + 1 < len(df):
-                next_idx = current_idx + 1
-                timestamp = df.iloc[next_idx]['timestamp']
-
-                # CRITICAL FIX: If we have a split time range, recheck the timestamp
-                if hasattr(self, '_split_time_range') and self.current_split:
-                    min_time, max_time = self._split_time_range
-                    if timestamp < min_time or timestamp > max_time:
-                        continue  # Skip this bar since it's outside our time range
-
-                # If this bar is at the current timestamp, publish it
-                if timestamp == next_timestamp:
-                    bar_data = df.iloc[next_idx].to_dict()
-
-                    # Add symbol to the bar data
-                    bar_data['symbol'] = symbol
-
-                    # Add timeframe to the bar data
-                    if hasattr(self, 'timeframe'):
-                        bar_data['timeframe'] = self.timeframe.to_string()
-
-                    # CRITICAL FIX: Store current bar for diagnosis
-                    self.current_bar = bar_data
-
-                    # Publish the bar
-                    self.event_bus.publish(Event(
-                        EventType.BAR,
-                        bar_data
-                    ))
-
-                    # Update current index
-                    self.current_indices[symbol] = next_idx
+        enforce_range = bool(hasattr(self, '_split_time_range') and self.current_split)
+        result = self._replay_step(enforce_range=enforce_range)
 
         # CRITICAL FIX: Verify we're actually using data from the correct time range
-        if hasattr(self, '_split_time_range') and self.current_split and self.current_bar:
+        if enforce_range and self.current_bar:
             min_time, max_time = self._split_time_range
             if 'timestamp' in self.current_bar:
                 current_time = self.current_bar['timestamp']
                 if current_time < min_time or current_time > max_time:
                     logger.error(f"TIME RANGE VIOLATION in {self.current_split}: {current_time} is outside range {min_time} to {max_time}")
 
-        return True
+        return result
         
     def split_data(self, train_ratio: float = 0.7) -> Tuple[Dict[str, List[Bar]], Dict[str, List[Bar]]]:
         """
@@ -1257,37 +1462,16 @@ class HistoricalDataHandler(DataHandler):
             test_df = self.data_splits[symbol].get('test')
             
             # Convert to bar objects
+            timeframe = getattr(self, 'timeframe', Timeframe.DAY_1)
             train_bars = []
             if train_df is not None:
-                for _, row in train_df.iterrows():
-                    bar_data = row.to_dict()
-                    bar_data['symbol'] = symbol
-                    train_bars.append(Bar(
-                        timestamp=bar_data['timestamp'],
-                        symbol=bar_data['symbol'],
-                        open=float(bar_data['open']),
-                        high=float(bar_data['high']),
-                        low=float(bar_data['low']),
-                        close=float(bar_data['close']),
-                        volume=float(bar_data.get('volume', 0)),
-                        timeframe=getattr(self, 'timeframe', Timeframe.DAY_1)
-                    ))
+                store = self.get_bar_store(symbol, 'train')
+                train_bars = store.bars(0, len(store), symbol, timeframe)
             
             test_bars = []
             if test_df is not None:
-                for _, row in test_df.iterrows():
-                    bar_data = row.to_dict()
-                    bar_data['symbol'] = symbol
-                    test_bars.append(Bar(
-                        timestamp=bar_data['timestamp'],
-                        symbol=bar_data['symbol'],
-                        open=float(bar_data['open']),
-                        high=float(bar_data['high']),
-                        low=float(bar_data['low']),
-                        close=float(bar_data['close']),
-                        volume=float(bar_data.get('volume', 0)),
-                        timeframe=getattr(self, 'timeframe', Timeframe.DAY_1)
-                    ))
+                store = self.get_bar_store(symbol, 'test')
+                test_bars = store.bars(0, len(store), symbol, timeframe)
             
             train_data[symbol] = train_bars
             test_data[symbol] = test_bars
@@ -0,0 +1,271 @@
+"""
+Process-wide cache of parsed market data.
+
+Optimization runs create a fresh data handler for every parameter set and
+split. Parsing the same CSV over and over dominates start-up time, so parsed
+frames, their columnar bar stores and split index ranges are cached here,
+keyed by the source file identity and the parsing options. Cached frames are
+backed by read-only arrays and handlers receive shallow copies of them with
+their own cursors, so run isolation is unchanged.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default memory cap for cached data (1 GiB)
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def read_only_frame(df):
+    """
+    Copy a frame onto read-only column arrays.
+
+    Shallow copies of the result share its arrays, so writes into them
+    (``view['close'] *= 2``, ``view.iloc[0] = ...``) raise instead of
+    changing the data for every other reader. Replacing a whole column
+    (``view['close'] = ...``) only affects the copy it is done on.
+
+    Args:
+        df (pd.DataFrame): Frame to copy
+
+    Returns:
+        pd.DataFrame: Frame with the same index and columns
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy(copy=True)
+            values.flags.writeable = False
+        else:
+            # Extension dtypes (e.g. tz-aware timestamps) keep their type
+            values = column.array.copy()
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class CachedMarketData:
+    """
+    A parsed source held by the cache.
+
+    Attributes:
+        df (pd.DataFrame): Parsed, sorted bar data
+        store (BarStore): Read-only columnar store built from ``df``
+        splits (dict): Split key to {split_name: (start, stop, has_split_column)}
+        nbytes (int): Approximate memory held by the entry
+    """
+
+    def __init__(self, df, store):
+        self.df = df
+        self.store = store
+        self.splits = {}
+        self.nbytes = int(df.memory_usage(deep=True).sum()) + store.nbytes
+
+    def view(self):
+        """
+        Get a view of the cached frame for one run.
+
+        Returns:
+            pd.DataFrame: Shallow copy sharing the cached read-only arrays; see
+                read_only_frame for what a run may change on it
+        """
+        return self.df.copy(deep=False)
+
+
+class MarketDataCache:
+    """
+    Thread-safe LRU cache of parsed market data with a memory cap.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Memory cap; least recently used entries are evicted beyond it
+            enabled (bool): Whether lookups and inserts are performed at all
+        """
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(file_path, date_format=None, date_column=None, max_bars=None):
+        """
+        Build a cache key for a source file and its parsing options.
+
+        Args:
+            file_path (str): Path to the source file
+            date_format (str): Timestamp format used for parsing
+            date_column (str): Name of the timestamp column
+            max_bars (int): Row limit applied when reading
+
+        Returns:
+            tuple: Cache key, or None if the file cannot be stat'ed
+        """
+        try:
+            path = os.path.abspath(file_path)
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size, date_format, date_column, max_bars)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key (tuple): Key from make_key
+
+        Returns:
+            CachedMarketData: Cached entry, or None on a miss
+        """
+        if not self.enabled or key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, df, store):
+        """
+        Insert a parsed source, evicting least recently used entries if needed.
+
+        The frame is copied onto read-only arrays and the store's arrays are
+        made read-only, so that runs cannot modify shared data.
+
+        Args:
+            key (tuple): Key from make_key
+            df (pd.DataFrame): Parsed, sorted bar data
+            store (BarStore): Columnar store built from ``df``
+
+        Returns:
+            CachedMarketData: The new entry, or None if caching is disabled
+        """
+        if not self.enabled or key is None:
+            return None
+
+        store.freeze()
+        entry = CachedMarketData(read_only_frame(df), store)
+        if entry.nbytes > self.max_bytes:
+            logger.info(f"Not caching {key[0]}: {entry.nbytes} bytes exceeds cache cap of {self.max_bytes}")
+            return entry
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._bytes -= old_entry.nbytes
+                self.evictions += 1
+                logger.debug(f"Evicted {old_key[0]} from market data cache")
+        return entry
+
+    def invalidate(self, file_path=None):
+        """
+        Drop cached entries.
+
+        Args:
+            file_path (str, optional): Only drop entries for this file; all entries if None
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            if file_path is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+
+            path = os.path.abspath(file_path)
+            keys = [key for key in self._entries if key[0] == path]
+            for key in keys:
+                self._bytes -= self._entries.pop(key).nbytes
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self.invalidate()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, memory use, hits, misses, hit rate and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+# Process-wide cache shared by all data handlers
+_market_data_cache = MarketDataCache()
+
+
+def get_market_data_cache():
+    """
+    Get the process-wide market data cache.
+
+    Returns:
+        MarketDataCache: Shared cache instance
+    """
+    return _market_data_cache
+
+
+def split_ranges(full_timestamps, splits):
+    """
+    Express split frames as index ranges into the full timestamp array.
+
+    Args:
+        full_timestamps (np.ndarray): int64 ns timestamps of the full data
+        splits (dict): Split name to BarStore of that split
+
+    Returns:
+        dict: Split name to (start, stop), or None if a split is not a contiguous slice
+    """
+    ranges = {}
+    for name, store in splits.items():
+        count = len(store)
+        if count == 0:
+            ranges[name] = (0, 0)
+            continue
+        start = int(np.searchsorted(full_timestamps, store.timestamps[0], side='left'))
+        stop = start + count
+        if stop > len(full_timestamps) or not np.array_equal(full_timestamps[start:stop], store.timestamps):
+            return None
+        ranges[name] = (start, stop)
+    return ranges
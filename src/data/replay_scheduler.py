@@ -0,0 +1,81 @@
+"""
+Merge scheduling for multi-symbol bar replay.
+
+The scheduler keeps a heap of (next_timestamp, symbol) entries over a set of
+columnar bar stores, so each replay step only touches the k symbols that tick
+at the next timestamp: O(k log n) instead of scanning every symbol.
+"""
+
+import heapq
+
+
+class MergeScheduler:
+    """
+    Heap-based k-way merge over per-symbol bar stores.
+
+    Symbols that tick at the same timestamp are returned in the order they
+    appear in the ``stores`` mapping, matching the ordering of a linear scan.
+    """
+
+    def __init__(self, stores, cursors):
+        """
+        Initialize the scheduler.
+
+        Args:
+            stores (dict): Symbol to BarStore mapping
+            cursors (dict): Symbol to index of the last replayed bar (-1 if none)
+        """
+        self.stores = stores
+        self._order = {symbol: i for i, symbol in enumerate(stores)}
+        self._heap = []
+        for symbol, store in stores.items():
+            next_idx = cursors.get(symbol, -1) + 1
+            if next_idx < len(store):
+                self._heap.append((int(store.timestamps[next_idx]), self._order[symbol], symbol, next_idx))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def peek_timestamp(self):
+        """
+        Get the next timestamp without consuming it.
+
+        Returns:
+            int: Next timestamp in nanoseconds, or None if exhausted
+        """
+        return self._heap[0][0] if self._heap else None
+
+    def pop_slice(self):
+        """
+        Remove and return every entry at the next timestamp.
+
+        Entries are not re-queued; call ``advance`` for each symbol that
+        should keep participating in the merge.
+
+        Returns:
+            tuple: (timestamp_ns, [(symbol, index), ...]), or (None, []) if exhausted
+        """
+        heap = self._heap
+        if not heap:
+            return None, []
+
+        ts_ns = heap[0][0]
+        entries = []
+        while heap and heap[0][0] == ts_ns:
+            _, _, symbol, idx = heapq.heappop(heap)
+            entries.append((symbol, idx))
+        return ts_ns, entries
+
+    def advance(self, symbol, idx):
+        """
+        Queue the bar after ``idx`` for a symbol, if there is one.
+
+        Args:
+            symbol (str): Symbol that was just replayed
+            idx (int): Index of the bar that was just replayed
+        """
+        store = self.stores[symbol]
+        next_idx = idx + 1
+        if next_idx < len(store):
+            heapq.heappush(self._heap, (int(store.timestamps[next_idx]), self._order[symbol], symbol, next_idx))
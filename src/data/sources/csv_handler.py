@@ -8,6 +8,7 @@ import logging
 from typing import Dict, List, Optional, Union, Any
 
 from ..data_source_base import DataSourceBase
+from ..binary_cache import read_csv_cached
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ class CSVDataSource(DataSourceBase):
     
     def __init__(self, data_dir: str, filename_pattern='{symbol}_{timeframe}.csv', 
                  date_column='timestamp', date_format='%Y-%m-%d', 
-                 column_map=None):
+                 column_map=None, use_binary_cache=True):
         """
         Initialize the CSV data source.
         
@@ -26,11 +27,13 @@ class CSVDataSource(DataSourceBase):
             date_column: Column containing dates
             date_format: Format of dates in CSV
             column_map: Map of CSV columns to standard column names
+            use_binary_cache: Read CSV files through their on-disk binary cache
         """
         self.data_dir = data_dir
         self.filename_pattern = filename_pattern
         self.date_column = date_column
         self.date_format = date_format
+        self.use_binary_cache = use_binary_cache
         self.column_map = column_map or {
             'open': ['open', 'Open'],
             'high': ['high', 'High'],
@@ -68,8 +71,13 @@ class CSVDataSource(DataSourceBase):
             if isinstance(end_date, str):
                 end_date = pd.to_datetime(end_date)
 
-            # Read CSV
-            df = pd.read_csv(filename)
+            # Read CSV through the binary cache, which also parses the date column
+            date_columns = [self.date_column, 'date', 'timestamp', 'time', 'datetime']
+            try:
+                df = read_csv_cached(filename, date_columns, use_cache=self.use_binary_cache)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Cached datetime parsing failed: {e}, falling back to raw columns")
+                df = read_csv_cached(filename, use_cache=self.use_binary_cache)
             logger.info(f"CSVDataSource: Loaded {len(df)} rows")
 
             # Determine date column - check if configured column exists
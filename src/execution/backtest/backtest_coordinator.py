@@ -38,6 +38,201 @@ from src.execution.broker.commission_model import CommissionModel
 # Set up logging
 logger = logging.getLogger(__name__)
 
+def calculate_backtest_statistics(equity_curve, trades, initial_capital, final_capital,
+                                  realized_pnl=None, log=None, metrics=None):
+    """
+    Calculate backtest statistics using the analytics module.
+    
+    When ``metrics`` was fed the same equity points as ``equity_curve``, the
+    return, Sharpe ratio and drawdown are read from it instead of being
+    recomputed from a DataFrame of the curve.
+    
+    Args:
+        equity_curve (list): Equity points recorded during the backtest
+        trades (list): List of trades
+        initial_capital (float): Starting capital
+        final_capital (float): Cash at the end of the backtest
+        realized_pnl (float, optional): Realized PnL tracked by the portfolio
+        log (logging.Logger, optional): Logger for diagnostics
+        metrics (MetricsAccumulator, optional): Running metrics of the equity curve
+        
+    Returns:
+        dict: Calculated statistics
+    """
+    log = log or logger
+    stats = {
+        'initial_capital': initial_capital,
+        'final_capital': final_capital,
+        'trades_executed': len(trades),
+    }
+    
+    # Convert equity curve to pandas DataFrame for analytics functions
+    import pandas as pd
+    import numpy as np
+    from datetime import datetime
+    
+    # CRITICAL FIX: Calculate returns based only on closed trades
+    closed_trades = [t for t in trades if t.get('closed', True)]
+    total_closed_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('pnl') is not None)
+    closed_return = total_closed_pnl / initial_capital
+    
+    # Store the closed-trade return - this will be consistent with profit factor
+    stats['return_pct_closed_only'] = closed_return * 100
+    
+    # Capture the realized PnL from portfolio if available - this should match closed trades
+    if realized_pnl is not None:
+        portfolio_realized_pnl = realized_pnl
+        portfolio_realized_return = portfolio_realized_pnl / initial_capital * 100
+        stats['portfolio_realized_return_pct'] = portfolio_realized_return
+        
+        # Check for consistency between portfolio and trade repository
+        pnl_diff = abs(portfolio_realized_pnl - total_closed_pnl)
+        if pnl_diff > 0.01:
+            log.warning(f"Inconsistency between portfolio realized PnL ({portfolio_realized_pnl:.2f}) "
+                         f"and trade repository PnL ({total_closed_pnl:.2f})")
+        else:
+            log.info(f"Portfolio and trade repository PnL are consistent: {portfolio_realized_pnl:.2f}")
+    
+    if (metrics is not None and equity_curve and len(equity_curve) > 1
+            and metrics.count == len(equity_curve) and metrics.min_equity > 0):
+        # Same values as the functional metrics below, which use log returns
+        # for a positive equity curve
+        stats['return_pct_with_open'] = metrics.total_return * 100
+        stats['return_pct'] = stats['return_pct_closed_only']
+        sharpe = metrics.sharpe_ratio
+        if abs(sharpe) > 100:
+            # Capped like sharpe_ratio caps numerical artifacts
+            sharpe = 10.0 if sharpe > 0 else -10.0
+        stats['sharpe_ratio'] = sharpe
+        stats['sharpe_ratio_full'] = sharpe
+        stats['max_drawdown'] = metrics.max_drawdown * 100
+        stats['max_drawdown_full'] = metrics.max_drawdown * 100
+    elif equity_curve:
+        # Create DataFrame from equity curve
+        equity_data = []
+        for point in equity_curve:
+            timestamp = point.get('timestamp')
+            # Use current time if timestamp is None
+            if timestamp is None:
+                timestamp = datetime.now()
+            equity_data.append({
+                'timestamp': timestamp,
+                'equity': point.get('equity', 0)
+            })
+        
+        equity_df = pd.DataFrame(equity_data)
+        if len(equity_df) > 0:
+            # Set timestamp as index
+            if 'timestamp' in equity_df.columns:
+                equity_df.set_index('timestamp', inplace=True)
+            
+            # Calculate return using analytics
+            if len(equity_df) > 1:
+                # IMPROVED: Create two versions of equity DataFrame
+                # One with full equity (including open positions)
+                equity_df_full = equity_df.copy()
+                
+                # One with closed-only equity (for consistent metrics)
+                if 'closed_only_equity' in equity_df.columns:
+                    equity_df_closed = equity_df.copy()
+                    equity_df_closed['equity'] = equity_df_closed['closed_only_equity']
+                else:
+                    equity_df_closed = equity_df.copy()
+                
+                # Calculate total return - both full and closed-only
+                ret_full = total_return(equity_df_full, trades)
+                ret_closed = total_return(equity_df_closed, trades) if 'closed_only_equity' in equity_df.columns else closed_return
+                
+                stats['return_pct_with_open'] = ret_full * 100  # Store full return
+                stats['return_pct_closed_only'] = ret_closed * 100  # Store closed-only return
+                
+                # CRITICAL FIX: Use the closed-trade return for consistency with profit factor
+                stats['return_pct'] = stats['return_pct_closed_only']
+                
+                # Calculate Sharpe ratio on CLOSED-ONLY equity for consistency
+                stats['sharpe_ratio'] = sharpe_ratio(equity_df_closed, trades)
+                stats['sharpe_ratio_full'] = sharpe_ratio(equity_df_full, trades)  # Also calculate for full equity
+                
+                # Calculate max drawdown on CLOSED-ONLY equity for consistency
+                stats['max_drawdown'] = max_drawdown(equity_df_closed, trades) * 100  # Convert to percentage
+                stats['max_drawdown_full'] = max_drawdown(equity_df_full, trades) * 100  # Also calculate for full equity
+            else:
+                # Not enough data points
+                stats['return_pct'] = stats['return_pct_closed_only']
+                stats['sharpe_ratio'] = 0.0
+                stats['max_drawdown'] = 0.0
+        else:
+            # No equity data
+            stats['return_pct'] = stats['return_pct_closed_only']
+            stats['sharpe_ratio'] = 0.0
+            stats['max_drawdown'] = 0.0
+    else:
+        # No equity curve, calculate return from closed trade PnL
+        stats['return_pct'] = stats['return_pct_closed_only']
+        stats['sharpe_ratio'] = 0.0
+        stats['max_drawdown'] = 0.0
+        
+    # Calculate win/loss statistics if trades exist
+    if trades:
+        # Calculate win rate using analytics
+        stats['win_rate'] = win_rate(trades)
+        
+        # IMPROVED: Only consider closed trades for most metrics
+        closed_trades = [t for t in trades if t.get('closed', True)]
+        
+        # Count profitable trades for reporting
+        profitable_trades = [t for t in closed_trades if t.get('pnl', 0) > 0]
+        loss_trades = [t for t in closed_trades if t.get('pnl', 0) < 0]
+        break_even_trades = [t for t in closed_trades if t.get('pnl', 0) == 0]
+        
+        stats['profitable_trades'] = len(profitable_trades)
+        stats['loss_trades'] = len(loss_trades)
+        stats['break_even_trades'] = len(break_even_trades)
+        stats['closed_trades'] = len(closed_trades)
+        
+        # Calculate average profits
+        if profitable_trades:
+            stats['avg_profit'] = sum(t.get('pnl', 0) for t in profitable_trades) / len(profitable_trades)
+        else:
+            stats['avg_profit'] = 0
+            
+        if loss_trades:
+            stats['avg_loss'] = sum(t.get('pnl', 0) for t in loss_trades) / len(loss_trades)
+        else:
+            stats['avg_loss'] = 0
+            
+        # Calculate profit factor using analytics - this only uses closed trades
+        stats['profit_factor'] = profit_factor(closed_trades)  # CRITICAL FIX: Use closed trades explicitly
+        
+        # IMPROVED: Calculate total PnL and verify consistency with equity curve
+        total_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('pnl') is not None)
+        equity_change = final_capital - initial_capital  # Use the initial_capital we determined earlier
+        pnl_equity_diff = abs(total_pnl - equity_change)
+        
+        # Log diagnostic info
+        log.info(f"Trade PnL total: {total_pnl:.2f}, Equity change: {equity_change:.2f}, Difference: {pnl_equity_diff:.2f}")
+        
+        # Add field to show how much of equity change comes from open positions
+        stats['open_position_value'] = equity_change - total_pnl
+        
+        # Check for significant inconsistency
+        if pnl_equity_diff > 0.01 * abs(equity_change):
+            log.warning(f"Inconsistency between trade PnL total ({total_pnl:.2f}) and equity change ({equity_change:.2f})")
+            stats['pnl_equity_consistency'] = False
+        else:
+            stats['pnl_equity_consistency'] = True
+            
+        # Verify consistency between return and profit factor
+        # This should now always be consistent because we're using closed trades for both
+        if (stats['return_pct'] > 0 and stats['profit_factor'] < 1) or (stats['return_pct'] < 0 and stats['profit_factor'] > 1):
+            log.warning(f"Inconsistency between return ({stats['return_pct']:.2f}%) and profit factor ({stats['profit_factor']:.2f})")
+            stats['metrics_consistency'] = False
+        else:
+            stats['metrics_consistency'] = True
+    
+    return stats
+
+
 class BacktestCoordinator(Component):
     """
     Manages the backtest execution process.
@@ -104,7 +299,8 @@ class BacktestCoordinator(Component):
         self.shared_context = {
             'event_bus': self.event_bus,
             'trade_repository': context.get('trade_repository'),
-            'config': self.config
+            'config': self.config,
+            'random': context.get('random')
         }
         
         # Create empty equity curve
@@ -229,10 +425,15 @@ class BacktestCoordinator(Component):
         else:
             self.logger.warning("Portfolio manager doesn't support close_all_positions method")
             
-    def run(self):
+    def run(self, pruner=None):
         """
         Run the backtest.
         
+        Args:
+            pruner (BacktestPruner, optional): Rules checked every few bars; when
+                one fires the run stops and the partial results are marked with
+                'pruned' (reason and bar)
+        
         Returns:
             dict: Backtest results
         """
@@ -309,6 +510,7 @@ class BacktestCoordinator(Component):
         # Run through all data
         has_more_data = True
         bar_count = 0
+        pruned = None
         
         while has_more_data:
             # Process the next bar
@@ -330,6 +532,15 @@ class BacktestCoordinator(Component):
             if max_bars and bar_count >= max_bars:
                 self.logger.info(f"Reached bar limit of {max_bars}, stopping backtest")
                 break
+            
+            # Stop hopeless runs early
+            if pruner is not None and has_more_data and pruner.should_check(bar_count):
+                reason = pruner.check(bar_count, self.equity_curve, self._get_trade_count(),
+                                      self._get_partial_statistics)
+                if reason:
+                    self.logger.info(f"Pruning backtest after {bar_count} bars: {reason}")
+                    pruned = {'reason': reason, 'bar': bar_count}
+                    break
         
         # Close all open trades at the end of the backtest
         self.close_all_open_trades()
@@ -337,9 +548,26 @@ class BacktestCoordinator(Component):
         # Signal end of backtest
         self.event_bus.publish(Event(EventType.BACKTEST_END, {}))
         
+        if pruned is not None:
+            self.results['pruned'] = pruned
+        
         # Return the results
         self.logger.info(f"Backtest completed after processing {bar_count} bars")
         return self.results
+    
+    def _get_trade_count(self):
+        """Number of trades recorded by the portfolio so far."""
+        portfolio = self.components.get('portfolio')
+        if portfolio is None or not hasattr(portfolio, 'get_trades'):
+            return 0
+        return len(portfolio.get_trades())
+    
+    def _get_partial_statistics(self):
+        """Statistics of the run so far, for pruning rules that score it."""
+        portfolio = self.components.get('portfolio')
+        if portfolio is None:
+            return {}
+        return self._calculate_statistics(portfolio, portfolio.get_trades())
         
     def on_portfolio_update(self, event):
         """
@@ -658,169 +886,20 @@ class BacktestCoordinator(Component):
         Returns:
             dict: Calculated statistics
         """
-        # Calculate basic statistics
         initial_capital = getattr(portfolio, 'initial_capital', None)
         if initial_capital is None:
             initial_capital = getattr(portfolio, 'initial_cash', 100000)
             self.logger.info(f"Using initial_cash ({initial_capital}) as initial_capital")
             
-        stats = {
-            'initial_capital': initial_capital,
-            'final_capital': portfolio.get_capital(),
-            'trades_executed': len(trades),
-        }
-        
-        # Convert equity curve to pandas DataFrame for analytics functions
-        import pandas as pd
-        import numpy as np
-        from datetime import datetime
-        
-        # CRITICAL FIX: Calculate returns based only on closed trades
-        closed_trades = [t for t in trades if t.get('closed', True)]
-        total_closed_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('pnl') is not None)
-        closed_return = total_closed_pnl / portfolio.initial_capital
-        
-        # Store the closed-trade return - this will be consistent with profit factor
-        stats['return_pct_closed_only'] = closed_return * 100
-        
-        # Capture the realized PnL from portfolio if available - this should match closed trades
-        if hasattr(portfolio, 'realized_pnl'):
-            portfolio_realized_pnl = portfolio.realized_pnl
-            portfolio_realized_return = portfolio_realized_pnl / portfolio.initial_capital * 100
-            stats['portfolio_realized_return_pct'] = portfolio_realized_return
-            
-            # Check for consistency between portfolio and trade repository
-            pnl_diff = abs(portfolio_realized_pnl - total_closed_pnl)
-            if pnl_diff > 0.01:
-                self.logger.warning(f"Inconsistency between portfolio realized PnL ({portfolio_realized_pnl:.2f}) "
-                             f"and trade repository PnL ({total_closed_pnl:.2f})")
-            else:
-                self.logger.info(f"Portfolio and trade repository PnL are consistent: {portfolio_realized_pnl:.2f}")
-        
-        if self.equity_curve:
-            # Create DataFrame from equity curve
-            equity_data = []
-            for point in self.equity_curve:
-                timestamp = point.get('timestamp')
-                # Use current time if timestamp is None
-                if timestamp is None:
-                    timestamp = datetime.now()
-                equity_data.append({
-                    'timestamp': timestamp,
-                    'equity': point.get('equity', 0)
-                })
-            
-            equity_df = pd.DataFrame(equity_data)
-            if len(equity_df) > 0:
-                # Set timestamp as index
-                if 'timestamp' in equity_df.columns:
-                    equity_df.set_index('timestamp', inplace=True)
-                
-                # Calculate return using analytics
-                if len(equity_df) > 1:
-                    # IMPROVED: Create two versions of equity DataFrame
-                    # One with full equity (including open positions)
-                    equity_df_full = equity_df.copy()
-                    
-                    # One with closed-only equity (for consistent metrics)
-                    if 'closed_only_equity' in equity_df.columns:
-                        equity_df_closed = equity_df.copy()
-                        equity_df_closed['equity'] = equity_df_closed['closed_only_equity']
-                    else:
-                        equity_df_closed = equity_df.copy()
-                    
-                    # Calculate total return - both full and closed-only
-                    ret_full = total_return(equity_df_full, trades)
-                    ret_closed = total_return(equity_df_closed, trades) if 'closed_only_equity' in equity_df.columns else closed_return
-                    
-                    stats['return_pct_with_open'] = ret_full * 100  # Store full return
-                    stats['return_pct_closed_only'] = ret_closed * 100  # Store closed-only return
-                    
-                    # CRITICAL FIX: Use the closed-trade return for consistency with profit factor
-                    stats['return_pct'] = stats['return_pct_closed_only']
-                    
-                    # Calculate Sharpe ratio on CLOSED-ONLY equity for consistency
-                    stats['sharpe_ratio'] = sharpe_ratio(equity_df_closed, trades)
-                    stats['sharpe_ratio_full'] = sharpe_ratio(equity_df_full, trades)  # Also calculate for full equity
-                    
-                    # Calculate max drawdown on CLOSED-ONLY equity for consistency
-                    stats['max_drawdown'] = max_drawdown(equity_df_closed, trades) * 100  # Convert to percentage
-                    stats['max_drawdown_full'] = max_drawdown(equity_df_full, trades) * 100  # Also calculate for full equity
-                else:
-                    # Not enough data points
-                    stats['return_pct'] = stats['return_pct_closed_only']
-                    stats['sharpe_ratio'] = 0.0
-                    stats['max_drawdown'] = 0.0
-            else:
-                # No equity data
-                stats['return_pct'] = stats['return_pct_closed_only']
-                stats['sharpe_ratio'] = 0.0
-                stats['max_drawdown'] = 0.0
-        else:
-            # No equity curve, calculate return from closed trade PnL
-            stats['return_pct'] = stats['return_pct_closed_only']
-            stats['sharpe_ratio'] = 0.0
-            stats['max_drawdown'] = 0.0
-            
-        # Calculate win/loss statistics if trades exist
-        if trades:
-            # Calculate win rate using analytics
-            stats['win_rate'] = win_rate(trades)
-            
-            # IMPROVED: Only consider closed trades for most metrics
-            closed_trades = [t for t in trades if t.get('closed', True)]
-            
-            # Count profitable trades for reporting
-            profitable_trades = [t for t in closed_trades if t.get('pnl', 0) > 0]
-            loss_trades = [t for t in closed_trades if t.get('pnl', 0) < 0]
-            break_even_trades = [t for t in closed_trades if t.get('pnl', 0) == 0]
-            
-            stats['profitable_trades'] = len(profitable_trades)
-            stats['loss_trades'] = len(loss_trades)
-            stats['break_even_trades'] = len(break_even_trades)
-            stats['closed_trades'] = len(closed_trades)
-            
-            # Calculate average profits
-            if profitable_trades:
-                stats['avg_profit'] = sum(t.get('pnl', 0) for t in profitable_trades) / len(profitable_trades)
-            else:
-                stats['avg_profit'] = 0
-                
-            if loss_trades:
-                stats['avg_loss'] = sum(t.get('pnl', 0) for t in loss_trades) / len(loss_trades)
-            else:
-                stats['avg_loss'] = 0
-                
-            # Calculate profit factor using analytics - this only uses closed trades
-            stats['profit_factor'] = profit_factor(closed_trades)  # CRITICAL FIX: Use closed trades explicitly
-            
-            # IMPROVED: Calculate total PnL and verify consistency with equity curve
-            total_pnl = sum(t.get('pnl', 0) for t in closed_trades if t.get('pnl') is not None)
-            equity_change = portfolio.get_capital() - initial_capital  # Use the initial_capital we determined earlier
-            pnl_equity_diff = abs(total_pnl - equity_change)
-            
-            # Log diagnostic info
-            self.logger.info(f"Trade PnL total: {total_pnl:.2f}, Equity change: {equity_change:.2f}, Difference: {pnl_equity_diff:.2f}")
-            
-            # Add field to show how much of equity change comes from open positions
-            stats['open_position_value'] = equity_change - total_pnl
-            
-            # Check for significant inconsistency
-            if pnl_equity_diff > 0.01 * abs(equity_change):
-                self.logger.warning(f"Inconsistency between trade PnL total ({total_pnl:.2f}) and equity change ({equity_change:.2f})")
-                stats['pnl_equity_consistency'] = False
-            else:
-                stats['pnl_equity_consistency'] = True
-                
-            # Verify consistency between return and profit factor
-            # This should now always be consistent because we're using closed trades for both
-            if (stats['return_pct'] > 0 and stats['profit_factor'] < 1) or (stats['return_pct'] < 0 and stats['profit_factor'] > 1):
-                self.logger.warning(f"Inconsistency between return ({stats['return_pct']:.2f}%) and profit factor ({stats['profit_factor']:.2f})")
-                stats['metrics_consistency'] = False
-            else:
-                stats['metrics_consistency'] = True
-        
-        return stats
+        return calculate_backtest_statistics(
+            self.equity_curve,
+            trades,
+            initial_capital,
+            portfolio.get_capital(),
+            realized_pnl=getattr(portfolio, 'realized_pnl', None),
+            log=self.logger,
+            metrics=getattr(portfolio, 'metrics', None)
+        )
     
     def reset(self):
         """Reset the backtest coordinator and all components."""
@@ -869,6 +948,8 @@ class BacktestCoordinator(Component):
             
         # Configure slippage model
         slippage_model.configure(slippage_config)
+        if self.shared_context.get('random') is not None:
+            slippage_model.rng = self.shared_context['random']
         
         # Create commission model
         commission_model = CommissionModel()
@@ -17,6 +17,9 @@ from src.core.events.event_bus import EventBus, EventType, Event
 from src.core.trade_repository import TradeRepository
 from src.core.backtest_state import BacktestState
 from src.execution.backtest.backtest_coordinator import BacktestCoordinator
+from src.execution.backtest.result_cache import get_data_fingerprint, get_result_cache
+from src.execution.backtest.pruning import create_pruner
+from src.strategy.components.indicators.indicator_cache import IndicatorSource, get_indicator_cache
 from src.strategy.strategy_adapters import StrategyAdapter
 
 # Set up logging
@@ -48,6 +51,16 @@ class OptimizingBacktest(Component):
         self.best_test_result = None
         self.all_results = []
         
+        # Persistent result cache, enabled with optimization.result_cache
+        self.result_cache = get_result_cache((config.get('optimization') or {}).get('result_cache'),
+                                             config.get('output_dir'))
+        
+        # Early termination of training runs, enabled with optimization.pruning;
+        # optimizers set the objective and best score for the score rule
+        self.pruning_config = (config.get('optimization') or {}).get('pruning')
+        self.prune_objective = None
+        self.prune_score_bound = None
+        
         # Initialize logger
         self.logger = logging.getLogger(__name__)
         
@@ -99,7 +112,7 @@ class OptimizingBacktest(Component):
             self.config['data']['train_test_split'] = train_test_config
             
         # Get parameter combinations to test
-        parameter_combinations = self.parameter_space.get_combinations()
+        parameter_combinations = self.parameter_space.get_grid()
         
         if not parameter_combinations:
             raise ValueError("No parameter combinations to test")
@@ -297,7 +310,7 @@ class OptimizingBacktest(Component):
 
         # CRITICAL FIX: Create completely new components for this backtest
         # Create new event bus for this backtest
-        event_bus = EventBus()
+        event_bus = EventBus.from_config(self.config.get('event_bus', {}))
 
         # Create fresh trade repository for each backtest to avoid state leakage
         trade_repository = TradeRepository()
@@ -316,16 +329,13 @@ class OptimizingBacktest(Component):
 
         # Set a deterministic seed based on parameter values to ensure reproducibility
         # But also make it unique for each train/test split
-        import hashlib
-        import random
-        import numpy as np
-
         # Create a hash from parameters and split name for reproducible randomness
         params_str = str(sorted(params.items()))
         unique_seed = int(hashlib.md5(f"{params_str}_{data_split}".encode()).hexdigest(), 16) % (2**32)
-        random.seed(unique_seed)
-        np.random.seed(unique_seed)
-        self.logger.info(f"Set random seed to {unique_seed} for {data_split} with params {params}")
+        # Run-local generator for the broker's slippage; concurrent runs in threads
+        # would reseed each other through the global one
+        context['random'] = random.Random(unique_seed)
+        self.logger.info(f"Seeded run random generator with {unique_seed} for {data_split} with params {params}")
 
         # Add data split info to the context
         context['data_split'] = data_split
@@ -353,16 +363,21 @@ class OptimizingBacktest(Component):
         data_handler = data_handler_class(data_handler_name, data_config)
         data_handler.initialize(context)
 
-        # Setup train/test split with logging to trace issues
-        self.logger.info(f"Setting up train/test split with method: {train_test_config.get('method', 'ratio')}")
-        data_handler.setup_train_test_split(
-            method=train_test_config.get('method', 'ratio'),
-            train_ratio=train_test_config.get('train_ratio', 0.7),
-            test_ratio=train_test_config.get('test_ratio', 0.3),
-            split_date=train_test_config.get('split_date'),
-            train_periods=train_test_config.get('train_periods'),
-            test_periods=train_test_config.get('test_periods')
-        )
+        if train_test_config.get('window') is not None:
+            # Walk-forward window: train/test are index ranges of the loaded data
+            self.logger.info(f"Setting up walk-forward window {train_test_config['window'].get('window_idx')}")
+            data_handler.setup_window_split(train_test_config['window'])
+        else:
+            # Setup train/test split with logging to trace issues
+            self.logger.info(f"Setting up train/test split with method: {train_test_config.get('method', 'ratio')}")
+            data_handler.setup_train_test_split(
+                method=train_test_config.get('method', 'ratio'),
+                train_ratio=train_test_config.get('train_ratio', 0.7),
+                test_ratio=train_test_config.get('test_ratio', 0.3),
+                split_date=train_test_config.get('split_date'),
+                train_periods=train_test_config.get('train_periods'),
+                test_periods=train_test_config.get('test_periods')
+            )
 
         # CRITICAL FIX: Make sure to activate the correct data split
         self.logger.info(f"Activating {data_split} split in data handler")
@@ -431,19 +446,6 @@ class OptimizingBacktest(Component):
 
         # Add more thorough diagnostics for train/test splits
         try:
-            # Create a function to generate a fingerprint for a DataFrame
-            def get_data_fingerprint(df):
-                """Create a unique fingerprint of a DataFrame for comparison"""
-                if df is None or df.empty:
-                    return "empty_dataframe"
-
-                # Use first 5 and last 5 rows for fingerprinting
-                sample_rows = pd.concat([df.head(5), df.tail(5)])
-                # Convert to string and hash
-                import hashlib
-                hash_obj = hashlib.md5(pd.util.hash_pandas_object(sample_rows).values)
-                return hash_obj.hexdigest()
-
             # Store fingerprints per symbol and split for comparison
             fingerprints = {}
 
@@ -453,7 +455,8 @@ class OptimizingBacktest(Component):
                 if hasattr(data_handler, 'data_splits') and data_split in data_handler.data_splits.get(symbol, {}):
                     split_df = data_handler.data_splits[symbol][data_split]
                     # Generate fingerprint
-                    fingerprint = get_data_fingerprint(split_df)
+                    # Use first 5 and last 5 rows for fingerprinting
+                    fingerprint = get_data_fingerprint(split_df, sample_rows=5)
                     fingerprints[symbol][data_split] = fingerprint
 
                     # Log the first 3 and last 3 timestamps
@@ -520,6 +523,9 @@ class OptimizingBacktest(Component):
             # Log strategy creation
             self.logger.info(f"Created strategy '{strategy_name}' with parameters {params}")
             
+            # Indicators created from here on read the session's cached series
+            self._attach_indicator_source(strategy, data_handler, data_split)
+            
             # CRITICAL FIX: Explicitly reset the strategy state
             if hasattr(strategy, 'reset') and callable(getattr(strategy, 'reset')):
                 self.logger.info(f"Explicitly resetting strategy state for {unique_strategy_name}")
@@ -552,6 +558,8 @@ class OptimizingBacktest(Component):
                     except Exception:
                         self.logger.warning(f"Could not set parameter {key}={value} on strategy")
                 
+                self._attach_indicator_source(strategy, data_handler, data_split)
+                
                 # CRITICAL FIX: Explicitly reset the strategy
                 if hasattr(strategy, 'reset') and callable(getattr(strategy, 'reset')):
                     self.logger.info("Explicitly resetting fallback strategy state")
@@ -559,6 +567,31 @@ class OptimizingBacktest(Component):
             except Exception as e2:
                 raise ValueError(f"Failed to create strategy '{strategy_name}': {e2}")
         
+        # Reuse a stored result of an identical earlier run
+        cache_key = None
+        if self.result_cache is not None:
+            cache_key = self._get_cache_key(strategy, data_handler, params, data_split, train_test_config)
+            results = self.result_cache.get(cache_key)
+            if results is not None:
+                results['parameters'] = params
+                results['data_split'] = data_split
+                results['cache_hit'] = True
+                logger.info(f"Result cache hit for {data_split} split, skipping backtest")
+                return results
+
+        # Optional fast path for strategies that can state their positions
+        # for a whole series at once
+        if self.config.get('optimization', {}).get('engine') == 'vectorized':
+            results = self._run_vectorized_backtest(strategy, data_handler, data_split, initial_capital)
+            if results is not None:
+                results['parameters'] = params
+                results['data_split'] = data_split
+                logger.info(f"Vectorized backtest completed with {len(results['trades'])} trades "
+                            f"in {data_split} split")
+                if cache_key is not None:
+                    self.result_cache.put(cache_key, results, strategy_name)
+                return results
+
         # Create other components with fresh state for each backtest
         from src.execution.portfolio import Portfolio
         from src.execution.broker.simulated_broker import SimulatedBroker
@@ -586,9 +619,12 @@ class OptimizingBacktest(Component):
         # Initialize backtest
         backtest.initialize(context)
         
-        # Setup and run backtest
+        # Setup and run backtest; only training runs are pruned, test runs validate
         backtest.setup()
-        results = backtest.run()
+        pruner = None
+        if data_split == 'train':
+            pruner = create_pruner(self.pruning_config, self.prune_objective, self.prune_score_bound)
+        results = backtest.run(pruner=pruner)
         
         # Add parameters and split info to results
         results['parameters'] = params
@@ -651,11 +687,86 @@ class OptimizingBacktest(Component):
                 'trades_executed': len(results.get('trades', []))
             }
         
+        # Pruned runs are partial, so they are not reused
+        if cache_key is not None and not results.get('pruned'):
+            self.result_cache.put(cache_key, results, strategy_name)
+        
         # CRITICAL FIX: Force garbage collection after backtest
         gc.collect()
         
         return results
+
+    def _attach_indicator_source(self, strategy, data_handler, data_split):
+        """
+        Give a strategy the cached indicator series of the optimization session.
+
+        Strategies opt in with an ``indicator_source`` attribute. Outside a
+        session the strategy keeps computing its own indicators.
+
+        Args:
+            strategy: Strategy instance
+            data_handler: Data handler with the split set up
+            data_split (str): Data split to use ('train' or 'test')
+        """
+        indicator_cache = get_indicator_cache()
+        if indicator_cache is not None and hasattr(strategy, 'indicator_source'):
+            strategy.indicator_source = IndicatorSource(indicator_cache, data_handler, data_split)
+
+    def _get_cache_key(self, strategy, data_handler, params, data_split, train_test_config):
+        """
+        Build the result cache key of a run.
+
+        Args:
+            strategy: Strategy instance with the parameters applied
+            data_handler: Data handler with the split set up
+            params (dict): Strategy parameters
+            data_split (str): Data split to use ('train' or 'test')
+            train_test_config (dict): Train/test configuration
+
+        Returns:
+            str: Cache key
+        """
+        data_fingerprint = {}
+        for symbol in data_handler.get_symbols():
+            split_df = getattr(data_handler, 'data_splits', {}).get(symbol, {}).get(data_split)
+            data_fingerprint[symbol] = get_data_fingerprint(split_df)
+
+        return self.result_cache.make_key(data_fingerprint, data_split, train_test_config,
+                                          type(strategy), params, self.config)
         
+    def _run_vectorized_backtest(self, strategy, data_handler, data_split, initial_capital):
+        """
+        Run a backtest with the vectorized engine.
+
+        Fills are priced like SimulatedBroker's defaults at the previous
+        bar's close, which is when the event-driven engine fills an order
+        placed on a bar, so both engines rank parameter sets the same way.
+
+        Args:
+            strategy: Strategy instance
+            data_handler: Data handler with the split set up
+            data_split (str): Data split to use ('train' or 'test')
+            initial_capital (float): Starting capital
+
+        Returns:
+            dict: Backtest results, or None if the strategy or data needs the
+                event-driven engine
+        """
+        from src.execution.backtest.vectorized import VectorizedBacktester, supports_vectorized
+
+        symbols = data_handler.get_symbols()
+        if not supports_vectorized(strategy) or len(symbols) != 1:
+            self.logger.info("Vectorized engine needs a single symbol and a strategy with "
+                             "vectorized_positions, using the event-driven engine")
+            return None
+
+        bars = data_handler.get_bar_store(symbols[0], data_split)
+        if bars is None:
+            return None
+
+        backtester = VectorizedBacktester(initial_capital, symbols[0], fill_on='previous_close')
+        return backtester.run(strategy, bars)
+
     def _get_data_handler_class(self):
         """
         Get the data handler class for backtest.
@@ -0,0 +1,306 @@
+"""
+Early termination of hopeless backtests.
+
+During an optimization most of the time goes into parameter sets that are
+obviously bad long before the end of the data. A BacktestPruner holds rules
+that BacktestCoordinator.run checks every ``check_interval`` bars; the first
+rule that fires stops the run, and the partial results are returned marked
+``pruned`` so the optimizer can discard them.
+
+Rules are configured under ``optimization.pruning``:
+
+    pruning:
+      check_interval: 100     # bars between checks
+      max_drawdown: 0.5       # stop above 50% drawdown (fraction, like MaxDrawdownLimit)
+      min_trades: 1           # stop with fewer trades than this ...
+      min_trades_by_bar: 500  # ... once this many bars are processed
+      score_margin: 1.0       # stop when the running score falls this far below the best
+      score_min_bars: 300     # bars before the score rule applies
+"""
+
+import logging
+
+from src.analytics.metrics.online import MetricsAccumulator
+
+logger = logging.getLogger(__name__)
+
+# Bars between checks when the configuration does not say
+DEFAULT_CHECK_INTERVAL = 100
+
+
+class PrunedRun(Exception):
+    """
+    Raised by an objective function whose backtest was stopped early.
+
+    Searches count these separately from errors.
+    """
+
+    def __init__(self, reason, bar=None):
+        """
+        Initialize the exception.
+
+        Args:
+            reason (str): Why the run was stopped
+            bar (int, optional): Bar at which the run was stopped
+        """
+        super().__init__(reason)
+        self.reason = reason
+        self.bar = bar
+
+    def __reduce__(self):
+        return (PrunedRun, (self.reason, self.bar))
+
+
+class PruningState:
+    """
+    Progress of a running backtest as seen by the pruning rules.
+    """
+
+    def __init__(self, bar, equity, peak_equity, max_drawdown, trade_count, statistics_function=None,
+                 metrics=None):
+        """
+        Initialize the state.
+
+        Args:
+            bar (int): Number of bars processed
+            equity (float): Latest equity, or None before the first update
+            peak_equity (float): Highest equity so far, or None
+            max_drawdown (float): Largest drawdown so far as a fraction
+            trade_count (int): Number of trades so far
+            statistics_function (callable, optional): Returns the statistics
+                of the partial run; only called by rules that need them
+            metrics (MetricsAccumulator, optional): Running metrics of the
+                equity points seen so far (Sharpe, Sortino, ...)
+        """
+        self.bar = bar
+        self.equity = equity
+        self.peak_equity = peak_equity
+        self.max_drawdown = max_drawdown
+        self.trade_count = trade_count
+        self.metrics = metrics
+        self._statistics_function = statistics_function
+        self._statistics = None
+
+    @property
+    def drawdown(self):
+        """Drawdown from the peak as a fraction (0.20 = 20%)."""
+        if self.equity is None or not self.peak_equity or self.peak_equity <= 0:
+            return 0.0
+        return max(0.0, (self.peak_equity - self.equity) / self.peak_equity)
+
+    @property
+    def statistics(self):
+        """Statistics of the partial run, computed on first access."""
+        if self._statistics is None and self._statistics_function is not None:
+            self._statistics = self._statistics_function()
+        return self._statistics or {}
+
+
+class PruningRule:
+    """
+    Base class of pruning rules.
+    """
+
+    def check(self, state):
+        """
+        Decide whether to stop a run.
+
+        Args:
+            state (PruningState): Progress of the run
+
+        Returns:
+            str: Reason to stop, or None to continue
+        """
+        raise NotImplementedError
+
+
+class MaxDrawdownRule(PruningRule):
+    """
+    Stop runs whose drawdown exceeds a threshold.
+    """
+
+    def __init__(self, max_drawdown):
+        """
+        Initialize the rule.
+
+        Args:
+            max_drawdown (float): Largest allowed drawdown (0.20 = 20%)
+        """
+        self.max_drawdown = max_drawdown
+
+    def check(self, state):
+        if state.max_drawdown > self.max_drawdown:
+            return f"drawdown {state.max_drawdown:.2%} exceeds {self.max_drawdown:.2%}"
+        return None
+
+
+class MinTradesRule(PruningRule):
+    """
+    Stop runs with too few trades after a number of bars.
+    """
+
+    def __init__(self, min_trades, by_bar):
+        """
+        Initialize the rule.
+
+        Args:
+            min_trades (int): Trades required ...
+            by_bar (int): ... once this many bars are processed
+        """
+        self.min_trades = min_trades
+        self.by_bar = by_bar
+
+    def check(self, state):
+        if state.bar >= self.by_bar and state.trade_count < self.min_trades:
+            return f"{state.trade_count} trades after {state.bar} bars, expected at least {self.min_trades}"
+        return None
+
+
+class ScoreBoundRule(PruningRule):
+    """
+    Stop runs whose running score falls below a bound.
+
+    The running score is the objective function applied to the statistics of
+    the partial run. It is only an estimate of the final score, so the bound
+    is usually the best score so far minus a margin.
+    """
+
+    def __init__(self, objective_function, bound, min_bars=0, maximize=True):
+        """
+        Initialize the rule.
+
+        Args:
+            objective_function (callable): Scores a results dict with 'statistics'
+            bound (float or callable): Bound, or a function returning the current
+                bound (None while there is none)
+            min_bars (int): Bars processed before the rule applies
+            maximize (bool): Whether higher scores are better
+        """
+        self.objective_function = objective_function
+        self.bound = bound
+        self.min_bars = min_bars
+        self.maximize = maximize
+
+    def check(self, state):
+        bound = self.bound() if callable(self.bound) else self.bound
+        if bound is None or state.bar < self.min_bars:
+            return None
+
+        score = self.objective_function({'statistics': state.statistics, 'partial': True})
+        if score is None:
+            return None
+        if (score < bound) if self.maximize else (score > bound):
+            return f"running score {score:.4f} is beyond the bound {bound:.4f}"
+        return None
+
+
+class BacktestPruner:
+    """
+    Set of pruning rules checked every ``check_interval`` bars.
+    """
+
+    def __init__(self, rules, check_interval=DEFAULT_CHECK_INTERVAL):
+        """
+        Initialize the pruner.
+
+        Args:
+            rules (list): PruningRule instances
+            check_interval (int): Bars between checks
+
+        Raises:
+            ValueError: If check_interval is not positive
+        """
+        if check_interval < 1:
+            raise ValueError(f"check_interval must be at least 1, got {check_interval}")
+        self.rules = list(rules)
+        self.check_interval = check_interval
+        self.metrics = MetricsAccumulator()
+        self._seen_points = 0
+
+    def should_check(self, bar):
+        """Whether the rules are due at this bar."""
+        return bar % self.check_interval == 0
+
+    def check(self, bar, equity_curve, trade_count, statistics_function=None):
+        """
+        Check the rules against the progress of a run.
+
+        Equity points are consumed incrementally, so repeated checks only
+        look at the points recorded since the last one.
+
+        Args:
+            bar (int): Number of bars processed
+            equity_curve (list): Equity points recorded so far (dicts with 'equity')
+            trade_count (int): Number of trades so far
+            statistics_function (callable, optional): Returns the statistics of
+                the partial run
+
+        Returns:
+            str: Reason to stop, or None to continue
+        """
+        for point in equity_curve[self._seen_points:]:
+            value = point.get('equity')
+            if value is not None:
+                self.metrics.add_equity(value, point.get('timestamp'))
+        self._seen_points = len(equity_curve)
+        equity = equity_curve[-1].get('equity') if equity_curve else None
+
+        state = PruningState(bar, equity, self.metrics.peak_equity, self.metrics.max_drawdown, trade_count,
+                             statistics_function, self.metrics)
+        for rule in self.rules:
+            reason = rule.check(state)
+            if reason:
+                return reason
+        return None
+
+
+def create_pruner(config, objective_function=None, score_bound=None):
+    """
+    Create a pruner from an ``optimization.pruning`` configuration.
+
+    Args:
+        config (dict): Pruning configuration (see the module docstring)
+        objective_function (callable, optional): Objective for the score rule
+        score_bound (float or callable, optional): Best score so far, or a
+            function returning it; the score rule stops runs below it minus
+            ``score_margin``
+
+    Returns:
+        BacktestPruner: Pruner, or None if no rule is configured
+    """
+    if not config or not config.get('enabled', True):
+        return None
+
+    rules = []
+    if config.get('max_drawdown') is not None:
+        rules.append(MaxDrawdownRule(config['max_drawdown']))
+    if config.get('min_trades'):
+        rules.append(MinTradesRule(config['min_trades'], config.get('min_trades_by_bar', 0)))
+    if config.get('score_margin') is not None and objective_function is not None and score_bound is not None:
+        margin = config['score_margin']
+
+        def bound():
+            best = score_bound() if callable(score_bound) else score_bound
+            return None if best is None else best - margin
+
+        rules.append(ScoreBoundRule(objective_function, bound, config.get('score_min_bars', 0)))
+
+    if not rules:
+        return None
+    return BacktestPruner(rules, config.get('check_interval', DEFAULT_CHECK_INTERVAL))
+
+
+def share_best_score(objective_function, best_score):
+    """
+    Pass the best score of a search to an objective that prunes against it.
+
+    Objectives opt in with a ``best_score`` attribute. Parallel evaluators
+    pickle the objective with every batch they submit, so workers see the
+    score as of the batch's submission.
+
+    Args:
+        objective_function (callable): Objective of the search
+        best_score (float): Best score so far
+    """
+    if hasattr(objective_function, 'best_score'):
+        objective_function.best_score = best_score
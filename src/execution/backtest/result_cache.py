@@ -0,0 +1,347 @@
+"""
+Persistent cache of backtest results.
+
+Re-running an optimization after adding a few points to a parameter space
+would otherwise backtest every point again. Results are stored in a SQLite
+file keyed by everything that determines them: a fingerprint of the split
+data, the split configuration, the strategy class and the hash of its source
+files, the normalized parameters and the execution settings (broker,
+slippage, commission, risk, engine). The value is the metrics as JSON plus a
+zlib-compressed blob holding trades, positions and, optionally, the equity
+curve.
+"""
+
+import os
+import json
+import zlib
+import time
+import pickle
+import sqlite3
+import hashlib
+import inspect
+import logging
+import threading
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default location, next to the other optimization output
+DEFAULT_CACHE_PATH = os.path.join('optimization_results', 'result_cache.sqlite')
+
+# Configuration sections that change what a backtest produces
+RESULT_CONFIG_KEYS = ('initial_capital', 'broker', 'slippage', 'commission', 'risk',
+                      'close_positions_eod', 'max_bars', 'strategy', 'analytics')
+
+# Result entries kept in the compressed blob rather than the metrics JSON
+_BLOB_KEYS = ('trades', 'positions', 'equity_curve')
+
+# Per-run entries that are not part of the cached value
+_RUN_KEYS = ('parameters', 'data_split', 'cache_hit')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    strategy TEXT,
+    parameters TEXT,
+    data_split TEXT,
+    metrics TEXT NOT NULL,
+    payload BLOB,
+    created REAL
+)
+"""
+
+
+def _to_builtin(value):
+    """JSON fallback for numpy scalars, timestamps and other objects."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _dumps(value):
+    return json.dumps(value, sort_keys=True, default=_to_builtin)
+
+
+def get_data_fingerprint(df, sample_rows=None):
+    """
+    Create a fingerprint of a DataFrame's contents.
+
+    Args:
+        df (pd.DataFrame): Data to fingerprint
+        sample_rows (int, optional): Only hash the first and last this many rows;
+            hashes every row if None
+
+    Returns:
+        str: Hex digest, or "empty_dataframe" for empty data
+    """
+    if df is None or df.empty:
+        return "empty_dataframe"
+
+    if sample_rows is not None:
+        df = pd.concat([df.head(sample_rows), df.tail(sample_rows)])
+    return hashlib.md5(pd.util.hash_pandas_object(df).values).hexdigest()
+
+
+_code_fingerprints = {}
+
+
+def get_code_fingerprint(cls):
+    """
+    Hash the source files defining a class and its base classes.
+
+    Args:
+        cls (type): Strategy class
+
+    Returns:
+        str: Hex digest of the source files, memoized per class
+    """
+    fingerprint = _code_fingerprints.get(cls)
+    if fingerprint is None:
+        digest = hashlib.md5()
+        seen = set()
+        for klass in cls.__mro__:
+            try:
+                path = inspect.getsourcefile(klass)
+            except TypeError:
+                continue  # Built-in classes have no source
+            if not path or path in seen or not os.path.exists(path):
+                continue
+            seen.add(path)
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        fingerprint = digest.hexdigest()
+        _code_fingerprints[cls] = fingerprint
+    return fingerprint
+
+
+def normalize_params(params):
+    """
+    Normalize parameters for hashing.
+
+    Args:
+        params (dict): Strategy parameters
+
+    Returns:
+        dict: Parameters with builtin values and sorted keys
+    """
+    return json.loads(_dumps(params or {}))
+
+
+class ResultCache:
+    """
+    SQLite-backed store of backtest results.
+
+    The database is opened lazily per process, so instances can be shared
+    with worker threads and sent to worker processes. Concurrent writers are
+    handled by SQLite's WAL journal.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, store_equity_curve=True):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite database file
+            store_equity_curve (bool): Whether equity curves are stored with the metrics
+        """
+        self.path = path
+        self.store_equity_curve = store_equity_curve
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pid = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lock'] = None
+        state['_connection'] = None
+        state['_pid'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    @staticmethod
+    def make_key(data_fingerprint, data_split, split_config, strategy_class, params, run_config=None):
+        """
+        Build the cache key of one backtest.
+
+        Args:
+            data_fingerprint (str or dict): Fingerprint of the data the run sees
+            data_split (str): Data split ('train' or 'test')
+            split_config (dict): Train/test split or walk-forward window configuration
+            strategy_class (type): Strategy class; its source files are hashed too
+            params (dict): Strategy parameters
+            run_config (dict, optional): Backtest configuration; only the sections in
+                RESULT_CONFIG_KEYS and the optimization engine are used
+
+        Returns:
+            str: Hex digest identifying the backtest
+        """
+        run_config = run_config or {}
+        settings = {key: run_config.get(key) for key in RESULT_CONFIG_KEYS}
+        settings['engine'] = (run_config.get('optimization') or {}).get('engine')
+        parts = {
+            'data': data_fingerprint,
+            'split': data_split,
+            'split_config': split_config,
+            'strategy': f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+            'code': get_code_fingerprint(strategy_class),
+            'params': normalize_params(params),
+            'settings': settings
+        }
+        return hashlib.sha256(_dumps(parts).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a result.
+
+        Args:
+            key (str): Cache key from make_key
+
+        Returns:
+            dict: Stored backtest results, or None if not cached
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT metrics, payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        results = json.loads(row[0])
+        if row[1] is not None:
+            results.update(pickle.loads(zlib.decompress(row[1])))
+        return results
+
+    def put(self, key, results, strategy_name=None):
+        """
+        Store a result.
+
+        Args:
+            key (str): Cache key from make_key
+            results (dict): Backtest results
+            strategy_name (str, optional): Strategy name, stored for inspection
+        """
+        metrics = {k: v for k, v in results.items() if k not in _BLOB_KEYS and k not in _RUN_KEYS}
+        payload = {k: results[k] for k in _BLOB_KEYS if k in results}
+        if not self.store_equity_curve:
+            payload.pop('equity_curve', None)
+
+        row = (
+            key,
+            strategy_name,
+            _dumps(results.get('parameters')),
+            results.get('data_split'),
+            _dumps(metrics),
+            zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)),
+            time.time()
+        )
+        with self._lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            connection.commit()
+            self.writes += 1
+
+    def __len__(self):
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        """Remove all stored results and reset the statistics."""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM results")
+            connection.commit()
+            self.hits = self.misses = self.writes = 0
+
+    def close(self):
+        """Close the database connection of this process."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def get_stats(self):
+        """
+        Get lookup statistics of this process.
+
+        Returns:
+            dict: Hits, misses, hit rate and writes
+        """
+        stats = hit_stats(self.hits, self.misses)
+        stats['writes'] = self.writes
+        stats['path'] = self.path
+        return stats
+
+
+def hit_stats(hits, misses):
+    """
+    Summarize cache lookups.
+
+    Args:
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that ran a backtest
+
+    Returns:
+        dict: Hits, misses and hit rate
+    """
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+
+
+# Process-wide caches by database path
+_result_caches = {}
+_result_caches_lock = threading.Lock()
+
+
+def get_result_cache(setting, output_dir=None):
+    """
+    Get the process-wide result cache for a configuration setting.
+
+    Args:
+        setting (bool, str or dict): optimization.result_cache value: True for the
+            default location, a database path, or a dict with 'path' and
+            'store_equity_curve'
+        output_dir (str, optional): Directory of the default database
+
+    Returns:
+        ResultCache: Shared cache, or None if caching is disabled
+    """
+    if not setting:
+        return None
+
+    options = dict(setting) if isinstance(setting, dict) else {}
+    if options and not options.get('enabled', True):
+        return None
+    if isinstance(setting, str):
+        path = setting
+    else:
+        path = options.get('path') or (
+            os.path.join(output_dir, 'result_cache.sqlite') if output_dir else DEFAULT_CACHE_PATH)
+    store_equity_curve = options.get('store_equity_curve', True)
+
+    with _result_caches_lock:
+        cache = _result_caches.get(path)
+        if cache is None:
+            cache = ResultCache(path, store_equity_curve)
+            _result_caches[path] = cache
+        return cache
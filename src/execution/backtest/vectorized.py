@@ -0,0 +1,346 @@
+"""
+Vectorized backtest engine for screening parameter sets.
+
+Most of the time in an event-driven backtest goes into passing every bar
+through the BAR -> SIGNAL -> ORDER -> FILL chain. When a strategy can state
+its positions for a whole series at once, the backtest reduces to array
+work plus a short loop over the bars where the position changes.
+
+Strategies opt in by implementing::
+
+    def vectorized_positions(self, bars, position_size=None) -> np.ndarray
+
+which returns the signed target position after every bar of ``bars`` (a
+BarStore). Each position change becomes a market fill priced with the
+same slippage and commission models as SimulatedBroker. By default the
+fill happens at the close of the bar that changed the position; with
+``fill_on='previous_close'`` it happens at the previous bar's close, which
+is what the event-driven engine does because the broker receives each bar
+after the strategy has already traded on it.
+Trades and equity points are recorded the way Portfolio and TradeRepository
+record them, and statistics come from the same function BacktestCoordinator
+uses, so a vectorized result can stand in for an event-driven one when
+ranking parameter sets.
+"""
+
+import math
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.core.data_model import Direction
+from src.data.bar_store import BarStore
+from src.execution.backtest.backtest_coordinator import calculate_backtest_statistics
+from src.execution.broker.commission_model import CommissionModel
+from src.execution.broker.slippage_model import FixedSlippageModel
+
+logger = logging.getLogger(__name__)
+
+# Statistics compared by compare_results unless told otherwise
+COMPARED_STATISTICS = (
+    'trades_executed', 'return_pct', 'return_pct_with_open', 'sharpe_ratio',
+    'max_drawdown', 'win_rate', 'profit_factor'
+)
+
+FILL_MODES = ('close', 'previous_close')
+
+# Trade fields compared by compare_results
+_COMPARED_TRADE_FIELDS = ('direction', 'quantity', 'entry_time', 'close_time', 'closed')
+_COMPARED_TRADE_VALUES = ('entry_price', 'close_price', 'pnl')
+
+
+def supports_vectorized(strategy):
+    """
+    Check whether a strategy provides vectorized positions.
+
+    Args:
+        strategy: Strategy instance
+
+    Returns:
+        bool: True if the strategy implements ``vectorized_positions``
+    """
+    return callable(getattr(strategy, 'vectorized_positions', None))
+
+
+def equity_curve_frame(equity_curve):
+    """
+    Convert recorded equity points to the DataFrame the analytics expect.
+
+    Args:
+        equity_curve (list): Equity points with 'timestamp' and 'equity'
+
+    Returns:
+        pd.DataFrame: Equity points indexed by timestamp
+    """
+    frame = pd.DataFrame(equity_curve)
+    if 'timestamp' in frame.columns:
+        frame = frame.set_index('timestamp')
+    return frame
+
+
+class VectorizedBacktester:
+    """
+    Backtest a single symbol from a strategy's target positions.
+    """
+
+    def __init__(self, initial_capital=100000, symbol='SYMBOL', commission_model=None,
+                 slippage_model=None, position_size=None, fill_on='close'):
+        """
+        Initialize the backtester.
+
+        Args:
+            initial_capital (float): Starting capital
+            symbol (str): Symbol recorded on trades and positions
+            commission_model (CommissionModel, optional): Defaults to SimulatedBroker's default
+            slippage_model (SlippageModel, optional): Defaults to SimulatedBroker's default
+            position_size (float, optional): Position size passed to the strategy
+            fill_on (str): 'close' to fill at the signal bar's close, or
+                'previous_close' to fill at the close before it
+
+        Raises:
+            ValueError: If fill_on is unknown
+        """
+        if fill_on not in FILL_MODES:
+            raise ValueError(f"Unknown fill_on: {fill_on}, expected one of {FILL_MODES}")
+        self.initial_capital = initial_capital
+        self.symbol = symbol
+        self.commission_model = commission_model or CommissionModel()
+        self.slippage_model = slippage_model or FixedSlippageModel()
+        self.position_size = position_size
+        self.fill_on = fill_on
+
+    def run(self, strategy, bars):
+        """
+        Backtest a strategy that implements ``vectorized_positions``.
+
+        Args:
+            strategy: Strategy instance
+            bars (BarStore or pd.DataFrame): Bars to test on
+
+        Returns:
+            dict: Results with the same keys as an event-driven backtest
+
+        Raises:
+            ValueError: If the strategy does not support vectorized backtests
+                or returns positions of the wrong length
+        """
+        if not supports_vectorized(strategy):
+            raise ValueError(f"Strategy {strategy.__class__.__name__} does not implement vectorized_positions")
+        if isinstance(bars, pd.DataFrame):
+            bars = BarStore.from_dataframe(bars)
+
+        positions = np.asarray(strategy.vectorized_positions(bars, position_size=self.position_size),
+                               dtype=np.float64)
+        if positions.shape != (len(bars),):
+            raise ValueError(f"Expected {len(bars)} positions, got shape {positions.shape}")
+        return self.run_positions(positions, bars)
+
+    def run_positions(self, positions, bars):
+        """
+        Backtest a series of target positions.
+
+        Args:
+            positions (np.ndarray): Signed target position after each bar
+            bars (BarStore or pd.DataFrame): Bars the positions refer to
+
+        Returns:
+            dict: Final capital, positions, trades, statistics and equity curve
+        """
+        if isinstance(bars, pd.DataFrame):
+            bars = BarStore.from_dataframe(bars)
+
+        positions = np.nan_to_num(np.asarray(positions, dtype=np.float64))
+        orders = np.diff(positions, prepend=0.0)
+        fill_indices = np.flatnonzero(orders)
+        close = bars.get('close')
+
+        ledger = _Ledger(self.initial_capital, self.symbol)
+        for idx in fill_indices:
+            quantity = float(abs(orders[idx]))
+            direction = Direction.LONG.value if orders[idx] > 0 else Direction.SHORT.value
+            price_idx = max(idx - 1, 0) if self.fill_on == 'previous_close' else idx
+            price = self.slippage_model.apply_slippage(float(close[price_idx]), quantity, direction)
+            commission = self.commission_model.calculate(price, quantity)
+            ledger.fill(direction, quantity, price, commission, bars.timestamp_at(price_idx))
+
+        if ledger.position != 0 and len(bars) > 0:
+            ledger.close_all(bars.timestamp_at(len(bars) - 1))
+
+        logger.debug(f"Vectorized backtest: {len(bars)} bars, {len(fill_indices)} fills, "
+                     f"{len(ledger.trades)} trades")
+
+        statistics = calculate_backtest_statistics(
+            ledger.equity_curve,
+            ledger.trades,
+            self.initial_capital,
+            ledger.cash,
+            realized_pnl=ledger.realized_pnl,
+            log=logger
+        )
+        return {
+            'final_capital': ledger.cash,
+            'positions': {self.symbol: ledger.position},
+            'trades': ledger.trades,
+            'statistics': statistics,
+            'equity_curve': ledger.equity_curve,
+            'engine': 'vectorized'
+        }
+
+
+class _Ledger:
+    """
+    Cash, position and trade bookkeeping for one symbol.
+
+    Mirrors Portfolio.on_fill and TradeRepository.close_trade: a fill closes
+    every open trade in the other direction and opens a trade for its full
+    quantity when the position ends up on its side. Trade PnL excludes
+    commission, cash pays it, and open positions are valued at the last
+    trade price the repository knows about.
+    """
+
+    def __init__(self, initial_capital, symbol):
+        self.initial_capital = initial_capital
+        self.symbol = symbol
+        self.cash = initial_capital
+        self.position = 0.0
+        self.realized_pnl = 0.0
+        self.trades = []
+        self.open_trades = []
+        self.equity_curve = []
+        self.last_close_price = None
+        self.last_entry_price = None
+        self.fill_count = 0
+
+    def fill(self, direction, quantity, price, commission, timestamp):
+        self.fill_count += 1
+        signed = quantity if direction == Direction.LONG.value else -quantity
+        self.position += signed
+
+        # Every open trade in the other direction is closed by the fill
+        for trade in list(self.open_trades):
+            if trade['direction'] != direction:
+                self._close_trade(trade, price, timestamp, min(quantity, trade['quantity']))
+
+        if direction == Direction.LONG.value:
+            self.cash -= price * quantity
+        else:
+            self.cash += price * quantity
+        self.cash -= commission
+
+        opening = (self.position > 0) if direction == Direction.LONG.value else (self.position < 0)
+        if opening:
+            trade = {
+                'id': f"trade_fill_{self.fill_count}",
+                'symbol': self.symbol,
+                'direction': direction,
+                'quantity': quantity,
+                'entry_price': price,
+                'entry_time': timestamp,
+                'closed': False,
+                'related_order_ids': [f"order_{self.fill_count}"]
+            }
+            self.trades.append(trade)
+            self.open_trades.append(trade)
+            self.last_entry_price = price
+
+        self._record(timestamp)
+
+    def close_all(self, timestamp):
+        # Portfolio.close_all_positions realizes PnL at the last known trade
+        # price and flattens the position without a cash flow, but only when
+        # it had an open trade to close
+        price = self._mark_price()
+        if self.open_trades:
+            for trade in list(self.open_trades):
+                self._close_trade(trade, price, timestamp, trade['quantity'])
+            self.position = 0.0
+        self._record(timestamp)
+
+    def _close_trade(self, trade, price, timestamp, quantity):
+        entry_value = trade['entry_price'] * quantity
+        exit_value = price * quantity
+        pnl = exit_value - entry_value if trade['direction'] == Direction.LONG.value else entry_value - exit_value
+
+        trade.update({
+            'closed': True,
+            'close_price': price,
+            'close_time': timestamp,
+            'pnl': pnl,
+            'closed_quantity': quantity
+        })
+        if quantity < trade['quantity']:
+            trade['closed'] = False
+            trade['quantity'] = trade['quantity'] - quantity
+        else:
+            self.open_trades.remove(trade)
+            self.realized_pnl += pnl
+        self.last_close_price = price
+
+    def _mark_price(self):
+        return self.last_close_price if self.last_close_price is not None else self.last_entry_price
+
+    def _record(self, timestamp):
+        market_value = self.position * self._mark_price() if self.position != 0 else 0
+        full_equity = self.cash + market_value
+        self.equity_curve.append({
+            'timestamp': timestamp,
+            'cash': self.cash,
+            'closed_pnl': self.realized_pnl,
+            'market_value': market_value,
+            'closed_only_equity': self.initial_capital + self.realized_pnl,
+            'full_equity': full_equity,
+            'equity': full_equity
+        })
+
+
+def compare_results(vectorized, event_driven, statistics=COMPARED_STATISTICS,
+                    rel_tol=1e-9, abs_tol=1e-6):
+    """
+    Compare a vectorized backtest with an event-driven run of the same strategy.
+
+    Args:
+        vectorized (dict): Results from VectorizedBacktester
+        event_driven (dict): Results from BacktestCoordinator
+        statistics (tuple): Statistic names to compare
+        rel_tol (float): Relative tolerance for prices, PnL and statistics
+        abs_tol (float): Absolute tolerance for prices, PnL and statistics
+
+    Returns:
+        list: Descriptions of the differences; empty if the runs agree
+    """
+    differences = []
+
+    def close_enough(a, b):
+        if a is None or b is None:
+            return a is b
+        a, b = float(a), float(b)
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+        return math.isclose(a, b, rel_tol=rel_tol, abs_tol=abs_tol)
+
+    fast_trades = vectorized.get('trades', [])
+    slow_trades = event_driven.get('trades', [])
+    if len(fast_trades) != len(slow_trades):
+        differences.append(f"trade count: {len(fast_trades)} vs {len(slow_trades)}")
+
+    for i, (fast, slow) in enumerate(zip(fast_trades, slow_trades)):
+        for field in _COMPARED_TRADE_FIELDS:
+            if fast.get(field) != slow.get(field):
+                differences.append(f"trade {i} {field}: {fast.get(field)} vs {slow.get(field)}")
+        for field in _COMPARED_TRADE_VALUES:
+            if not close_enough(fast.get(field), slow.get(field)):
+                differences.append(f"trade {i} {field}: {fast.get(field)} vs {slow.get(field)}")
+
+    fast_stats = vectorized.get('statistics', {})
+    slow_stats = event_driven.get('statistics', {})
+    for name in statistics:
+        if name not in fast_stats and name not in slow_stats:
+            continue
+        if not close_enough(fast_stats.get(name), slow_stats.get(name)):
+            differences.append(f"{name}: {fast_stats.get(name)} vs {slow_stats.get(name)}")
+
+    if not close_enough(vectorized.get('final_capital'), event_driven.get('final_capital')):
+        differences.append(f"final_capital: {vectorized.get('final_capital')} vs {event_driven.get('final_capital')}")
+
+    return differences
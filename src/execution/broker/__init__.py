@@ -4,11 +4,14 @@ Broker module for order execution and market simulation.
 This module provides components for:
 - Order execution and routing
 - Market simulation for backtesting
+- Indexed book of pending orders
 - Slippage and commission modeling
 """
 from src.execution.broker.broker_base import BrokerBase
 from src.execution.broker.simulated_broker import SimulatedBroker
 from src.execution.broker.market_simulator import MarketSimulator
+from src.execution.broker.market_stats import RollingMarketStats
+from src.execution.broker.order_book import OrderBook
 from src.execution.broker.slippage_model import FixedSlippageModel, VariableSlippageModel
 from src.execution.broker.commission_model import CommissionModel
 
@@ -16,6 +19,8 @@ __all__ = [
     'BrokerBase',
     'SimulatedBroker',
     'MarketSimulator',
+    'RollingMarketStats',
+    'OrderBook',
     'FixedSlippageModel',
     'VariableSlippageModel',
     'CommissionModel'
@@ -353,8 +353,8 @@ class SimulatedBroker:
             
             # Check if rule ID exists and is not the current order
             if rule_id in processed_orders:
-                processed_order = processed_orders[rule_id]
-                return processed_order.get('event_id') != order_id
+                # The event bus keeps the ID of the event that claimed each key
+                return processed_orders[rule_id] != order_id
                 
         return False
         
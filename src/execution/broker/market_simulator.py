@@ -9,10 +9,14 @@ import datetime
 from typing import Dict, Any, List, Optional, Tuple, Callable
 
 from src.core.component import Component
+from src.core.logging.hot_path import get_hot_path_logger
+from src.execution.broker.market_stats import RollingMarketStats
 from src.core.event_system.event import Event
 from src.core.event_system.event_types import EventType
+from src.data.data_types import Bar
 
 logger = logging.getLogger(__name__)
+hot_log = get_hot_path_logger(__name__)
 
 class MarketSimulator(Component):
     """
@@ -35,8 +39,13 @@ class MarketSimulator(Component):
         
         # Market state
         self.current_prices = {}  # symbol -> {open, high, low, close, volume, timestamp}
-        self.historical_prices = {}  # symbol -> List[price_dict]
-        self.market_stats = {}  # symbol -> {volatility, liquidity, spread, etc.}
+        self.historical_prices = {}  # symbol -> RingBuffer of the last bars
+        self.market_stats = {}  # symbol -> RollingMarketStats (once a symbol has two bars)
+        self._rolling_stats = {}  # symbol -> RollingMarketStats
+        
+        # Bars kept per symbol for the statistics, with per-symbol overrides
+        self.max_history_bars = self.config.get('max_history_bars', 100)
+        self.history_windows = dict(self.config.get('history_windows') or {})
         
         # Configuration parameters
         self.max_price_impact = self.config.get('max_price_impact', 0.01)  # 1% max impact
@@ -100,6 +109,10 @@ class MarketSimulator(Component):
             symbol: Symbol to update
             bar: Bar object or dictionary with price data
         """
+        # Bars are immutable and already hold floats, so they are stored as they are
+        if isinstance(bar, Bar):
+            return self._store_price_data(symbol, bar)
+            
         # Create price data dictionary from bar
         if hasattr(bar, 'to_dict'):
             bar_data = bar.to_dict()
@@ -136,20 +149,34 @@ class MarketSimulator(Component):
                 'timestamp': timestamp
             }
             
-            # Store the price data and log more details for debugging
-            self.current_prices[symbol] = price_data
-            logger.info(f"Updated price data for {symbol}: close={close_price:.4f}")
+            return self._store_price_data(symbol, price_data)
             
-            # Add to historical prices
-            if symbol not in self.historical_prices:
-                self.historical_prices[symbol] = []
+        except Exception as e:
+            logger.error(f"Error updating price data for {symbol}: {e}", exc_info=True)
+            return False
+    
+    def _store_price_data(self, symbol, price_data):
+        """
+        Make price data the current prices of a symbol and add it to its history.
+        
+        Args:
+            symbol: Symbol to update
+            price_data: Bar or price dictionary, not modified afterwards
             
-            self.historical_prices[symbol].append(price_data.copy())
+        Returns:
+            bool: True if the price data was stored
+        """
+        try:
+            # Store the price data and log more details for debugging
+            self.current_prices[symbol] = price_data
+            hot_log.hot("Updated price data for %s: close=%.4f", symbol, price_data['close'])
             
-            # Keep only the most recent N bars
-            max_history = self.config.get('max_history_bars', 100)
-            if len(self.historical_prices[symbol]) > max_history:
-                self.historical_prices[symbol] = self.historical_prices[symbol][-max_history:]
+            # Add to the rolling window, which drops the oldest bar once full
+            stats = self._rolling_stats.get(symbol)
+            if stats is None:
+                stats = self._rolling_stats[symbol] = RollingMarketStats(self.get_history_window(symbol))
+                self.historical_prices[symbol] = stats.bars
+            stats.update(price_data)
                 
             # Update market statistics
             self._update_market_stats(symbol)
@@ -168,6 +195,7 @@ class MarketSimulator(Component):
         self.current_prices = {}
         self.historical_prices = {}
         self.market_stats = {}
+        self._rolling_stats = {}
         
         logger.info("Market simulator reset")
     
@@ -197,7 +225,7 @@ class MarketSimulator(Component):
         if 'close' in bar_data:
             try:
                 close_value = float(bar_data.get('close', 0))
-                logger.info(f"Market simulator received bar for {symbol} with close={close_value:.4f}")
+                hot_log.hot("Market simulator received bar for %s with close=%.4f", symbol, close_value)
             except (ValueError, TypeError):
                 logger.warning(f"Market simulator received bar for {symbol} with invalid close value: {bar_data.get('close')}")
         else:
@@ -232,7 +260,7 @@ class MarketSimulator(Component):
         if symbol not in self.current_prices:
             logger.error(f"Price data for {symbol} not stored in current_prices after update")
         else:
-            logger.info(f"Verified price data for {symbol} in current_prices: {self.current_prices[symbol]['close']:.4f}")
+            hot_log.hot("Verified price data for %s in current_prices: %.4f", symbol, self.current_prices[symbol]['close'])
     
     def check_fill_conditions(self, order: Dict[str, Any]) -> Tuple[bool, float]:
         """
@@ -249,7 +277,7 @@ class MarketSimulator(Component):
         direction = order.get('direction')
         
         # Log more detailed order information for debugging
-        logger.info(f"Checking fill conditions for {order_type} order: {symbol} {direction}")
+        hot_log.hot("Checking fill conditions for %s order: %s %s", order_type, symbol, direction)
         
         # Validate inputs
         if not symbol or not direction:
@@ -283,19 +311,19 @@ class MarketSimulator(Component):
                 return False, 0.0
         
         price_data = self.current_prices[symbol]
-        logger.info(f"Using price data for {symbol}: open={price_data['open']:.4f}, high={price_data['high']:.4f}, "
-                   f"low={price_data['low']:.4f}, close={price_data['close']:.4f}")
+        hot_log.hot("Using price data for %s: open=%.4f, high=%.4f, low=%.4f, close=%.4f", symbol,
+                    price_data['open'], price_data['high'], price_data['low'], price_data['close'])
         
         # Use custom handler if available for this order type
         if order_type in self.fill_handlers:
-            logger.debug(f"Using custom fill handler for {order_type}")
+            hot_log.debug("Using custom fill handler for %s", order_type)
             return self.fill_handlers[order_type](order, price_data, self.market_stats.get(symbol, {}))
         
         # Default handling for common order types
         if order_type == 'MARKET':
             # Market orders always fill at current price
             fill_price = price_data['close']
-            logger.info(f"Market order can fill at price: {fill_price:.4f}")
+            hot_log.hot("Market order can fill at price: %.4f", fill_price)
             return True, fill_price
             
         elif order_type == 'LIMIT':
@@ -311,13 +339,13 @@ class MarketSimulator(Component):
                 can_fill = price_data['low'] <= limit_price
                 # Fill at the better of limit price or open price
                 fill_price = max(min(price_data['open'], limit_price), price_data['low'])
-                logger.info(f"Buy limit order at {limit_price:.4f} - can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Buy limit order at %.4f - can fill: %s, fill price: %.4f", limit_price, can_fill, fill_price)
             else:
                 # Sell limit: can fill if price goes above limit
                 can_fill = price_data['high'] >= limit_price
                 # Fill at the better of limit price or open price
                 fill_price = min(max(price_data['open'], limit_price), price_data['high'])
-                logger.info(f"Sell limit order at {limit_price:.4f} - can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Sell limit order at %.4f - can fill: %s, fill price: %.4f", limit_price, can_fill, fill_price)
             
             return can_fill, fill_price
             
@@ -334,13 +362,13 @@ class MarketSimulator(Component):
                 can_fill = price_data['high'] >= stop_price
                 # Fill at the worse of stop price or open price
                 fill_price = max(price_data['open'], stop_price)
-                logger.info(f"Buy stop order at {stop_price:.4f} - can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Buy stop order at %.4f - can fill: %s, fill price: %.4f", stop_price, can_fill, fill_price)
             else:
                 # Sell stop: can fill if price goes below stop
                 can_fill = price_data['low'] <= stop_price
                 # Fill at the worse of stop price or open price
                 fill_price = min(price_data['open'], stop_price)
-                logger.info(f"Sell stop order at {stop_price:.4f} - can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Sell stop order at %.4f - can fill: %s, fill price: %.4f", stop_price, can_fill, fill_price)
             
             return can_fill, fill_price
             
@@ -365,8 +393,9 @@ class MarketSimulator(Component):
                     can_fill = False
                     fill_price = 0.0
                     
-                logger.info(f"Buy stop-limit order (stop={stop_price:.4f}, limit={limit_price:.4f}) - "
-                           f"stop triggered: {stop_triggered}, can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Buy stop-limit order (stop=%.4f, limit=%.4f) - stop triggered: %s, "
+                            "can fill: %s, fill price: %.4f",
+                            stop_price, limit_price, stop_triggered, can_fill, fill_price)
             else:
                 # First check if stop is triggered
                 stop_triggered = price_data['low'] <= stop_price
@@ -379,8 +408,9 @@ class MarketSimulator(Component):
                     can_fill = False
                     fill_price = 0.0
                     
-                logger.info(f"Sell stop-limit order (stop={stop_price:.4f}, limit={limit_price:.4f}) - "
-                           f"stop triggered: {stop_triggered}, can fill: {can_fill}, fill price: {fill_price:.4f}")
+                hot_log.hot("Sell stop-limit order (stop=%.4f, limit=%.4f) - stop triggered: %s, "
+                            "can fill: %s, fill price: %.4f",
+                            stop_price, limit_price, stop_triggered, can_fill, fill_price)
             
             return can_fill, fill_price
         
@@ -407,10 +437,15 @@ class MarketSimulator(Component):
         if not symbol or not quantity or not direction:
             return base_price
         
-        # Get market statistics
-        market_stat = self.market_stats.get(symbol, {})
-        liquidity = market_stat.get('liquidity', 10000.0)  # Default to high liquidity
-        volatility = market_stat.get('volatility', 0.01)  # Default to 1% volatility
+        # Get market statistics, read from the rolling statistics when available
+        market_stat = self.market_stats.get(symbol)
+        if isinstance(market_stat, RollingMarketStats):
+            liquidity = market_stat.liquidity
+            volatility = market_stat.volatility
+        else:
+            market_stat = market_stat or {}
+            liquidity = market_stat.get('liquidity', 10000.0)  # Default to high liquidity
+            volatility = market_stat.get('volatility', 0.01)  # Default to 1% volatility
         
         # Calculate impact based on order size relative to liquidity
         impact_factor = min(abs(quantity) / liquidity, self.max_price_impact)
@@ -450,45 +485,50 @@ class MarketSimulator(Component):
         """
         Update market statistics for a symbol.
         
+        The rolling statistics are maintained as bars arrive; they are
+        published in market_stats once the symbol has two bars.
+        
         Args:
             symbol: Symbol to update statistics for
         """
-        if not symbol or symbol not in self.historical_prices:
-            return
-        
-        # Get price history
-        price_history = self.historical_prices[symbol]
-        
-        if len(price_history) < 2:
-            return
+        stats = self._rolling_stats.get(symbol)
+        if stats is not None and len(stats.bars) >= 2:
+            self.market_stats[symbol] = stats
+    
+    def get_history_window(self, symbol: str) -> int:
+        """
+        Get the number of bars the statistics of a symbol are computed over.
         
-        # Calculate volatility (using close prices)
-        closes = [bar['close'] for bar in price_history]
+        Args:
+            symbol: Symbol to get the window for
+            
+        Returns:
+            int: Window length
+        """
+        return self.history_windows.get(symbol, self.max_history_bars)
+    
+    def set_history_window(self, symbol: str, window: int) -> None:
+        """
+        Set the number of bars the statistics of a symbol are computed over.
         
-        # Simple volatility calculation (standard deviation of returns)
-        returns = [(closes[i] / closes[i-1]) - 1.0 for i in range(1, len(closes))]
+        Bars already seen are kept up to the new window length.
         
-        if returns:
-            import statistics
-            
-            try:
-                volatility = statistics.stdev(returns)
-            except statistics.StatisticsError:
-                volatility = 0.01  # Default if calculation fails
-                
-            # Calculate average volume (proxy for liquidity)
-            avg_volume = sum(bar.get('volume', 0) for bar in price_history) / len(price_history)
-            
-            # Calculate average spread if high/low available
-            avg_spread = sum((bar['high'] - bar['low']) / bar['close'] for bar in price_history) / len(price_history)
+        Args:
+            symbol: Symbol to set the window for
+            window: Window length
             
-            # Store statistics
-            self.market_stats[symbol] = {
-                'volatility': volatility,
-                'liquidity': max(avg_volume, 1.0),  # Avoid division by zero
-                'spread': avg_spread,
-                'last_update': datetime.datetime.now()
-            }
+        Raises:
+            ValueError: If window is not positive
+        """
+        if window < 1:
+            raise ValueError(f"History window must be at least 1, got {window}")
+        self.history_windows[symbol] = window
+        stats = self._rolling_stats.get(symbol)
+        if stats is not None:
+            stats.resize(window)
+            self.historical_prices[symbol] = stats.bars
+            if len(stats.bars) < 2:
+                self.market_stats.pop(symbol, None)
     
     def get_current_price(self, symbol: str) -> Dict[str, Any]:
         """
@@ -512,4 +552,4 @@ class MarketSimulator(Component):
         Returns:
             dict: Market statistics or empty dict if not found
         """
-        return self.market_stats.get(symbol, {})
\ No newline at end of file
+        return dict(self.market_stats.get(symbol, {}))
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Rolling market statistics with O(1) updates.
+
+The market simulator keeps the last N bars of each symbol and derives the
+volatility, liquidity and spread used for market impact from them. These
+used to be recomputed from the whole window on every bar (and the window
+itself was a list sliced on every bar). RollingMarketStats keeps the bars
+in a fixed-size ring buffer and maintains running sums of returns, squared
+returns, volumes and spreads, adding the new bar's terms and subtracting
+those of the bar that leaves the window:
+
+- volatility: sample standard deviation of the close-to-close returns in
+  the window (0.01 while there are fewer than two returns)
+- liquidity: average volume, at least 1.0
+- spread: average (high - low) / close
+
+Running sums drift slightly as values are added and subtracted, so they
+are recomputed from the buffer each time it wraps around, which keeps the
+update amortized O(1).
+"""
+
+import datetime
+import math
+from collections.abc import Mapping
+from typing import Any, Iterator, List, Optional
+
+# Volatility reported while there are fewer than two returns
+DEFAULT_VOLATILITY = 0.01
+
+# Statistics exposed through the mapping interface
+STAT_KEYS = ('volatility', 'liquidity', 'spread', 'last_update')
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer of the most recent items.
+
+    Iteration and indexing go from the oldest item to the newest, and the
+    buffer compares equal to a list of the same items.
+    """
+
+    __slots__ = ('maxlen', '_items', '_start', '_size')
+
+    def __init__(self, maxlen: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            maxlen: Number of items kept
+
+        Raises:
+            ValueError: If maxlen is not positive
+        """
+        if maxlen < 1:
+            raise ValueError(f"maxlen must be at least 1, got {maxlen}")
+        self.maxlen = maxlen
+        self._items: List[Any] = [None] * maxlen
+        self._start = 0
+        self._size = 0
+
+    def append(self, item: Any) -> Any:
+        """
+        Add an item, dropping the oldest one if the buffer is full.
+
+        Args:
+            item: Item to add
+
+        Returns:
+            The dropped item, or None if the buffer was not full
+        """
+        if self._size < self.maxlen:
+            self._items[(self._start + self._size) % self.maxlen] = item
+            self._size += 1
+            return None
+        evicted = self._items[self._start]
+        self._items[self._start] = item
+        self._start = (self._start + 1) % self.maxlen
+        return evicted
+
+    def clear(self) -> None:
+        """Drop every item."""
+        self._items = [None] * self.maxlen
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ring buffer index out of range")
+        return self._items[(self._start + index) % self.maxlen]
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.maxlen]
+
+    def __eq__(self, other):
+        if isinstance(other, (RingBuffer, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RingBuffer({list(self)!r}, maxlen={self.maxlen})"
+
+
+def _spread(bar) -> float:
+    close = bar['close']
+    return (bar['high'] - bar['low']) / close if close else 0.0
+
+
+def _return(previous_close: float, close: float) -> float:
+    return close / previous_close - 1.0 if previous_close else 0.0
+
+
+class RollingMarketStats(Mapping):
+    """
+    Market statistics over a rolling window of bars.
+
+    Reads like the statistics dictionary it replaces: ``stats['volatility']``,
+    ``stats.get('liquidity', default)`` and ``dict(stats)`` all work, and
+    the attributes of the same names can be read directly.
+    """
+
+    def __init__(self, window: int = 100):
+        """
+        Initialize the statistics.
+
+        Args:
+            window: Number of bars in the window
+
+        Raises:
+            ValueError: If window is not positive
+        """
+        self.bars = RingBuffer(window)
+        self.last_update: Optional[datetime.datetime] = None
+        self._reset_sums()
+
+    @property
+    def window(self) -> int:
+        """int: Number of bars in the window."""
+        return self.bars.maxlen
+
+    def _reset_sums(self) -> None:
+        self._return_sum = 0.0
+        self._return_sq_sum = 0.0
+        self._volume_sum = 0.0
+        self._spread_sum = 0.0
+        self._updates = 0
+
+    def update(self, bar) -> None:
+        """
+        Add a bar, dropping the oldest one once the window is full.
+
+        Args:
+            bar: Bar or price dictionary with open, high, low, close and
+                optionally volume
+        """
+        bars = self.bars
+        close = bar['close']
+        volume = bar.get('volume', 0) or 0
+        spread = _spread(bar)
+        new_return = _return(bars[-1]['close'], close) if len(bars) else None
+
+        evicted = bars.append(bar)
+        self._volume_sum += volume
+        self._spread_sum += spread
+        if new_return is not None:
+            self._return_sum += new_return
+            self._return_sq_sum += new_return * new_return
+
+        if evicted is not None:
+            # The return from the evicted bar to the new oldest bar leaves the window
+            old_return = _return(evicted['close'], bars[0]['close'])
+            self._volume_sum -= evicted.get('volume', 0) or 0
+            self._spread_sum -= _spread(evicted)
+            self._return_sum -= old_return
+            self._return_sq_sum -= old_return * old_return
+
+        self._updates += 1
+        if self._updates >= bars.maxlen:
+            self._recompute()
+        self.last_update = datetime.datetime.now()
+
+    def _recompute(self) -> None:
+        """Recompute the running sums from the bars in the window."""
+        self._reset_sums()
+        previous_close = None
+        for bar in self.bars:
+            close = bar['close']
+            self._volume_sum += bar.get('volume', 0) or 0
+            self._spread_sum += _spread(bar)
+            if previous_close is not None:
+                r = _return(previous_close, close)
+                self._return_sum += r
+                self._return_sq_sum += r * r
+            previous_close = close
+
+    def resize(self, window: int) -> None:
+        """
+        Change the window, keeping the most recent bars that fit.
+
+        Args:
+            window: New number of bars in the window
+        """
+        recent = self.bars[-window:]
+        self.bars = RingBuffer(window)
+        for bar in recent:
+            self.bars.append(bar)
+        self._recompute()
+
+    def clear(self) -> None:
+        """Drop every bar."""
+        self.bars.clear()
+        self.last_update = None
+        self._reset_sums()
+
+    @property
+    def volatility(self) -> float:
+        """float: Sample standard deviation of the returns in the window."""
+        n = len(self.bars) - 1
+        if n < 2:
+            return DEFAULT_VOLATILITY
+        variance = (self._return_sq_sum - self._return_sum * self._return_sum / n) / (n - 1)
+        return math.sqrt(variance) if variance > 0.0 else 0.0
+
+    @property
+    def liquidity(self) -> float:
+        """float: Average volume in the window, at least 1.0."""
+        size = len(self.bars)
+        return max(self._volume_sum / size, 1.0) if size else 1.0
+
+    @property
+    def spread(self) -> float:
+        """float: Average (high - low) / close in the window."""
+        size = len(self.bars)
+        return self._spread_sum / size if size else 0.0
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in STAT_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STAT_KEYS)
+
+    def __len__(self) -> int:
+        return len(STAT_KEYS)
+
+    def __repr__(self) -> str:
+        return f"RollingMarketStats({dict(self)!r}, window={self.window})"
@@ -0,0 +1,255 @@
+"""
+Indexed book of pending orders for the simulated broker.
+
+The broker used to keep pending orders in one list, scanning all of it for
+the orders of a symbol on every bar and removing filled orders with
+``list.remove``. With many resting orders across symbols that is quadratic.
+OrderBook keeps the same orders indexed by symbol and by order id, and
+keeps the trigger prices of LIMIT and STOP orders sorted, so a bar only
+looks at the orders its range can fill:
+
+- BUY LIMIT and SELL STOP orders fill once the low reaches their price,
+  so only orders priced at or above the bar's low are candidates
+- SELL LIMIT and BUY STOP orders fill once the high reaches their price,
+  so only orders priced at or below the bar's high are candidates
+
+Every other order (MARKET, STOP_LIMIT, custom types, orders without a
+usable price) is a candidate on every bar. Candidates are only a superset
+of the fillable orders; the broker still decides with its fill check, so
+fills are unchanged. Trigger prices are read when an order is added.
+
+OrderBook still behaves like the list it replaces: ``append``, ``remove``,
+``len()``, iteration (in arrival order) and comparison with a list work.
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Order types whose trigger prices are indexed
+INDEXED_ORDER_TYPES = ('LIMIT', 'STOP')
+
+# Index sides: orders triggered when the bar's low falls to their price or below,
+# and orders triggered when the bar's high rises to their price or above
+_LOW_SIDE = 'low'
+_HIGH_SIDE = 'high'
+
+
+def _trigger_side(order: Dict[str, Any]) -> Optional[Tuple[str, float]]:
+    """
+    Get the index side and trigger price of an order.
+
+    Returns:
+        tuple: (side, price), or None if the order is checked on every bar
+    """
+    order_type = order.get('order_type')
+    if order_type not in INDEXED_ORDER_TYPES:
+        return None
+    price = order.get('price')
+    if isinstance(price, bool) or not isinstance(price, (int, float)) or math.isnan(price):
+        return None
+    buy = order.get('direction') == 'BUY'
+    if (order_type == 'LIMIT') == buy:
+        return _LOW_SIDE, float(price)
+    return _HIGH_SIDE, float(price)
+
+
+class _SymbolOrders:
+    """Pending orders of one symbol."""
+
+    __slots__ = ('orders', 'unindexed', 'low_side', 'high_side')
+
+    def __init__(self):
+        self.orders: Dict[int, Dict[str, Any]] = {}     # seq -> order, in arrival order
+        self.unindexed: Dict[int, Dict[str, Any]] = {}  # seq -> order checked on every bar
+        self.low_side: List[Tuple[float, int]] = []     # sorted (price, seq)
+        self.high_side: List[Tuple[float, int]] = []    # sorted (price, seq)
+
+
+class OrderBook:
+    """
+    Pending orders indexed by symbol, order id and trigger price.
+    """
+
+    def __init__(self, orders=()):
+        """
+        Initialize the book.
+
+        Args:
+            orders: Orders to add, in arrival order
+        """
+        self._orders: Dict[int, Dict[str, Any]] = {}       # seq -> order, in arrival order
+        self._keys: Dict[int, Tuple[Any, Optional[Tuple[str, float]]]] = {}  # seq -> (symbol, trigger)
+        self._seqs: Dict[int, int] = {}                    # id(order) -> seq
+        self._ids: Dict[Any, List[int]] = {}               # order id -> seqs
+        self._symbols: Dict[Any, _SymbolOrders] = {}
+        self._next_seq = 0
+        for order in orders:
+            self.append(order)
+
+    def append(self, order: Dict[str, Any]) -> None:
+        """
+        Add an order.
+
+        Args:
+            order: Order dictionary (needs 'symbol'; 'order_type',
+                'direction' and 'price' are used for the price index)
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        symbol = order.get('symbol')
+        trigger = _trigger_side(order)
+
+        self._orders[seq] = order
+        self._keys[seq] = (symbol, trigger)
+        self._seqs[id(order)] = seq
+        self._ids.setdefault(order.get('id'), []).append(seq)
+
+        book = self._symbols.get(symbol)
+        if book is None:
+            book = self._symbols[symbol] = _SymbolOrders()
+        book.orders[seq] = order
+        if trigger is None:
+            book.unindexed[seq] = order
+        else:
+            side, price = trigger
+            insort(book.low_side if side == _LOW_SIDE else book.high_side, (price, seq))
+
+    def _discard(self, seq: int) -> Dict[str, Any]:
+        """Remove the order with a sequence number from every index."""
+        order = self._orders.pop(seq)
+        symbol, trigger = self._keys.pop(seq)
+        del self._seqs[id(order)]
+        seqs = self._ids[order.get('id')]
+        seqs.remove(seq)
+        if not seqs:
+            del self._ids[order.get('id')]
+
+        book = self._symbols[symbol]
+        del book.orders[seq]
+        if trigger is None:
+            del book.unindexed[seq]
+        else:
+            side, price = trigger
+            entries = book.low_side if side == _LOW_SIDE else book.high_side
+            del entries[bisect_left(entries, (price, seq))]
+        if not book.orders:
+            del self._symbols[symbol]
+        return order
+
+    def remove(self, order: Dict[str, Any]) -> None:
+        """
+        Remove an order, like ``list.remove``.
+
+        Args:
+            order: The order object that was added
+
+        Raises:
+            ValueError: If the order is not in the book
+        """
+        seq = self._seqs.get(id(order))
+        if seq is None:
+            raise ValueError("order not in order book")
+        self._discard(seq)
+
+    def pop_id(self, order_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Remove the earliest pending order with an id.
+
+        Args:
+            order_id: Order id
+
+        Returns:
+            dict: The removed order, or None if no order has this id
+        """
+        seqs = self._ids.get(order_id)
+        if not seqs:
+            return None
+        return self._discard(seqs[0])
+
+    def get(self, order_id: Any) -> Optional[Dict[str, Any]]:
+        """
+        Get the earliest pending order with an id.
+
+        Args:
+            order_id: Order id
+
+        Returns:
+            dict: The order, or None if no order has this id
+        """
+        seqs = self._ids.get(order_id)
+        return self._orders[seqs[0]] if seqs else None
+
+    def __contains__(self, order: Any) -> bool:
+        return id(order) in self._seqs
+
+    def for_symbol(self, symbol: Any) -> List[Dict[str, Any]]:
+        """
+        Get the pending orders of a symbol.
+
+        Args:
+            symbol: Symbol
+
+        Returns:
+            list: Orders in arrival order
+        """
+        book = self._symbols.get(symbol)
+        return list(book.orders.values()) if book else []
+
+    def candidates(self, symbol: Any, low: Any, high: Any) -> List[Dict[str, Any]]:
+        """
+        Get the orders of a symbol that a bar's range could fill.
+
+        Args:
+            symbol: Symbol
+            low: Low of the bar the fill check uses
+            high: High of the bar the fill check uses
+
+        Returns:
+            list: Orders in arrival order; every order of the symbol if the
+            range is not a pair of numbers
+        """
+        book = self._symbols.get(symbol)
+        if book is None:
+            return []
+        if not all(isinstance(v, (int, float)) and not math.isnan(v) for v in (low, high)):
+            return list(book.orders.values())
+
+        seqs = list(book.unindexed)
+        # Low-side orders trigger at prices >= low, high-side orders at prices <= high
+        seqs.extend(seq for _, seq in book.low_side[bisect_left(book.low_side, (low,)):])
+        seqs.extend(seq for _, seq in book.high_side[:bisect_left(book.high_side, (high, math.inf))])
+        seqs.sort()
+        return [book.orders[seq] for seq in seqs]
+
+    def symbols(self) -> List[Any]:
+        """
+        Get the symbols with pending orders.
+
+        Returns:
+            list: Symbols
+        """
+        return list(self._symbols)
+
+    def clear(self) -> None:
+        """Remove every order."""
+        self.__init__()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._orders.values()))
+
+    def __getitem__(self, index):
+        return list(self._orders.values())[index]
+
+    def __eq__(self, other):
+        if isinstance(other, OrderBook):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"OrderBook({list(self._orders.values())!r})"
@@ -11,13 +11,17 @@ import datetime
 from typing import Dict, Any, List, Optional, Union, Tuple
 
 from src.core.component import Component
+from src.core.logging.hot_path import get_hot_path_logger
 from src.core.event_system.event import Event
 from src.core.event_system.event_types import EventType
+from src.data.data_types import Bar
+from src.execution.broker.order_book import OrderBook, INDEXED_ORDER_TYPES
 from src.execution.broker.slippage_model import FixedSlippageModel
 from src.execution.broker.commission_model import CommissionModel
 
 # Set up logging
 logger = logging.getLogger(__name__)
+hot_log = get_hot_path_logger(__name__)
 
 class SimulatedBroker(Component):
     """
@@ -44,7 +48,7 @@ class SimulatedBroker(Component):
         
         # Trading state
         self.latest_prices = {}  # symbol -> price data
-        self.pending_orders = []  # Orders waiting to be processed
+        self.pending_orders = OrderBook()  # Orders waiting to be processed
         self.filled_orders = {}  # order_id -> fill_data
         self.rejected_orders = {}  # order_id -> reject_reason
         
@@ -79,6 +83,10 @@ class SimulatedBroker(Component):
         # Get portfolio from context if available (for convenience)
         self.portfolio = context.get('portfolio')
         
+        # Draw slippage from the run's seeded generator if there is one
+        if context.get('random') is not None:
+            self.slippage_model.rng = context['random']
+        
         if not self.event_bus:
             raise ValueError("SimulatedBroker requires event_bus in context")
             
@@ -99,7 +107,7 @@ class SimulatedBroker(Component):
         """Reset the broker state."""
         super().reset()
         self.latest_prices = {}
-        self.pending_orders = []
+        self.pending_orders = OrderBook()
         self.filled_orders = {}
         self.rejected_orders = {}
         
@@ -137,24 +145,29 @@ class SimulatedBroker(Component):
             return
             
         try:
-            # Convert any numeric strings to floats, handling errors
-            open_price = float(bar_data.get('open', 0.0)) if bar_data.get('open') is not None else None
-            high_price = float(bar_data.get('high', 0.0)) if bar_data.get('high') is not None else None
-            low_price = float(bar_data.get('low', 0.0)) if bar_data.get('low') is not None else None
-            close_price = float(bar_data.get('close', 0.0)) if bar_data.get('close') is not None else None
-            
-            # Update latest price
-            self.latest_prices[symbol] = {
-                'open': open_price,
-                'high': high_price,
-                'low': low_price,
-                'close': close_price,
-                'timestamp': bar_data.get('timestamp')
-            }
+            if isinstance(bar_data, Bar):
+                # Bars hold floats and cannot change, so the bar is the latest price
+                self.latest_prices[symbol] = bar_data
+                close_price = bar_data.close
+            else:
+                # Convert any numeric strings to floats, handling errors
+                open_price = float(bar_data.get('open', 0.0)) if bar_data.get('open') is not None else None
+                high_price = float(bar_data.get('high', 0.0)) if bar_data.get('high') is not None else None
+                low_price = float(bar_data.get('low', 0.0)) if bar_data.get('low') is not None else None
+                close_price = float(bar_data.get('close', 0.0)) if bar_data.get('close') is not None else None
+                
+                # Update latest price
+                self.latest_prices[symbol] = {
+                    'open': open_price,
+                    'high': high_price,
+                    'low': low_price,
+                    'close': close_price,
+                    'timestamp': bar_data.get('timestamp')
+                }
             
             # Log the price update
             if close_price is not None:
-                logger.info(f"Updated price for {symbol}: close={close_price:.4f}")
+                hot_log.hot("Updated price for %s: close=%.4f", symbol, close_price)
             else:
                 logger.warning(f"Updated price for {symbol} with missing close price")
                 
@@ -162,7 +175,7 @@ class SimulatedBroker(Component):
             if self.market_simulator and hasattr(self.market_simulator, 'update_price_data'):
                 # Ensure data is passed to market simulator for consistent price state
                 self.market_simulator.update_price_data(symbol, bar_data)
-                logger.debug(f"Forwarded price update to market simulator for {symbol}")
+                hot_log.debug("Forwarded price update to market simulator for %s", symbol)
                 
         except (ValueError, TypeError) as e:
             logger.warning(f"Error converting price data for {symbol}: {e}")
@@ -216,11 +229,15 @@ class SimulatedBroker(Component):
         # Get latest price data
         price_data = self.latest_prices[symbol]
         
-        # Find orders for this symbol
-        orders_to_process = [o for o in self.pending_orders if o.get('symbol') == symbol]
+        # Find orders for this symbol that the bar's range could fill
+        orders_to_process = self._candidate_orders(symbol, price_data)
         
         # Process each order
         for order in orders_to_process:
+            # Skip orders filled while publishing an earlier fill
+            if order not in self.pending_orders:
+                continue
+            
             # Check if order can be filled
             if self.market_simulator and hasattr(self.market_simulator, 'check_fill_conditions'):
                 # Use market simulator for more sophisticated fill logic
@@ -251,6 +268,31 @@ class SimulatedBroker(Component):
                 # Publish fill event
                 self.event_bus.publish(Event(EventType.FILL, fill_data))
                 
+    def _candidate_orders(self, symbol, price_data):
+        """
+        Get the pending orders of a symbol that could fill on the current bar.
+        
+        The range is taken from the price data the fill check uses. Orders
+        outside it cannot fill, so they are not checked; if fills of LIMIT
+        or STOP orders are customized, every order is checked.
+        
+        Args:
+            symbol: Symbol to get orders for
+            price_data: Latest price data held by the broker
+            
+        Returns:
+            list: Orders in arrival order
+        """
+        if self.market_simulator and hasattr(self.market_simulator, 'check_fill_conditions'):
+            fill_handlers = getattr(self.market_simulator, 'fill_handlers', None) or {}
+            current_prices = getattr(self.market_simulator, 'current_prices', None)
+            if (not isinstance(current_prices, dict) or symbol not in current_prices
+                    or any(order_type in fill_handlers for order_type in INDEXED_ORDER_TYPES)):
+                return self.pending_orders.for_symbol(symbol)
+            price_data = current_prices[symbol]
+            
+        return self.pending_orders.candidates(symbol, price_data.get('low'), price_data.get('high'))
+        
     def _check_fill_conditions(self, order, price_data):
         """
         Check if an order can be filled with the current price data.
@@ -395,22 +437,19 @@ class SimulatedBroker(Component):
         Returns:
             bool: True if canceled, False otherwise
         """
-        # Find the order in pending orders
-        for i, order in enumerate(self.pending_orders):
-            if order.get('id') == order_id:
-                # Remove from pending orders
-                removed_order = self.pending_orders.pop(i)
-                
-                # Create canceled order event
-                canceled_data = removed_order.copy()
-                canceled_data['status'] = 'CANCELED'
-                canceled_data['cancel_time'] = datetime.datetime.now()
-                
-                # Publish order update event
-                self.event_bus.publish(Event(EventType.ORDER_UPDATE, canceled_data))
-                
-                logger.info(f"Canceled order {order_id}")
-                return True
+        # Remove the order from pending orders
+        removed_order = self.pending_orders.pop_id(order_id)
+        if removed_order is not None:
+            # Create canceled order event
+            canceled_data = removed_order.copy()
+            canceled_data['status'] = 'CANCELED'
+            canceled_data['cancel_time'] = datetime.datetime.now()
+            
+            # Publish order update event
+            self.event_bus.publish(Event(EventType.ORDER_UPDATE, canceled_data))
+            
+            logger.info(f"Canceled order {order_id}")
+            return True
         
         logger.warning(f"Could not cancel order {order_id} - not found in pending orders")
         return False
@@ -426,33 +465,30 @@ class SimulatedBroker(Component):
         Returns:
             bool: True if rejected, False otherwise
         """
-        # Find the order in pending orders
-        for i, order in enumerate(self.pending_orders):
-            if order.get('id') == order_id:
-                # Remove from pending orders
-                removed_order = self.pending_orders.pop(i)
-                
-                # Store rejection
-                self.rejected_orders[order_id] = {
-                    'order': removed_order,
-                    'reason': reason,
-                    'timestamp': datetime.datetime.now()
-                }
-                
-                # Create rejected order event
-                rejected_data = removed_order.copy()
-                rejected_data['status'] = 'REJECTED'
-                rejected_data['reject_reason'] = reason
-                rejected_data['reject_time'] = datetime.datetime.now()
-                
-                # Publish order update event
-                self.event_bus.publish(Event(EventType.ORDER_UPDATE, rejected_data))
-                
-                # Update stats
-                self.stats['orders_rejected'] += 1
-                
-                logger.info(f"Rejected order {order_id}: {reason}")
-                return True
+        # Remove the order from pending orders
+        removed_order = self.pending_orders.pop_id(order_id)
+        if removed_order is not None:
+            # Store rejection
+            self.rejected_orders[order_id] = {
+                'order': removed_order,
+                'reason': reason,
+                'timestamp': datetime.datetime.now()
+            }
+            
+            # Create rejected order event
+            rejected_data = removed_order.copy()
+            rejected_data['status'] = 'REJECTED'
+            rejected_data['reject_reason'] = reason
+            rejected_data['reject_time'] = datetime.datetime.now()
+            
+            # Publish order update event
+            self.event_bus.publish(Event(EventType.ORDER_UPDATE, rejected_data))
+            
+            # Update stats
+            self.stats['orders_rejected'] += 1
+            
+            logger.info(f"Rejected order {order_id}: {reason}")
+            return True
         
         logger.warning(f"Could not reject order {order_id} - not found in pending orders")
         return False
@@ -16,7 +16,8 @@ class SlippageModel(ABC):
     
     def __init__(self):
         """Initialize the slippage model."""
-        pass
+        # Source of random draws; a seeded random.Random makes runs reproducible
+        self.rng = random
     
     @abstractmethod
     def apply_slippage(self, price: float, quantity: float, direction: str, 
@@ -146,7 +147,7 @@ class VariableSlippageModel(SlippageModel):
         volatility_factor = 1.0 + (volatility * self.volatility_impact)
         
         # Random factor to simulate market unpredictability
-        random_component = 1.0 + random.uniform(-self.random_factor, self.random_factor)
+        random_component = 1.0 + self.rng.uniform(-self.random_factor, self.random_factor)
         
         # Combined slippage factor
         slippage_percent = self.base_slippage * size_factor * volatility_factor * random_component
@@ -7,8 +7,10 @@ rather than across multiple components.
 
 import logging
 from src.core.component import Component
+from src.core.logging.hot_path import get_hot_path_logger
 from src.core.events.event_bus import Event, EventType
 from src.core.data_model import Trade, Direction
+from src.analytics.metrics.online import MetricsAccumulator
 
 class Portfolio(Component):
     """
@@ -43,8 +45,12 @@ class Portfolio(Component):
         self.equity_history = []  # History of equity values
         self.timestamp_history = []  # Corresponding timestamps
         
+        # Running metrics over the published equity points and closed trades
+        self.metrics = MetricsAccumulator()
+        
         # Initialize logger
         self.logger = logging.getLogger(__name__)
+        self.hot_log = get_hot_path_logger(__name__)
         
     def initialize(self, context):
         """
@@ -81,6 +87,7 @@ class Portfolio(Component):
         self.cash_history = []
         self.equity_history = []
         self.timestamp_history = []
+        self.metrics.reset()
         # No need to reset trade_repository here - that's managed centrally
         
     def _get_last_price(self, symbol):
@@ -241,6 +248,7 @@ class Portfolio(Component):
                     # Update realized PnL tracking with the same value that's in the trade
                     trade_pnl = updated_trade.get('pnl', 0.0)
                     self.realized_pnl += trade_pnl
+                    self.metrics.add_trade(trade_pnl)
                     
                     # Log the trade close with PnL for debugging
                     self.logger.info(f"Trade closed: {updated_trade.get('id')}, PnL: {trade_pnl:.2f}")
@@ -266,12 +274,13 @@ class Portfolio(Component):
                 if last_fill_price is not None:
                     position_value = quantity * last_fill_price
                     market_value += position_value
-                    self.logger.debug(f"Position value for {symbol}: {quantity} x {last_fill_price:.2f} = {position_value:.2f}")
+                    self.hot_log.debug("Position value for %s: %s x %.2f = %.2f",
+                                       symbol, quantity, last_fill_price, position_value)
                 else:
                     self.logger.warning(f"No price data available for {symbol} - position value not included in equity")
 
         # Log market value for debugging
-        self.logger.debug(f"Total market value: {market_value:.2f}, Cash: {self.current_capital:.2f}")
+        self.hot_log.debug("Total market value: %.2f, Cash: %.2f", market_value, self.current_capital)
 
         # Full equity includes both cash and market value
         full_equity = self.current_capital + market_value
@@ -281,6 +290,7 @@ class Portfolio(Component):
             self.cash_history.append(self.current_capital)
             self.equity_history.append(full_equity)
             self.timestamp_history.append(timestamp)
+        self.metrics.add_equity(full_equity, timestamp)
 
         update_data = {
             'timestamp': timestamp,
@@ -293,9 +303,8 @@ class Portfolio(Component):
             'full_equity': full_equity  # Cash + market value
         }
 
-        self.logger.debug(f"Portfolio update: Capital={self.current_capital:.2f}, "
-                          f"Closed PnL={closed_pnl:.2f}, Market Value={market_value:.2f}, "
-                          f"Full Equity={full_equity:.2f}")
+        self.hot_log.debug("Portfolio update: Capital=%.2f, Closed PnL=%.2f, Market Value=%.2f, Full Equity=%.2f",
+                           self.current_capital, closed_pnl, market_value, full_equity)
 
         self.event_bus.publish(Event(
             EventType.PORTFOLIO,
@@ -410,6 +419,7 @@ class Portfolio(Component):
                         closed_trades.append(closed_trade)
                         # Update realized PnL tracking
                         self.realized_pnl += closed_trade.get('pnl', 0.0)
+                        self.metrics.add_trade(closed_trade.get('pnl'))
 
                         # Log the trade close
                         self.logger.info(f"Closed trade {trade_id} at {last_price:.2f} with PnL {closed_trade.get('pnl', 0.0):.2f}")
@@ -9,9 +9,15 @@ from typing import Dict, Any, List, Optional, Union
 
 from src.core.events.event_types import EventType, Event
 from src.core.events.event_utils import create_signal_event, EventTracker, create_trade_close_event
+from src.core.equity_recorder import EquityRecorder, worker_spill_path
+from src.core.logging.hot_path import get_hot_path_logger
 from .position import Position
 
 logger = logging.getLogger(__name__)
+hot_log = get_hot_path_logger(__name__)
+
+# Equity warnings repeated on consecutive bars are logged every N occurrences
+EQUITY_WARNING_INTERVAL = 100
 
 class PortfolioManager:
     """Portfolio for tracking positions and equity."""
@@ -32,7 +38,7 @@ class PortfolioManager:
         self.cash = initial_cash
         self.positions = {}  # symbol -> Position
         self.equity = initial_cash
-        self.equity_curve = []  # List of equity points
+        self.equity_curve = EquityRecorder()  # Array-backed equity points
         self.configured = False
         
         # Use external trade registry if provided or create an internal trades list
@@ -439,7 +445,7 @@ class PortfolioManager:
             self.trades = []
             logger.info(f"Trade list reset - new empty list with ID: {id(self.trades)}")
         
-        self.equity_curve = []
+        self.equity_curve.reset()
         self.processed_fill_ids.clear()  # Clear processed fill IDs
         
         # CRITICAL: Re-initialize deduplication caches (don't just clear them)
@@ -469,12 +475,8 @@ class PortfolioManager:
         self.event_tracker.reset()
         
         # Add point to equity curve
-        self.equity_curve.append({
-            'timestamp': datetime.datetime.now(),
-            'equity': self.equity,
-            'cash': self.cash,
-            'positions_value': 0.0
-        })
+        self.equity_curve.record(datetime.datetime.now(), self.equity, self.cash, 0.0)
+        hot_log.reset_counters()
 
         logger.info(f"Reset portfolio {self._name} to initial state with cash: ${self.initial_cash:.2f}")
         
@@ -499,6 +501,18 @@ class PortfolioManager:
         self.equity = self.initial_cash
         self._name = config_dict.get('name', self._name)
         
+        # Optional downsampling of the in-memory equity curve, e.g.
+        # {'every': 60, 'path': 'equity.bin'} keeps every 60th point in memory
+        # and all points on disk, in a file of this process and thread
+        # (equity.<pid>-<thread>.bin) so concurrent runs do not share it
+        recording = config_dict.get('equity_curve')
+        if recording:
+            self.equity_curve = EquityRecorder(
+                every=recording.get('every', 1),
+                on_change=recording.get('on_change', False),
+                path=worker_spill_path(recording.get('path'))
+            )
+        
         self.configured = True
         logger.info(f"Configured portfolio {self._name} with initial cash: ${self.initial_cash:.2f}")
     
@@ -589,7 +603,9 @@ class PortfolioManager:
                     value = raw_value
                     
                     if abs(raw_value) > max_position_value:
-                        logger.warning(f"Capping excessive position value for {symbol}: {raw_value} -> {max_position_value if raw_value > 0 else -max_position_value}")
+                        hot_log.every(('capping', symbol), EQUITY_WARNING_INTERVAL, logging.WARNING,
+                                      "Capping excessive position value for %s: %s -> %s", symbol, raw_value,
+                                      max_position_value if raw_value > 0 else -max_position_value)
                         value = max_position_value if raw_value > 0 else -max_position_value
                     
                     position_value += value
@@ -611,19 +627,26 @@ class PortfolioManager:
             max_allowed_change = max(0.50 * abs(previous_equity), 10000)  # Allow 50% change or 10000, whichever is greater
             
             if abs(equity_change) > max_allowed_change and abs(previous_equity) > 1000:
-                logger.warning(f"Suspicious equity change: {previous_equity:.2f} -> {new_equity:.2f} (change: {equity_change:.2f})")
+                logged = hot_log.every('suspicious_change', EQUITY_WARNING_INTERVAL, logging.WARNING,
+                                       "Suspicious equity change: %.2f -> %.2f (change: %.2f)",
+                                       previous_equity, new_equity, equity_change)
                 
-                # Log position values for debugging
-                for pos_value in position_values_log:
-                    logger.warning(f"Position: {pos_value['symbol']} x {pos_value['quantity']} @ {pos_value['price']:.2f} = {pos_value['raw_value']:.2f} (capped: {pos_value['capped_value']:.2f})")
+                # Log position values for debugging, along with the warning they explain
+                if logged:
+                    for pos_value in position_values_log:
+                        logger.warning("Position: %s x %s @ %.2f = %.2f (capped: %.2f)", pos_value['symbol'],
+                                       pos_value['quantity'], pos_value['price'], pos_value['raw_value'],
+                                       pos_value['capped_value'])
                 
                 # Apply change limiting for stability - only allow max_allowed_change in either direction
                 if equity_change > 0:
                     new_equity = previous_equity + max_allowed_change
-                    logger.warning(f"Limiting positive equity change to {max_allowed_change:.2f}")
+                    hot_log.every('limit_positive', EQUITY_WARNING_INTERVAL, logging.WARNING,
+                                  "Limiting positive equity change to %.2f", max_allowed_change)
                 else:
                     new_equity = previous_equity - max_allowed_change
-                    logger.warning(f"Limiting negative equity change to {max_allowed_change:.2f}")
+                    hot_log.every('limit_negative', EQUITY_WARNING_INTERVAL, logging.WARNING,
+                                  "Limiting negative equity change to %.2f", max_allowed_change)
             
             # CRITICAL FIX: Ensure equity doesn't go excessively negative
             if new_equity < -0.5 * self.initial_cash:
@@ -633,7 +656,8 @@ class PortfolioManager:
             # CRITICAL FIX: Apply sensible absolute limits
             max_equity = 10 * self.initial_cash  # 10x initial capital
             if abs(new_equity) > max_equity:
-                logger.warning(f"Extreme equity value calculated: {new_equity:.2f}, capping to {max_equity:.2f}")
+                hot_log.every('extreme_equity', EQUITY_WARNING_INTERVAL, logging.WARNING,
+                              "Extreme equity value calculated: %.2f, capping to %.2f", new_equity, max_equity)
                 if new_equity > 0:
                     new_equity = max_equity
                 else:
@@ -644,7 +668,8 @@ class PortfolioManager:
             
             # Log substantial drops for debugging
             if new_equity < 0.5 * previous_equity and previous_equity > 1000:
-                logger.warning(f"Significant equity drop: {previous_equity:.2f} -> {new_equity:.2f}")
+                hot_log.every('equity_drop', EQUITY_WARNING_INTERVAL, logging.WARNING,
+                              "Significant equity drop: %.2f -> %.2f", previous_equity, new_equity)
 
             return self.equity
             
@@ -676,13 +701,7 @@ class PortfolioManager:
         self.update_equity()
         
         # Record equity point
-        equity_point = {
-            'timestamp': timestamp,
-            'equity': self.equity,
-            'cash': self.cash,
-            'positions_value': self.equity - self.cash
-        }
-        self.equity_curve.append(equity_point)
+        self.equity_curve.record(timestamp, self.equity, self.cash, self.equity - self.cash)
     
     def get_position(self, symbol):
         """
@@ -749,19 +768,15 @@ class PortfolioManager:
         if not self.equity_curve:
             return pd.DataFrame(columns=['timestamp', 'equity', 'cash', 'positions_value'])
             
-        df = pd.DataFrame(self.equity_curve)
-        
-        if not df.empty:
-            df.set_index('timestamp', inplace=True)
-            
-        return df
+        # A view of the recorded arrays, indexed by timestamp
+        return self.equity_curve.to_dataframe()
     
     def get_equity_curve(self):
         """
         Get the equity curve data.
         
         Returns:
-            Equity curve data
+            EquityRecorder: Equity points; indexing and iteration give dicts
         """
         return self.equity_curve
         
@@ -122,8 +122,7 @@ class PortfolioAnalytics:
         sortino_ratio = excess_returns.mean() / downside_deviation * math.sqrt(trading_days_per_year) if downside_deviation > 0 else 0.0
         
         # Calculate max drawdown
-        equity_series = pd.Series([point['equity'] for point in self.portfolio_manager.equity_curve],
-                                index=[point['timestamp'] for point in self.portfolio_manager.equity_curve])
+        equity_series = self.portfolio_manager.get_equity_curve_df()['equity']
         running_max = equity_series.cummax()
         drawdown = (equity_series / running_max) - 1.0
         max_drawdown = abs(drawdown.min())
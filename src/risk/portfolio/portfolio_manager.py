@@ -13,9 +13,12 @@ from collections import defaultdict
 
 from src.core.event_system.event import Event
 from src.core.event_system.event_types import EventType
+from src.core.equity_recorder import EquityRecorder, worker_spill_path
+from src.core.logging.hot_path import get_hot_path_logger
 from src.risk.position import Position, PositionTracker
 
 logger = logging.getLogger(__name__)
+hot_log = get_hot_path_logger(__name__)
 
 class PortfolioManager:
     """
@@ -56,7 +59,7 @@ class PortfolioManager:
         
         # Initialize equity tracking
         self.equity = initial_cash
-        self.equity_curve = []
+        self.equity_curve = EquityRecorder()  # Array-backed equity points
         self.equity_history = []
         
         # Statistics tracking
@@ -189,7 +192,7 @@ class PortfolioManager:
         self.cash = self.initial_cash
         self.position_tracker.reset()
         self.equity = self.initial_cash
-        self.equity_curve = []
+        self.equity_curve.reset()
         self.equity_history = []
         
         # Reset trade tracking
@@ -444,16 +447,21 @@ class PortfolioManager:
             equity_change = new_equity - previous_equity
             max_allowed_change = max(0.25 * abs(previous_equity), 10000)  # Allow 25% change or 10000, whichever is greater
             
+            # These checks can fire on every bar, so each warning is logged once per simulated day
             if abs(equity_change) > max_allowed_change and abs(previous_equity) > 1000:
-                logger.warning(f"Suspicious equity change: {previous_equity:.2f} -> {new_equity:.2f} (change: {equity_change:.2f})")
+                hot_log.once_per_day('suspicious_change', timestamp, logging.WARNING,
+                                     "Suspicious equity change: %.2f -> %.2f (change: %.2f)",
+                                     previous_equity, new_equity, equity_change)
                 
                 # Apply change limiting for stability
                 if equity_change > 0:
                     new_equity = previous_equity + max_allowed_change
-                    logger.warning(f"Limiting positive equity change to {max_allowed_change:.2f}")
+                    hot_log.once_per_day('limit_positive', timestamp, logging.WARNING,
+                                         "Limiting positive equity change to %.2f", max_allowed_change)
                 else:
                     new_equity = previous_equity - max_allowed_change
-                    logger.warning(f"Limiting negative equity change to {max_allowed_change:.2f}")
+                    hot_log.once_per_day('limit_negative', timestamp, logging.WARNING,
+                                         "Limiting negative equity change to %.2f", max_allowed_change)
             
             # Ensure equity doesn't go excessively negative
             if new_equity < -0.5 * self.initial_cash:
@@ -463,7 +471,8 @@ class PortfolioManager:
             # Apply sensible absolute limits
             max_equity = 10 * self.initial_cash  # 10x initial capital
             if abs(new_equity) > max_equity:
-                logger.warning(f"Extreme equity value calculated: {new_equity:.2f}, capping to {max_equity:.2f}")
+                hot_log.once_per_day('extreme_equity', timestamp, logging.WARNING,
+                                     "Extreme equity value calculated: %.2f, capping to %.2f", new_equity, max_equity)
                 if new_equity > 0:
                     new_equity = max_equity
                 else:
@@ -473,13 +482,7 @@ class PortfolioManager:
             self.equity = new_equity
             
             # Record equity point
-            equity_point = {
-                'timestamp': timestamp,
-                'equity': self.equity,
-                'cash': self.cash,
-                'positions_value': positions_value
-            }
-            self.equity_curve.append(equity_point)
+            self.equity_curve.record(timestamp, self.equity, self.cash, positions_value)
             self.equity_history.append((timestamp, self.equity))
             
             # Update peak equity and drawdown
@@ -600,12 +603,8 @@ class PortfolioManager:
         if not self.equity_curve:
             return pd.DataFrame(columns=['timestamp', 'equity', 'cash', 'positions_value'])
             
-        df = pd.DataFrame(self.equity_curve)
-        
-        if not df.empty:
-            df.set_index('timestamp', inplace=True)
-            
-        return df
+        # A view of the recorded arrays, indexed by timestamp
+        return self.equity_curve.to_dataframe()
     
     def get_returns(self) -> pd.Series:
         """
@@ -638,7 +637,7 @@ class PortfolioManager:
         self.cash = self.initial_cash
         self.position_tracker.reset()
         self.equity = self.initial_cash
-        self.equity_curve = []
+        self.equity_curve.reset()
         self.equity_history = []
         self.processed_fill_ids.clear()
         
@@ -660,12 +659,10 @@ class PortfolioManager:
         }
         
         # Record initial equity point
-        self.equity_curve.append({
-            'timestamp': datetime.datetime.now(),
-            'equity': self.equity,
-            'cash': self.cash,
-            'positions_value': 0.0
-        })
+        self.equity_curve.record(datetime.datetime.now(), self.equity, self.cash, 0.0)
+        
+        # Start rate-limited equity warnings afresh for the next run
+        hot_log.reset_counters()
         
         logger.info(f"Reset portfolio {self._name} to initial state with cash: ${self.initial_cash:.2f}")
         
@@ -687,6 +684,18 @@ class PortfolioManager:
         self.initial_cash = config_dict.get('initial_cash', 10000.0)
         self._name = config_dict.get('name', self._name)
         
+        # Optional downsampling of the in-memory equity curve, e.g.
+        # {'every': 60, 'path': 'equity.bin'} keeps every 60th point in memory
+        # and all points on disk, in a file of this process and thread
+        # (equity.<pid>-<thread>.bin) so concurrent runs do not share it
+        recording = config_dict.get('equity_curve')
+        if recording:
+            self.equity_curve = EquityRecorder(
+                every=recording.get('every', 1),
+                on_change=recording.get('on_change', False),
+                path=worker_spill_path(recording.get('path'))
+            )
+        
         # Reset with new initial cash
         self.reset()
         
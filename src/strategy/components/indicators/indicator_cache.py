@@ -0,0 +1,387 @@
+"""
+Indicator series shared by the backtests of an optimization session.
+
+A grid search over moving-average windows recomputes the same averages for
+every point that uses them: the 20-bar SMA is identical whether the other
+window is 5 or 50. While an optimization session is open, strategies that
+support it receive an IndicatorSource for their run, and the streaming
+indicators they would create are replaced by CachedIndicator objects reading
+series computed once per (symbol, split, indicator, window) with the array
+functions in ``vectorized``. Those accumulate in the same order as the
+streaming indicators, so strategies see exactly the same values.
+
+A CachedIndicator checks every input it is given against the input its
+series was computed from. If a run does not replay its split from the first
+bar, the indicator switches to the streaming indicator, replayed over the
+inputs seen so far, so results never depend on whether the cache was used.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+from src.strategy.components.indicators.streaming import RSI, SMA, RollingStd
+from src.strategy.components.indicators.vectorized import rolling_mean, rolling_std, rsi
+
+logger = logging.getLogger(__name__)
+
+# Default memory cap for cached series (256 MiB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _closes(store):
+    """Close prices, one per bar (a copy, the cache owns its arrays)."""
+    return np.array(store.get('close'), dtype=np.float64)
+
+
+def _returns(store):
+    """Simple returns, one per bar after the first."""
+    close = _closes(store)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return close[1:] / close[:-1] - 1
+
+
+# Inputs fed to the indicators, computed from a symbol's BarStore
+INPUTS = {
+    'close': _closes,
+    'returns': _returns
+}
+
+# Indicator name to (input, series function, streaming indicator factory)
+INDICATORS = {
+    'sma': ('close', rolling_mean, SMA),
+    'return_std': ('returns', rolling_std, RollingStd),
+    'simple_rsi': ('close', rsi, lambda window: RSI(window, wilder=False))
+}
+
+
+def create_indicator(source, symbol, indicator, window):
+    """
+    Create an indicator, reading a cached series when a source provides one.
+
+    Args:
+        source (IndicatorSource): Source of the run, or None
+        symbol (str): Symbol the indicator is fed with
+        indicator (str): Name from INDICATORS ('sma' takes closes, 'return_std'
+            simple returns, 'simple_rsi' closes)
+        window (int): Window length
+
+    Returns:
+        CachedIndicator or StreamingIndicator: Indicator with the streaming
+            indicator's update/value/previous interface
+    """
+    if source is not None:
+        cached = source.get_indicator(symbol, indicator, window)
+        if cached is not None:
+            return cached
+    return INDICATORS[indicator][2](window)
+
+
+class CachedIndicator:
+    """
+    Stand-in for a streaming indicator that reads a precomputed series.
+    """
+
+    def __init__(self, series, inputs, streaming):
+        """
+        Initialize the indicator.
+
+        Args:
+            series (list): Indicator value after each input, NaN during warm-up
+            inputs (list): Inputs the series was computed from
+            streaming (StreamingIndicator): Fresh streaming indicator to
+                continue with if an input differs
+        """
+        self.window = streaming.window
+        self.value = None
+        self.previous = None
+        self.count = 0
+        self._series = series
+        self._inputs = inputs
+        self._streaming = streaming
+        self._cached = True
+
+    @property
+    def ready(self):
+        """bool: True once the indicator has a value."""
+        return self.value is not None
+
+    @property
+    def cached(self):
+        """bool: True while values come from the precomputed series."""
+        return self._cached
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Indicator value, None during warm-up
+        """
+        if self._cached:
+            index = self.count
+            if index < len(self._inputs) and self._inputs[index] == value:
+                result = self._series[index]
+                self.count = index + 1
+                self.previous = self.value
+                self.value = None if result != result else result
+                return self.value
+            self._switch_to_streaming()
+
+        result = self._streaming.update(value)
+        self.count = self._streaming.count
+        self.previous = self._streaming.previous
+        self.value = self._streaming.value
+        return result
+
+    def reset(self):
+        """Clear all state."""
+        self.value = None
+        self.previous = None
+        self.count = 0
+        self._streaming.reset()
+        self._cached = True
+
+    def _switch_to_streaming(self):
+        """Continue with the streaming indicator fed the inputs seen so far."""
+        logger.debug(f"Input {self.count} differs from the cached series, switching to a streaming indicator")
+        self._cached = False
+        for value in self._inputs[:self.count]:
+            self._streaming.update(value)
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator series with a memory cap.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Memory cap; least recently used series are evicted beyond it
+        """
+        self.max_bytes = max_bytes
+        self._series = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(symbol, split, store, name, window=None):
+        """
+        Build the key of a series.
+
+        The split name alone does not identify the data (walk-forward windows
+        reuse 'train' and 'test'), so the key includes the length and end
+        points of the split's bars.
+
+        Args:
+            symbol (str): Symbol
+            split (str): Split name, or None for the full data
+            store (BarStore): Bars of the split
+            name (str): Indicator or input name
+            window (int, optional): Window length
+
+        Returns:
+            tuple: Cache key
+        """
+        close = store.get('close')
+        data = (len(store), int(store.timestamps[0]), int(store.timestamps[-1]),
+                float(close[0]), float(close[-1]))
+        return (symbol, split, data, name, window)
+
+    def get(self, key, compute):
+        """
+        Get a series, computing and storing it on a miss.
+
+        Args:
+            key (tuple): Key from make_key
+            compute (callable): Returns the series as a NumPy array
+
+        Returns:
+            np.ndarray: Read-only series
+        """
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+                self.hits += 1
+                return series
+            self.misses += 1
+
+        series = np.asarray(compute())
+        series.flags.writeable = False
+        if series.nbytes > self.max_bytes:
+            return series
+
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = series
+                self._bytes += series.nbytes
+                while self._bytes > self.max_bytes and len(self._series) > 1:
+                    _, old = self._series.popitem(last=False)
+                    self._bytes -= old.nbytes
+                    self.evictions += 1
+            return self._series[key]
+
+    def clear(self):
+        """Drop all series and reset the counters."""
+        with self._lock:
+            self._series.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self):
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Series count, memory use, hits, misses, hit rate and evictions
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'series': len(self._series),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+class IndicatorSource:
+    """
+    Cached indicators for the bars of one backtest's data split.
+    """
+
+    def __init__(self, cache, data_handler, split):
+        """
+        Initialize the source.
+
+        Args:
+            cache (IndicatorCache): Cache of the optimization session
+            data_handler: Data handler with the split set up
+            split (str): Split the backtest replays ('train' or 'test')
+        """
+        self.cache = cache
+        self.data_handler = data_handler
+        self.split = split
+        self._inputs = {}
+
+    def get_indicator(self, symbol, indicator, window):
+        """
+        Get a cached indicator.
+
+        Args:
+            symbol (str): Symbol the indicator is fed with
+            indicator (str): Name from INDICATORS
+            window (int): Window length
+
+        Returns:
+            CachedIndicator: Indicator, or None if the split has no bars for the symbol
+        """
+        input_name, function, factory = INDICATORS[indicator]
+        inputs = self._get_inputs(symbol, input_name)
+        if inputs is None:
+            return None
+        store, values, input_list = inputs
+
+        key = self.cache.make_key(symbol, self.split, store, indicator, window)
+        series = self.cache.get(key, lambda: function(values, window))
+        # The streaming indicator validates the window and takes over on a mismatch
+        return CachedIndicator(series.tolist(), input_list, factory(window))
+
+    def _get_inputs(self, symbol, input_name):
+        """Inputs of a symbol as (store, array, list), shared by the run's indicators."""
+        if (symbol, input_name) not in self._inputs:
+            store = None
+            if hasattr(self.data_handler, 'get_bar_store'):
+                store = self.data_handler.get_bar_store(symbol, self.split)
+            if store is None or len(store) == 0 or store.get('close') is None:
+                self._inputs[(symbol, input_name)] = None
+            else:
+                key = self.cache.make_key(symbol, self.split, store, input_name)
+                values = self.cache.get(key, lambda: INPUTS[input_name](store))
+                self._inputs[(symbol, input_name)] = (store, values, values.tolist())
+        return self._inputs[(symbol, input_name)]
+
+
+# Cache of the optimization session in this process, if one is open
+_session_cache = None
+
+
+def get_indicator_cache():
+    """
+    Get the indicator cache of the open optimization session.
+
+    Returns:
+        IndicatorCache: Session cache, or None outside a session
+    """
+    return _session_cache
+
+
+def open_indicator_session(max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Open an optimization session in this process, or join the open one.
+
+    Worker processes call this once; their session lasts as long as they do.
+
+    Args:
+        max_bytes (int): Memory cap of a new session's cache
+
+    Returns:
+        IndicatorCache: Session cache
+    """
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = IndicatorCache(max_bytes)
+    return _session_cache
+
+
+def close_indicator_session():
+    """Close the optimization session in this process and free its series."""
+    global _session_cache
+    cache, _session_cache = _session_cache, None
+    if cache is not None:
+        stats = cache.get_stats()
+        if stats['hits'] + stats['misses']:
+            logger.info(f"Indicator cache: {stats['series']} series, {stats['hits']} hits, "
+                        f"{stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)")
+        cache.clear()
+
+
+@contextmanager
+def indicator_session(enabled=True):
+    """
+    Scope an optimization session; nested sessions share the outer one.
+
+    Args:
+        enabled (bool): Whether to cache indicators at all
+
+    Yields:
+        IndicatorCache: Session cache, or None if disabled
+    """
+    if not enabled:
+        yield None
+        return
+    if _session_cache is not None:
+        yield _session_cache
+        return
+    cache = open_indicator_session()
+    try:
+        yield cache
+    finally:
+        close_indicator_session()
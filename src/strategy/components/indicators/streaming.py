@@ -0,0 +1,591 @@
+"""
+Streaming indicators with O(1) updates for bar-by-bar strategies.
+
+Each indicator is fed one value (or one bar) at a time through ``update``
+and keeps only the fixed-size history its window needs, so a backtest does
+not rebuild lists from the whole bar history on every bar. ``value`` is
+None until the indicator has seen enough data, and ``previous`` holds the
+value before the latest update, which is what crossover checks need.
+
+Rolling sums are kept as running totals (``total += new - oldest``). The
+array functions in ``vectorized`` accumulate in the same order, so a
+strategy computed with these indicators and its vectorized_positions hook
+agree exactly.
+"""
+
+import math
+import numbers
+from collections import deque
+
+
+class StreamingIndicator:
+    """
+    Base class for streaming indicators.
+    """
+
+    def __init__(self):
+        self.value = None
+        self.previous = None
+        self.count = 0
+
+    @property
+    def ready(self):
+        """bool: True once the indicator has a value."""
+        return self.value is not None
+
+    def _set(self, value):
+        """Record a new value and keep the old one as ``previous``."""
+        self.previous = self.value
+        self.value = value
+        return value
+
+    def reset(self):
+        """Clear all state."""
+        self.value = None
+        self.previous = None
+        self.count = 0
+
+
+def _check_window(window):
+    """Validate a window length and return it as an int."""
+    if not isinstance(window, numbers.Integral) or isinstance(window, bool) or window < 1:
+        raise ValueError(f"Window must be a positive integer, got {window!r}")
+    return int(window)
+
+
+class RollingSum(StreamingIndicator):
+    """
+    Sum of the last ``window`` values, kept as a running total.
+    """
+
+    def __init__(self, window):
+        """
+        Initialize the rolling sum.
+
+        Args:
+            window (int): Window length
+
+        Raises:
+            ValueError: If window is not a positive integer
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self._values = deque(maxlen=self.window)
+        self._total = 0.0
+
+    def _push(self, value):
+        """Add a value to the window and return the running total once it is full."""
+        oldest = self._values[0] if len(self._values) == self.window else 0.0
+        self._values.append(value)
+        self._total += value - oldest
+        self.count += 1
+        return self._total if len(self._values) == self.window else None
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Sum of the last ``window`` values, None during warm-up
+        """
+        return self._set(self._push(value))
+
+    def reset(self):
+        super().reset()
+        self._values.clear()
+        self._total = 0.0
+
+
+class SMA(RollingSum):
+    """
+    Simple moving average of the last ``window`` values.
+    """
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Moving average, None during warm-up
+        """
+        total = self._push(value)
+        return self._set(None if total is None else total / self.window)
+
+
+class EMA(StreamingIndicator):
+    """
+    Exponential moving average seeded with the SMA of the first ``window`` values.
+    """
+
+    def __init__(self, window, alpha=None):
+        """
+        Initialize the EMA.
+
+        Args:
+            window (int): Window length
+            alpha (float, optional): Smoothing factor (default: 2 / (window + 1))
+
+        Raises:
+            ValueError: If window is not a positive integer or alpha is not in (0, 1]
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self.alpha = 2.0 / (window + 1) if alpha is None else alpha
+        if not 0 < self.alpha <= 1:
+            raise ValueError(f"Alpha must be in (0, 1], got {self.alpha}")
+        self._seed = 0.0
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: EMA, None during warm-up
+        """
+        self.count += 1
+        if self.value is None:
+            self._seed += value
+            if self.count < self.window:
+                return None
+            return self._set(self._seed / self.window)
+        return self._set(self.value + self.alpha * (value - self.value))
+
+    def reset(self):
+        super().reset()
+        self._seed = 0.0
+
+
+class RollingVariance(StreamingIndicator):
+    """
+    Variance of the last ``window`` values from running sums of values and squares.
+
+    Values are accumulated as offsets from the first value seen, which keeps
+    the sums small and avoids most of the cancellation that raw sums of
+    squares suffer from for prices far from zero.
+    """
+
+    def __init__(self, window, ddof=0):
+        """
+        Initialize the rolling variance.
+
+        Args:
+            window (int): Window length
+            ddof (int): Delta degrees of freedom (0 for population variance, like np.var)
+
+        Raises:
+            ValueError: If window is not larger than ddof
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        if window <= ddof:
+            raise ValueError(f"Window ({window}) must be larger than ddof ({ddof})")
+        self.ddof = ddof
+        self._values = deque(maxlen=self.window)
+        self._total = 0.0
+        self._total_sq = 0.0
+        self._offset = None
+        self.mean = None
+
+    def _push(self, value):
+        """Add a value to the window and return the variance once it is full."""
+        if self._offset is None:
+            self._offset = value
+        value = value - self._offset
+        oldest = self._values[0] if len(self._values) == self.window else 0.0
+        self._values.append(value)
+        self._total += value - oldest
+        self._total_sq += value * value - oldest * oldest
+        self.count += 1
+        if len(self._values) < self.window:
+            return None
+
+        shifted_mean = self._total / self.window
+        self.mean = self._offset + shifted_mean
+        variance = (self._total_sq - self._total * shifted_mean) / (self.window - self.ddof)
+        return variance if variance > 0 else 0.0
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Variance, None during warm-up
+        """
+        return self._set(self._push(value))
+
+    def reset(self):
+        super().reset()
+        self._values.clear()
+        self._total = 0.0
+        self._total_sq = 0.0
+        self._offset = None
+        self.mean = None
+
+
+class RollingStd(RollingVariance):
+    """
+    Standard deviation of the last ``window`` values.
+    """
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Standard deviation, None during warm-up
+        """
+        variance = self._push(value)
+        return self._set(None if variance is None else math.sqrt(variance))
+
+
+class RollingMax(StreamingIndicator):
+    """
+    Maximum of the last ``window`` values using a monotonic queue.
+    """
+
+    def __init__(self, window):
+        """
+        Initialize the rolling maximum.
+
+        Args:
+            window (int): Window length
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self._queue = deque()  # (index, value), values decreasing
+
+    def _keep(self, queued, value):
+        return queued > value
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Rolling extreme, None during warm-up
+        """
+        index = self.count
+        self.count += 1
+        while self._queue and not self._keep(self._queue[-1][1], value):
+            self._queue.pop()
+        self._queue.append((index, value))
+        if self._queue[0][0] <= index - self.window:
+            self._queue.popleft()
+        return self._set(self._queue[0][1] if self.count >= self.window else None)
+
+    def reset(self):
+        super().reset()
+        self._queue.clear()
+
+
+class RollingMin(RollingMax):
+    """
+    Minimum of the last ``window`` values using a monotonic queue.
+    """
+
+    def _keep(self, queued, value):
+        return queued < value
+
+
+class RSI(StreamingIndicator):
+    """
+    Relative Strength Index over ``window`` price changes.
+
+    Uses Wilder's smoothing by default. With ``wilder=False`` the average
+    gain and loss are simple moving averages of the last ``window`` changes.
+    """
+
+    def __init__(self, window=14, wilder=True):
+        """
+        Initialize the RSI.
+
+        Args:
+            window (int): Number of price changes to average
+            wilder (bool): Whether to use Wilder's smoothing
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self.wilder = wilder
+        self._last_price = None
+        self._gains = SMA(window)
+        self._losses = SMA(window)
+        self.avg_gain = None
+        self.avg_loss = None
+
+    def update(self, price):
+        """
+        Add a price.
+
+        Args:
+            price (float): New price
+
+        Returns:
+            Optional[float]: RSI between 0 and 100, None during warm-up
+        """
+        self.count += 1
+        last_price, self._last_price = self._last_price, price
+        if last_price is None:
+            return None
+
+        change = price - last_price
+        gain = max(0, change)
+        loss = max(0, -change)
+
+        if self.wilder and self.avg_gain is not None:
+            self.avg_gain = (self.avg_gain * (self.window - 1) + gain) / self.window
+            self.avg_loss = (self.avg_loss * (self.window - 1) + loss) / self.window
+        else:
+            self.avg_gain = self._gains.update(gain)
+            self.avg_loss = self._losses.update(loss)
+            if self.avg_gain is None:
+                return None
+
+        if self.avg_loss == 0:
+            return self._set(100)
+        return self._set(100 - (100 / (1 + self.avg_gain / self.avg_loss)))
+
+    def reset(self):
+        super().reset()
+        self._last_price = None
+        self._gains.reset()
+        self._losses.reset()
+        self.avg_gain = None
+        self.avg_loss = None
+
+
+class TrueRange(StreamingIndicator):
+    """
+    True range of each bar against the previous close.
+
+    The first bar has no previous close and produces no value.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = None
+
+    def update(self, high, low, close):
+        """
+        Add a bar.
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+
+        Returns:
+            Optional[float]: True range, None for the first bar
+        """
+        self.count += 1
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return None
+        return self._set(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+
+    def reset(self):
+        super().reset()
+        self._prev_close = None
+
+
+class ATR(StreamingIndicator):
+    """
+    Average True Range over ``window`` bars.
+
+    Uses Wilder's smoothing by default; with ``wilder=False`` it is the
+    simple average of the last ``window`` true ranges.
+    """
+
+    def __init__(self, window=14, wilder=True):
+        """
+        Initialize the ATR.
+
+        Args:
+            window (int): Number of true ranges to average
+            wilder (bool): Whether to use Wilder's smoothing
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self.wilder = wilder
+        self._true_range = TrueRange()
+        self._average = SMA(window)
+
+    def update(self, high, low, close):
+        """
+        Add a bar.
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+
+        Returns:
+            Optional[float]: ATR, None during warm-up
+        """
+        self.count += 1
+        true_range = self._true_range.update(high, low, close)
+        if true_range is None:
+            return None
+        if self.wilder and self.value is not None:
+            return self._set((self.value * (self.window - 1) + true_range) / self.window)
+        average = self._average.update(true_range)
+        return None if average is None else self._set(average)
+
+    def reset(self):
+        super().reset()
+        self._true_range.reset()
+        self._average.reset()
+
+
+class ADX(StreamingIndicator):
+    """
+    Average Directional Index with Wilder's smoothing.
+
+    ``plus_di`` and ``minus_di`` are available once ``window`` bars of
+    directional movement have been seen; the ADX itself needs another
+    ``window`` values of DX.
+    """
+
+    def __init__(self, window=14):
+        """
+        Initialize the ADX.
+
+        Args:
+            window (int): Smoothing window
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self._prev = None  # (high, low, close)
+        self._seed = [0.0, 0.0, 0.0]  # TR, +DM, -DM sums during warm-up
+        self._smoothed = None
+        self._dx_sum = 0.0
+        self._dx_count = 0
+        self.plus_di = None
+        self.minus_di = None
+
+    def update(self, high, low, close):
+        """
+        Add a bar.
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+
+        Returns:
+            Optional[float]: ADX between 0 and 100, None during warm-up
+        """
+        self.count += 1
+        prev, self._prev = self._prev, (high, low, close)
+        if prev is None:
+            return None
+
+        prev_high, prev_low, prev_close = prev
+        up_move = high - prev_high
+        down_move = prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+        window = self.window
+        if self._smoothed is None:
+            self._seed[0] += true_range
+            self._seed[1] += plus_dm
+            self._seed[2] += minus_dm
+            if self.count - 1 < window:
+                return None
+            self._smoothed = list(self._seed)
+        else:
+            smoothed = self._smoothed
+            smoothed[0] = smoothed[0] - smoothed[0] / window + true_range
+            smoothed[1] = smoothed[1] - smoothed[1] / window + plus_dm
+            smoothed[2] = smoothed[2] - smoothed[2] / window + minus_dm
+
+        tr_sum, plus_sum, minus_sum = self._smoothed
+        self.plus_di = 100 * plus_sum / tr_sum if tr_sum else 0.0
+        self.minus_di = 100 * minus_sum / tr_sum if tr_sum else 0.0
+        di_sum = self.plus_di + self.minus_di
+        dx = 100 * abs(self.plus_di - self.minus_di) / di_sum if di_sum else 0.0
+
+        if self.value is None:
+            self._dx_sum += dx
+            self._dx_count += 1
+            if self._dx_count < window:
+                return None
+            return self._set(self._dx_sum / window)
+        return self._set((self.value * (window - 1) + dx) / window)
+
+    def reset(self):
+        super().reset()
+        self._prev = None
+        self._seed = [0.0, 0.0, 0.0]
+        self._smoothed = None
+        self._dx_sum = 0.0
+        self._dx_count = 0
+        self.plus_di = None
+        self.minus_di = None
+
+
+class BollingerBands(StreamingIndicator):
+    """
+    Bollinger Bands: SMA middle band and bands ``num_std`` deviations away.
+
+    ``value`` is the middle band; ``upper`` and ``lower`` hold the bands.
+    """
+
+    def __init__(self, window=20, num_std=2.0):
+        """
+        Initialize the bands.
+
+        Args:
+            window (int): Window length
+            num_std (float): Band width in standard deviations
+        """
+        super().__init__()
+        self.window = _check_window(window)
+        self.num_std = num_std
+        self._std = RollingStd(window)
+        self.upper = None
+        self.lower = None
+
+    def update(self, value):
+        """
+        Add a value.
+
+        Args:
+            value (float): New value
+
+        Returns:
+            Optional[float]: Middle band, None during warm-up
+        """
+        self.count += 1
+        std = self._std.update(value)
+        if std is None:
+            return None
+        middle = self._std.mean
+        self.upper = middle + self.num_std * std
+        self.lower = middle - self.num_std * std
+        return self._set(middle)
+
+    def reset(self):
+        super().reset()
+        self._std.reset()
+        self.upper = None
+        self.lower = None
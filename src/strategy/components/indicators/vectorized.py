@@ -0,0 +1,238 @@
+"""
+Array versions of the indicators used by the bar-by-bar strategies.
+
+Each function computes an indicator for every bar at once and returns an
+array aligned with the input, with NaN for bars that do not have enough
+history yet. Rolling sums, means and standard deviations accumulate
+running totals in the same order as the streaming indicators in
+``streaming`` (``total += new - oldest``), so comparisons such as
+crossovers give the same answer in both modes. Leading NaN values are
+treated as bars the indicator has not seen yet, like a streaming indicator
+that only starts receiving values once they exist.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _aligned(values, window, n):
+    """Pad a per-window result with NaN so it lines up with the bars."""
+    out = np.full(n, np.nan)
+    if len(values):
+        out[window - 1:] = values
+    return out
+
+
+def _running_totals(values, window):
+    """
+    Running totals of the last ``window`` values, as RollingSum accumulates them.
+
+    Returns the start index of the data after any leading NaN values and
+    the totals from there on (the first ``window - 1`` entries are partial).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(values))
+    start = valid[0] if len(valid) else len(values)
+    data = values[start:]
+    increments = data.copy()
+    increments[window:] -= data[:-window] if window < len(data) else data[:0]
+    return start, data, np.cumsum(increments)
+
+
+def _place(totals, start, window, n):
+    """Put full-window totals at the bars they belong to."""
+    out = np.full(n, np.nan)
+    if len(totals) >= window:
+        out[start + window - 1:] = totals[window - 1:]
+    return out
+
+
+def rolling_sum(values, window):
+    """
+    Sum of the last ``window`` values, kept as a running total like RollingSum.
+
+    Args:
+        values (np.ndarray): Input values
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling sum, NaN during warm-up
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1:
+        return np.full(len(values), np.nan)
+    start, _, totals = _running_totals(values, window)
+    return _place(totals, start, window, len(values))
+
+
+def rolling_mean(values, window):
+    """
+    Mean of the last ``window`` values, computed like SMA (running total / window).
+
+    Args:
+        values (np.ndarray): Input values
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling mean, NaN for the first ``window - 1`` bars
+    """
+    if window < 1:
+        return np.full(len(np.asarray(values)), np.nan)
+    return rolling_sum(values, window) / window
+
+
+def rolling_std(values, window):
+    """
+    Population standard deviation of the last ``window`` values, like RollingStd.
+
+    Args:
+        values (np.ndarray): Input values
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling standard deviation, NaN during warm-up
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if window < 1:
+        return np.full(n, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0:
+        return np.full(n, np.nan)
+    # Offsets from the first value, as RollingVariance accumulates them
+    shifted = values - values[valid[0]]
+    start, data, totals = _running_totals(shifted, window)
+    _, _, totals_sq = _running_totals(data * data, window)
+    variance = (totals_sq - totals * (totals / window)) / window
+    std = np.sqrt(np.where(variance > 0, variance, 0.0))
+    return _place(std, start, window, n)
+
+
+def rsi(values, window):
+    """
+    Relative Strength Index with simple averages, like RSI(window, wilder=False).
+
+    Args:
+        values (np.ndarray): Prices
+        window (int): Number of price changes to average
+
+    Returns:
+        np.ndarray: RSI between 0 and 100, NaN until ``window`` changes are available
+    """
+    values = np.asarray(values, dtype=np.float64)
+    changes = values - shift(values)
+    avg_gain = rolling_mean(np.maximum(changes, 0), window)
+    avg_loss = rolling_mean(np.maximum(-changes, 0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+
+
+def rolling_max(values, window):
+    """
+    Maximum of the last ``window`` values.
+
+    Args:
+        values (np.ndarray): Input values
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling maximum, NaN during warm-up
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1 or len(values) < window:
+        return np.full(len(values), np.nan)
+    return _aligned(sliding_window_view(values, window).max(axis=-1), window, len(values))
+
+
+def rolling_min(values, window):
+    """
+    Minimum of the last ``window`` values.
+
+    Args:
+        values (np.ndarray): Input values
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Rolling minimum, NaN during warm-up
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window < 1 or len(values) < window:
+        return np.full(len(values), np.nan)
+    return _aligned(sliding_window_view(values, window).min(axis=-1), window, len(values))
+
+
+def shift(values, periods=1):
+    """
+    Shift values forward by ``periods`` bars, filling the start with NaN.
+
+    Args:
+        values (np.ndarray): Input values
+        periods (int): Number of bars to shift by
+
+    Returns:
+        np.ndarray: Shifted values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def crossovers(fast, slow):
+    """
+    Find the bars where a fast line crosses a slow line.
+
+    A bar crosses up when the fast line was at or below the slow line on the
+    previous bar and is above it now, and crosses down in the mirror case.
+    Bars where either line (or its previous value) is NaN never cross.
+
+    Args:
+        fast (np.ndarray): Fast line, e.g. a short moving average
+        slow (np.ndarray): Slow line
+
+    Returns:
+        tuple: Boolean arrays (cross_up, cross_down)
+    """
+    fast = np.asarray(fast, dtype=np.float64)
+    slow = np.asarray(slow, dtype=np.float64)
+    prev_fast, prev_slow = shift(fast), shift(slow)
+    cross_up = (prev_fast <= prev_slow) & (fast > slow)
+    cross_down = (prev_fast >= prev_slow) & (fast < slow)
+    return cross_up, cross_down
+
+
+def true_range(high, low, close):
+    """
+    True range of each bar against the previous close.
+
+    Args:
+        high (np.ndarray): High prices
+        low (np.ndarray): Low prices
+        close (np.ndarray): Close prices
+
+    Returns:
+        np.ndarray: True range, NaN for the first bar
+    """
+    prev_close = shift(close)
+    return np.maximum(np.maximum(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def hold_signals(signals, initial=0.0):
+    """
+    Turn sparse signals into a held state.
+
+    NaN entries mean "no signal on this bar" and keep the previous state.
+
+    Args:
+        signals (np.ndarray): Signal values with NaN where nothing was emitted
+        initial (float): State before the first signal
+
+    Returns:
+        np.ndarray: State after each bar
+    """
+    signals = np.asarray(signals, dtype=np.float64)
+    has_signal = ~np.isnan(signals)
+    last = np.where(has_signal, np.arange(len(signals)), -1)
+    np.maximum.accumulate(last, out=last)
+    return np.where(last >= 0, signals[np.maximum(last, 0)], initial)
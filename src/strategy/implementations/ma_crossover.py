@@ -7,10 +7,14 @@ that generates entry and exit signals when fast MA crosses slow MA.
 
 import logging
 import numpy as np
+from collections import deque
 from typing import Dict, List, Optional, Any, Union, Tuple
 
 from src.strategy.strategy import Strategy
 from src.data.data_types import Bar, Timeframe
+from src.strategy.components.indicators.streaming import SMA
+from src.strategy.components.indicators.indicator_cache import create_indicator
+from src.strategy.components.indicators.vectorized import hold_signals, rolling_sum, shift
 
 logger = logging.getLogger(__name__)
 
@@ -39,11 +43,15 @@ class MovingAverageCrossover(Strategy):
         }
         
         # Data storage for each symbol
-        self.bars_dict = {}  # Dict[symbol, List[Bar]]
+        self.bars_dict = {}  # Dict[symbol, deque[Bar]] capped at the longest MA window
+        self.moving_averages = {}  # Dict[symbol, Tuple[SMA, SMA]] (fast, slow)
         self.last_fast_ma = {}  # Dict[symbol, float]
         self.last_slow_ma = {}  # Dict[symbol, float]
         self.last_position = {}  # Dict[symbol, int] (1 for long, -1 for short, 0 for flat)
         
+        # Cached indicator series, set by optimizers for the duration of a run
+        self.indicator_source = None
+        
     def initialize(self, context: Dict[str, Any] = None) -> None:
         """
         Initialize the strategy.
@@ -54,10 +62,23 @@ class MovingAverageCrossover(Strategy):
         super().initialize(context)
         
         for symbol in self.symbols:
-            self.bars_dict[symbol] = []
-            self.last_fast_ma[symbol] = None
-            self.last_slow_ma[symbol] = None
-            self.last_position[symbol] = 0  # Start flat
+            self._reset_symbol(symbol)
+    
+    def _reset_symbol(self, symbol: str) -> None:
+        """
+        Create empty history and moving averages for a symbol.
+        
+        Args:
+            symbol: Symbol to reset
+        """
+        fast_period = self.parameters.get('fast_period', 10)
+        slow_period = self.parameters.get('slow_period', 30)
+        self.bars_dict[symbol] = deque(maxlen=max(fast_period, slow_period))
+        self.moving_averages[symbol] = (create_indicator(self.indicator_source, symbol, 'sma', fast_period),
+                                        create_indicator(self.indicator_source, symbol, 'sma', slow_period))
+        self.last_fast_ma[symbol] = None
+        self.last_slow_ma[symbol] = None
+        self.last_position[symbol] = 0  # Start flat
     
     def calculate_signals(self, bar: Bar) -> None:
         """
@@ -76,25 +97,21 @@ class MovingAverageCrossover(Strategy):
         
         # Initialize if needed
         if symbol not in self.bars_dict:
-            self.bars_dict[symbol] = []
-            self.last_fast_ma[symbol] = None
-            self.last_slow_ma[symbol] = None
-            self.last_position[symbol] = 0
+            self._reset_symbol(symbol)
             self.logger.debug(f"Initialized data structures for {symbol}")
         
         # Store the bar
         self.bars_dict[symbol].append(bar)
-        self.logger.debug(f"Added bar to history for {symbol}, total bars: {len(self.bars_dict[symbol])}")
-        
-        # Need at least slow_period bars to calculate
-        slow_period = self.parameters.get('slow_period', 30)
-        if len(self.bars_dict[symbol]) < slow_period:
-            return
         
         # Calculate moving averages
         fast_period = self.parameters.get('fast_period', 10)
+        slow_period = self.parameters.get('slow_period', 30)
         current_fast_ma, current_slow_ma = self._calculate_mas(symbol, fast_period, slow_period)
         
+        # Need at least slow_period bars (and fast_period bars) for both MAs
+        if current_fast_ma is None or current_slow_ma is None:
+            return
+        
         # Check if we have previous values to compare
         if self.last_fast_ma[symbol] is not None and self.last_slow_ma[symbol] is not None:
             # Check for crossover
@@ -125,9 +142,12 @@ class MovingAverageCrossover(Strategy):
         self.last_fast_ma[symbol] = current_fast_ma
         self.last_slow_ma[symbol] = current_slow_ma
     
-    def _calculate_mas(self, symbol: str, fast_period: int, slow_period: int) -> Tuple[float, float]:
+    def _calculate_mas(self, symbol: str, fast_period: int, slow_period: int) -> Tuple[Optional[float], Optional[float]]:
         """
-        Calculate fast and slow moving averages.
+        Update the fast and slow moving averages with the latest bar.
+        
+        The averages are streaming indicators, so each call is O(1). They
+        are rebuilt from the stored bars if the periods have changed.
         
         Args:
             symbol: Symbol to calculate for
@@ -135,27 +155,66 @@ class MovingAverageCrossover(Strategy):
             slow_period: Slow moving average period
             
         Returns:
-            Tuple[float, float]: Fast and slow MA values
+            Tuple[Optional[float], Optional[float]]: Fast and slow MA values,
+                None while an average does not have enough bars
         """
         bars = self.bars_dict[symbol]
-        closes = [bar.close for bar in bars]
+        fast_sma, slow_sma = self.moving_averages[symbol]
         
-        # Debug the calculation
-        self.logger.debug(f"Calculating MAs for {symbol} with {len(closes)} close prices")
-        self.logger.debug(f"Fast period: {fast_period}, Slow period: {slow_period}")
+        if fast_sma.window != fast_period or slow_sma.window != slow_period:
+            # Periods changed since the averages were created - rebuild from the stored bars
+            history = list(bars)
+            self.bars_dict[symbol] = bars = deque(history, maxlen=max(fast_period, slow_period))
+            fast_sma, slow_sma = SMA(fast_period), SMA(slow_period)
+            self.moving_averages[symbol] = (fast_sma, slow_sma)
+            for past_bar in history[:-1]:
+                fast_sma.update(past_bar.close)
+                slow_sma.update(past_bar.close)
         
-        # Calculate fast MA
-        fast_data = closes[-fast_period:]
-        fast_ma = sum(fast_data) / fast_period
+        close = bars[-1].close
+        fast_ma = fast_sma.update(close)
+        slow_ma = slow_sma.update(close)
         
-        # Calculate slow MA
-        slow_data = closes[-slow_period:]
-        slow_ma = sum(slow_data) / slow_period
-        
-        self.logger.debug(f"MA results - Fast: {fast_ma:.4f}, Slow: {slow_ma:.4f}, Diff: {fast_ma - slow_ma:.4f}")
+        if fast_ma is not None and slow_ma is not None and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"MA results - Fast: {fast_ma:.4f}, Slow: {slow_ma:.4f}, Diff: {fast_ma - slow_ma:.4f}")
         
         return fast_ma, slow_ma
     
+    def vectorized_positions(self, bars, position_size: Optional[float] = None) -> np.ndarray:
+        """
+        Compute the target position after every bar for the vectorized backtester.
+
+        Entries and exits follow calculate_signals: long after the fast MA
+        crosses above the slow MA, flat after it crosses back below.
+
+        Args:
+            bars: BarStore for a single symbol
+            position_size: Position size while long (default: the
+                'position_size' parameter, or 100)
+
+        Returns:
+            np.ndarray: Position after each bar
+        """
+        if position_size is None:
+            position_size = self.parameters.get('position_size', 100)
+        fast_period = self.parameters.get('fast_period', 10)
+        slow_period = self.parameters.get('slow_period', 30)
+
+        close = bars.get('close')
+        fast_ma = rolling_sum(close, fast_period) / fast_period
+        slow_ma = rolling_sum(close, slow_period) / slow_period
+        prev_fast_ma, prev_slow_ma = shift(fast_ma), shift(slow_ma)
+
+        # Crossovers are checked once the previous bar has both MAs
+        has_previous = ~np.isnan(prev_fast_ma) & ~np.isnan(prev_slow_ma)
+        was_above = prev_fast_ma > prev_slow_ma
+        is_above = fast_ma > slow_ma
+
+        signals = np.full(len(close), np.nan)
+        signals[has_previous & is_above & ~was_above] = 1.0
+        signals[has_previous & was_above & ~is_above] = 0.0
+        return hold_signals(signals) * position_size
+
     def _generate_long_entry(self, symbol: str) -> None:
         """
         Generate a long entry signal.
@@ -190,9 +249,6 @@ class MovingAverageCrossover(Strategy):
         
         # Reset strategy-specific state
         for symbol in self.symbols:
-            self.bars_dict[symbol] = []
-            self.last_fast_ma[symbol] = None
-            self.last_slow_ma[symbol] = None
-            self.last_position[symbol] = 0  # Reset to flat
+            self._reset_symbol(symbol)
         
         self.logger.info(f"MA Crossover strategy {self.name} reset")
\ No newline at end of file
@@ -7,8 +7,11 @@ a slow moving average, and sell signals when the fast MA crosses below the slow
 
 import numpy as np
 import pandas as pd
+from collections import deque
 from src.core.component import Component
 from src.core.events.event_bus import Event, EventType
+from src.strategy.components.indicators.indicator_cache import create_indicator
+from src.strategy.components.indicators.vectorized import crossovers, rolling_mean
 
 class SimpleMACrossoverStrategy(Component):
     """
@@ -41,10 +44,14 @@ class SimpleMACrossoverStrategy(Component):
         self.stop_loss_pct = stop_loss_pct
         
         # Internal data
-        self.prices = {}  # symbol -> list of prices
+        self.prices = {}  # symbol -> recent prices, capped at the longest MA window
+        self.moving_averages = {}  # symbol -> (fast SMA, slow SMA)
         self.positions = {}  # symbol -> current position
         self.trailing_stops = {}  # symbol -> trailing stop level
         
+        # Cached indicator series, set by optimizers for the duration of a run
+        self.indicator_source = None
+        
     def initialize(self, context):
         """
         Initialize with dependencies.
@@ -68,6 +75,7 @@ class SimpleMACrossoverStrategy(Component):
         """Reset the strategy state."""
         super().reset()
         self.prices = {}
+        self.moving_averages = {}
         self.positions = {}
         self.trailing_stops = {}
         
@@ -86,24 +94,26 @@ class SimpleMACrossoverStrategy(Component):
         
         # Initialize data structures for this symbol if needed
         if symbol not in self.prices:
-            self.prices[symbol] = []
+            self.prices[symbol] = deque(maxlen=max(self.fast_period, self.slow_period))
+            self.moving_averages[symbol] = (create_indicator(self.indicator_source, symbol, 'sma', self.fast_period),
+                                            create_indicator(self.indicator_source, symbol, 'sma', self.slow_period))
             self.positions[symbol] = 0
             
         # Add price to history
         self.prices[symbol].append(close_price)
         
+        # Update moving averages
+        fast_sma, slow_sma = self.moving_averages[symbol]
+        fast_ma = fast_sma.update(close_price)
+        slow_ma = slow_sma.update(close_price)
+        
         # Wait until we have enough data
-        if len(self.prices[symbol]) < self.slow_period:
+        if fast_ma is None or slow_ma is None:
             return
-            
-        # Calculate moving averages
-        fast_ma = np.mean(self.prices[symbol][-self.fast_period:])
-        slow_ma = np.mean(self.prices[symbol][-self.slow_period:])
         
         # Previous moving averages
-        prev_prices = self.prices[symbol][:-1]
-        prev_fast_ma = np.mean(prev_prices[-self.fast_period:]) if len(prev_prices) >= self.fast_period else None
-        prev_slow_ma = np.mean(prev_prices[-self.slow_period:]) if len(prev_prices) >= self.slow_period else None
+        prev_fast_ma = fast_sma.previous
+        prev_slow_ma = slow_sma.previous
         
         # Check for crossover (if we have previous values)
         if prev_fast_ma is not None and prev_slow_ma is not None:
@@ -143,6 +153,28 @@ class SimpleMACrossoverStrategy(Component):
                 if close_price > self.trailing_stops[symbol]:
                     self._generate_signal(symbol, 'LONG', close_price, timestamp)
                     
+    def vectorized_positions(self, bars, position_size=None):
+        """
+        Compute the target position after every bar for the vectorized backtester.
+
+        The portfolio does not report positions back to the strategy during
+        a backtest, so on_bar trades position_size on every crossover and the
+        trailing stop never triggers; the same happens here.
+
+        Args:
+            bars (BarStore): Bars for a single symbol
+            position_size (float, optional): Overrides the strategy's position size
+
+        Returns:
+            np.ndarray: Signed position after each bar
+        """
+        size = self.position_size if position_size is None else position_size
+        close = bars.get('close')
+        cross_up, cross_down = crossovers(rolling_mean(close, self.fast_period),
+                                          rolling_mean(close, self.slow_period))
+        orders = np.where(cross_up, size, np.where(cross_down, -size, 0.0))
+        return np.cumsum(orders)
+
     def on_portfolio_update(self, event):
         """
         Handle portfolio update events by tracking positions.
@@ -14,6 +14,10 @@ import numpy as np
 from src.strategy.strategy_base import Strategy
 from src.core.events.event_types import EventType
 from src.core.events.event_utils import create_signal_event
+from src.strategy.components.indicators.streaming import ATR, SMA, RollingStd
+from src.strategy.components.indicators.vectorized import (
+    hold_signals, rolling_std, rolling_sum, true_range
+)
 
 logger = logging.getLogger(__name__)
 
@@ -49,8 +53,8 @@ class MeanReversionStrategy(Strategy):
         self.atr_multiplier = self.parameters.get('atr_multiplier', 1.5)
         self.atr_period = self.parameters.get('atr_period', 14)
         
-        # Internal state for data storage only
-        self.data = {symbol: [] for symbol in self.symbols}
+        # Streaming indicators per symbol
+        self.data = {symbol: self._create_indicators() for symbol in self.symbols}
         
         # Register for events
         if self.event_bus:
@@ -73,48 +77,40 @@ class MeanReversionStrategy(Strategy):
         self.atr_period = self.parameters.get('atr_period', 14)
         
         # Reset data for all configured symbols
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators() for symbol in self.symbols}
         
         logger.info(f"Mean Reversion strategy configured with parameters: "
                    f"window={self.window}, std_dev_multiplier={self.std_dev_multiplier}")
     
-    def _calculate_atr(self, data, period):
+    def _create_indicators(self):
         """
-        Calculate Average True Range (ATR) for volatility-based thresholds.
+        Create the streaming indicators for one symbol.
         
-        Args:
-            data: List of price data dictionaries
-            period: ATR calculation period
-            
         Returns:
-            float: ATR value
+            dict: Bar count, moving average, standard deviation and ATR
         """
-        if len(data) < period + 1:
-            return None
+        return {
+            'bars': 0,
+            'moving_avg': SMA(self.window),
+            'std_dev': RollingStd(self.window),
+            # Simple average of the last atr_period true ranges
+            'atr': ATR(self.atr_period, wilder=False)
+        }
+    
+    def _calculate_atr(self, indicators, high, low, close):
+        """
+        Update the Average True Range (ATR) used for volatility-based thresholds.
         
-        true_ranges = []
-        for i in range(1, len(data)):
-            high = data[i]['high']
-            low = data[i]['low']
-            prev_close = data[i-1]['price']  # Using 'price' as close
-            
-            # True Range is the greatest of:
-            # 1. Current High - Current Low
-            # 2. |Current High - Previous Close|
-            # 3. |Current Low - Previous Close|
-            tr1 = high - low
-            tr2 = abs(high - prev_close)
-            tr3 = abs(low - prev_close)
-            true_range = max(tr1, tr2, tr3)
-            
-            true_ranges.append(true_range)
+        Args:
+            indicators: Streaming indicators for the symbol
+            high: Bar high
+            low: Bar low
+            close: Bar close
             
-        # Use only the last 'period' number of true ranges
-        true_ranges = true_ranges[-period:]
-        
-        # Calculate ATR as simple average of true ranges
-        atr = sum(true_ranges) / len(true_ranges)
-        return atr
+        Returns:
+            Optional[float]: ATR value, None until atr_period true ranges are available
+        """
+        return indicators['atr'].update(high, low, close)
     
     def on_bar(self, bar_event):
         """
@@ -137,34 +133,27 @@ class MeanReversionStrategy(Strategy):
         price = bar_event.get_close()
         timestamp = bar_event.get_timestamp()
         
-        # Store data for this symbol
+        # Update the indicators for this symbol
         if symbol not in self.data:
-            self.data[symbol] = []
+            self.data[symbol] = self._create_indicators()
         
-        self.data[symbol].append({
-            'timestamp': timestamp,
-            'price': price,
-            'high': bar_event.get_high(),
-            'low': bar_event.get_low()
-        })
+        indicators = self.data[symbol]
+        indicators['bars'] += 1
+        moving_avg = indicators['moving_avg'].update(price)
+        std_dev = indicators['std_dev'].update(price)
+        atr = self._calculate_atr(indicators, bar_event.get_high(), bar_event.get_low(), price)
         
         # Check if we have enough data
-        if len(self.data[symbol]) < self.window:
+        if moving_avg is None:
             return None
         
-        # Keep only the most recent window + some buffer for calculations
-        max_data_points = max(self.window * 2, self.window + 20)
-        if len(self.data[symbol]) > max_data_points:
-            self.data[symbol] = self.data[symbol][-max_data_points:]
-        
-        # Calculate moving average
-        prices = [bar['price'] for bar in self.data[symbol][-self.window:]]
-        moving_avg = sum(prices) / len(prices)
+        # ATR thresholds apply once more than atr_period bars are held; the
+        # history is capped at max(2 * window, window + 20) bars
+        history = min(indicators['bars'], max(self.window * 2, self.window + 20))
         
         # Calculate price deviation threshold
-        if self.use_atr and len(self.data[symbol]) > self.atr_period:
+        if self.use_atr and history > self.atr_period:
             # Use ATR-based threshold
-            atr = self._calculate_atr(self.data[symbol], self.atr_period)
             if atr is None:
                 return None
                 
@@ -172,7 +161,6 @@ class MeanReversionStrategy(Strategy):
             
         else:
             # Use standard deviation-based threshold
-            std_dev = np.std(prices)
             threshold = std_dev * self.std_dev_multiplier
         
         # Calculate price deviation from moving average
@@ -221,9 +209,45 @@ class MeanReversionStrategy(Strategy):
         
         return None
     
+    def vectorized_positions(self, bars, position_size=None):
+        """
+        Compute the target position after every bar for the vectorized backtester.
+
+        Deviations and thresholds are computed as in on_bar; the position
+        follows the direction of the latest signal.
+
+        Args:
+            bars: BarStore for a single symbol
+            position_size (float, optional): Position size (default: the
+                'position_size' parameter, or 100)
+
+        Returns:
+            np.ndarray: Signed position after each bar
+        """
+        if position_size is None:
+            position_size = self.parameters.get('position_size', 100)
+
+        close = bars.get('close')
+        n = len(close)
+        moving_avg = rolling_sum(close, self.window) / self.window
+        threshold = rolling_std(close, self.window) * self.std_dev_multiplier
+
+        if self.use_atr:
+            # on_bar switches to ATR once its trimmed history exceeds atr_period
+            history = np.minimum(np.arange(1, n + 1), max(self.window * 2, self.window + 20))
+            atr = rolling_sum(true_range(bars.get('high'), bars.get('low'), close),
+                              self.atr_period) / self.atr_period
+            threshold = np.where(history > self.atr_period, atr * self.atr_multiplier, threshold)
+
+        deviation = close - moving_avg
+        signals = np.full(n, np.nan)
+        signals[deviation < -threshold] = 1.0
+        signals[deviation > threshold] = -1.0
+        return hold_signals(signals) * position_size
+
     def reset(self):
         """Reset the strategy state."""
         # Reset strategy-specific state
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators() for symbol in self.symbols}
         
         logger.info(f"Mean Reversion strategy {self.name} reset")
\ No newline at end of file
@@ -11,11 +11,14 @@ based on detected market regimes. The strategy includes:
 import logging
 import pandas as pd
 import numpy as np
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 
 from src.core.events.event_types import EventType
 from src.core.events.event_utils import create_signal_event
 from src.strategy.strategy_base import Strategy
+from src.strategy.components.indicators.streaming import ATR, RollingMax, RollingMin
+from src.strategy.components.indicators.indicator_cache import create_indicator
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +56,11 @@ class RegimeEnsembleStrategy(Strategy):
         # Extract parameters with defaults
         self._set_default_parameters()
         
+        # Cached indicator series, set by optimizers for the duration of a run
+        self.indicator_source = None
+        
         # Internal state
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators(symbol) for symbol in self.symbols}
         self.current_regimes = {symbol: MarketRegime.NEUTRAL for symbol in self.symbols}
         self.signal_count = 0
         
@@ -118,7 +124,7 @@ class RegimeEnsembleStrategy(Strategy):
         self._set_default_parameters()
         
         # Reset data for all configured symbols
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators(symbol) for symbol in self.symbols}
         self.current_regimes = {symbol: MarketRegime.NEUTRAL for symbol in self.symbols}
         
         logger.info(f"Regime Ensemble strategy configured with {len(self.symbols)} symbols")
@@ -146,16 +152,12 @@ class RegimeEnsembleStrategy(Strategy):
         high_price = bar_event.get_high()
         low_price = bar_event.get_low()
         
-        # Store data for this symbol
+        # Update the indicators for this symbol
         if symbol not in self.data:
-            self.data[symbol] = []
+            self.data[symbol] = self._create_indicators(symbol)
         
-        self.data[symbol].append({
-            'timestamp': timestamp,
-            'close': close_price,
-            'high': high_price,
-            'low': low_price
-        })
+        state = self.data[symbol]
+        self._update_indicators(state, high_price, low_price, close_price)
         
         # We need enough data for the longest window
         min_bars_needed = max(
@@ -167,9 +169,9 @@ class RegimeEnsembleStrategy(Strategy):
         )
         
         # Check if we have enough data
-        if len(self.data[symbol]) <= min_bars_needed:
-            if len(self.data[symbol]) % 10 == 0:
-                logger.debug(f"Collecting data for {symbol}: {len(self.data[symbol])}/{min_bars_needed} bars")
+        if state['bars'] <= min_bars_needed:
+            if state['bars'] % 10 == 0:
+                logger.debug(f"Collecting data for {symbol}: {state['bars']}/{min_bars_needed} bars")
             return None
         
         # Detect market regime first
@@ -228,6 +230,72 @@ class RegimeEnsembleStrategy(Strategy):
         
         return None
     
+    def _create_indicators(self, symbol):
+        """
+        Create the streaming indicators for one symbol.
+        
+        Buffers are capped at the longest window each indicator needs. The
+        moving averages, volatility and RSI read cached series when an
+        optimizer provides them.
+        
+        Args:
+            symbol: Symbol the indicators are fed with
+        
+        Returns:
+            dict: Indicator state for the symbol
+        """
+        source = self.indicator_source
+        return {
+            'bars': 0,
+            'last_close': None,
+            'zero_close': False,  # A zero close makes later returns undefined
+            'recent_closes': deque(maxlen=20),
+            'trend_ma': create_indicator(source, symbol, 'sma', self.trend_ma_window),
+            'volatility': create_indicator(source, symbol, 'return_std', self.volatility_window),
+            'fast_ma': create_indicator(source, symbol, 'sma', self.fast_ma_window),
+            'slow_ma': create_indicator(source, symbol, 'sma', self.slow_ma_window),
+            # Simple averages of the last window changes / true ranges
+            'rsi': create_indicator(source, symbol, 'simple_rsi', self.rsi_window),
+            'atr': ATR(self.breakout_window, wilder=False),
+            # Channel over the previous breakout_window - 1 bars, excluding the current bar
+            'channel_high': RollingMax(self.breakout_window - 1) if self.breakout_window > 1 else None,
+            'channel_low': RollingMin(self.breakout_window - 1) if self.breakout_window > 1 else None,
+            'channel': (None, None)
+        }
+    
+    def _update_indicators(self, state, high, low, close):
+        """
+        Update a symbol's indicators with a new bar.
+        
+        Args:
+            state: Indicator state from _create_indicators
+            high: Bar high
+            low: Bar low
+            close: Bar close
+        """
+        last_close = state['last_close']
+        
+        state['bars'] += 1
+        state['recent_closes'].append(close)
+        state['trend_ma'].update(close)
+        state['fast_ma'].update(close)
+        state['slow_ma'].update(close)
+        state['rsi'].update(close)
+        state['atr'].update(high, low, close)
+        
+        # The channel for this bar comes from the bars before it
+        if state['channel_high'] is not None:
+            state['channel'] = (state['channel_high'].value, state['channel_low'].value)
+            state['channel_high'].update(high)
+            state['channel_low'].update(low)
+        
+        if last_close is not None:
+            if last_close == 0:
+                state['zero_close'] = True
+            elif not state['zero_close']:
+                state['volatility'].update(close / last_close - 1)
+        state['last_close'] = close
+    
     def _detect_regime(self, symbol):
         """
         Detect the current market regime.
@@ -238,23 +306,21 @@ class RegimeEnsembleStrategy(Strategy):
         Returns:
             Detected regime type
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
+        state = self.data[symbol]
+        if state['zero_close']:
+            raise ZeroDivisionError(f"Returns for {symbol} are undefined after a zero close")
         
         # Calculate trend indicator: price vs long-term MA
-        trend_ma = sum(closes[-self.trend_ma_window:]) / self.trend_ma_window
-        current_price = closes[-1]
-        recent_prices = closes[-20:]  # Last 20 bars
+        trend_ma = state['trend_ma'].value
+        current_price = state['last_close']
+        recent_prices = state['recent_closes']  # Last 20 bars
         
         # Trend calculation: % difference from MA and recent direction
         trend_diff_pct = (current_price - trend_ma) / trend_ma
         recent_trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
         
         # Volatility calculation: standard deviation of returns
-        returns = [closes[i] / closes[i-1] - 1 for i in range(1, len(closes))]
-        recent_returns = returns[-self.volatility_window:]
-        volatility = np.std(recent_returns)
+        volatility = state['volatility'].value
         
         # Determine regime based on volatility and trend
         if volatility > self.volatility_threshold:
@@ -282,17 +348,11 @@ class RegimeEnsembleStrategy(Strategy):
         Returns:
             Signal value between -1.0 and 1.0
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
+        state = self.data[symbol]
         
-        # Calculate moving averages
-        fast_ma = sum(closes[-self.fast_ma_window:]) / self.fast_ma_window
-        slow_ma = sum(closes[-self.slow_ma_window:]) / self.slow_ma_window
-        
-        # Previous MAs (for crossover detection)
-        fast_ma_prev = sum(closes[-(self.fast_ma_window+1):-1]) / self.fast_ma_window
-        slow_ma_prev = sum(closes[-(self.slow_ma_window+1):-1]) / self.slow_ma_window
+        # Current and previous moving averages (for crossover detection)
+        fast_ma, fast_ma_prev = state['fast_ma'].value, state['fast_ma'].previous
+        slow_ma, slow_ma_prev = state['slow_ma'].value, state['slow_ma'].previous
         
         # Crossover logic with distance factor
         ma_diff = (fast_ma - slow_ma) / slow_ma  # Normalized difference
@@ -313,19 +373,8 @@ class RegimeEnsembleStrategy(Strategy):
     def _calculate_mean_reversion_signal(self, symbol):
         """
         Calculate mean reversion signal (-1.0 to 1.0) based on RSI.
-        
-        Args:
-            symbol: Symbol to calculate for
-            
-        Returns:
-            Signal value between -1.0 and 1.0
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
-        
-        # Calculate RSI
-        rsi = self._calculate_rsi(closes, self.rsi_window)
+        rsi = self._calculate_rsi(symbol)
         
         # Enhanced RSI signal with stronger values at extremes
         if rsi >= self.rsi_overbought:
@@ -347,30 +396,19 @@ class RegimeEnsembleStrategy(Strategy):
     def _calculate_volatility_signal(self, symbol):
         """
         Calculate volatility breakout signal (-1.0 to 1.0).
-        
-        Args:
-            symbol: Symbol to calculate for
-            
-        Returns:
-            Signal value between -1.0 and 1.0
         """
-        # Get historical data
-        data = self.data[symbol]
-        highs = [bar['high'] for bar in data]
-        lows = [bar['low'] for bar in data]
-        closes = [bar['close'] for bar in data]
+        state = self.data[symbol]
         
         # Current price
-        current_close = closes[-1]
+        current_close = state['last_close']
         
-        # Calculate Average True Range (ATR) for volatility measure
-        atr = self._calculate_atr(highs, lows, closes, self.breakout_window)
+        # Average True Range (ATR) for volatility measure
+        atr = self._calculate_atr(symbol)
         
-        # Calculate recent price channel
-        recent_highs = highs[-self.breakout_window:-1]  # Exclude current bar
-        recent_lows = lows[-self.breakout_window:-1]    # Exclude current bar
-        channel_high = max(recent_highs)
-        channel_low = min(recent_lows)
+        # Recent price channel, excluding the current bar
+        channel_high, channel_low = state['channel']
+        if channel_high is None:
+            raise ValueError(f"breakout_window must be at least 2 to form a price channel, got {self.breakout_window}")
         
         # Dynamic breakout levels using ATR
         breakout_high = channel_high + self.breakout_multiplier * atr
@@ -391,81 +429,30 @@ class RegimeEnsembleStrategy(Strategy):
             # No breakout
             return 0.0
     
-    def _calculate_rsi(self, prices, window):
+    def _calculate_rsi(self, symbol):
         """
-        Calculate Relative Strength Index (RSI).
+        Get the Relative Strength Index (RSI) for a symbol.
         
-        Args:
-            prices: List of price values
-            window: RSI period
-            
-        Returns:
-            RSI value (0-100)
+        Average gains and losses are simple averages of the last rsi_window
+        price changes.
         """
-        if len(prices) <= window:
-            return 50  # Default value if not enough data
-        
-        # Calculate price changes
-        changes = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        
-        # Calculate average gains and losses
-        recent_changes = changes[-(window+1):]  # +1 for calculations
-        gains = [max(0, change) for change in recent_changes]
-        losses = [max(0, -change) for change in recent_changes]
-        
-        # Calculate average gain and loss
-        avg_gain = sum(gains[-window:]) / window
-        avg_loss = sum(losses[-window:]) / window
-        
-        # Handle zero losses
-        if avg_loss == 0:
-            return 100
-        
-        # Calculate RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        rsi = self.data[symbol]['rsi'].value
+        return 50 if rsi is None else rsi  # Default value if not enough data
     
-    def _calculate_atr(self, highs, lows, closes, window):
+    def _calculate_atr(self, symbol):
         """
-        Calculate Average True Range (ATR).
+        Get the Average True Range (ATR) for a symbol.
         
-        Args:
-            highs: List of high prices
-            lows: List of low prices
-            closes: List of close prices
-            window: ATR period
-            
-        Returns:
-            ATR value
+        ATR is the simple average of the last breakout_window true ranges.
         """
-        if len(closes) <= window:
-            return 0.01 * closes[-1]  # Default 1% if not enough data
-        
-        # Calculate true ranges
-        tr = []
-        for i in range(1, len(closes)):
-            high = highs[i]
-            low = lows[i]
-            prev_close = closes[i-1]
-            
-            tr1 = high - low  # Current high - low
-            tr2 = abs(high - prev_close)  # Current high - previous close
-            tr3 = abs(low - prev_close)  # Current low - previous close
-            
-            tr.append(max(tr1, tr2, tr3))
-        
-        # Calculate ATR as simple average of true ranges
-        recent_tr = tr[-window:]
-        atr = sum(recent_tr) / window
-        
-        return atr
+        state = self.data[symbol]
+        atr = state['atr'].value
+        return 0.01 * state['last_close'] if atr is None else atr  # Default 1% if not enough data
     
     def reset(self):
         """Reset the strategy state."""
         # Reset internal state
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators(symbol) for symbol in self.symbols}
         self.current_regimes = {symbol: MarketRegime.NEUTRAL for symbol in self.symbols}
         self.signal_count = 0
         
@@ -7,9 +7,12 @@ a slow moving average, and sell signals when the fast MA crosses below the slow
 
 import numpy as np
 import pandas as pd
+from collections import deque
 import logging
 from src.core.component import Component
 from src.core.events.event_bus import Event, EventType
+from src.strategy.components.indicators.indicator_cache import create_indicator
+from src.strategy.components.indicators.vectorized import crossovers, rolling_mean
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -46,7 +49,8 @@ class SimpleMACrossoverStrategy(Component):
         self.stop_loss_pct = stop_loss_pct
         
         # Internal data
-        self.prices = {}  # symbol -> list of prices
+        self.prices = {}  # symbol -> recent prices, capped at the longest MA window
+        self.moving_averages = {}  # symbol -> (fast SMA, slow SMA)
         self.positions = {}  # symbol -> current position
         self.trailing_stops = {}  # symbol -> trailing stop level
         
@@ -55,6 +59,9 @@ class SimpleMACrossoverStrategy(Component):
         self.active_orders = {}   # symbol -> list of active order IDs
         self.signal_count = 0     # Counter for generating unique signal IDs
         
+        # Cached indicator series, set by optimizers for the duration of a run
+        self.indicator_source = None
+        
         logger.info(f"SimpleMACrossoverStrategy initialized with fast_period={fast_period}, slow_period={slow_period}")
         
     def initialize(self, context):
@@ -115,6 +122,7 @@ class SimpleMACrossoverStrategy(Component):
         logger.info("Resetting SimpleMACrossoverStrategy state")
         super().reset()
         self.prices = {}
+        self.moving_averages = {}
         self.positions = {}
         self.trailing_stops = {}
         
@@ -138,7 +146,9 @@ class SimpleMACrossoverStrategy(Component):
         
         # Initialize data structures for this symbol if needed
         if symbol not in self.prices:
-            self.prices[symbol] = []
+            self.prices[symbol] = deque(maxlen=max(self.fast_period, self.slow_period))
+            self.moving_averages[symbol] = (create_indicator(self.indicator_source, symbol, 'sma', self.fast_period),
+                                            create_indicator(self.indicator_source, symbol, 'sma', self.slow_period))
             self.positions[symbol] = 0
             self.active_signals[symbol] = None  # No active signal yet
             self.active_orders[symbol] = []     # No active orders yet
@@ -146,18 +156,18 @@ class SimpleMACrossoverStrategy(Component):
         # Add price to history
         self.prices[symbol].append(close_price)
         
+        # Update moving averages
+        fast_sma, slow_sma = self.moving_averages[symbol]
+        fast_ma = fast_sma.update(close_price)
+        slow_ma = slow_sma.update(close_price)
+        
         # Wait until we have enough data
-        if len(self.prices[symbol]) < self.slow_period:
+        if fast_ma is None or slow_ma is None:
             return
-            
-        # Calculate moving averages
-        fast_ma = np.mean(self.prices[symbol][-self.fast_period:])
-        slow_ma = np.mean(self.prices[symbol][-self.slow_period:])
         
         # Previous moving averages
-        prev_prices = self.prices[symbol][:-1]
-        prev_fast_ma = np.mean(prev_prices[-self.fast_period:]) if len(prev_prices) >= self.fast_period else None
-        prev_slow_ma = np.mean(prev_prices[-self.slow_period:]) if len(prev_prices) >= self.slow_period else None
+        prev_fast_ma = fast_sma.previous
+        prev_slow_ma = slow_sma.previous
         
         # Debug log moving averages
         prev_fast_str = f"{prev_fast_ma:.2f}" if prev_fast_ma is not None else "None"
@@ -187,6 +197,40 @@ class SimpleMACrossoverStrategy(Component):
                     logger.info(f"SHORT signal generated for {symbol}: Fast MA ({fast_ma:.2f}) crossed below Slow MA ({slow_ma:.2f})")
                     self._generate_signal(symbol, 'SHORT', close_price, timestamp)
         
+    def vectorized_positions(self, bars, position_size=None):
+        """
+        Compute the target position after every bar for the vectorized backtester.
+
+        Crossovers are found with array operations and the on_bar rules are
+        then applied to the crossover bars only. The portfolio does not
+        report positions back to the strategy during a backtest, so every
+        signal that passes the active-signal check trades position_size.
+
+        Args:
+            bars (BarStore): Bars for a single symbol
+            position_size (float, optional): Overrides the strategy's position size
+
+        Returns:
+            np.ndarray: Signed position after each bar
+        """
+        size = self.position_size if position_size is None else position_size
+        slow_period = self.slow_period
+        fast_period = min(self.fast_period, slow_period - 1)  # Same adjustment as initialize()
+
+        cross_up, cross_down = crossovers(rolling_mean(bars.get('close'), fast_period),
+                                          rolling_mean(bars.get('close'), slow_period))
+
+        orders = np.zeros(len(bars))
+        active_signal = None
+        for idx in np.flatnonzero(cross_up | cross_down):
+            direction = 'LONG' if cross_up[idx] else 'SHORT'
+            if direction == active_signal:
+                continue
+            active_signal = direction
+            orders[idx] = size if direction == 'LONG' else -size
+
+        return np.cumsum(orders)
+
     def on_portfolio_update(self, event):
         """
         Handle portfolio update events by tracking positions.
@@ -6,12 +6,18 @@ easily compatible with the optimizer by reducing the required dependencies.
 """
 import logging
 import numpy as np
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 
 from src.core.component import Component
 from src.core.events.event_types import EventType, Event
 from src.data.data_types import Bar
 from src.strategy.strategy import Strategy
+from src.strategy.components.indicators.streaming import ATR, RollingMax, RollingMin
+from src.strategy.components.indicators.indicator_cache import create_indicator
+from src.strategy.components.indicators.vectorized import (
+    crossovers, hold_signals, rolling_max, rolling_min, rolling_std, rolling_sum, shift, true_range
+)
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +110,9 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         self.signal_count = 0
         self.symbols = []
         
+        # Cached indicator series, set by optimizers for the duration of a run
+        self.indicator_source = None
+        
         logger.info(f"Simple Regime Ensemble strategy initialized: {name}")
     
     def initialize(self, context):
@@ -122,7 +131,7 @@ class SimpleRegimeEnsembleStrategy(Strategy):
             self.symbols = ['SPY']  # Default if not specified
         
         # Initialize state for each symbol
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators(symbol) for symbol in self.symbols}
         self.current_regimes = {symbol: MarketRegime.NEUTRAL for symbol in self.symbols}
         
         logger.info(f"Regime Ensemble strategy initialized with {len(self.symbols)} symbols")
@@ -140,17 +149,12 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         if symbol not in self.symbols and len(self.symbols) > 0:
             self.symbols.append(symbol)
         
-        # Store data for this symbol
+        # Update the indicators for this symbol
         if symbol not in self.data:
-            self.data[symbol] = []
+            self.data[symbol] = self._create_indicators(symbol)
         
-        # Store bar data
-        self.data[symbol].append({
-            'timestamp': bar.timestamp,
-            'close': bar.close,
-            'high': bar.high,
-            'low': bar.low
-        })
+        state = self.data[symbol]
+        self._update_indicators(state, bar.high, bar.low, bar.close)
         
         # We need enough data for the longest window
         min_bars_needed = max(
@@ -162,9 +166,9 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         )
         
         # Check if we have enough data
-        if len(self.data[symbol]) <= min_bars_needed:
-            if len(self.data[symbol]) % 10 == 0:
-                logger.debug(f"Collecting data for {symbol}: {len(self.data[symbol])}/{min_bars_needed} bars")
+        if state['bars'] <= min_bars_needed:
+            if state['bars'] % 10 == 0:
+                logger.debug(f"Collecting data for {symbol}: {state['bars']}/{min_bars_needed} bars")
             return
         
         # Detect market regime first
@@ -218,6 +222,181 @@ class SimpleRegimeEnsembleStrategy(Strategy):
                 metadata={'regime': regime}
             )
     
+    def vectorized_positions(self, bars, position_size=None):
+        """
+        Compute the target position after every bar for the vectorized backtester.
+
+        Regimes, rule signals and their weighted combination are computed
+        for all bars at once with the same formulas as calculate_signals.
+        Bars where calculate_signals would fail (e.g. a division by zero)
+        emit no signal. The position follows the direction of the latest
+        signal.
+
+        Args:
+            bars: BarStore for a single symbol
+            position_size (float, optional): Position size (default: the
+                'position_size' parameter, or 100)
+
+        Returns:
+            np.ndarray: Signed position after each bar
+        """
+        if position_size is None:
+            position_size = self.parameters.get('position_size', 100)
+
+        close = bars.get('close')
+        high = bars.get('high')
+        low = bars.get('low')
+        n = len(close)
+        min_bars_needed = max(self.volatility_window, self.trend_ma_window, self.slow_ma_window,
+                              self.rsi_window, self.breakout_window)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Regime: trend against the long MA and volatility of returns
+            trend_ma = rolling_sum(close, self.trend_ma_window) / self.trend_ma_window
+            first_recent = close[np.maximum(np.arange(n) - 19, 0)]
+            trend_diff_pct = (close - trend_ma) / trend_ma
+            recent_trend = (close - first_recent) / first_recent
+            volatility = rolling_std(close / shift(close) - 1, self.volatility_window)
+
+            conditions = [
+                volatility > self.volatility_threshold,
+                (np.abs(trend_diff_pct) > self.trend_threshold) & (np.sign(trend_diff_pct) == np.sign(recent_trend)),
+                np.abs(trend_diff_pct) < self.trend_threshold * 0.5
+            ]
+            regimes = [MarketRegime.VOLATILE, MarketRegime.TREND, MarketRegime.MEAN_REVERSION]
+
+            def regime_values(value):
+                return np.select(conditions, [value(self.regime_weights[r]) for r in regimes],
+                                 value(self.regime_weights[MarketRegime.NEUTRAL]))
+
+            # Trend following: MA crossover with distance factor
+            fast_ma = rolling_sum(close, self.fast_ma_window) / self.fast_ma_window
+            slow_ma = rolling_sum(close, self.slow_ma_window) / self.slow_ma_window
+            cross_up, cross_down = crossovers(fast_ma, slow_ma)
+            ma_diff = (fast_ma - slow_ma) / slow_ma
+            trend_signal = np.where(cross_up, np.minimum(1.0, 0.5 + 10.0 * ma_diff),
+                                    np.where(cross_down, np.maximum(-1.0, -0.5 + 10.0 * ma_diff),
+                                             np.clip(5.0 * ma_diff, -0.4, 0.4)))
+
+            # Mean reversion: RSI
+            changes = close - shift(close)
+            avg_gain = rolling_sum(np.maximum(changes, 0), self.rsi_window) / self.rsi_window
+            avg_loss = rolling_sum(np.maximum(-changes, 0), self.rsi_window) / self.rsi_window
+            rsi = np.where(avg_loss == 0, 100, 100 - (100 / (1 + avg_gain / avg_loss)))
+            overbought = rsi >= self.rsi_overbought
+            oversold = ~overbought & (rsi <= self.rsi_oversold)
+            midpoint = (self.rsi_overbought + self.rsi_oversold) / 2
+            mean_reversion_signal = np.where(
+                overbought,
+                -0.5 - 0.5 * np.minimum(1.0, (rsi - self.rsi_overbought) / (100 - self.rsi_overbought)),
+                np.where(oversold,
+                         0.5 + 0.5 * np.minimum(1.0, (self.rsi_oversold - rsi) / self.rsi_oversold),
+                         -0.3 * ((rsi - midpoint) / (self.rsi_overbought - midpoint))))
+
+            # Volatility breakout: ATR-widened channel of the previous bars
+            atr = rolling_sum(true_range(high, low, close), self.breakout_window) / self.breakout_window
+            channel_high = shift(rolling_max(high, self.breakout_window - 1))
+            channel_low = shift(rolling_min(low, self.breakout_window - 1))
+            breakout_high = channel_high + self.breakout_multiplier * atr
+            breakout_low = channel_low - self.breakout_multiplier * atr
+            above = close > breakout_high
+            below = ~above & (close < breakout_low)
+            volatility_signal = np.where(
+                above,
+                np.minimum(1.0, 0.5 + 0.5 * np.minimum(1.0, (close - breakout_high) / (breakout_high - channel_high))),
+                np.where(below,
+                         np.maximum(-1.0, -0.5 - 0.5 * np.minimum(1.0, (breakout_low - close) / (channel_low - breakout_low))),
+                         0.0))
+
+            total_weight = regime_values(lambda weights: sum(weights.values()))
+            combined = (trend_signal * regime_values(lambda weights: weights['trend_following'])
+                        + mean_reversion_signal * regime_values(lambda weights: weights['mean_reversion'])
+                        + volatility_signal * regime_values(lambda weights: weights['volatility_breakout']))
+            combined = np.where(total_weight > 0, combined / total_weight, 0)
+
+        # Bars where the bar-by-bar calculation raises instead of signalling
+        failed = (
+            (trend_ma == 0) | (first_recent == 0) | (slow_ma == 0)
+            | (np.cumsum(close == 0) - (close == 0) > 0)
+            | (overbought & (self.rsi_overbought == 100))
+            | (oversold & (self.rsi_oversold == 0))
+            | (~overbought & ~oversold & (self.rsi_overbought == midpoint))
+            | (above & (breakout_high == channel_high))
+            | (below & (channel_low == breakout_low))
+        )
+        valid = (np.arange(n) >= min_bars_needed) & ~failed & (self.breakout_window > 1)
+
+        signals = np.full(n, np.nan)
+        signals[valid & (combined >= 0.5)] = 1.0
+        signals[valid & (combined <= -0.5)] = -1.0
+        return hold_signals(signals) * position_size
+
+    def _create_indicators(self, symbol):
+        """
+        Create the streaming indicators for one symbol.
+        
+        Buffers are capped at the longest window each indicator needs. The
+        moving averages, volatility and RSI read cached series when an
+        optimizer provides them.
+        
+        Args:
+            symbol: Symbol the indicators are fed with
+        
+        Returns:
+            dict: Indicator state for the symbol
+        """
+        source = self.indicator_source
+        return {
+            'bars': 0,
+            'last_close': None,
+            'zero_close': False,  # A zero close makes later returns undefined
+            'recent_closes': deque(maxlen=20),
+            'trend_ma': create_indicator(source, symbol, 'sma', self.trend_ma_window),
+            'volatility': create_indicator(source, symbol, 'return_std', self.volatility_window),
+            'fast_ma': create_indicator(source, symbol, 'sma', self.fast_ma_window),
+            'slow_ma': create_indicator(source, symbol, 'sma', self.slow_ma_window),
+            # Simple averages of the last window changes / true ranges
+            'rsi': create_indicator(source, symbol, 'simple_rsi', self.rsi_window),
+            'atr': ATR(self.breakout_window, wilder=False),
+            # Channel over the previous breakout_window - 1 bars, excluding the current bar
+            'channel_high': RollingMax(self.breakout_window - 1) if self.breakout_window > 1 else None,
+            'channel_low': RollingMin(self.breakout_window - 1) if self.breakout_window > 1 else None,
+            'channel': (None, None)
+        }
+    
+    def _update_indicators(self, state, high, low, close):
+        """
+        Update a symbol's indicators with a new bar.
+        
+        Args:
+            state: Indicator state from _create_indicators
+            high: Bar high
+            low: Bar low
+            close: Bar close
+        """
+        last_close = state['last_close']
+        
+        state['bars'] += 1
+        state['recent_closes'].append(close)
+        state['trend_ma'].update(close)
+        state['fast_ma'].update(close)
+        state['slow_ma'].update(close)
+        state['rsi'].update(close)
+        state['atr'].update(high, low, close)
+        
+        # The channel for this bar comes from the bars before it
+        if state['channel_high'] is not None:
+            state['channel'] = (state['channel_high'].value, state['channel_low'].value)
+            state['channel_high'].update(high)
+            state['channel_low'].update(low)
+        
+        if last_close is not None:
+            if last_close == 0:
+                state['zero_close'] = True
+            elif not state['zero_close']:
+                state['volatility'].update(close / last_close - 1)
+        state['last_close'] = close
+    
     def _detect_regime(self, symbol):
         """
         Detect the current market regime.
@@ -228,23 +407,21 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         Returns:
             Detected regime type
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
+        state = self.data[symbol]
+        if state['zero_close']:
+            raise ZeroDivisionError(f"Returns for {symbol} are undefined after a zero close")
         
         # Calculate trend indicator: price vs long-term MA
-        trend_ma = sum(closes[-self.trend_ma_window:]) / self.trend_ma_window
-        current_price = closes[-1]
-        recent_prices = closes[-20:]  # Last 20 bars
+        trend_ma = state['trend_ma'].value
+        current_price = state['last_close']
+        recent_prices = state['recent_closes']  # Last 20 bars
         
         # Trend calculation: % difference from MA and recent direction
         trend_diff_pct = (current_price - trend_ma) / trend_ma
         recent_trend = (recent_prices[-1] - recent_prices[0]) / recent_prices[0]
         
         # Volatility calculation: standard deviation of returns
-        returns = [closes[i] / closes[i-1] - 1 for i in range(1, len(closes))]
-        recent_returns = returns[-self.volatility_window:]
-        volatility = np.std(recent_returns)
+        volatility = state['volatility'].value
         
         # Determine regime based on volatility and trend
         if volatility > self.volatility_threshold:
@@ -272,17 +449,11 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         Returns:
             Signal value between -1.0 and 1.0
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
-        
-        # Calculate moving averages
-        fast_ma = sum(closes[-self.fast_ma_window:]) / self.fast_ma_window
-        slow_ma = sum(closes[-self.slow_ma_window:]) / self.slow_ma_window
+        state = self.data[symbol]
         
-        # Previous MAs (for crossover detection)
-        fast_ma_prev = sum(closes[-(self.fast_ma_window+1):-1]) / self.fast_ma_window
-        slow_ma_prev = sum(closes[-(self.slow_ma_window+1):-1]) / self.slow_ma_window
+        # Current and previous moving averages (for crossover detection)
+        fast_ma, fast_ma_prev = state['fast_ma'].value, state['fast_ma'].previous
+        slow_ma, slow_ma_prev = state['slow_ma'].value, state['slow_ma'].previous
         
         # Crossover logic with distance factor
         ma_diff = (fast_ma - slow_ma) / slow_ma  # Normalized difference
@@ -304,12 +475,7 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         """
         Calculate mean reversion signal (-1.0 to 1.0) based on RSI.
         """
-        # Get historical prices
-        data = self.data[symbol]
-        closes = [bar['close'] for bar in data]
-        
-        # Calculate RSI
-        rsi = self._calculate_rsi(closes, self.rsi_window)
+        rsi = self._calculate_rsi(symbol)
         
         # Enhanced RSI signal with stronger values at extremes
         if rsi >= self.rsi_overbought:
@@ -332,23 +498,18 @@ class SimpleRegimeEnsembleStrategy(Strategy):
         """
         Calculate volatility breakout signal (-1.0 to 1.0).
         """
-        # Get historical data
-        data = self.data[symbol]
-        highs = [bar['high'] for bar in data]
-        lows = [bar['low'] for bar in data]
-        closes = [bar['close'] for bar in data]
+        state = self.data[symbol]
         
         # Current price
-        current_close = closes[-1]
+        current_close = state['last_close']
         
-        # Calculate Average True Range (ATR) for volatility measure
-        atr = self._calculate_atr(highs, lows, closes, self.breakout_window)
+        # Average True Range (ATR) for volatility measure
+        atr = self._calculate_atr(symbol)
         
-        # Calculate recent price channel
-        recent_highs = highs[-self.breakout_window:-1]  # Exclude current bar
-        recent_lows = lows[-self.breakout_window:-1]    # Exclude current bar
-        channel_high = max(recent_highs)
-        channel_low = min(recent_lows)
+        # Recent price channel, excluding the current bar
+        channel_high, channel_low = state['channel']
+        if channel_high is None:
+            raise ValueError(f"breakout_window must be at least 2 to form a price channel, got {self.breakout_window}")
         
         # Dynamic breakout levels using ATR
         breakout_high = channel_high + self.breakout_multiplier * atr
@@ -369,65 +530,30 @@ class SimpleRegimeEnsembleStrategy(Strategy):
             # No breakout
             return 0.0
     
-    def _calculate_rsi(self, prices, window):
+    def _calculate_rsi(self, symbol):
         """
-        Calculate Relative Strength Index (RSI).
-        """
-        if len(prices) <= window:
-            return 50  # Default value if not enough data
-        
-        # Calculate price changes
-        changes = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        
-        # Calculate average gains and losses
-        recent_changes = changes[-(window+1):]  # +1 for calculations
-        gains = [max(0, change) for change in recent_changes]
-        losses = [max(0, -change) for change in recent_changes]
-        
-        # Calculate average gain and loss
-        avg_gain = sum(gains[-window:]) / window
-        avg_loss = sum(losses[-window:]) / window
-        
-        # Handle zero losses
-        if avg_loss == 0:
-            return 100
-        
-        # Calculate RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        Get the Relative Strength Index (RSI) for a symbol.
         
-        return rsi
-    
-    def _calculate_atr(self, highs, lows, closes, window):
+        Average gains and losses are simple averages of the last rsi_window
+        price changes.
         """
-        Calculate Average True Range (ATR).
+        rsi = self.data[symbol]['rsi'].value
+        return 50 if rsi is None else rsi  # Default value if not enough data
+    
+    def _calculate_atr(self, symbol):
         """
-        if len(closes) <= window:
-            return 0.01 * closes[-1]  # Default 1% if not enough data
-        
-        # Calculate true ranges
-        tr = []
-        for i in range(1, len(closes)):
-            high = highs[i]
-            low = lows[i]
-            prev_close = closes[i-1]
-            
-            tr1 = high - low  # Current high - low
-            tr2 = abs(high - prev_close)  # Current high - previous close
-            tr3 = abs(low - prev_close)  # Current low - previous close
-            
-            tr.append(max(tr1, tr2, tr3))
-        
-        # Calculate ATR as simple average of true ranges
-        recent_tr = tr[-window:]
-        atr = sum(recent_tr) / window
+        Get the Average True Range (ATR) for a symbol.
         
-        return atr
+        ATR is the simple average of the last breakout_window true ranges.
+        """
+        state = self.data[symbol]
+        atr = state['atr'].value
+        return 0.01 * state['last_close'] if atr is None else atr  # Default 1% if not enough data
     
     def reset(self):
         """Reset the strategy state."""
         # Reset internal state
-        self.data = {symbol: [] for symbol in self.symbols}
+        self.data = {symbol: self._create_indicators(symbol) for symbol in self.symbols}
         self.current_regimes = {symbol: MarketRegime.NEUTRAL for symbol in self.symbols}
         self.signal_count = 0
         
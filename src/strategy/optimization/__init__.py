@@ -16,6 +16,11 @@ from src.strategy.optimization.parameter_space import (
 
 from src.strategy.optimization.grid_search import GridSearch
 from src.strategy.optimization.random_search import RandomSearch
+from src.strategy.optimization.successive_halving import SuccessiveHalving
+from src.strategy.optimization.bayesian_search import BayesianSearch
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.strategy.optimization.walk_forward import WalkForwardOptimizer, WalkForwardCache
+from src.strategy.optimization.checkpoint import OptimizationJournal
 
 __all__ = [
     'Parameter',
@@ -25,5 +30,11 @@ __all__ = [
     'BooleanParameter',
     'ParameterSpace',
     'GridSearch',
-    'RandomSearch'
+    'RandomSearch',
+    'SuccessiveHalving',
+    'BayesianSearch',
+    'ParallelEvaluator',
+    'WalkForwardOptimizer',
+    'WalkForwardCache',
+    'OptimizationJournal'
 ]
@@ -0,0 +1,373 @@
+"""
+Bayesian optimization for strategy parameters.
+
+This module implements a Tree-structured Parzen Estimator (TPE): evaluated
+points are split into the best ``gamma`` fraction and the rest, each group is
+modelled with per-parameter Parzen densities, and the next point is the
+candidate drawn from the good density that maximizes the ratio of good to
+bad density. Integer, float, categorical, boolean and conditional
+parameters are supported; conditional parameters are modelled from the
+points that share their parent value.
+"""
+
+import math
+import time
+import random
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+from src.core.exceptions import OptimizationError
+from src.execution.backtest.pruning import PrunedRun, share_best_score
+from src.strategy.optimization.parameter_space import (
+    ParameterSpace, IntegerParameter, FloatParameter, ConditionalParameter
+)
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.core.logging.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+# Weight of the uniform prior in each Parzen density, in observations
+PRIOR_WEIGHT = 1.0
+
+
+def _point_key(params: Dict[str, Any]) -> str:
+    return repr(sorted(params.items()))
+
+
+class _NumericDomain:
+    """Ordered values mapped to [0, 1]; grids are snapped to their nearest value."""
+
+    def __init__(self, param):
+        self.log_scale = param.log_scale
+        self.is_int = isinstance(param, IntegerParameter)
+        self.grid = None
+        if self.is_int or param.step is not None:
+            self.grid = sorted(param.get_values())
+        self.low, self.high = param.min_value, param.max_value
+
+    def _transform(self, value):
+        return math.log(value) if self.log_scale else value
+
+    def to_unit(self, value):
+        if self.grid is not None:
+            return self.grid.index(value) / (len(self.grid) - 1) if len(self.grid) > 1 else 0.5
+        low, high = self._transform(self.low), self._transform(self.high)
+        return (self._transform(value) - low) / (high - low) if high > low else 0.5
+
+    def from_unit(self, unit):
+        if self.grid is not None:
+            return self.grid[int(round(unit * (len(self.grid) - 1)))]
+        low, high = self._transform(self.low), self._transform(self.high)
+        value = low + unit * (high - low)
+        return math.exp(value) if self.log_scale else value
+
+    def bandwidth(self, count):
+        # Scott-like shrinking bandwidth, never narrower than half a grid step
+        width = 0.2 * count ** -0.2
+        if self.grid is not None and len(self.grid) > 1:
+            width = max(width, 0.5 / (len(self.grid) - 1))
+        return max(width, 0.01)
+
+    def sample(self, rng, units):
+        """Draw from the prior-smoothed Parzen density of the observed units."""
+        pick = rng.random() * (len(units) + PRIOR_WEIGHT)
+        if pick < PRIOR_WEIGHT:
+            return rng.random()
+        center = units[min(int(pick - PRIOR_WEIGHT), len(units) - 1)]
+        unit = rng.gauss(center, self.bandwidth(len(units)))
+        return min(1.0, max(0.0, unit))
+
+    def log_density(self, unit, units):
+        width = self.bandwidth(max(len(units), 1))
+        total = PRIOR_WEIGHT
+        for center in units:
+            total += math.exp(-0.5 * ((unit - center) / width) ** 2) / (width * math.sqrt(2 * math.pi))
+        return math.log(total / (len(units) + PRIOR_WEIGHT))
+
+
+class _CategoricalDomain:
+    """Unordered values with smoothed frequencies."""
+
+    @staticmethod
+    def sample(rng, values, observed):
+        weights = [PRIOR_WEIGHT + sum(1 for o in observed if o == v) for v in values]
+        return rng.choices(values, weights=weights)[0]
+
+    @staticmethod
+    def log_density(value, values, observed):
+        count = sum(1 for o in observed if o == value)
+        return math.log((count + PRIOR_WEIGHT) / (len(observed) + PRIOR_WEIGHT * len(values)))
+
+
+class BayesianSearch:
+    """Bayesian (TPE) optimizer for strategy parameters."""
+
+    def __init__(self, parameter_space: ParameterSpace, seed: Optional[int] = None):
+        """Initialize Bayesian search optimizer.
+
+        Args:
+            parameter_space: Parameter space to search
+            seed: Random seed for reproducibility (default: None)
+        """
+        self.parameter_space = parameter_space
+        self.results = []
+        self.best_result = None
+        self.best_score = None
+        self.best_params = None
+        self._rng = random.Random(seed)
+
+        # Parents are sampled before the parameters that depend on them
+        self._order = [p for p in parameter_space.parameters.values() if not isinstance(p, ConditionalParameter)]
+        self._order += [p for p in parameter_space.parameters.values() if isinstance(p, ConditionalParameter)]
+        self._numeric = {
+            p.name: _NumericDomain(p) for p in self._order
+            if isinstance(p, (IntegerParameter, FloatParameter))
+        }
+
+    def search(self, objective_function: Callable[[Dict[str, Any]], float],
+               num_samples: int, maximize: bool = True,
+               max_time: Optional[float] = None, callback: Optional[Callable] = None,
+               executor: str = 'serial', max_workers: Optional[int] = None,
+               n_initial: Optional[int] = None, gamma: float = 0.25, n_candidates: int = 24,
+               evaluator: Optional[ParallelEvaluator] = None) -> Dict[str, Any]:
+        """Perform Bayesian search.
+
+        Args:
+            objective_function: Function to evaluate parameter combinations
+            num_samples: Number of points to evaluate
+            maximize: Whether to maximize (True) or minimize (False) objective
+            max_time: Maximum time in seconds (default: None)
+            callback: Optional callback function called after each evaluation
+                with arguments (params, score, is_best)
+            executor: 'serial', 'thread' or 'process' (default: 'serial');
+                the process executor requires a picklable objective function
+            max_workers: Number of parallel workers (default: executor's default)
+            n_initial: Random points evaluated before the model is used
+                (default: a quarter of num_samples, between 5 and 20)
+            gamma: Fraction of points modelled as good
+            n_candidates: Candidates drawn from the good density per proposal
+            evaluator: Evaluator to use instead of executor and max_workers;
+                parallel evaluators get one proposal per worker at a time
+
+        Returns:
+            Dictionary with search results
+
+        Raises:
+            OptimizationError: If optimization fails
+        """
+        if not 0 < gamma < 1:
+            raise OptimizationError(f"gamma must be between 0 and 1, got {gamma}")
+
+        self.results = []
+        self.best_result = None
+        self.best_score = None
+        self.best_params = None
+
+        if n_initial is None:
+            n_initial = min(20, max(5, num_samples // 4))
+
+        logger.info(f"Starting Bayesian search with {num_samples} samples ({n_initial} random)")
+
+        # Start timing
+        start_time = time.time()
+        evaluations = 0
+        attempts = 0
+        pruned = 0
+        evaluator = evaluator or ParallelEvaluator(executor, max_workers)
+        batch_size = 1 if evaluator.is_serial else (evaluator.max_workers or 4)
+        observations = []
+        seen = set()
+
+        while attempts < num_samples:
+            if max_time is not None and time.time() - start_time > max_time:
+                logger.info(f"Stopping Bayesian search: reached max time ({max_time}s)")
+                break
+
+            batch = []
+            for _ in range(min(batch_size, num_samples - attempts)):
+                use_model = len(observations) >= n_initial
+                params = self._propose(observations, seen, gamma, n_candidates, maximize, use_model)
+                if params is None:
+                    break
+                seen.add(_point_key(params))
+                batch.append(params)
+            if not batch:
+                logger.info("Stopping Bayesian search: no unevaluated points left")
+                break
+
+            for params, score, error in evaluator.map(objective_function, batch):
+                attempts += 1
+                if isinstance(error, PrunedRun):
+                    pruned += 1
+                    logger.info(f"Pruned parameters {params}: {error}")
+                    continue
+                if error is not None:
+                    logger.warning(f"Error evaluating parameters {params}: {error}")
+                    continue
+                evaluations += 1
+                observations.append((params, score))
+                self._record(params, score, evaluations, maximize, callback)
+                share_best_score(objective_function, self.best_score)
+
+        # Calculate statistics
+        elapsed_time = time.time() - start_time
+        evaluations_per_second = evaluations / elapsed_time if elapsed_time > 0 else 0
+
+        logger.info(
+            f"Bayesian search complete: "
+            f"{evaluations} evaluations, "
+            f"{elapsed_time:.2f}s, "
+            f"{evaluations_per_second:.2f} eval/s"
+        )
+
+        # Return search results
+        return {
+            'best_params': self.best_params,
+            'best_score': self.best_score,
+            'evaluations': evaluations,
+            'pruned': pruned,
+            'elapsed_time': elapsed_time,
+            'results': self.results
+        }
+
+    def _propose(self, observations: List[Tuple[Dict[str, Any], float]], seen: set,
+                 gamma: float, n_candidates: int, maximize: bool,
+                 use_model: bool) -> Optional[Dict[str, Any]]:
+        """Propose the next point to evaluate.
+
+        Args:
+            observations: Evaluated (params, score) pairs
+            seen: Keys of points already evaluated or pending
+            gamma: Fraction of points modelled as good
+            n_candidates: Candidates drawn from the good density
+            maximize: Whether higher scores are better
+            use_model: Whether to use the TPE model rather than random draws
+
+        Returns:
+            Parameter dictionary, or None if no new point was found
+        """
+        if use_model:
+            ranked = sorted(observations, key=lambda o: o[1], reverse=maximize)
+            n_good = max(1, int(math.ceil(gamma * len(ranked))))
+            good = [params for params, _ in ranked[:n_good]]
+            bad = [params for params, _ in ranked[n_good:]]
+
+            candidates = [self._sample(good) for _ in range(n_candidates)]
+            scored = sorted(((self._log_density(c, good) - self._log_density(c, bad), i)
+                             for i, c in enumerate(candidates)), reverse=True)
+            for _, i in scored:
+                if _point_key(candidates[i]) not in seen:
+                    return candidates[i]
+
+        # Random draws, also used once the model only proposes known points
+        for _ in range(100):
+            params = self._sample([])
+            if _point_key(params) not in seen:
+                return params
+        return None
+
+    def _domain_values(self, param, params: Dict[str, Any]) -> List[Any]:
+        if isinstance(param, ConditionalParameter):
+            return list(param.get_values(params.get(param.parent_parameter.name)))
+        return list(param.get_values())
+
+    def _observed(self, param, points: List[Dict[str, Any]], params: Dict[str, Any]) -> List[Any]:
+        """Values of a parameter in the observed points relevant to ``params``."""
+        if isinstance(param, ConditionalParameter):
+            parent = param.parent_parameter.name
+            return [p[param.name] for p in points
+                    if param.name in p and p.get(parent) == params.get(parent)]
+        return [p[param.name] for p in points if param.name in p]
+
+    def _sample(self, points: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Draw a point from the Parzen densities of ``points`` (uniform if empty)."""
+        params = {}
+        for param in self._order:
+            observed = self._observed(param, points, params)
+            if param.name in self._numeric:
+                domain = self._numeric[param.name]
+                units = [domain.to_unit(v) for v in observed]
+                params[param.name] = domain.from_unit(domain.sample(self._rng, units))
+            else:
+                values = self._domain_values(param, params)
+                if values:
+                    params[param.name] = _CategoricalDomain.sample(self._rng, values, observed)
+        return params
+
+    def _log_density(self, params: Dict[str, Any], points: List[Dict[str, Any]]) -> float:
+        """Log density of a point under the Parzen densities of ``points``."""
+        total = 0.0
+        for param in self._order:
+            if param.name not in params:
+                continue
+            observed = self._observed(param, points, params)
+            if param.name in self._numeric:
+                domain = self._numeric[param.name]
+                total += domain.log_density(domain.to_unit(params[param.name]),
+                                            [domain.to_unit(v) for v in observed])
+            else:
+                total += _CategoricalDomain.log_density(
+                    params[param.name], self._domain_values(param, params), observed)
+        return total
+
+    def _record(self, params: Dict[str, Any], score: float, evaluation: int,
+                maximize: bool, callback: Optional[Callable]) -> None:
+        """Record an evaluation and update the best result.
+
+        Args:
+            params: Evaluated parameters
+            score: Objective value
+            evaluation: Evaluation number
+            maximize: Whether higher scores are better
+            callback: Optional callback called with (params, score, is_best)
+        """
+        result = {
+            'params': params,
+            'score': score,
+            'evaluation': evaluation,
+            'timestamp': time.time()
+        }
+        self.results.append(result)
+
+        # Update best result
+        is_best = False
+        if self.best_score is None:
+            is_best = True
+        elif maximize and score > self.best_score:
+            is_best = True
+        elif not maximize and score < self.best_score:
+            is_best = True
+
+        if is_best:
+            self.best_score = score
+            self.best_params = params
+            self.best_result = result
+
+            logger.info(f"New best result: score={score}, params={params}")
+
+        # Call callback if provided
+        if callback:
+            callback(params, score, is_best)
+
+    def get_best_params(self) -> Optional[Dict[str, Any]]:
+        """Get best parameters found.
+
+        Returns:
+            Best parameters or None if no search has been performed
+        """
+        return self.best_params
+
+    def get_best_score(self) -> Optional[float]:
+        """Get best score found.
+
+        Returns:
+            Best score or None if no search has been performed
+        """
+        return self.best_score
+
+    def get_results(self) -> List[Dict[str, Any]]:
+        """Get all evaluation results.
+
+        Returns:
+            List of evaluation results
+        """
+        return self.results
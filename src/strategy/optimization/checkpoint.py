@@ -0,0 +1,280 @@
+"""
+Checkpoint journal for long-running optimizations.
+
+Completed evaluations are appended to a JSON Lines file in the output
+directory as they arrive, one line per grid point with its parameters,
+scores and train/test metrics. A run that dies part way through keeps
+everything it finished, and a resumed run skips the grid indices already in
+the journal. The first line identifies the run, so a journal written for a
+different strategy, parameter space, split, data file or cost model is not
+resumed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+from src.data.market_data_cache import MarketDataCache
+from src.execution.backtest.result_cache import RESULT_CONFIG_KEYS
+
+logger = logging.getLogger(__name__)
+
+# Journal file name in the output directory
+JOURNAL_FILENAME = 'optimization_journal.jsonl'
+
+# Default location when no output directory is configured
+DEFAULT_JOURNAL_PATH = os.path.join('optimization_results', JOURNAL_FILENAME)
+
+# Seconds between forced writes of the journal to disk
+DEFAULT_SYNC_INTERVAL = 5.0
+
+
+def _to_builtin(value):
+    """JSON fallback for numpy scalars, timestamps and other objects."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def _data_identity(data_config):
+    """
+    Describe the data a run reads: its settings and each source file's identity.
+
+    Args:
+        data_config (dict): Data configuration
+
+    Returns:
+        dict: Data settings and (path, mtime, size) of every source file
+    """
+    data_config = data_config or {}
+    sources = []
+    for source in data_config.get('sources') or []:
+        path = source.get('file')
+        sources.append({
+            'source': source,
+            'identity': MarketDataCache.make_key(path) if path else None
+        })
+    settings = {key: value for key, value in data_config.items() if key not in ('sources', 'train_test_split')}
+    return {'settings': settings, 'sources': sources}
+
+
+def get_run_fingerprint(strategy_name, parameter_grid, train_test_config, run_config=None):
+    """
+    Fingerprint the settings that decide what each grid index means.
+
+    Args:
+        strategy_name (str): Name of the optimized strategy
+        parameter_grid (ParameterGrid): Grid being evaluated; every value of
+            every parameter is hashed, a list of points is hashed whole
+        train_test_config (dict): Train/test split configuration
+        run_config (dict, optional): Backtest configuration; its data sources
+            (with file path, size and modification time) and the settings in
+            RESULT_CONFIG_KEYS (max_bars, broker, slippage, commission, ...)
+            are hashed
+
+    Returns:
+        str: Hex digest
+    """
+    if hasattr(parameter_grid, 'describe'):
+        values = parameter_grid.describe()
+    else:
+        values = list(parameter_grid)
+    run_config = run_config or {}
+    payload = json.dumps({
+        'strategy': strategy_name,
+        'parameter_count': len(parameter_grid),
+        'values': values,
+        'train_test_split': train_test_config,
+        'data': _data_identity(run_config.get('data')),
+        'settings': {key: run_config.get(key) for key in RESULT_CONFIG_KEYS}
+    }, sort_keys=True, default=_to_builtin)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+class OptimizationJournal:
+    """
+    Append-only journal of completed grid evaluations.
+    """
+
+    def __init__(self, path, fingerprint, sync_interval=DEFAULT_SYNC_INTERVAL):
+        """
+        Initialize the journal.
+
+        Args:
+            path (str): Journal file path
+            fingerprint (str): Run fingerprint from get_run_fingerprint
+            sync_interval (float): Seconds between fsyncs; every record is
+                flushed to the operating system as soon as it is written
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.sync_interval = sync_interval
+        self._file = None
+        self._last_sync = 0.0
+
+    def load(self):
+        """
+        Read the completed evaluations of a previous run.
+
+        A truncated last line, left by a run killed while writing, is ignored.
+
+        Returns:
+            dict: Grid index to record; empty if there is no journal or it
+                belongs to a different run
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        records = {}
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        for number, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"Ignoring unreadable line {number + 1} of journal {self.path}")
+                continue
+            if number == 0:
+                if record.get('fingerprint') != self.fingerprint:
+                    logger.warning(f"Journal {self.path} belongs to a different optimization run, "
+                                   f"starting from scratch")
+                    return {}
+                continue
+            records[record['index']] = record
+        return records
+
+    def open(self, resume=False):
+        """
+        Open the journal for writing.
+
+        Args:
+            resume (bool): Append to the journal of the same run instead of
+                starting a new one
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        if resume and self._has_header():
+            # A crash mid-write leaves a partial line; start the next record on its own line
+            partial = False
+            with open(self.path, 'rb') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    partial = f.read(1) != b'\n'
+            self._file = open(self.path, 'a')
+            if partial:
+                self._file.write('\n')
+        else:
+            self._file = open(self.path, 'w')
+            self._write({'fingerprint': self.fingerprint, 'created': time.time()})
+        self._sync()
+
+    def record(self, index, result):
+        """
+        Append a completed evaluation.
+
+        Args:
+            index (int): Grid index of the parameters (0-based)
+            result (dict): Evaluation with parameters, train_score, test_score,
+                train_result and test_result, or an error
+        """
+        if self._file is None:
+            return
+
+        record = {
+            'index': index,
+            'parameters': result.get('parameters'),
+            'train_score': result.get('train_score'),
+            'test_score': result.get('test_score'),
+            'train_metrics': (result.get('train_result') or {}).get('statistics'),
+            'test_metrics': (result.get('test_result') or {}).get('statistics')
+        }
+        if result.get('error') is not None:
+            record['error'] = result['error']
+        if result.get('pruned'):
+            record['pruned'] = result['pruned']
+        self._write(record)
+
+        if time.time() - self._last_sync >= self.sync_interval:
+            self._sync()
+
+    def close(self):
+        """Write outstanding records to disk and close the file."""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def to_result(record):
+        """
+        Rebuild an optimizer result from a journal record.
+
+        Args:
+            record (dict): Journal record
+
+        Returns:
+            dict: Result in the form of FixedOptimizer's all_results entries
+        """
+        result = {
+            'parameters': record['parameters'],
+            'train_score': record['train_score'],
+            'test_score': record['test_score'],
+            'resumed': True
+        }
+        if 'error' in record:
+            result['error'] = record['error']
+        elif 'pruned' in record:
+            result['pruned'] = record['pruned']
+            result['train_result'] = {'statistics': record.get('train_metrics') or {}}
+            result['test_result'] = None
+        else:
+            result['train_result'] = {'statistics': record.get('train_metrics') or {}}
+            result['test_result'] = {'statistics': record.get('test_metrics') or {}}
+        return result
+
+    def _has_header(self):
+        try:
+            with open(self.path) as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError):
+            return False
+        return header.get('fingerprint') == self.fingerprint
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, default=_to_builtin) + '\n')
+        self._file.flush()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.time()
+
+
+def get_journal(setting, output_dir, fingerprint):
+    """
+    Get the journal for an optimization.checkpoint setting.
+
+    Args:
+        setting (bool, str or None): False disables the journal, a string is
+            its path, True or None use <output_dir>/optimization_journal.jsonl
+            (True falls back to optimization_results/ without an output
+            directory, None disables it)
+        output_dir (str, optional): Output directory of the run
+        fingerprint (str): Run fingerprint from get_run_fingerprint
+
+    Returns:
+        OptimizationJournal: Journal, or None if checkpointing is disabled
+    """
+    if setting is False:
+        return None
+    if isinstance(setting, str):
+        path = setting
+    elif output_dir:
+        path = os.path.join(output_dir, JOURNAL_FILENAME)
+    elif setting:
+        path = DEFAULT_JOURNAL_PATH
+    else:
+        return None
+    return OptimizationJournal(path, fingerprint)
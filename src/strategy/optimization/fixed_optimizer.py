@@ -8,17 +8,86 @@ strategy state is not carried over between the train and test runs.
 import logging
 import os
 import time
-import random
+import threading
 import uuid
 import json
-import numpy as np
 import importlib
 from pathlib import Path
 from datetime import datetime
 
+from src.strategy.optimization.parallel import ParallelEvaluator, warm_market_data
+from src.strategy.optimization.checkpoint import OptimizationJournal, get_journal, get_run_fingerprint
+from src.strategy.components.indicators.indicator_cache import indicator_session, open_indicator_session
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Searches that score candidates on the training split before testing the best
+ADAPTIVE_METHODS = ('successive_halving', 'hyperband', 'bayesian')
+
+# Optimizer rebuilt in each worker by _init_worker; thread workers get their own
+_worker_state = threading.local()
+
+
+def _init_worker(state):
+    """
+    Prepare a worker to evaluate parameter combinations.
+    
+    Args:
+        state (dict): Optimizer settings from FixedOptimizer._create_evaluator
+    """
+    _worker_state.optimizer = FixedOptimizer(
+        state['strategy_name'],
+        state['config'],
+        state['parameter_space'],
+        state['objective_function']
+    )
+    _worker_state.bootstrap = None
+    if state['bootstrap_config'] is not None:
+        from types import SimpleNamespace
+        _worker_state.bootstrap = SimpleNamespace(config=state['bootstrap_config'])
+    
+    # Parse market data once per worker; later runs hit the worker's data cache
+    data_config = dict(state['config'].get('data', {}))
+    if 'max_bars' in state['config']:
+        data_config['max_bars'] = state['config']['max_bars']
+    warm_market_data(data_config)
+    
+    # Indicator series are shared by the evaluations of this worker
+    if state['config'].get('optimization', {}).get('indicator_cache', True):
+        open_indicator_session()
+
+
+def _evaluate_in_worker(task):
+    """
+    Evaluate one (index, parameters, best score) task in a worker.
+    
+    Args:
+        task (tuple): Combination number, parameters and the best training
+            score when the task was submitted (for pruning)
+        
+    Returns:
+        dict: Result from FixedOptimizer._evaluate_combination
+    """
+    idx, params, best_score = task
+    optimizer = _worker_state.optimizer
+    optimizer.prune_score_bound = best_score
+    return optimizer._evaluate_combination(idx, params, _worker_state.bootstrap)
+
+
+def _score_in_worker(params, budget=None):
+    """
+    Score parameters on the training split in a worker.
+    
+    Args:
+        params (dict): Strategy parameters
+        budget (int, optional): Number of bars to use, None for all
+        
+    Returns:
+        float: Result from FixedOptimizer._score_training
+    """
+    return _worker_state.optimizer._score_training(params, budget, _worker_state.bootstrap)
+
 class FixedOptimizer:
     """
     Optimizer implementation with train/test split and proper isolation.
@@ -27,7 +96,8 @@ class FixedOptimizer:
     runs to prevent overfitting and state leakage.
     """
     
-    def __init__(self, strategy_name, config, parameter_space, objective_function=None):
+    def __init__(self, strategy_name, config, parameter_space, objective_function=None,
+                 executor=None, max_workers=None):
         """
         Initialize the optimizer.
         
@@ -36,6 +106,10 @@ class FixedOptimizer:
             config (dict): Base configuration dictionary
             parameter_space (object): Parameter space for optimization
             objective_function (callable, optional): Function to evaluate results
+            executor (str, optional): 'serial', 'thread' or 'process'; defaults to
+                optimization.executor in the config
+            max_workers (int, optional): Number of parallel workers; defaults to
+                optimization.max_workers in the config
         """
         self.strategy_name = strategy_name
         self.config = config
@@ -44,6 +118,17 @@ class FixedOptimizer:
         self.results = None
         self.best_parameters = None
         
+        # Best training score so far, the reference of the pruning score rule
+        self.prune_score_bound = None
+        
+        # Parallel evaluation settings
+        optimization_config = config.get('optimization') or {}
+        self.executor = executor or optimization_config.get('executor')
+        self.max_workers = max_workers or optimization_config.get('max_workers')
+        
+        # Share indicator series across the runs of an optimization
+        self.indicator_cache = optimization_config.get('indicator_cache', True)
+        
         # Get train_test_split configuration
         self.train_test_config = config.get('train_test_split', {})
         if not self.train_test_config:
@@ -96,17 +181,34 @@ class FixedOptimizer:
         """
         Run the optimization process.
         
+        Indicator series are cached for the duration of the run, so each
+        distinct indicator is computed once per split rather than once per
+        parameter combination.
+        
         Args:
             bootstrap (object, optional): Bootstrap object providing context
             
         Returns:
             dict: Optimization results
         """
-        logger.info(f"Starting optimization for strategy: {self.strategy_name}")
-        logger.info(f"Parameter space has {len(self.parameter_space.get_combinations())} combinations")
+        with indicator_session(self.indicator_cache):
+            return self._optimize(bootstrap)
+    
+    def _optimize(self, bootstrap=None):
+        """
+        Run the optimization process within an indicator session.
         
-        # Get parameter combinations to test
-        parameter_combinations = self.parameter_space.get_combinations()
+        Args:
+            bootstrap (object, optional): Bootstrap object providing context
+            
+        Returns:
+            dict: Optimization results
+        """
+        logger.info(f"Starting optimization for strategy: {self.strategy_name}")
+        # Get parameter combinations to test; the grid generates them on demand
+        parameter_combinations = self.parameter_space.get_grid()
+        total_combinations = len(parameter_combinations)
+        logger.info(f"Parameter space has {total_combinations} combinations")
         
         # Check if max_bars parameter is available
         max_bars = None
@@ -127,260 +229,147 @@ class FixedOptimizer:
             self.config['data']['max_bars'] = max_bars
             logger.info(f"Added max_bars={max_bars} to data config")
         
+        method = (self.config.get('optimization') or {}).get('method')
+        if method == 'walk_forward':
+            return self._optimize_walk_forward()
+        if method in ADAPTIVE_METHODS:
+            return self._optimize_adaptive(method, bootstrap)
+        
         # Prepare results storage
         all_results = []
         best_train_score = float('-inf')
         best_parameters = None
+        best_index = None
+        self.prune_score_bound = None
         best_train_result = None
         best_test_result = None
         
+        # Completed evaluations are journaled as they arrive; a resumed run skips them
+        optimization_config = self.config.get('optimization') or {}
+        fingerprint = get_run_fingerprint(self.strategy_name, parameter_combinations, self.train_test_config,
+                                          self.config)
+        journal = get_journal(optimization_config.get('checkpoint'), self.config.get('output_dir'), fingerprint)
+        completed_records = {}
+        if journal and optimization_config.get('resume'):
+            completed_records = journal.load()
+            logger.info(f"Resuming from {journal.path}: {len(completed_records)} of "
+                        f"{total_combinations} combinations already evaluated")
+        
+        for index in sorted(completed_records):
+            result = OptimizationJournal.to_result(completed_records[index])
+            all_results.append(result)
+            if result['train_score'] > best_train_score:
+                best_train_score = result['train_score']
+                best_parameters = result['parameters']
+                best_index = index
+                self.prune_score_bound = best_train_score
+        
         # Time tracking
         start_time = time.time()
-        total_combinations = len(parameter_combinations)
         progress_step = max(1, total_combinations // 20)  # Show progress every 5%
         
-        # Process each parameter combination
-        for idx, params in enumerate(parameter_combinations, 1):
-            # Log progress update
-            if idx % progress_step == 0 or idx == 1 or idx == total_combinations:
-                elapsed = time.time() - start_time
-                progress = idx / total_combinations * 100
-                est_total = elapsed / idx * total_combinations
-                remaining = est_total - elapsed
-                
-                logger.info(f"Progress: {progress:.1f}% ({idx}/{total_combinations}), " +
-                            f"Elapsed: {elapsed:.1f}s, Remaining: {remaining:.1f}s")
-            
-            # CRITICAL FIX: Create a backtest config that's a deep copy
-            # to ensure no state leakage between runs
-            import copy
-            backtest_config = copy.deepcopy(self.config)
-            
-            # CRITICAL FIX: Ensure train_test_split config is part of the backtest config
-            if 'data' not in backtest_config:
-                backtest_config['data'] = {}
-            
-            # Copy train_test_split to data config if not already present
-            if self.train_test_config and 'train_test_split' not in backtest_config['data']:
-                logger.info("Adding train_test_split configuration to backtest data config")
-                backtest_config['data']['train_test_split'] = copy.deepcopy(self.train_test_config)
-            
-            # Add current parameters to the config for this run
-            backtest_config['strategy_parameters'] = params
-            
-            # Log parameters being tested
-            params_str = ', '.join([f"{k}={v}" for k, v in params.items()])
-            logger.info(f"Testing parameters: {params_str}")
-            
-            try:
-                # Run backtest with the training data
-                logger.info(f"{'=' * 30} TRAINING BACKTEST {'=' * 30}")
-                
-                # CRITICAL FIX: Use a run-specific random seed derived from parameters
-                # This ensures reproducibility while keeping runs isolated
-                import hashlib
-                params_str = str(sorted(params.items()))
-                train_seed = int(hashlib.md5(f"{params_str}_train_{idx}".encode()).hexdigest(), 16) % (2**32)
-                random.seed(train_seed)
-                np.random.seed(train_seed)
+        # Choose how combinations are evaluated; workers load market data once each
+        evaluator = self._create_evaluator(bootstrap)
+        if completed_records:
+            # The grid decodes the remaining points from their index
+            tasks = ((index + 1, parameter_combinations[index]) for index in range(total_combinations)
+                     if index not in completed_records)
+        else:
+            tasks = enumerate(parameter_combinations, 1)
+        remaining = total_combinations - len(completed_records)
+        
+        if evaluator.is_serial:
+            def evaluate(task):
+                self._log_progress(task[0], total_combinations, progress_step, start_time)
+                return self._evaluate_combination(task[0], task[1], bootstrap)
+        else:
+            evaluate = _evaluate_in_worker
+            # Tasks are drawn as workers free up, so each carries the best score at that time
+            tasks = ((idx, params, self.prune_score_bound) for idx, params in tasks)
+        
+        if journal:
+            journal.open(resume=bool(completed_records))
+        
+        # Process each parameter combination; results arrive in evaluation order
+        outcomes = evaluator.map(evaluate, tasks, remaining)
+        try:
+            for completed, (task, result, error) in enumerate(outcomes, 1):
+                idx, params = task[0], task[1]
+                if not evaluator.is_serial:
+                    self._log_progress(completed, remaining, progress_step, start_time)
                 
-                # CRITICAL FIX: Create a fresh bootstrap context for each run
-                # to ensure complete isolation
-                if bootstrap:
-                    # Create a fresh context with the required dependencies
-                    context = self._create_fresh_context(bootstrap, params, 'train')
-                    
-                    # Import here to avoid circular imports
-                    from src.execution.backtest.optimizing_backtest import OptimizingBacktest
-                    
-                    # Create a fresh backtest coordinator instance (with unique name)
-                    backtest_id = f"train_{idx}_{uuid.uuid4().hex[:8]}"
-                    backtest = OptimizingBacktest(
-                        name=f"backtest_{backtest_id}", 
-                        config=backtest_config,
-                        parameter_space=self.parameter_space
-                    )
-                    
-                    # Initialize with our fresh context
-                    backtest.initialize(context)
-                    
-                    # Get a fresh instance of the strategy
-                    strategy_factory = context.get('strategy_factory')
-                    if not strategy_factory:
-                        raise ValueError("Strategy factory not found in context")
-                    
-                    # CRITICAL FIX: Force garbage collection before running
-                    # to ensure maximum memory availability
-                    import gc
-                    gc.collect()
-                    
-                    # Run backtest with training data
-                    train_result = backtest._run_backtest_with_params(
-                        self.strategy_name,
-                        params,
-                        'train',
-                        self.train_test_config
-                    )
-                    
-                    # CRITICAL FIX: Force garbage collection after train run
-                    # to ensure no state leakage
-                    gc.collect()
-                    
-                    # Run backtest with test data
-                    logger.info(f"{'=' * 30} TESTING BACKTEST {'=' * 30}")
-                    # Use a different seed for test run
-                    test_seed = int(hashlib.md5(f"{params_str}_test_{idx}".encode()).hexdigest(), 16) % (2**32)
-                    random.seed(test_seed)
-                    np.random.seed(test_seed)
-                    
-                    # Create a fresh context for the test run
-                    test_context = self._create_fresh_context(bootstrap, params, 'test')
-                    
-                    # Create a fresh backtest instance for test
-                    backtest_id = f"test_{idx}_{uuid.uuid4().hex[:8]}"
-                    test_backtest = OptimizingBacktest(
-                        name=f"backtest_{backtest_id}",
-                        config=backtest_config,
-                        parameter_space=self.parameter_space
-                    )
-                    
-                    # Initialize with our fresh context
-                    test_backtest.initialize(test_context)
-                    
-                    # Run backtest with test data
-                    test_result = test_backtest._run_backtest_with_params(
-                        self.strategy_name,
-                        params,
-                        'test',
-                        self.train_test_config
-                    )
-                else:
-                    # No bootstrap provided, create a minimal ad-hoc backtest
-                    logger.info("Creating minimal backtest environment as no bootstrap was provided")
-                    
-                    # Create necessary components for a minimal backtest
-                    from src.data.historical_data_handler import HistoricalDataHandler
-                    from src.core.events.event_bus import EventBus
-                    from src.core.trade_repository import TradeRepository
-                    from src.execution.backtest.optimizing_backtest import OptimizingBacktest
-                    from src.strategy.strategy_factory import StrategyFactory
-                    
-                    # Create a minimal bootstrap context
-                    event_bus = EventBus()
-                    trade_repository = TradeRepository()
-                    strategy_factory = StrategyFactory()
-                    
-                    # Create a minimal context
-                    context = {
-                        'event_bus': event_bus,
-                        'trade_repository': trade_repository,
-                        'strategy_factory': strategy_factory,
-                        'config': backtest_config.copy(),
-                        'data_split': 'train'
-                    }
+                if error is not None:
+                    logger.error(f"Error testing parameters {params}: {error}")
+                    logger.error("Exception details:", exc_info=error)
                     
-                    # Create a parameter space aware backtest coordinator
-                    backtest = OptimizingBacktest('backtest', backtest_config, self.parameter_space)
-                    backtest.initialize(context)
+                    # Add failed result to track errors
+                    all_results.append({
+                        'parameters': params,
+                        'train_score': float('-inf'),
+                        'test_score': float('-inf'),
+                        'error': str(error)
+                    })
+                    if journal:
+                        journal.record(idx - 1, all_results[-1])
                     
-                    # Run backtest with training data
-                    train_result = backtest._run_backtest_with_params(
-                        self.strategy_name,
-                        params,
-                        'train',
-                        self.train_test_config
-                    )
-                    
-                    # CRITICAL FIX: Force garbage collection after train run
-                    # to ensure no state leakage
+                    # Force garbage collection to clean up resources
                     import gc
                     gc.collect()
-                    
-                    # Run backtest with test data
-                    logger.info(f"{'=' * 30} TESTING BACKTEST {'=' * 30}")
-                    # Use a different seed for test run
-                    test_seed = int(hashlib.md5(f"{params_str}_test_{idx}".encode()).hexdigest(), 16) % (2**32)
-                    random.seed(test_seed)
-                    np.random.seed(test_seed)
-                    
-                    # Update context for test run
-                    context['data_split'] = 'test'
-                    
-                    # Create a fresh backtest instance for test
-                    backtest_id = f"test_{idx}_{uuid.uuid4().hex[:8]}"
-                    test_backtest = OptimizingBacktest(
-                        name=f"backtest_{backtest_id}",
-                        config=backtest_config,
-                        parameter_space=self.parameter_space
-                    )
-                    
-                    # Initialize with test context
-                    test_backtest.initialize(context)
-                    
-                    # Run backtest with test data
-                    test_result = test_backtest._run_backtest_with_params(
-                        self.strategy_name,
-                        params,
-                        'test',
-                        self.train_test_config
-                    )
-                
-                # Calculate training score
-                train_score = self.objective_function(train_result)
-                test_score = self.objective_function(test_result)
-                
-                # Get statistics for display
-                train_stats = train_result.get('statistics', {})
-                test_stats = test_result.get('statistics', {})
-                
-                # Log results
-                logger.info(f"Train score: {train_score:.4f}, "
-                            f"Return: {train_stats.get('return_pct', 0):.2f}%, "
-                            f"Sharpe: {train_stats.get('sharpe_ratio', 0):.2f}")
-                logger.info(f"Test score: {test_score:.4f}, "
-                            f"Return: {test_stats.get('return_pct', 0):.2f}%, "
-                            f"Sharpe: {test_stats.get('sharpe_ratio', 0):.2f}")
-                
-                # Store result
-                result = {
-                    'parameters': params,
-                    'train_score': train_score,
-                    'test_score': test_score,
-                    'train_result': train_result,
-                    'test_result': test_result
-                }
+                    continue
                 
                 all_results.append(result)
+                if journal:
+                    journal.record(idx - 1, result)
                 
-                # Update best result if this is better
-                if train_score > best_train_score:
+                # Update best result if this is better; ties go to the earlier grid point
+                train_score = result['train_score']
+                test_score = result['test_score']
+                if train_score > best_train_score or (
+                        train_score == best_train_score and best_index is not None and idx - 1 < best_index):
                     best_train_score = train_score
                     best_parameters = params
-                    best_train_result = train_result
-                    best_test_result = test_result
+                    best_index = idx - 1
+                    self.prune_score_bound = best_train_score
+                    best_train_result = result['train_result']
+                    best_test_result = result['test_result']
                     
-                    logger.info(f"New best parameters: {params_str}")
+                    logger.info(f"New best parameters: {str(sorted(params.items()))}")
                     logger.info(f"Best train score: {train_score:.4f}, Best test score: {test_score:.4f}")
-                
-            except Exception as e:
-                logger.error(f"Error testing parameters {params}: {e}")
-                logger.exception("Exception details:")
-                
-                # Add failed result to track errors
-                all_results.append({
-                    'parameters': params,
-                    'train_score': float('-inf'),
-                    'test_score': float('-inf'),
-                    'error': str(e)
-                })
-                
-                # Force garbage collection to clean up resources
-                import gc
-                gc.collect()
+        finally:
+            if journal:
+                journal.close()
+        
+        # The journal only holds metrics, so a best point from a previous run is run again
+        if best_parameters is not None and best_train_result is None:
+            logger.info(f"Re-running best journaled parameters: {str(sorted(best_parameters.items()))}")
+            result = self._evaluate_combination(best_index + 1, best_parameters, bootstrap)
+            best_train_result = result['train_result']
+            best_test_result = result['test_result']
         
         # Calculate total elapsed time
         total_time = time.time() - start_time
         logger.info(f"Optimization completed in {total_time:.1f} seconds")
+
+        # Report how often runs reused already parsed market data
+        from src.data.market_data_cache import get_market_data_cache
+        cache_stats = get_market_data_cache().get_stats()
+        logger.info(f"Market data cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                    f"({cache_stats['hit_rate']:.1%} hit rate), {cache_stats['bytes'] / 1e6:.1f} MB held")
+        
+        # Report how many backtests were answered by the persistent result cache;
+        # results carry the flag, so runs in worker processes are counted too
+        result_cache_stats = None
+        if (self.config.get('optimization') or {}).get('result_cache'):
+            from src.execution.backtest.result_cache import hit_stats
+            runs = [result.get(key) for result in all_results for key in ('train_result', 'test_result')]
+            hits = sum(1 for run in runs if run and run.get('cache_hit'))
+            result_cache_stats = hit_stats(hits, sum(1 for run in runs if run) - hits)
+            logger.info(f"Result cache: {result_cache_stats['hits']} hits, {result_cache_stats['misses']} misses "
+                        f"({result_cache_stats['hit_rate']:.1%} hit rate)")
+        
+        pruned_count = sum(1 for result in all_results if result.get('pruned'))
+        if pruned_count:
+            logger.info(f"Pruned {pruned_count} of {len(all_results)} combinations before the end of the data")
         
         # Sort results by train score
         all_results.sort(key=lambda x: x.get('train_score', float('-inf')), reverse=True)
@@ -392,7 +381,12 @@ class FixedOptimizer:
             'best_test_score': self.objective_function(best_test_result) if best_test_result else float('-inf'),
             'all_results': all_results,
             'parameter_count': len(parameter_combinations),
+            'resumed_count': len(completed_records),
+            'pruned_count': pruned_count,
+            'journal_file': journal.path if journal else None,
             'execution_time': total_time,
+            'data_cache': cache_stats,
+            'result_cache': result_cache_stats,
             'train_test_split': self.train_test_config,
             'strategy_name': self.strategy_name
         }
@@ -467,6 +461,528 @@ class FixedOptimizer:
         
         return self.results
     
+    def _optimize_walk_forward(self):
+        """
+        Run walk-forward optimization over windows of the loaded data.
+        
+        Settings are read from the optimization config: window_size,
+        step_size, test_size, window_type, window_unit ('days' or 'bars'),
+        search_method ('grid' or 'random'), max_evaluations_per_window,
+        num_trials, random_seed and cache_file (default:
+        walk_forward_cache.pkl in the output directory).
+        Windows are optimized concurrently with the configured executor.
+        
+        Returns:
+            dict: Optimization results with the walk-forward details
+        """
+        from src.core.events.event_bus import EventBus
+        from src.data.historical_data_handler import HistoricalDataHandler
+        from src.strategy.optimization.walk_forward import (
+            WalkForwardCache, WalkForwardOptimizer, WindowBacktest
+        )
+        
+        optimization_config = self.config.get('optimization') or {}
+        start_time = time.time()
+        
+        # Windows are computed once on a handler holding the full data
+        data_handler = HistoricalDataHandler('walk_forward_data_handler', dict(self.config.get('data', {})))
+        data_handler.initialize({'event_bus': EventBus()})
+        
+        cache_file = optimization_config.get('cache_file')
+        if not cache_file and self.config.get('output_dir'):
+            cache_file = os.path.join(self.config['output_dir'], 'walk_forward_cache.pkl')
+        
+        # Reporter output is produced in this process only
+        backtest_config = {k: v for k, v in self.config.items() if k != 'reporter'}
+        optimizer = WalkForwardOptimizer(
+            data_handler,
+            WindowBacktest(self.strategy_name, backtest_config, strategy_dirs=self.config.get('strategy_dirs')),
+            optimization_config.get('search_method', 'grid'),
+            executor=self.executor,
+            max_workers=self.max_workers,
+            cache=WalkForwardCache(cache_file)
+        )
+        objective = None if self.objective_function == self._default_objective else self.objective_function
+        walk_forward = optimizer.optimize(
+            self.parameter_space,
+            window_size=optimization_config.get('window_size', 60),
+            step_size=optimization_config.get('step_size', 20),
+            test_size=optimization_config.get('test_size'),
+            window_type=optimization_config.get('window_type', 'rolling'),
+            unit=optimization_config.get('window_unit', 'days'),
+            objective_function=objective,
+            max_evaluations_per_window=optimization_config.get('max_evaluations_per_window'),
+            random_samples=optimization_config.get('num_trials'),
+            random_seed=optimization_config.get('random_seed')
+        )
+        
+        oos_scores = [r['out_of_sample_score'] for r in walk_forward['results']
+                      if r['out_of_sample_score'] is not None]
+        oos_curve = walk_forward['oos_equity_curve']
+        walk_forward['oos_equity_curve'] = oos_curve.reset_index().to_dict('records')
+        
+        self.results = {
+            'best_parameters': walk_forward['best_parameters'],
+            'best_score': sum(oos_scores) / len(oos_scores) if oos_scores else float('-inf'),
+            'parameter_count': self.parameter_space.get_combination_count(),
+            'execution_time': time.time() - start_time,
+            'walk_forward': walk_forward,
+            'strategy_name': self.strategy_name
+        }
+        self.best_parameters = walk_forward['best_parameters']
+        
+        logger.info(f"Walk-forward optimization completed in {self.results['execution_time']:.1f} seconds, "
+                    f"mean out-of-sample score {self.results['best_score']:.4f}")
+        
+        # Generate report if reporter is configured
+        if self.reporter:
+            try:
+                self.reporter.generate_report(self.results)
+            except Exception as e:
+                logger.error(f"Error generating report: {e}")
+        
+        return self.results
+    
+    def _optimize_adaptive(self, method, bootstrap=None):
+        """
+        Run a successive halving, Hyperband or Bayesian (TPE) search.
+        
+        Candidates are scored on the training split only; the best parameters
+        are then run on the train and test splits like any grid point.
+        Settings are read from the optimization config: num_trials,
+        random_seed and max_time, initial_trials for the Bayesian search, and
+        min_budget (bars) and eta for successive halving and Hyperband.
+        
+        Args:
+            method (str): 'successive_halving', 'hyperband' or 'bayesian'
+            bootstrap (object, optional): Bootstrap object providing context
+            
+        Returns:
+            dict: Optimization results
+        """
+        from src.strategy.optimization.bayesian_search import BayesianSearch
+        from src.strategy.optimization.successive_halving import SuccessiveHalving, data_bar_count
+        
+        optimization_config = self.config.get('optimization') or {}
+        start_time = time.time()
+        
+        evaluator = self._create_evaluator(bootstrap)
+        if evaluator.is_serial:
+            def objective(params, budget=None):
+                return self._score_training(params, budget, bootstrap)
+        else:
+            objective = _score_in_worker
+        
+        if method == 'bayesian':
+            search = BayesianSearch(self.parameter_space, optimization_config.get('random_seed'))
+            search_results = search.search(
+                objective,
+                num_samples=optimization_config.get('num_trials', 50),
+                max_time=optimization_config.get('max_time'),
+                n_initial=optimization_config.get('initial_trials'),
+                evaluator=evaluator
+            )
+        else:
+            # Budgets are prefixes of the data the backtests load
+            data_config = dict(self.config.get('data', {}))
+            if 'max_bars' in self.config:
+                data_config['max_bars'] = self.config['max_bars']
+            search = SuccessiveHalving(self.parameter_space, optimization_config.get('random_seed'))
+            search_results = search.search(
+                objective,
+                max_budget=data_bar_count(data_config),
+                min_budget=optimization_config.get('min_budget'),
+                eta=optimization_config.get('eta', 3),
+                hyperband=method == 'hyperband',
+                num_samples=optimization_config.get('num_trials'),
+                max_time=optimization_config.get('max_time'),
+                evaluator=evaluator
+            )
+        
+        best_parameters = search_results['best_params']
+        all_results = [{
+            'parameters': result['params'],
+            'train_score': result['score'],
+            'budget': result.get('budget')
+        } for result in search_results['results']]
+        
+        self.results = {
+            'best_parameters': best_parameters,
+            'best_score': search_results['best_score'],
+            'all_results': all_results,
+            'evaluations': search_results['evaluations'],
+            'method': method,
+            'train_test_split': self.train_test_config,
+            'strategy_name': self.strategy_name
+        }
+        self.best_parameters = best_parameters
+        
+        if best_parameters is None:
+            logger.error(f"{method} search produced no results")
+        else:
+            # Validate the winner on the test split
+            final = self._evaluate_combination(1, best_parameters, bootstrap)
+            self.results.update({
+                'best_train_score': final['train_score'],
+                'best_test_score': final['test_score'],
+                'train_results': final['train_result'],
+                'test_results': final['test_result']
+            })
+        
+        self.results['execution_time'] = time.time() - start_time
+        logger.info(f"{method} optimization completed in {self.results['execution_time']:.1f} seconds "
+                    f"with {search_results['evaluations']} evaluations")
+        
+        # Generate report if reporter is configured
+        if self.reporter:
+            try:
+                self.reporter.generate_report(self.results)
+            except Exception as e:
+                logger.error(f"Error generating report: {e}")
+        
+        return self.results
+    
+    def _score_training(self, params, budget=None, bootstrap=None):
+        """
+        Score parameters with a backtest on the training split.
+        
+        Args:
+            params (dict): Strategy parameters
+            budget (int, optional): Only use the first ``budget`` bars of the data
+                (applied as max_bars); None uses all of it
+            bootstrap (object, optional): Bootstrap object providing context
+            
+        Returns:
+            float: Objective score of the training run
+        """
+        import copy
+        from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+        
+        backtest_config = copy.deepcopy({k: v for k, v in self.config.items() if k != 'reporter'})
+        backtest_config['strategy_parameters'] = params
+        if budget is not None:
+            max_bars = backtest_config.get('max_bars')
+            backtest_config['max_bars'] = min(budget, max_bars) if max_bars else budget
+        
+        if bootstrap:
+            context = self._create_fresh_context(bootstrap, params, 'train')
+        else:
+            from src.core.events.event_bus import EventBus
+            from src.core.trade_repository import TradeRepository
+            from src.strategy.strategy_factory import StrategyFactory
+            context = {
+                'event_bus': EventBus(),
+                'trade_repository': TradeRepository(),
+                'strategy_factory': StrategyFactory(),
+                'config': backtest_config.copy(),
+                'data_split': 'train'
+            }
+        
+        backtest = OptimizingBacktest(f"backtest_train_{uuid.uuid4().hex[:8]}", backtest_config,
+                                      self.parameter_space)
+        backtest.initialize(context)
+        result = backtest._run_backtest_with_params(self.strategy_name, params, 'train', self.train_test_config)
+        
+        # Runs stopped by the drawdown or trade rules never win; scores on different
+        # budgets are not comparable, so the score rule is not used here
+        if result.get('pruned'):
+            logger.info(f"Pruned parameters {params} after {result['pruned']['bar']} bars: "
+                        f"{result['pruned']['reason']}")
+            return float('-inf')
+        
+        score = self.objective_function(result)
+        logger.info(f"Train score: {score:.4f} on {budget or 'all'} bars with parameters {params}")
+        return score
+    
+    def _create_evaluator(self, bootstrap):
+        """
+        Create the evaluator that runs parameter combinations.
+        
+        Args:
+            bootstrap (object): Bootstrap object providing context, or None
+            
+        Returns:
+            ParallelEvaluator: Serial, thread or process evaluator
+        """
+        settings = {
+            'executor': self.executor,
+            'max_workers': self.max_workers,
+            'batch_size': self.config.get('optimization', {}).get('batch_size')
+        }
+        
+        # Reporter output is produced in this process only
+        worker_config = {k: v for k, v in self.config.items() if k != 'reporter'}
+        objective = None if self.objective_function == self._default_objective else self.objective_function
+        state = {
+            'strategy_name': self.strategy_name,
+            'config': worker_config,
+            'parameter_space': self.parameter_space,
+            'objective_function': objective,
+            'bootstrap_config': getattr(bootstrap, 'config', None) if bootstrap else None
+        }
+        evaluator = ParallelEvaluator.from_config(settings, initializer=_init_worker, initargs=(state,))
+        if not evaluator.is_serial:
+            logger.info(f"Evaluating parameter combinations with {evaluator.executor} executor "
+                        f"({evaluator.max_workers or 'default'} workers)")
+        return evaluator
+    
+    def _log_progress(self, idx, total_combinations, progress_step, start_time):
+        """
+        Log a progress update every ``progress_step`` combinations.
+        
+        Args:
+            idx (int): Number of the current combination (1-based)
+            total_combinations (int): Number of combinations
+            progress_step (int): Log interval
+            start_time (float): Optimization start time
+        """
+        if idx % progress_step == 0 or idx == 1 or idx == total_combinations:
+            elapsed = time.time() - start_time
+            progress = idx / total_combinations * 100
+            est_total = elapsed / idx * total_combinations
+            remaining = est_total - elapsed
+            
+            logger.info(f"Progress: {progress:.1f}% ({idx}/{total_combinations}), " +
+                        f"Elapsed: {elapsed:.1f}s, Remaining: {remaining:.1f}s")
+    
+    def _configure_pruning(self, backtest):
+        """
+        Let a training backtest stop early, as configured by optimization.pruning.
+        
+        Args:
+            backtest (OptimizingBacktest): Backtest about to run the training split
+        """
+        backtest.prune_objective = self.objective_function
+        backtest.prune_score_bound = self.prune_score_bound
+    
+    def _pruned_result(self, params, train_result):
+        """
+        Build the result of a combination whose training run was pruned.
+        
+        Args:
+            params (dict): Strategy parameters
+            train_result (dict): Partial training results
+            
+        Returns:
+            dict: Result that never becomes the best
+        """
+        pruned = train_result['pruned']
+        logger.info(f"Pruned parameters {params} after {pruned['bar']} bars: {pruned['reason']}")
+        return {
+            'parameters': params,
+            'train_score': float('-inf'),
+            'test_score': float('-inf'),
+            'train_result': train_result,
+            'test_result': None,
+            'pruned': pruned
+        }
+    
+    def _evaluate_combination(self, idx, params, bootstrap=None):
+        """
+        Run the train and test backtests for one parameter combination.
+        
+        Args:
+            idx (int): Number of the combination (1-based), used in run names
+            params (dict): Strategy parameters
+            bootstrap (object, optional): Bootstrap object providing context
+            
+        Returns:
+            dict: Parameters, train/test scores and train/test results
+        """
+        # CRITICAL FIX: Create a backtest config that's a deep copy
+        # to ensure no state leakage between runs
+        import copy
+        backtest_config = copy.deepcopy(self.config)
+        
+        # CRITICAL FIX: Ensure train_test_split config is part of the backtest config
+        if 'data' not in backtest_config:
+            backtest_config['data'] = {}
+        
+        # Copy train_test_split to data config if not already present
+        if self.train_test_config and 'train_test_split' not in backtest_config['data']:
+            logger.info("Adding train_test_split configuration to backtest data config")
+            backtest_config['data']['train_test_split'] = copy.deepcopy(self.train_test_config)
+        
+        # Add current parameters to the config for this run
+        backtest_config['strategy_parameters'] = params
+        
+        # Log parameters being tested
+        params_str = ', '.join([f"{k}={v}" for k, v in params.items()])
+        logger.info(f"Testing parameters: {params_str}")
+        
+        # Run backtest with the training data
+        logger.info(f"{'=' * 30} TRAINING BACKTEST {'=' * 30}")
+        
+        # Each backtest seeds its own random generator from the parameters and
+        # split, so runs are reproducible and isolated in any executor
+        
+        # CRITICAL FIX: Create a fresh bootstrap context for each run
+        # to ensure complete isolation
+        if bootstrap:
+            # Create a fresh context with the required dependencies
+            context = self._create_fresh_context(bootstrap, params, 'train')
+            
+            # Import here to avoid circular imports
+            from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+            
+            # Create a fresh backtest coordinator instance (with unique name)
+            backtest_id = f"train_{idx}_{uuid.uuid4().hex[:8]}"
+            backtest = OptimizingBacktest(
+                name=f"backtest_{backtest_id}", 
+                config=backtest_config,
+                parameter_space=self.parameter_space
+            )
+            
+            # Initialize with our fresh context
+            backtest.initialize(context)
+            self._configure_pruning(backtest)
+            
+            # Get a fresh instance of the strategy
+            strategy_factory = context.get('strategy_factory')
+            if not strategy_factory:
+                raise ValueError("Strategy factory not found in context")
+            
+            # CRITICAL FIX: Force garbage collection before running
+            # to ensure maximum memory availability
+            import gc
+            gc.collect()
+            
+            # Run backtest with training data
+            train_result = backtest._run_backtest_with_params(
+                self.strategy_name,
+                params,
+                'train',
+                self.train_test_config
+            )
+            
+            # A pruned training run is not worth testing
+            if train_result.get('pruned'):
+                return self._pruned_result(params, train_result)
+            
+            # CRITICAL FIX: Force garbage collection after train run
+            # to ensure no state leakage
+            gc.collect()
+            
+            # Run backtest with test data
+            logger.info(f"{'=' * 30} TESTING BACKTEST {'=' * 30}")
+            
+            # Create a fresh context for the test run
+            test_context = self._create_fresh_context(bootstrap, params, 'test')
+            
+            # Create a fresh backtest instance for test
+            backtest_id = f"test_{idx}_{uuid.uuid4().hex[:8]}"
+            test_backtest = OptimizingBacktest(
+                name=f"backtest_{backtest_id}",
+                config=backtest_config,
+                parameter_space=self.parameter_space
+            )
+            
+            # Initialize with our fresh context
+            test_backtest.initialize(test_context)
+            
+            # Run backtest with test data
+            test_result = test_backtest._run_backtest_with_params(
+                self.strategy_name,
+                params,
+                'test',
+                self.train_test_config
+            )
+        else:
+            # No bootstrap provided, create a minimal ad-hoc backtest
+            logger.info("Creating minimal backtest environment as no bootstrap was provided")
+            
+            # Create necessary components for a minimal backtest
+            from src.data.historical_data_handler import HistoricalDataHandler
+            from src.core.events.event_bus import EventBus
+            from src.core.trade_repository import TradeRepository
+            from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+            from src.strategy.strategy_factory import StrategyFactory
+            
+            # Create a minimal bootstrap context
+            event_bus = EventBus()
+            trade_repository = TradeRepository()
+            strategy_factory = StrategyFactory()
+            
+            # Create a minimal context
+            context = {
+                'event_bus': event_bus,
+                'trade_repository': trade_repository,
+                'strategy_factory': strategy_factory,
+                'config': backtest_config.copy(),
+                'data_split': 'train'
+            }
+            
+            # Create a parameter space aware backtest coordinator
+            backtest = OptimizingBacktest('backtest', backtest_config, self.parameter_space)
+            backtest.initialize(context)
+            self._configure_pruning(backtest)
+            
+            # Run backtest with training data
+            train_result = backtest._run_backtest_with_params(
+                self.strategy_name,
+                params,
+                'train',
+                self.train_test_config
+            )
+            
+            # A pruned training run is not worth testing
+            if train_result.get('pruned'):
+                return self._pruned_result(params, train_result)
+            
+            # CRITICAL FIX: Force garbage collection after train run
+            # to ensure no state leakage
+            import gc
+            gc.collect()
+            
+            # Run backtest with test data
+            logger.info(f"{'=' * 30} TESTING BACKTEST {'=' * 30}")
+            
+            # Update context for test run
+            context['data_split'] = 'test'
+            
+            # Create a fresh backtest instance for test
+            backtest_id = f"test_{idx}_{uuid.uuid4().hex[:8]}"
+            test_backtest = OptimizingBacktest(
+                name=f"backtest_{backtest_id}",
+                config=backtest_config,
+                parameter_space=self.parameter_space
+            )
+            
+            # Initialize with test context
+            test_backtest.initialize(context)
+            
+            # Run backtest with test data
+            test_result = test_backtest._run_backtest_with_params(
+                self.strategy_name,
+                params,
+                'test',
+                self.train_test_config
+            )
+        
+        # Calculate training score
+        train_score = self.objective_function(train_result)
+        test_score = self.objective_function(test_result)
+        
+        # Get statistics for display
+        train_stats = train_result.get('statistics', {})
+        test_stats = test_result.get('statistics', {})
+        
+        # Log results
+        logger.info(f"Train score: {train_score:.4f}, "
+                    f"Return: {train_stats.get('return_pct', 0):.2f}%, "
+                    f"Sharpe: {train_stats.get('sharpe_ratio', 0):.2f}")
+        logger.info(f"Test score: {test_score:.4f}, "
+                    f"Return: {test_stats.get('return_pct', 0):.2f}%, "
+                    f"Sharpe: {test_stats.get('sharpe_ratio', 0):.2f}")
+        
+        return {
+            'parameters': params,
+            'train_score': train_score,
+            'test_score': test_score,
+            'train_result': train_result,
+            'test_result': test_result
+        }
+    
     def _create_fresh_context(self, bootstrap, params, split_type):
         """
         Create a fresh context for a backtest run.
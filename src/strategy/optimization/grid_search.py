@@ -12,6 +12,8 @@ from typing import Dict, Any, List, Tuple, Optional, Callable, Union, Iterator
 
 from src.core.exceptions import OptimizationError
 from src.strategy.optimization.parameter_space import ParameterSpace
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.execution.backtest.pruning import PrunedRun, share_best_score
 from src.core.logging.structured_logger import get_logger
 
 logger = get_logger(__name__)
@@ -34,7 +36,8 @@ class GridSearch:
     
     def search(self, objective_function: Callable[[Dict[str, Any]], float], 
                maximize: bool = True, max_evaluations: Optional[int] = None,
-               max_time: Optional[float] = None, callback: Optional[Callable] = None) -> Dict[str, Any]:
+               max_time: Optional[float] = None, callback: Optional[Callable] = None,
+               executor: str = 'serial', max_workers: Optional[int] = None) -> Dict[str, Any]:
         """Perform grid search.
         
         Args:
@@ -44,6 +47,9 @@ class GridSearch:
             max_time: Maximum time in seconds (default: None)
             callback: Optional callback function called after each evaluation
                 with arguments (params, score, is_best)
+            executor: 'serial', 'thread' or 'process' (default: 'serial');
+                the process executor requires a picklable objective function
+            max_workers: Number of parallel workers (default: executor's default)
             
         Returns:
             Dictionary with search results
@@ -72,55 +78,59 @@ class GridSearch:
         # Start timing
         start_time = time.time()
         evaluations = 0
+        pruned = 0
+        evaluator = ParallelEvaluator(executor, max_workers)
         
-        # Evaluate each parameter combination
-        for params in all_points:
-            # Check termination conditions
-            if max_evaluations is not None and evaluations >= max_evaluations:
-                logger.info(f"Stopping grid search: reached max evaluations ({max_evaluations})")
-                break
-            
-            if max_time is not None and time.time() - start_time > max_time:
-                logger.info(f"Stopping grid search: reached max time ({max_time}s)")
-                break
-            
-            # Evaluate parameters
-            try:
-                score = objective_function(params)
-                evaluations += 1
+        if evaluator.is_serial:
+            # Evaluate each parameter combination
+            for params in all_points:
+                # Check termination conditions
+                if max_evaluations is not None and evaluations >= max_evaluations:
+                    logger.info(f"Stopping grid search: reached max evaluations ({max_evaluations})")
+                    break
                 
-                # Record result
-                result = {
-                    'params': params,
-                    'score': score,
-                    'evaluation': evaluations,
-                    'timestamp': time.time()
-                }
-                self.results.append(result)
+                if max_time is not None and time.time() - start_time > max_time:
+                    logger.info(f"Stopping grid search: reached max time ({max_time}s)")
+                    break
                 
-                # Update best result
-                is_best = False
-                if self.best_score is None:
-                    is_best = True
-                elif maximize and score > self.best_score:
-                    is_best = True
-                elif not maximize and score < self.best_score:
-                    is_best = True
-                
-                if is_best:
-                    self.best_score = score
-                    self.best_params = params
-                    self.best_result = result
+                # Evaluate parameters
+                try:
+                    score = objective_function(params)
+                    evaluations += 1
+                    self._record(params, score, evaluations, maximize, callback)
+                    share_best_score(objective_function, self.best_score)
+                except PrunedRun as e:
+                    pruned += 1
+                    logger.info(f"Pruned parameters {params}: {e}")
+                except Exception as e:
+                    logger.warning(f"Error evaluating parameters {params}: {e}")
+                    # Continue with next parameter combination
+        else:
+            # Workers evaluate batches; results arrive here in grid order. Points
+            # are drawn from the whole grid so that pruned or failed points are
+            # replaced until max_evaluations is reached, as in the serial path.
+            limit = total_points if max_evaluations is None else min(total_points, max_evaluations)
+            points = all_points.iter_range(0, total_points)
+            
+            for params, score, error in evaluator.map(objective_function, points, limit):
+                if isinstance(error, PrunedRun):
+                    pruned += 1
+                    logger.info(f"Pruned parameters {params}: {error}")
+                elif error is not None:
+                    logger.warning(f"Error evaluating parameters {params}: {error}")
+                else:
+                    evaluations += 1
+                    self._record(params, score, evaluations, maximize, callback)
+                    # Batches submitted from now on carry the new best score
+                    share_best_score(objective_function, self.best_score)
                     
-                    logger.info(f"New best result: score={score}, params={params}")
+                    if max_evaluations is not None and evaluations >= max_evaluations:
+                        logger.info(f"Stopping grid search: reached max evaluations ({max_evaluations})")
+                        break
                 
-                # Call callback if provided
-                if callback:
-                    callback(params, score, is_best)
-                
-            except Exception as e:
-                logger.warning(f"Error evaluating parameters {params}: {e}")
-                # Continue with next parameter combination
+                if max_time is not None and time.time() - start_time > max_time:
+                    logger.info(f"Stopping grid search: reached max time ({max_time}s)")
+                    break
         
         # Calculate statistics
         elapsed_time = time.time() - start_time
@@ -138,11 +148,51 @@ class GridSearch:
             'best_params': self.best_params,
             'best_score': self.best_score,
             'evaluations': evaluations,
+            'pruned': pruned,
             'total_points': total_points,
             'elapsed_time': elapsed_time,
             'results': self.results
         }
     
+    def _record(self, params: Dict[str, Any], score: float, evaluation: int,
+                maximize: bool, callback: Optional[Callable]) -> None:
+        """Record an evaluation and update the best result.
+        
+        Args:
+            params: Evaluated parameters
+            score: Objective value
+            evaluation: Evaluation number
+            maximize: Whether higher scores are better
+            callback: Optional callback called with (params, score, is_best)
+        """
+        result = {
+            'params': params,
+            'score': score,
+            'evaluation': evaluation,
+            'timestamp': time.time()
+        }
+        self.results.append(result)
+        
+        # Update best result
+        is_best = False
+        if self.best_score is None:
+            is_best = True
+        elif maximize and score > self.best_score:
+            is_best = True
+        elif not maximize and score < self.best_score:
+            is_best = True
+        
+        if is_best:
+            self.best_score = score
+            self.best_params = params
+            self.best_result = result
+            
+            logger.info(f"New best result: score={score}, params={params}")
+        
+        # Call callback if provided
+        if callback:
+            callback(params, score, is_best)
+    
     def get_best_params(self) -> Optional[Dict[str, Any]]:
         """Get best parameters found.
         
@@ -27,8 +27,13 @@ try:
     from src.strategy.optimization.walk_forward import WalkForward
 except ImportError:
     from src.strategy.optimization.walk_forward import WalkForwardOptimizer as WalkForward
+from src.strategy.optimization.walk_forward import WalkForwardCache, WindowBacktest
+from src.strategy.optimization.bayesian_search import BayesianSearch
+from src.strategy.optimization.successive_halving import SuccessiveHalving, data_bar_count
 from src.strategy.optimization.objective_functions import get_objective_function, OBJECTIVES
 from src.strategy.optimization.reporter import OptimizationReporter
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.strategy.components.indicators.indicator_cache import indicator_session
 
 # Standard analytics imports for consistency
 from src.analytics.metrics.functional import (
@@ -39,11 +44,95 @@ from src.analytics.metrics.functional import (
     calculate_all_metrics
 )
 from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+from src.execution.backtest.result_cache import get_result_cache
+from src.execution.backtest.pruning import PrunedRun
 from src.strategy.strategy_factory import StrategyFactory
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Methods that search the training split and then test the best parameters
+SEARCH_METHODS = ('random', 'successive_halving', 'hyperband', 'bayesian')
+
+class TrainingObjective:
+    """
+    Objective that scores parameters with a backtest on the training split.
+    
+    Instances can be sent to worker processes: the strategy factory is not
+    pickled and is rebuilt from the strategy directories in the worker.
+    """
+    
+    def __init__(self, strategy_name, backtest_config, parameter_space, train_test_config,
+                 objective_function, strategy_factory=None, strategy_dirs=None):
+        """
+        Initialize the objective.
+        
+        Args:
+            strategy_name (str): Name of the strategy to backtest
+            backtest_config (dict): Backtest configuration
+            parameter_space (ParameterSpace): Parameter space being searched
+            train_test_config (dict): Train/test split configuration
+            objective_function (callable): Function scoring backtest results
+            strategy_factory (StrategyFactory, optional): Factory to use in this process
+            strategy_dirs (list, optional): Extra strategy directories for rebuilt factories
+        """
+        self.strategy_name = strategy_name
+        self.backtest_config = backtest_config
+        self.parameter_space = parameter_space
+        self.train_test_config = train_test_config
+        self.objective_function = objective_function
+        self.strategy_factory = strategy_factory
+        self.strategy_dirs = strategy_dirs or []
+        
+        # Best score of the search, kept up to date by the searches for pruning
+        self.best_score = None
+        
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['strategy_factory'] = None
+        return state
+        
+    def __call__(self, params, budget=None):
+        """
+        Run a training backtest and score it.
+        
+        Args:
+            params (dict): Strategy parameters
+            budget (int, optional): Only use the first ``budget`` bars of the data
+                (applied as max_bars); None uses all of it
+            
+        Returns:
+            float: Objective score
+            
+        Raises:
+            PrunedRun: If a pruning rule stopped the backtest early
+        """
+        if self.strategy_factory is None:
+            strategy_dirs = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'implementations')]
+            self.strategy_factory = StrategyFactory(strategy_dirs + list(self.strategy_dirs))
+            
+        backtest_config = self.backtest_config
+        if budget is not None:
+            max_bars = backtest_config.get('max_bars')
+            backtest_config = dict(backtest_config, max_bars=min(budget, max_bars) if max_bars else budget)
+            
+        backtest = OptimizingBacktest('optimizer', backtest_config, self.parameter_space)
+        backtest.initialize({'strategy_factory': self.strategy_factory})
+        # Scores on a prefix of the data are not comparable with the best full-data score
+        backtest.prune_objective = self.objective_function
+        backtest.prune_score_bound = self.best_score if budget is None else None
+        backtest_results = backtest._run_backtest_with_params(
+            self.strategy_name,
+            params,
+            'train',
+            self.train_test_config
+        )
+        if backtest_results.get('pruned'):
+            pruned = backtest_results['pruned']
+            raise PrunedRun(pruned['reason'], pruned['bar'])
+        return self.objective_function(backtest_results)
+
+
 class StrategyOptimizer:
     """
     Standard optimizer for trading strategies.
@@ -219,12 +308,35 @@ class StrategyOptimizer:
                 'params': self.config['strategy']['fixed_params']
             }
             
+        # Share the persistent result cache with every backtest
+        result_cache = self.config.get('optimization', {}).get('result_cache')
+        if result_cache:
+            backtest_config['optimization'] = {'result_cache': result_cache}
+            backtest_config['output_dir'] = self.output_dir
+            
+        # Early termination rules for training runs
+        pruning = self.config.get('optimization', {}).get('pruning')
+        if pruning:
+            backtest_config.setdefault('optimization', {})['pruning'] = pruning
+            
         return backtest_config
         
     def optimize(self):
         """
         Run the optimization process.
         
+        The backtests of the run share one indicator cache session.
+        
+        Returns:
+            dict: Optimization results
+        """
+        with indicator_session(self.config.get('optimization', {}).get('indicator_cache', True)):
+            return self._optimize()
+    
+    def _optimize(self):
+        """
+        Run the optimization process within an indicator session.
+        
         Returns:
             dict: Optimization results
         """
@@ -261,36 +373,75 @@ class StrategyOptimizer:
                 self.objective_function,
                 train_test_config
             )
-        elif optimization_method == 'random':
-            logger.info("Using random search optimization")
-            # Get number of trials
-            num_trials = self.config.get('optimization', {}).get('num_trials', 100)
+        elif optimization_method in SEARCH_METHODS:
+            optimization_config = self.config.get('optimization', {})
+            evaluator = ParallelEvaluator.from_config(optimization_config)
             
-            # Create optimizer with random search
-            optimizer = RandomSearch(
-                parameter_space=self.parameter_space,
-                seed=self.config.get('optimization', {}).get('random_seed')
+            # Create an objective function wrapper for optimizing backtest
+            _objective_function = TrainingObjective(
+                self.config['strategy']['name'],
+                backtest_config,
+                self.parameter_space,
+                train_test_config,
+                self.objective_function,
+                self.strategy_factory,
+                self.config.get('strategy_dirs', [])
             )
             
-            # Create an objective function wrapper for optimizing backtest
-            def _objective_function(params):
-                backtest = OptimizingBacktest('optimizer', backtest_config, self.parameter_space)
-                backtest.initialize(context)
-                backtest_results = backtest._run_backtest_with_params(
-                    self.config['strategy']['name'], 
-                    params, 
-                    'train',
-                    train_test_config
+            if optimization_method == 'random':
+                logger.info("Using random search optimization")
+                # Create optimizer with random search
+                optimizer = RandomSearch(
+                    parameter_space=self.parameter_space,
+                    seed=optimization_config.get('random_seed')
+                )
+                
+                # Run random search, in parallel if configured
+                search_results = optimizer.search(
+                    objective_function=_objective_function,
+                    num_samples=optimization_config.get('num_trials', 100),
+                    maximize=True,
+                    max_time=optimization_config.get('max_time'),
+                    executor=evaluator.executor,
+                    max_workers=evaluator.max_workers
+                )
+            elif optimization_method == 'bayesian':
+                logger.info("Using Bayesian (TPE) optimization")
+                optimizer = BayesianSearch(
+                    parameter_space=self.parameter_space,
+                    seed=optimization_config.get('random_seed')
+                )
+                search_results = optimizer.search(
+                    objective_function=_objective_function,
+                    num_samples=optimization_config.get('num_trials', 100),
+                    maximize=True,
+                    max_time=optimization_config.get('max_time'),
+                    executor=evaluator.executor,
+                    max_workers=evaluator.max_workers,
+                    n_initial=optimization_config.get('initial_trials')
+                )
+            else:
+                logger.info(f"Using {optimization_method.replace('_', ' ')} optimization")
+                # Budgets are prefixes of the data the backtests load
+                data_config = dict(backtest_config.get('data', {}))
+                if 'max_bars' in backtest_config:
+                    data_config['max_bars'] = backtest_config['max_bars']
+                optimizer = SuccessiveHalving(
+                    parameter_space=self.parameter_space,
+                    seed=optimization_config.get('random_seed')
+                )
+                search_results = optimizer.search(
+                    objective_function=_objective_function,
+                    max_budget=data_bar_count(data_config),
+                    min_budget=optimization_config.get('min_budget'),
+                    eta=optimization_config.get('eta', 3),
+                    hyperband=optimization_method == 'hyperband',
+                    num_samples=optimization_config.get('num_trials'),
+                    maximize=True,
+                    max_time=optimization_config.get('max_time'),
+                    executor=evaluator.executor,
+                    max_workers=evaluator.max_workers
                 )
-                return self.objective_function(backtest_results)
-            
-            # Run random search
-            search_results = optimizer.search(
-                objective_function=_objective_function,
-                num_samples=num_trials,
-                maximize=True,
-                max_time=self.config.get('optimization', {}).get('max_time')
-            )
             
             # Run backtest with best parameters on test set
             backtest = OptimizingBacktest('optimizer', backtest_config, self.parameter_space)
@@ -322,36 +473,62 @@ class StrategyOptimizer:
             }
         elif optimization_method == 'walk_forward':
             logger.info("Using walk-forward optimization")
-            # Get walk-forward parameters
-            window_size = self.config.get('optimization', {}).get('window_size', 60)
-            step_size = self.config.get('optimization', {}).get('step_size', 20)
-            window_type = self.config.get('optimization', {}).get('window_type', 'rolling')
+            optimization_config = self.config.get('optimization', {})
+            evaluator = ParallelEvaluator.from_config(optimization_config)
             
-            # For walk-forward optimization, we'll use a simplified implementation for now
-            # Create an optimizing backtest for each window
-            logger.info(f"Walk-forward optimization with window size {window_size}, step size {step_size}")
-            
-            # This is a placeholder - actual walk-forward would use time windows
-            # For now, we'll just do a standard grid search and add the walk-forward metadata
-            backtest = OptimizingBacktest('optimizer', backtest_config, self.parameter_space)
-            backtest.initialize(context)
+            # Windows are index ranges of data loaded once by this handler
+            from src.core.events.event_bus import EventBus
+            from src.data.historical_data_handler import HistoricalDataHandler
+            data_handler = HistoricalDataHandler('walk_forward_data_handler', dict(backtest_config.get('data', {})))
+            data_handler.initialize({'event_bus': EventBus()})
             
-            # Run standard optimization with proper train/test split
-            results = backtest.optimize(
-                self.config['strategy']['name'],
-                self.objective_function,
-                train_test_config
+            optimizer = WalkForward(
+                data_handler,
+                WindowBacktest(
+                    self.config['strategy']['name'],
+                    backtest_config,
+                    self.strategy_factory,
+                    self.config.get('strategy_dirs', [])
+                ),
+                optimization_config.get('search_method', 'grid'),
+                executor=evaluator.executor,
+                max_workers=evaluator.max_workers,
+                cache=WalkForwardCache(optimization_config.get(
+                    'cache_file', os.path.join(self.output_dir, 'walk_forward_cache.pkl')))
+            )
+            walk_forward = optimizer.optimize(
+                self.parameter_space,
+                window_size=optimization_config.get('window_size', 60),
+                step_size=optimization_config.get('step_size', 20),
+                test_size=optimization_config.get('test_size'),
+                window_type=optimization_config.get('window_type', 'rolling'),
+                unit=optimization_config.get('window_unit', 'days'),
+                objective_function=self.objective_function,
+                random_samples=optimization_config.get('num_trials'),
+                random_seed=optimization_config.get('random_seed')
             )
             
-            # Add walk-forward specific metadata
-            results['walk_forward'] = {
-                'window_size': window_size,
-                'step_size': step_size,
-                'window_type': window_type
+            # Score the parameters by their mean out-of-sample score
+            oos_scores = [r['out_of_sample_score'] for r in walk_forward['results']
+                          if r['out_of_sample_score'] is not None]
+            results = {
+                'best_parameters': walk_forward['best_parameters'],
+                'best_score': sum(oos_scores) / len(oos_scores) if oos_scores else 0.0,
+                'elapsed_time': walk_forward['elapsed_time'],
+                'walk_forward': walk_forward
             }
         else:
             raise ValueError(f"Unknown optimization method: {optimization_method}")
             
+        # Report lookups of the persistent result cache made in this process
+        result_cache = get_result_cache(backtest_config.get('optimization', {}).get('result_cache'),
+                                        self.output_dir)
+        if result_cache is not None:
+            results['result_cache'] = result_cache.get_stats()
+            logger.info(f"Result cache: {results['result_cache']['hits']} hits, "
+                        f"{results['result_cache']['misses']} misses "
+                        f"({results['result_cache']['hit_rate']:.1%} hit rate)")
+            
         # Add timestamp and ID to results
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         results['timestamp'] = timestamp
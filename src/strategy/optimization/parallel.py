@@ -0,0 +1,240 @@
+"""
+Parallel evaluation of parameter combinations.
+
+Every evaluation in a parameter search is an isolated backtest, so the
+searches hand their candidates to a ParallelEvaluator which runs them
+serially, on a thread pool or on a process pool. Candidates are sent to
+workers in batches and results are yielded in submission order, so
+best-so-far tracking, callbacks and progress logging stay in the calling
+process and behave exactly as in a serial run. Candidates are drawn from
+their iterable as workers free up, so a lazy parameter grid is never
+materialized.
+
+When logging goes through an asynchronous sink, worker processes send
+their records to the parent's sink rather than writing the log file
+themselves.
+"""
+
+import math
+import pickle
+import logging
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+from src.core.logging.async_sink import install_worker_logging, worker_log_queue
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ('serial', 'thread', 'process')
+
+# Upper bound of the default batch size, so huge grids still stream
+MAX_BATCH_SIZE = 64
+
+# Batches submitted per worker ahead of the results being consumed
+BATCHES_IN_FLIGHT = 4
+
+
+def _run_batch(func, batch):
+    """
+    Evaluate a batch of items inside a worker.
+
+    Exceptions are returned rather than raised so that one failing item does
+    not discard the rest of the batch.
+
+    Args:
+        func (callable): Evaluation function
+        batch (list): Items to evaluate
+
+    Returns:
+        list: (result, error) tuples in batch order
+    """
+    outcomes = []
+    for item in batch:
+        try:
+            outcomes.append((func(item), None))
+        except Exception as e:
+            outcomes.append((None, e))
+    return outcomes
+
+
+def _initialize_worker(log_queue, level, initializer, initargs):
+    """
+    Worker initializer that forwards logging to the parent's sink.
+
+    Args:
+        log_queue: Queue of the parent's asynchronous log sink
+        level (int): Root logger level
+        initializer (callable): Initializer to run afterwards, or None
+        initargs (tuple): Arguments for ``initializer``
+    """
+    install_worker_logging(log_queue, level)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def warm_market_data(data_config):
+    """
+    Worker initializer that loads market data into the worker's cache.
+
+    Data handlers created by later evaluations in the same worker then reuse
+    the parsed data instead of reading the source files again.
+
+    Args:
+        data_config (dict): Data configuration used by the backtests
+    """
+    try:
+        from src.core.events.event_bus import EventBus
+        from src.data.historical_data_handler import HistoricalDataHandler
+
+        handler = HistoricalDataHandler('warmup_data_handler', data_config)
+        handler.initialize({'event_bus': EventBus()})
+    except Exception as e:
+        logger.warning(f"Could not preload market data in worker: {e}")
+
+
+class ParallelEvaluator:
+    """
+    Evaluate items with a serial, thread-pool or process-pool executor.
+    """
+
+    def __init__(self, executor: str = 'serial', max_workers: Optional[int] = None,
+                 batch_size: Optional[int] = None, initializer: Optional[Callable] = None,
+                 initargs: Tuple = ()):
+        """
+        Initialize the evaluator.
+
+        Args:
+            executor: 'serial', 'thread' or 'process'
+            max_workers: Number of workers (default: executor's default)
+            batch_size: Items sent to a worker at a time (default: about
+                four batches per worker)
+            initializer: Called once in each worker before evaluating
+            initargs: Arguments for ``initializer``
+
+        Raises:
+            ValueError: If the executor is unknown or max_workers is invalid
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}, expected one of {EXECUTORS}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.initializer = initializer
+        self.initargs = initargs
+
+    @classmethod
+    def from_config(cls, config: Optional[dict], **kwargs) -> 'ParallelEvaluator':
+        """
+        Create an evaluator from an optimization config section.
+
+        Recognised keys are ``executor``, ``max_workers`` and ``batch_size``.
+        A ``max_workers`` above one without an explicit executor selects the
+        process executor.
+
+        Args:
+            config: Optimization configuration
+            **kwargs: Extra constructor arguments
+
+        Returns:
+            ParallelEvaluator: Configured evaluator
+        """
+        config = config or {}
+        max_workers = config.get('max_workers')
+        executor = config.get('executor') or ('process' if max_workers and max_workers > 1 else 'serial')
+        return cls(executor, max_workers, config.get('batch_size'), **kwargs)
+
+    @property
+    def is_serial(self) -> bool:
+        """Whether items are evaluated in the calling thread."""
+        return self.executor == 'serial' or self.max_workers == 1
+
+    def map(self, func: Callable[[Any], Any], items: Iterable,
+            size: Optional[int] = None) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+        """
+        Evaluate ``func`` for every item.
+
+        Items are consumed lazily. In serial mode there is one evaluation per
+        step of the returned iterator; otherwise a bounded number of batches
+        per worker is kept submitted and outstanding work is cancelled when
+        the iterator is closed early.
+
+        Args:
+            func: Evaluation function; must be picklable for the process executor
+            items: Items to evaluate
+            size: Number of items, used to size batches when ``items`` has
+                no length (e.g. a generator)
+
+        Yields:
+            tuple: (item, result, error) in the order of ``items``
+        """
+        if self.is_serial:
+            for item in items:
+                try:
+                    yield item, func(item), None
+                except Exception as e:
+                    yield item, None, e
+            return
+
+        if size is None and hasattr(items, '__len__'):
+            size = len(items)
+        if size == 0:
+            return
+
+        pool_class = ProcessPoolExecutor if self.executor == 'process' else ThreadPoolExecutor
+        if pool_class is ProcessPoolExecutor and not self._picklable(func):
+            logger.warning("Evaluation function cannot be sent to worker processes, using threads instead")
+            pool_class = ThreadPoolExecutor
+
+        initializer, initargs = self.initializer, self.initargs
+        if pool_class is ProcessPoolExecutor:
+            log_queue = worker_log_queue()
+            if log_queue is not None:
+                initializer = _initialize_worker
+                initargs = (log_queue, logging.getLogger().level, self.initializer, self.initargs)
+
+        pool = pool_class(max_workers=self.max_workers, initializer=initializer, initargs=initargs)
+        workers = pool._max_workers
+        batch_size = self.batch_size
+        if batch_size is None:
+            batch_size = min(MAX_BATCH_SIZE, max(1, math.ceil((size or 0) / (workers * 4))))
+        logger.info(f"Evaluating {size if size is not None else 'streamed'} items on {workers} "
+                    f"{'process' if pool_class is ProcessPoolExecutor else 'thread'} workers "
+                    f"in batches of {batch_size}")
+
+        iterator = iter(items)
+        pending = deque()
+
+        def submit():
+            batch = list(islice(iterator, batch_size))
+            if batch:
+                pending.append((batch, pool.submit(_run_batch, func, batch)))
+            return bool(batch)
+
+        try:
+            while len(pending) < workers * BATCHES_IN_FLIGHT and submit():
+                pass
+            while pending:
+                batch, future = pending.popleft()
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    # The whole batch was lost (e.g. a worker process died)
+                    outcomes = [(None, e)] * len(batch)
+                submit()
+                for item, (result, error) in zip(batch, outcomes):
+                    yield item, result, error
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _picklable(func) -> bool:
+        try:
+            pickle.dumps(func)
+            return True
+        except Exception:
+            return False
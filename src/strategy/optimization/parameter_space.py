@@ -5,7 +5,9 @@ This module provides classes for defining parameter spaces for strategy optimiza
 supporting different parameter types and constraints.
 """
 
+import random
 import numpy as np
+from bisect import bisect_right
 from itertools import product
 
 class Parameter:
@@ -372,6 +374,198 @@ class ConditionalParameter(Parameter):
         # Check if value is valid for specific parent value
         return value in self.value_map.get(parent_value, [])
 
+class _Branch:
+    """
+    Grid points of one parameter together with the parameters depending on it.
+    
+    For every value, the dependent parameters whose value map has values for
+    it form a mixed-radix product, so only valid branches are counted.
+    """
+    
+    def __init__(self, name, values, dependencies, parameters):
+        """
+        Initialize a branch.
+        
+        Args:
+            name (str): Parameter name
+            values (list): Values of the parameter on this branch
+            dependencies (dict): Parent name to dependent parameter names
+            parameters (dict): Parameter name to Parameter
+        """
+        self.name = name
+        self.values = list(values)
+        self.children = []
+        self.offsets = []
+        self.size = 0
+        for value in self.values:
+            children = []
+            for dependent_name in dependencies.get(name, []):
+                dependent_values = parameters[dependent_name].get_values(value)
+                if dependent_values:
+                    children.append(_Branch(dependent_name, dependent_values, dependencies, parameters))
+            self.children.append(children)
+            self.offsets.append(self.size)
+            self.size += _product_size(children)
+            
+    def decode(self, index, point):
+        """
+        Add the parameters of the index-th grid point of this branch to ``point``.
+        
+        Args:
+            index (int): Position within the branch
+            point (dict): Parameter dictionary to update
+        """
+        value_index = bisect_right(self.offsets, index) - 1
+        point[self.name] = self.values[value_index]
+        _decode_product(self.children[value_index], index - self.offsets[value_index], point)
+        
+    def encode(self, point):
+        """
+        Get the position of a grid point within this branch.
+        
+        Args:
+            point (dict): Parameter dictionary
+            
+        Returns:
+            int: Position within the branch
+        """
+        value_index = self.values.index(point[self.name])
+        return self.offsets[value_index] + _encode_product(self.children[value_index], point)
+        
+    def describe(self):
+        """
+        Get the values of this branch and of its dependent parameters.
+        
+        Returns:
+            list: [name, values, children], where children holds the
+                descriptions of the dependent branches of each value
+        """
+        return [self.name, self.values,
+                [[child.describe() for child in children] for children in self.children]]
+
+
+def _product_size(branches):
+    size = 1
+    for branch in branches:
+        size *= branch.size
+    return size
+
+
+def _decode_product(branches, index, point):
+    # Mixed-radix digits with the last branch varying fastest, like itertools.product
+    digits = []
+    for branch in reversed(branches):
+        index, digit = divmod(index, branch.size)
+        digits.append(digit)
+    for branch, digit in zip(branches, reversed(digits)):
+        branch.decode(digit, point)
+
+
+def _encode_product(branches, point):
+    index = 0
+    for branch in branches:
+        index = index * branch.size + branch.encode(point)
+    return index
+
+
+class ParameterGrid:
+    """
+    Lazy sequence of the grid points of a parameter space.
+    
+    Points are decoded on demand from their index, so the length is known
+    without enumerating the grid, any point can be fetched directly and work
+    can be split into index ranges, e.g. to shard it across processes or to
+    resume a search. Conditional parameters take each value valid for their
+    parent's value; other branches are never generated.
+    """
+    
+    def __init__(self, parameter_space):
+        """
+        Initialize the grid.
+        
+        Args:
+            parameter_space (ParameterSpace): Parameter space to enumerate
+        """
+        parameters = parameter_space.parameters
+        dependencies = parameter_space.conditional_dependencies
+        self._branches = [
+            _Branch(name, param.get_values(), dependencies, parameters)
+            for name, param in parameters.items()
+            if not isinstance(param, ConditionalParameter)
+        ]
+        self._size = _product_size(self._branches)
+        self._flat = not any(children for branch in self._branches for children in branch.children)
+        
+    def __len__(self):
+        return self._size
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.iter_range(*index.indices(self._size)))
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"Grid index {index} out of range for {self._size} points")
+        point = {}
+        _decode_product(self._branches, index, point)
+        return point
+        
+    def __iter__(self):
+        if self._flat:
+            # Without conditional parameters the grid is a plain product
+            names = [branch.name for branch in self._branches]
+            for values in product(*(branch.values for branch in self._branches)):
+                yield dict(zip(names, values))
+        else:
+            yield from self.iter_range(0, self._size)
+            
+    def iter_range(self, start=0, stop=None, step=1):
+        """
+        Iterate over the points with indices in ``range(start, stop, step)``.
+        
+        Args:
+            start (int): First index
+            stop (int, optional): End index (exclusive); defaults to the grid size
+            step (int): Index step
+            
+        Returns:
+            iterator: Parameter dictionaries
+        """
+        stop = self._size if stop is None else min(stop, self._size)
+        for index in range(start, stop, step):
+            yield self[index]
+            
+    def index(self, point):
+        """
+        Get the index of a grid point.
+        
+        Args:
+            point (dict): Parameter dictionary
+            
+        Returns:
+            int: Index of the point
+            
+        Raises:
+            ValueError: If the point is not on the grid
+        """
+        try:
+            return _encode_product(self._branches, point)
+        except (KeyError, ValueError):
+            raise ValueError(f"{point} is not a point of the grid")
+            
+    def describe(self):
+        """
+        Get every value the grid enumerates, in enumeration order.
+        
+        Two grids with the same description enumerate the same points in the
+        same order, so it identifies what each grid index means.
+        
+        Returns:
+            list: One [name, values, children] entry per top-level parameter
+        """
+        return [branch.describe() for branch in self._branches]
+
+
 class ParameterSpace:
     """Parameter space for optimization."""
     
@@ -418,60 +612,66 @@ class ParameterSpace:
         """
         Get all valid parameter combinations.
         
+        Builds every combination in memory; use get_grid to iterate lazily.
+        
         Returns:
             list: List of parameter dictionaries
         """
-        # Identify top-level parameters (not conditional)
-        top_level_params = {
-            name: param for name, param in self.parameters.items()
-            if not isinstance(param, ConditionalParameter)
-        }
+        return list(self.get_grid())
         
-        # Get values for top-level parameters
-        param_values = {
-            name: param.get_values() for name, param in top_level_params.items()
-        }
+    def get_grid(self):
+        """
+        Get a lazy view of all valid parameter combinations.
+        
+        Returns:
+            ParameterGrid: Sequence of parameter dictionaries
+        """
+        return ParameterGrid(self)
         
-        # Generate combinations of top-level parameters
-        param_names = list(param_values.keys())
-        combinations = []
+    def get_combination_count(self):
+        """
+        Get the number of valid parameter combinations without enumerating them.
         
-        for values in product(*param_values.values()):
-            # Create parameter dictionary
-            param_dict = dict(zip(param_names, values))
-            
-            # Add conditional parameters
-            self._add_conditional_parameters(param_dict)
-            
-            combinations.append(param_dict)
-            
-        return combinations
+        Returns:
+            int: Number of combinations
+        """
+        return len(self.get_grid())
         
-    def _add_conditional_parameters(self, param_dict):
+    def get_all_grid_points(self):
         """
-        Add conditional parameters to a parameter dictionary.
+        Get all grid points for grid search.
         
-        Args:
-            param_dict (dict): Parameter dictionary to update
+        Returns:
+            ParameterGrid: Lazy sequence of parameter dictionaries
         """
-        # Check each parent parameter
-        for parent_name in self.conditional_dependencies:
+        return self.get_grid()
+        
+    def get_random_point(self):
+        """
+        Sample a random parameter combination.
+        
+        Values are drawn with the ``random`` module, so ``random.seed`` makes
+        the sequence of points reproducible.
+        
+        Returns:
+            dict: Parameter dictionary
+        """
+        param_dict = {
+            name: random.choice(list(param.get_values()))
+            for name, param in self.parameters.items()
+            if not isinstance(param, ConditionalParameter)
+        }
+        
+        for parent_name, dependents in self.conditional_dependencies.items():
             if parent_name not in param_dict:
                 continue
-                
-            parent_value = param_dict[parent_name]
-            
-            # Add dependent parameters
-            for dependent_name in self.conditional_dependencies[parent_name]:
-                param = self.parameters[dependent_name]
-                
-                # Get values for this parent value
-                values = param.get_values(parent_value)
-                
+            for dependent_name in dependents:
+                values = self.parameters[dependent_name].get_values(param_dict[parent_name])
                 if values:
-                    # Add first value to the dictionary
-                    param_dict[dependent_name] = values[0]
+                    param_dict[dependent_name] = random.choice(list(values))
                     
+        return param_dict
+        
     def from_dict(self, config):
         """
         Create a parameter space from a configuration dictionary.
@@ -12,6 +12,8 @@ from typing import Dict, Any, List, Tuple, Optional, Callable, Union, Iterator
 
 from src.core.exceptions import OptimizationError
 from src.strategy.optimization.parameter_space import ParameterSpace
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.execution.backtest.pruning import PrunedRun, share_best_score
 from src.core.logging.structured_logger import get_logger
 
 logger = get_logger(__name__)
@@ -39,7 +41,8 @@ class RandomSearch:
     
     def search(self, objective_function: Callable[[Dict[str, Any]], float], 
                num_samples: int, maximize: bool = True, 
-               max_time: Optional[float] = None, callback: Optional[Callable] = None) -> Dict[str, Any]:
+               max_time: Optional[float] = None, callback: Optional[Callable] = None,
+               executor: str = 'serial', max_workers: Optional[int] = None) -> Dict[str, Any]:
         """Perform random search.
         
         Args:
@@ -49,6 +52,9 @@ class RandomSearch:
             max_time: Maximum time in seconds (default: None)
             callback: Optional callback function called after each evaluation
                 with arguments (params, score, is_best)
+            executor: 'serial', 'thread' or 'process' (default: 'serial');
+                the process executor requires a picklable objective function
+            max_workers: Number of parallel workers (default: executor's default)
             
         Returns:
             Dictionary with search results
@@ -66,54 +72,51 @@ class RandomSearch:
         # Start timing
         start_time = time.time()
         evaluations = 0
+        pruned = 0
+        evaluator = ParallelEvaluator(executor, max_workers)
         
-        # Evaluate random parameter combinations
-        for i in range(num_samples):
-            # Check time limit
-            if max_time is not None and time.time() - start_time > max_time:
-                logger.info(f"Stopping random search: reached max time ({max_time}s)")
-                break
-            
-            # Generate random parameters
-            params = self.parameter_space.get_random_point()
-            
-            # Evaluate parameters
-            try:
-                score = objective_function(params)
-                evaluations += 1
-                
-                # Record result
-                result = {
-                    'params': params,
-                    'score': score,
-                    'evaluation': evaluations,
-                    'timestamp': time.time()
-                }
-                self.results.append(result)
-                
-                # Update best result
-                is_best = False
-                if self.best_score is None:
-                    is_best = True
-                elif maximize and score > self.best_score:
-                    is_best = True
-                elif not maximize and score < self.best_score:
-                    is_best = True
+        if evaluator.is_serial:
+            # Evaluate random parameter combinations
+            for i in range(num_samples):
+                # Check time limit
+                if max_time is not None and time.time() - start_time > max_time:
+                    logger.info(f"Stopping random search: reached max time ({max_time}s)")
+                    break
                 
-                if is_best:
-                    self.best_score = score
-                    self.best_params = params
-                    self.best_result = result
-                    
-                    logger.info(f"New best result: score={score}, params={params}")
+                # Generate random parameters
+                params = self.parameter_space.get_random_point()
                 
-                # Call callback if provided
-                if callback:
-                    callback(params, score, is_best)
+                # Evaluate parameters
+                try:
+                    score = objective_function(params)
+                    evaluations += 1
+                    self._record(params, score, evaluations, maximize, callback)
+                    share_best_score(objective_function, self.best_score)
+                except PrunedRun as e:
+                    pruned += 1
+                    logger.info(f"Pruned parameters {params}: {e}")
+                except Exception as e:
+                    logger.warning(f"Error evaluating parameters {params}: {e}")
+                    # Continue with next parameter combination
+        else:
+            # Draw all samples here so the sequence only depends on the seed
+            samples = [self.parameter_space.get_random_point() for _ in range(num_samples)]
+            
+            for params, score, error in evaluator.map(objective_function, samples):
+                if isinstance(error, PrunedRun):
+                    pruned += 1
+                    logger.info(f"Pruned parameters {params}: {error}")
+                elif error is not None:
+                    logger.warning(f"Error evaluating parameters {params}: {error}")
+                else:
+                    evaluations += 1
+                    self._record(params, score, evaluations, maximize, callback)
+                    # Batches submitted from now on carry the new best score
+                    share_best_score(objective_function, self.best_score)
                 
-            except Exception as e:
-                logger.warning(f"Error evaluating parameters {params}: {e}")
-                # Continue with next parameter combination
+                if max_time is not None and time.time() - start_time > max_time:
+                    logger.info(f"Stopping random search: reached max time ({max_time}s)")
+                    break
         
         # Calculate statistics
         elapsed_time = time.time() - start_time
@@ -131,10 +134,50 @@ class RandomSearch:
             'best_params': self.best_params,
             'best_score': self.best_score,
             'evaluations': evaluations,
+            'pruned': pruned,
             'elapsed_time': elapsed_time,
             'results': self.results
         }
     
+    def _record(self, params: Dict[str, Any], score: float, evaluation: int,
+                maximize: bool, callback: Optional[Callable]) -> None:
+        """Record an evaluation and update the best result.
+        
+        Args:
+            params: Evaluated parameters
+            score: Objective value
+            evaluation: Evaluation number
+            maximize: Whether higher scores are better
+            callback: Optional callback called with (params, score, is_best)
+        """
+        result = {
+            'params': params,
+            'score': score,
+            'evaluation': evaluation,
+            'timestamp': time.time()
+        }
+        self.results.append(result)
+        
+        # Update best result
+        is_best = False
+        if self.best_score is None:
+            is_best = True
+        elif maximize and score > self.best_score:
+            is_best = True
+        elif not maximize and score < self.best_score:
+            is_best = True
+        
+        if is_best:
+            self.best_score = score
+            self.best_params = params
+            self.best_result = result
+            
+            logger.info(f"New best result: score={score}, params={params}")
+        
+        # Call callback if provided
+        if callback:
+            callback(params, score, is_best)
+    
     def get_best_params(self) -> Optional[Dict[str, Any]]:
         """Get best parameters found.
         
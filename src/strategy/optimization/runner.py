@@ -15,6 +15,7 @@ from pathlib import Path
 from src.strategy.optimization.fixed_optimizer import FixedOptimizer as StrategyOptimizer
 from src.core.system_init import Bootstrap
 from src.core.configuration.config import Config
+from src.core.logging import refresh_hot_path_loggers
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,9 @@ def run_optimization(config, **kwargs):
             - param_file (str): Parameter space file path override
             - output_dir (str): Output directory override
             - max_bars (int): Maximum number of bars to process in each backtest
+            - workers (int): Number of parallel workers for evaluating parameters
+            - executor (str): 'serial', 'thread' or 'process' evaluation
+            - resume (bool): Skip combinations already in the checkpoint journal
 
     Returns:
         tuple: (success flag, result message, results dict)
@@ -89,6 +93,9 @@ def run_optimization(config, **kwargs):
     param_file = kwargs.get('param_file')
     output_dir = kwargs.get('output_dir')
     max_bars = kwargs.get('max_bars')
+    workers = kwargs.get('workers')
+    executor = kwargs.get('executor')
+    resume = kwargs.get('resume')
 
     # Apply overrides if provided
     if method:
@@ -97,6 +104,18 @@ def run_optimization(config, **kwargs):
             optimization_config['optimization'] = {}
         optimization_config['optimization']['method'] = method
 
+    if workers or executor or resume:
+        optimization_config['optimization'] = dict(optimization_config.get('optimization') or {})
+        if workers:
+            logger.info(f"Using {workers} workers for optimization")
+            optimization_config['optimization']['max_workers'] = workers
+        if executor:
+            logger.info(f"Using {executor} executor for optimization")
+            optimization_config['optimization']['executor'] = executor
+        if resume:
+            logger.info("Resuming optimization from the checkpoint journal")
+            optimization_config['optimization']['resume'] = True
+
     if output_dir:
         logger.info(f"Using output directory: {output_dir}")
         optimization_config['output_dir'] = output_dir
@@ -140,7 +159,7 @@ def run_optimization(config, **kwargs):
         # Get strategy name
         strategy_name = optimization_config.get('strategy', {}).get('name', 'simple_ma_crossover')
         
-        logger.info(f"Created parameter space with {len(parameter_space.get_combinations())} combinations")
+        logger.info(f"Created parameter space with {parameter_space.get_combination_count()} combinations")
         
         # Create and initialize optimizer
         optimizer = StrategyOptimizer(
@@ -214,10 +233,13 @@ def run_optimization(config, **kwargs):
         logger.error(traceback.format_exc())
         return False, message, None
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """
     Parse command line arguments when running this module directly.
     
+    Args:
+        argv (list, optional): Arguments to parse, defaults to sys.argv
+        
     Returns:
         argparse.Namespace: Parsed arguments
     """
@@ -225,14 +247,20 @@ def parse_arguments():
     
     parser = argparse.ArgumentParser(description="Strategy Optimization Runner")
     parser.add_argument("--config", required=True, help="Path to configuration file")
-    parser.add_argument("--method", choices=["grid", "random", "walk_forward"], 
+    parser.add_argument("--method", choices=["grid", "random", "walk_forward",
+                        "successive_halving", "hyperband", "bayesian"],
                         help="Optimization method")
     parser.add_argument("--param-file", help="Parameter space file path")
     parser.add_argument("--output-dir", help="Output directory for results")
+    parser.add_argument("--workers", type=int, help="Number of parallel workers")
+    parser.add_argument("--executor", choices=["serial", "thread", "process"],
+                        help="How parameter combinations are evaluated")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip combinations completed by an interrupted run")
     parser.add_argument("--log-file", help="Log file path")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 def setup_logging(log_file=None, verbose=False):
     """
@@ -258,26 +286,49 @@ def setup_logging(log_file=None, verbose=False):
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=handlers
     )
+    refresh_hot_path_loggers()
 
-if __name__ == "__main__":
-    """Run optimization directly from command line."""
-    args = parse_arguments()
+def main(argv=None):
+    """
+    Run optimization from command line arguments.
+    
+    Args:
+        argv (list, optional): Arguments to parse, defaults to sys.argv
+        
+    Returns:
+        int: Exit code
+    """
+    args = parse_arguments(argv)
     
     # Set up logging
     setup_logging(log_file=args.log_file, verbose=args.verbose)
     
+    # Load the base configuration
+    try:
+        with open(args.config, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"ERROR: Could not load configuration {args.config}: {e}")
+        return 1
+    
     # Run optimization
-    success, message, results = run_from_config(
-        args.config,
+    success, message, results = run_optimization(
+        config,
         method=args.method,
         param_file=args.param_file,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        workers=args.workers,
+        executor=args.executor,
+        resume=args.resume
     )
     
     # Print result
     if success:
         print(message)
-        sys.exit(0)
-    else:
-        print(f"ERROR: {message}")
-        sys.exit(1)
\ No newline at end of file
+        return 0
+    print(f"ERROR: {message}")
+    return 1
+
+if __name__ == "__main__":
+    """Run optimization directly from command line."""
+    sys.exit(main())
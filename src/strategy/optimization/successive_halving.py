@@ -0,0 +1,332 @@
+"""
+Successive halving and Hyperband optimization for strategy parameters.
+
+Candidates are first backtested on a short prefix of the data and only the
+best fraction of each rung is promoted to a longer prefix, so most of the
+budget is spent on promising parameters. The budget of a run is a number of
+bars passed as ``max_bars``, which limits the data before the train/test
+split; the last rung runs on the full training data.
+"""
+
+import math
+import time
+import random
+from typing import Dict, Any, List, Tuple, Optional, Callable
+
+from src.core.exceptions import OptimizationError
+from src.strategy.optimization.parameter_space import ParameterSpace
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.core.logging.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def data_bar_count(data_config: Dict[str, Any]) -> int:
+    """Count the bars a backtest with this data configuration loads.
+
+    Args:
+        data_config: Data configuration, with max_bars applied
+
+    Returns:
+        Number of bars of the longest symbol
+    """
+    from src.core.events.event_bus import EventBus
+    from src.data.historical_data_handler import HistoricalDataHandler
+
+    handler = HistoricalDataHandler('budget_data_handler', dict(data_config))
+    handler.initialize({'event_bus': EventBus()})
+    return max((len(df) for df in handler.data.values()), default=0)
+
+
+class BudgetedObjective:
+    """Objective bound to a budget, so it can be mapped over candidates.
+
+    Instances are picklable when the wrapped objective is.
+    """
+
+    def __init__(self, objective_function: Callable[[Dict[str, Any], Optional[int]], float],
+                 budget: Optional[int]):
+        """Initialize the objective.
+
+        Args:
+            objective_function: Function called with (params, budget)
+            budget: Number of bars, or None for the full data
+        """
+        self.objective_function = objective_function
+        self.budget = budget
+
+    def __call__(self, params: Dict[str, Any]) -> float:
+        return self.objective_function(params, self.budget)
+
+
+class SuccessiveHalving:
+    """Successive halving and Hyperband optimizer for strategy parameters."""
+
+    def __init__(self, parameter_space: ParameterSpace, seed: Optional[int] = None):
+        """Initialize successive halving optimizer.
+
+        Args:
+            parameter_space: Parameter space to search
+            seed: Random seed for reproducibility (default: None)
+        """
+        self.parameter_space = parameter_space
+        self.results = []
+        self.best_result = None
+        self.best_score = None
+        self.best_params = None
+
+        # Set random seed if provided
+        if seed is not None:
+            random.seed(seed)
+
+    @staticmethod
+    def get_brackets(min_budget: int, max_budget: int, eta: int = 3, hyperband: bool = False,
+                     num_samples: Optional[int] = None) -> List[Tuple[int, List[Optional[int]]]]:
+        """Plan the brackets of a search.
+
+        A single successive halving bracket starts ``num_samples`` candidates
+        (default: eta ** number of halvings) on ``min_budget``. Hyperband runs
+        one bracket per starting budget, trading many short runs against few
+        long ones.
+
+        Args:
+            min_budget: Bars of the first rung
+            max_budget: Bars of the full data
+            eta: Factor by which budgets grow and candidates shrink per rung
+            hyperband: Whether to plan all Hyperband brackets
+            num_samples: Candidates of a successive halving bracket
+
+        Returns:
+            List of (number of candidates, rung budgets); the last budget of
+            every bracket is None, meaning the full data
+
+        Raises:
+            OptimizationError: If the settings are invalid
+        """
+        if eta < 2:
+            raise OptimizationError(f"eta must be at least 2, got {eta}")
+        if not 0 < min_budget <= max_budget:
+            raise OptimizationError(f"Budgets must satisfy 0 < min_budget <= max_budget, "
+                                    f"got {min_budget} and {max_budget}")
+
+        s_max = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+
+        def rungs(s):
+            budgets = [int(round(max_budget * eta ** (i - s))) for i in range(s)]
+            return budgets + [None]
+
+        if not hyperband:
+            return [(num_samples or eta ** s_max, rungs(s_max))]
+        return [(int(math.ceil((s_max + 1) / (s + 1) * eta ** s)), rungs(s))
+                for s in range(s_max, -1, -1)]
+
+    def search(self, objective_function: Callable[[Dict[str, Any], Optional[int]], float],
+               max_budget: int, min_budget: Optional[int] = None, eta: int = 3,
+               hyperband: bool = False, num_samples: Optional[int] = None,
+               maximize: bool = True, max_time: Optional[float] = None,
+               callback: Optional[Callable] = None, executor: str = 'serial',
+               max_workers: Optional[int] = None,
+               evaluator: Optional[ParallelEvaluator] = None) -> Dict[str, Any]:
+        """Perform successive halving or Hyperband search.
+
+        Args:
+            objective_function: Function called with (params, budget), where
+                budget is a number of bars or None for the full data
+            max_budget: Number of bars of the full data
+            min_budget: Bars of the shortest runs (default: max_budget / eta ** 3)
+            eta: Factor by which budgets grow and candidates shrink per rung
+            hyperband: Whether to run all Hyperband brackets instead of one
+                successive halving bracket
+            num_samples: Candidates of a successive halving bracket
+                (default: eta ** number of halvings)
+            maximize: Whether to maximize (True) or minimize (False) objective
+            max_time: Maximum time in seconds (default: None)
+            callback: Optional callback function called after each evaluation
+                with arguments (params, score, is_best)
+            executor: 'serial', 'thread' or 'process' (default: 'serial');
+                the process executor requires a picklable objective function
+            max_workers: Number of parallel workers (default: executor's default)
+            evaluator: Evaluator to use instead of executor and max_workers
+
+        Returns:
+            Dictionary with search results; only full-data scores compete for
+            the best result
+
+        Raises:
+            OptimizationError: If optimization fails
+        """
+        self.results = []
+        self.best_result = None
+        self.best_score = None
+        self.best_params = None
+
+        if min_budget is None:
+            min_budget = max(1, max_budget // eta ** 3)
+        brackets = self.get_brackets(min_budget, max_budget, eta, hyperband, num_samples)
+
+        logger.info(f"Starting {'Hyperband' if hyperband else 'successive halving'} search with "
+                    f"{len(brackets)} bracket(s), budgets from {min_budget} to {max_budget} bars")
+
+        # Start timing
+        start_time = time.time()
+        evaluations = 0
+        evaluator = evaluator or ParallelEvaluator(executor, max_workers)
+        stopped = False
+
+        # Draw every bracket's candidates up front so the sequence only depends on the seed
+        samples = [self._sample_candidates(num_candidates) for num_candidates, _ in brackets]
+
+        for bracket, (candidates, (_, budgets)) in enumerate(zip(samples, brackets)):
+            for rung, budget in enumerate(budgets):
+                scored = []
+                objective = BudgetedObjective(objective_function, budget)
+                for params, score, error in evaluator.map(objective, candidates):
+                    if error is not None:
+                        logger.warning(f"Error evaluating parameters {params}: {error}")
+                    else:
+                        evaluations += 1
+                        scored.append((params, score))
+                        self._record(params, score, evaluations, budget, bracket, rung,
+                                     maximize, callback)
+
+                    if max_time is not None and time.time() - start_time > max_time:
+                        logger.info(f"Stopping successive halving: reached max time ({max_time}s)")
+                        stopped = True
+                        break
+
+                if stopped or budget is None or not scored:
+                    break
+
+                # Promote the best 1/eta of the rung; sorting is stable, so ties keep sample order
+                scored.sort(key=lambda item: item[1], reverse=maximize)
+                candidates = [params for params, _ in scored[:max(1, len(scored) // eta)]]
+                logger.info(f"Bracket {bracket}, rung {rung}: promoting {len(candidates)} of "
+                            f"{len(scored)} candidates from {budget} bars")
+
+            if stopped:
+                break
+
+        # Without any full-data run, fall back to the longest runs
+        if self.best_params is None and self.results:
+            longest = max(self.results, key=lambda r: (r['budget'] is None, r['budget'] or 0))['budget']
+            for result in self.results:
+                if result['budget'] == longest:
+                    self._update_best(result, maximize)
+
+        # Calculate statistics
+        elapsed_time = time.time() - start_time
+        evaluations_per_second = evaluations / elapsed_time if elapsed_time > 0 else 0
+
+        logger.info(
+            f"Successive halving complete: "
+            f"{evaluations} evaluations, "
+            f"{elapsed_time:.2f}s, "
+            f"{evaluations_per_second:.2f} eval/s"
+        )
+
+        # Return search results
+        return {
+            'best_params': self.best_params,
+            'best_score': self.best_score,
+            'evaluations': evaluations,
+            'elapsed_time': elapsed_time,
+            'results': self.results
+        }
+
+    def _sample_candidates(self, num_candidates: int) -> List[Dict[str, Any]]:
+        """Draw distinct random candidates.
+
+        Args:
+            num_candidates: Number of candidates wanted
+
+        Returns:
+            Up to num_candidates distinct parameter dictionaries
+        """
+        candidates = []
+        seen = set()
+        for _ in range(num_candidates * 20):
+            if len(candidates) == num_candidates:
+                break
+            params = self.parameter_space.get_random_point()
+            key = repr(sorted(params.items()))
+            if key not in seen:
+                seen.add(key)
+                candidates.append(params)
+        return candidates
+
+    def _record(self, params: Dict[str, Any], score: float, evaluation: int,
+                budget: Optional[int], bracket: int, rung: int, maximize: bool,
+                callback: Optional[Callable]) -> None:
+        """Record an evaluation and update the best result.
+
+        Args:
+            params: Evaluated parameters
+            score: Objective value
+            evaluation: Evaluation number
+            budget: Bars of the run, or None for the full data
+            bracket: Bracket number
+            rung: Rung number within the bracket
+            maximize: Whether higher scores are better
+            callback: Optional callback called with (params, score, is_best)
+        """
+        result = {
+            'params': params,
+            'score': score,
+            'evaluation': evaluation,
+            'budget': budget,
+            'bracket': bracket,
+            'rung': rung,
+            'timestamp': time.time()
+        }
+        self.results.append(result)
+
+        # Scores on a prefix of the data are not comparable with full-data scores
+        is_best = budget is None and self._update_best(result, maximize)
+
+        # Call callback if provided
+        if callback:
+            callback(params, score, is_best)
+
+    def _update_best(self, result: Dict[str, Any], maximize: bool) -> bool:
+        """Make a result the best one if it improves on it.
+
+        Args:
+            result: Recorded evaluation
+            maximize: Whether higher scores are better
+
+        Returns:
+            Whether the result is the new best
+        """
+        score = result['score']
+        if self.best_score is not None and (score <= self.best_score if maximize else score >= self.best_score):
+            return False
+
+        self.best_score = score
+        self.best_params = result['params']
+        self.best_result = result
+        logger.info(f"New best result: score={score}, params={result['params']}")
+        return True
+
+    def get_best_params(self) -> Optional[Dict[str, Any]]:
+        """Get best parameters found.
+
+        Returns:
+            Best parameters or None if no search has been performed
+        """
+        return self.best_params
+
+    def get_best_score(self) -> Optional[float]:
+        """Get best score found.
+
+        Returns:
+            Best score or None if no search has been performed
+        """
+        return self.best_score
+
+    def get_results(self) -> List[Dict[str, Any]]:
+        """Get all evaluation results.
+
+        Returns:
+            List of evaluation results
+        """
+        return self.results
@@ -3,61 +3,445 @@ Walk-forward optimization for strategy parameters.
 
 This module provides walk-forward optimization capabilities for strategy robustness,
 using time-based windows to better generalize to unseen market conditions.
+
+Windows are row ranges of the data a HistoricalDataHandler has already
+loaded. Each window's train-period search and out-of-sample test is an
+independent task, so windows can be optimized concurrently, and the test
+periods are chained into one out-of-sample equity curve. Scores are cached
+per (window, parameters), so re-running on an extended dataset only
+evaluates the windows that did not exist before.
 """
 
+import os
+import json
 import time
+import pickle
+import hashlib
 import logging
+import tempfile
 import pandas as pd
 from typing import Dict, Any, List, Tuple, Optional, Callable, Union
 
 from src.core.exceptions import OptimizationError
+from src.execution.backtest.pruning import PrunedRun
+from src.execution.backtest.result_cache import RESULT_CONFIG_KEYS, get_code_fingerprint
+from src.analytics.metrics.functional import calculate_all_metrics
 from src.strategy.optimization.parameter_space import ParameterSpace
 from src.strategy.optimization.grid_search import GridSearch
 from src.strategy.optimization.random_search import RandomSearch
+from src.strategy.optimization.parallel import ParallelEvaluator, warm_market_data
+from src.strategy.optimization.objective_functions import sharpe_ratio
 
 logger = logging.getLogger(__name__)
 
+OPTIMIZATION_METHODS = ('grid', 'random')
+
+
+def _params_key(params: Dict[str, Any]) -> Tuple:
+    """Order-independent, hashable key of a parameter set."""
+    return tuple(sorted((name, repr(value)) for name, value in params.items()))
+
+
+def _window_key(window: Dict[str, Any]) -> Tuple:
+    """Key of a window's time boundaries, which do not move when data is appended."""
+    return tuple(str(window[key]) for key in ('train_start', 'train_end', 'test_start', 'test_end'))
+
+
+def _objective_key(objective_function: Callable) -> Optional[Tuple]:
+    """
+    Stable identity of an objective for cache keys.
+
+    Functions and methods are identified by module and qualified name.
+    Lambdas, nested functions and other callables share names or have none,
+    so they get no key and their scores are not cached.
+    """
+    module = getattr(objective_function, '__module__', None)
+    qualname = getattr(objective_function, '__qualname__', None)
+    if not module or not qualname or '<' in qualname:
+        return None
+    return (module, qualname)
+
+
+def _summarize(result: Dict[str, Any], score: float, keep_curve: bool) -> Dict[str, Any]:
+    """
+    Reduce a backtest result to what the walk-forward analysis keeps.
+
+    Args:
+        result: Backtest result
+        score: Objective score of the result
+        keep_curve: Keep the equity curve and trades (out-of-sample runs)
+
+    Returns:
+        Cache entry with the score and statistics
+    """
+    entry = {'score': score, 'statistics': dict(result.get('statistics') or {})}
+    if keep_curve:
+        entry['equity_curve'] = [{'timestamp': point.get('timestamp'), 'equity': point.get('equity')}
+                                 for point in result.get('equity_curve') or []]
+        entry['trades'] = list(result.get('trades') or [])
+    return entry
+
+
+def stitch_equity_curves(window_results: List[Dict[str, Any]], initial_capital: float) -> pd.DataFrame:
+    """
+    Chain the out-of-sample equity curves of consecutive windows.
+
+    Every test run starts from ``initial_capital``. Each curve is rescaled
+    to continue from the stitched equity where the previous window ended,
+    giving the equity of trading each test period in turn with the
+    parameters chosen for it. When test periods overlap (step shorter than
+    the test size) only the points after the previous window are kept.
+
+    Args:
+        window_results: Window results in time order
+        initial_capital: Starting capital of every test run
+
+    Returns:
+        DataFrame with 'equity' and 'window_idx' columns indexed by timestamp
+    """
+    frames = []
+    capital = initial_capital
+    last_timestamp = None
+    for result in window_results:
+        curve = (result.get('out_of_sample_result') or {}).get('equity_curve')
+        if not curve:
+            continue
+        equity = pd.DataFrame(curve).set_index('timestamp')['equity']
+        equity = pd.to_numeric(equity, errors='coerce').dropna()
+        base = initial_capital
+        if last_timestamp is not None:
+            earlier = equity[equity.index <= last_timestamp]
+            if len(earlier):
+                base = float(earlier.iloc[-1])
+            equity = equity[equity.index > last_timestamp]
+        if equity.empty or base == 0:
+            continue
+        stitched = equity * (capital / base)
+        frames.append(pd.DataFrame({'equity': stitched, 'window_idx': result['window_idx']}))
+        capital = float(stitched.iloc[-1])
+        last_timestamp = equity.index[-1]
+
+    if not frames:
+        return pd.DataFrame(columns=['equity', 'window_idx'])
+    return pd.concat(frames)
+
+
+class WalkForwardCache:
+    """
+    Walk-forward scores keyed by (window, parameters, split).
+
+    Entries are grouped by a namespace (strategy, data and objective) and
+    the window's time boundaries. Windows are anchored at the first bar, so
+    the windows of an extended dataset reuse the entries of the shorter
+    one; this assumes bars that were already loaded do not change. With a
+    path the entries are loaded from and saved to a pickle file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Pickle file to load from and save to (default: memory only)
+        """
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    self.entries = pickle.load(f)
+                logger.info(f"Loaded walk-forward results for {len(self.entries)} windows from {path}")
+            except Exception as e:
+                logger.warning(f"Could not load walk-forward cache {path}: {e}")
+
+    def get_window(self, namespace: Tuple, window: Dict[str, Any]) -> Dict[Tuple, Dict[str, Any]]:
+        """
+        Get the cached entries of a window.
+
+        Args:
+            namespace: Strategy, data and objective identity
+            window: Walk-forward window
+
+        Returns:
+            Copy of the entries, keyed by (parameters key, split)
+        """
+        return dict(self.entries.get((namespace, _window_key(window)), {}))
+
+    def update_window(self, namespace: Tuple, window: Dict[str, Any],
+                      entries: Dict[Tuple, Dict[str, Any]], hits: int = 0) -> None:
+        """
+        Add a window's newly computed entries and count its lookups.
+
+        Args:
+            namespace: Strategy, data and objective identity
+            window: Walk-forward window
+            entries: New entries, keyed by (parameters key, split)
+            hits: Number of lookups served from the cache
+        """
+        self.entries.setdefault((namespace, _window_key(window)), {}).update(entries)
+        self.hits += hits
+        self.misses += len(entries)
+
+    def save(self) -> None:
+        """Write the entries to the cache file, replacing it atomically."""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.walk_forward_', dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self.entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Could not save walk-forward cache {self.path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Window and entry counts, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            'windows': len(self.entries),
+            'entries': sum(len(entries) for entries in self.entries.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class WindowBacktest:
+    """
+    Backtest of a strategy on the train or test period of a window.
+
+    Instances can be sent to worker processes: like TrainingObjective, the
+    strategy factory is not pickled and is rebuilt from the strategy
+    directories in the worker.
+    """
+
+    def __init__(self, strategy_name: str, backtest_config: Dict[str, Any],
+                 strategy_factory=None, strategy_dirs: Optional[List[str]] = None):
+        """
+        Initialize the backtest runner.
+
+        Args:
+            strategy_name: Name of the strategy to backtest
+            backtest_config: Backtest configuration, including the data section
+            strategy_factory: Factory to use in this process (optional)
+            strategy_dirs: Extra strategy directories for rebuilt factories
+        """
+        self.strategy_name = strategy_name
+        self.backtest_config = backtest_config
+        self.strategy_factory = strategy_factory
+        self.strategy_dirs = strategy_dirs or []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['strategy_factory'] = None
+        return state
+
+    @property
+    def initial_capital(self) -> float:
+        """Starting capital of every run."""
+        return self.backtest_config.get('initial_capital', 100000)
+
+    @property
+    def data_config(self) -> Dict[str, Any]:
+        """Data configuration the runs load, with max_bars applied."""
+        data_config = dict(self.backtest_config.get('data', {}))
+        if 'max_bars' in self.backtest_config:
+            data_config['max_bars'] = self.backtest_config['max_bars']
+        return data_config
+
+    @property
+    def cache_namespace(self) -> Tuple:
+        """
+        Identity of the strategy, data and settings for cache keys.
+
+        Like ResultCache.make_key, it covers the configuration sections in
+        RESULT_CONFIG_KEYS, the optimization engine and the source files of
+        the strategy class, so changing any of them invalidates saved scores.
+        """
+        data_config = self.data_config
+        sources = tuple(sorted((source.get('symbol'), os.path.abspath(source.get('file', '')))
+                               for source in data_config.get('sources', [])))
+        settings = {key: self.backtest_config.get(key) for key in RESULT_CONFIG_KEYS}
+        settings['engine'] = (self.backtest_config.get('optimization') or {}).get('engine')
+        settings_digest = hashlib.sha256(
+            json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+        strategy_class = self._get_strategy_factory().get_strategy_class(self.strategy_name)
+        return (self.strategy_name, sources, data_config.get('max_bars'), settings_digest,
+                get_code_fingerprint(strategy_class))
+
+    def _get_strategy_factory(self):
+        """Get the strategy factory, rebuilding it after unpickling."""
+        # Import here to avoid circular imports
+        from src.strategy.strategy_factory import StrategyFactory
+
+        if self.strategy_factory is None:
+            strategy_dirs = [os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'implementations')]
+            self.strategy_factory = StrategyFactory(strategy_dirs + list(self.strategy_dirs))
+        return self.strategy_factory
+
+    def __call__(self, params: Dict[str, Any], window: Dict[str, Any], split: str) -> Dict[str, Any]:
+        """
+        Run a backtest on one period of a window.
+
+        Args:
+            params: Strategy parameters
+            window: Window from HistoricalDataHandler.create_walk_forward_windows
+            split: 'train' or 'test'
+
+        Returns:
+            Backtest results
+        """
+        # Import here to avoid circular imports
+        from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+
+        backtest = OptimizingBacktest(f"walk_forward_{window.get('window_idx')}", self.backtest_config, None)
+        backtest.initialize({'strategy_factory': self._get_strategy_factory()})
+        return backtest._run_backtest_with_params(self.strategy_name, params, split, {'window': window})
+
+
+def _optimize_window(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Optimize one window: search the train period, then test the best parameters.
+
+    Runs in the calling process or in a worker; backtests whose score is in
+    ``task['cached']`` are not run again. Train runs stopped by
+    ``optimization.pruning`` are counted by the search as pruned and are not
+    cached.
+
+    Args:
+        task: Window, runner, parameter space, objective and search settings
+            from WalkForwardOptimizer.optimize, and the window's cached entries
+
+    Returns:
+        Window result, newly computed cache entries and the number of cache hits
+    """
+    window = task['window']
+    runner = task['runner']
+    objective_function = task['objective_function']
+    cached = task['cached']
+    computed = {}
+    hits = 0
+
+    def evaluate(params, split):
+        nonlocal hits
+        key = (_params_key(params), split)
+        entry = cached.get(key)
+        if entry is not None:
+            hits += 1
+            return entry
+        result = runner(params, window, split)
+        if result.get('pruned'):
+            # A run stopped early has no comparable score; it is neither scored nor cached
+            pruned = result['pruned']
+            raise PrunedRun(pruned['reason'], pruned['bar'])
+        entry = _summarize(result, objective_function(result), keep_curve=(split == 'test'))
+        cached[key] = computed[key] = entry
+        return entry
+
+    def train_objective(params):
+        return evaluate(params, 'train')['score']
+
+    if task['method'] == 'grid':
+        search_results = GridSearch(task['parameter_space']).search(
+            objective_function=train_objective,
+            maximize=task['maximize'],
+            max_evaluations=task['max_evaluations']
+        )
+    else:
+        search_results = RandomSearch(task['parameter_space'], seed=task['random_seed']).search(
+            objective_function=train_objective,
+            num_samples=task['random_samples'] or 100,
+            maximize=task['maximize']
+        )
+
+    best_params = search_results.get('best_params')
+    out_of_sample = None
+    if best_params:
+        try:
+            out_of_sample = evaluate(best_params, 'test')
+        except Exception as e:
+            logger.error(f"Error evaluating parameters on test data of window {window['window_idx'] + 1}: {e}")
+
+    window_result = {
+        'window_idx': window['window_idx'],
+        'train_start': window['train_start'],
+        'train_end': window['train_end'],
+        'test_start': window['test_start'],
+        'test_end': window['test_end'],
+        'best_parameters': best_params,
+        'in_sample_score': search_results.get('best_score'),
+        'out_of_sample_score': out_of_sample['score'] if out_of_sample else None,
+        'out_of_sample_result': out_of_sample,
+        'optimization_results': search_results
+    }
+    return {'window_result': window_result, 'entries': computed, 'hits': hits}
+
 
 class WalkForwardOptimizer:
     """Walk-forward optimizer for strategy parameters."""
     
-    def __init__(self, data_handler, strategy_factory, optimization_method="grid"):
+    def __init__(self, data_handler, backtest_runner: Callable, optimization_method: str = "grid",
+                 executor: Optional[str] = None, max_workers: Optional[int] = None,
+                 cache: Optional[WalkForwardCache] = None):
         """
         Initialize walk-forward optimizer.
         
         Args:
             data_handler: Data handler with walk-forward window support
-            strategy_factory: Function to create strategy instances
+            backtest_runner: Callable ``(params, window, split) -> results``, e.g. a
+                WindowBacktest; must be picklable for the process executor
             optimization_method: Method for optimization ('grid' or 'random')
+            executor: 'serial', 'thread' or 'process' evaluation of windows
+            max_workers: Number of windows optimized at once
+            cache: Cache of per-window scores (default: a new in-memory cache)
         """
         self.data_handler = data_handler
-        self.strategy_factory = strategy_factory
+        self.backtest_runner = backtest_runner
         self.optimization_method = optimization_method
+        self.executor = executor or ('process' if max_workers and max_workers > 1 else 'serial')
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else WalkForwardCache()
         self.results = []
         self.windows = []
         self.best_parameters = None
+        self.oos_equity_curve = None
     
     def optimize(self, parameter_space: ParameterSpace, 
-                window_size_days: int, step_size_days: int, 
-                test_size_days: Optional[int] = None,
+                window_size: int, step_size: int, 
+                test_size: Optional[int] = None,
                 window_type: str = "rolling",
+                unit: str = "days",
                 objective_function: Callable = None,
                 maximize: bool = True,
                 max_evaluations_per_window: Optional[int] = None,
-                random_samples: Optional[int] = None) -> Dict[str, Any]:
+                random_samples: Optional[int] = None,
+                random_seed: Optional[int] = None) -> Dict[str, Any]:
         """
         Perform walk-forward optimization.
         
         Args:
             parameter_space: Parameter space to search
-            window_size_days: Size of each window in days
-            step_size_days: Size of each step forward in days
-            test_size_days: Size of test portion in days (default: 20% of window_size)
+            window_size: Train plus test length of each window
+            step_size: Size of each step forward
+            test_size: Size of test portion (default: 20% of window_size)
             window_type: Type of window ('rolling' or 'expanding')
-            objective_function: Function to evaluate parameter combinations
+            unit: Unit of the sizes ('days' or 'bars')
+            objective_function: Function scoring backtest results (default: Sharpe ratio);
+                must be picklable for the process executor
             maximize: Whether to maximize (True) or minimize (False) objective
             max_evaluations_per_window: Maximum evaluations per window for grid search
             random_samples: Number of random samples for random search
+            random_seed: Base seed for random search; window i uses random_seed + i
             
         Returns:
             Dictionary with optimization results
@@ -65,17 +449,22 @@ class WalkForwardOptimizer:
         Raises:
             OptimizationError: If optimization fails
         """
+        if self.optimization_method not in OPTIMIZATION_METHODS:
+            raise OptimizationError(f"Invalid optimization method: {self.optimization_method}")
+        
         # Reset results
         self.results = []
         self.windows = []
+        self.oos_equity_curve = None
         
         # Create walk-forward windows
         try:
             self.windows = self.data_handler.create_walk_forward_windows(
-                window_size_days=window_size_days,
-                step_size_days=step_size_days,
-                test_size_days=test_size_days,
-                window_type=window_type
+                window_size,
+                step_size,
+                test_size=test_size,
+                window_type=window_type,
+                unit=unit
             )
         except Exception as e:
             raise OptimizationError(f"Error creating walk-forward windows: {e}")
@@ -90,79 +479,83 @@ class WalkForwardOptimizer:
         # Start timing
         start_time = time.time()
         
-        # Process each window
-        for window_idx, window in enumerate(self.windows):
-            logger.info(f"Processing window {window_idx+1}/{len(self.windows)}: "
-                      f"{window['train_start']} to {window['test_end']}")
-            
-            # Set date range for training
-            self.data_handler.set_date_range(window['train_start'], window['train_end'])
-            
-            # Create optimizer for this window
-            if self.optimization_method == "grid":
-                optimizer = GridSearch(parameter_space)
-                # Run optimization
-                window_opt_results = optimizer.search(
-                    objective_function=objective_function,
-                    maximize=maximize,
-                    max_evaluations=max_evaluations_per_window
-                )
-            elif self.optimization_method == "random":
-                optimizer = RandomSearch(parameter_space)
-                # Run optimization
-                window_opt_results = optimizer.search(
-                    objective_function=objective_function,
-                    num_samples=random_samples or 100,
-                    maximize=maximize
-                )
-            else:
-                raise OptimizationError(f"Invalid optimization method: {self.optimization_method}")
-            
-            # Extract best parameters
-            best_params = window_opt_results.get('best_params')
-            in_sample_score = window_opt_results.get('best_score')
+        objective_function = objective_function or sharpe_ratio
+        objective_key = _objective_key(objective_function)
+        if objective_key is None:
+            logger.info(f"Objective {objective_function!r} has no stable name; scores are not cached")
+            namespace = None
+        else:
+            namespace = (getattr(self.backtest_runner, 'cache_namespace', None), objective_key)
+        tasks = [{
+            'window': window,
+            'runner': self.backtest_runner,
+            'parameter_space': parameter_space,
+            'objective_function': objective_function,
+            'maximize': maximize,
+            'method': self.optimization_method,
+            'max_evaluations': max_evaluations_per_window,
+            'random_samples': random_samples,
+            'random_seed': None if random_seed is None else random_seed + window['window_idx'],
+            'cached': self.cache.get_window(namespace, window) if namespace is not None else {}
+        } for window in self.windows]
+        
+        # Windows are independent; workers parse the market data once each
+        data_config = getattr(self.backtest_runner, 'data_config', None)
+        evaluator = ParallelEvaluator(
+            self.executor, self.max_workers, batch_size=1,
+            initializer=warm_market_data if data_config else None,
+            initargs=(data_config,) if data_config else ()
+        )
+        
+        # Process each window; results arrive in window order
+        for task, outcome, error in evaluator.map(_optimize_window, tasks):
+            window = task['window']
+            window_idx = window['window_idx']
+            if error is not None:
+                logger.error(f"Error optimizing window {window_idx+1}: {error}")
+                continue
             
-            if not best_params:
+            if namespace is not None:
+                self.cache.update_window(namespace, window, outcome['entries'], outcome['hits'])
+            window_result = outcome['window_result']
+            if not window_result['best_parameters']:
                 logger.warning(f"No best parameters found for window {window_idx+1}")
                 continue
             
-            # Set date range for out-of-sample testing
-            self.data_handler.set_date_range(window['test_start'], window['test_end'])
-            
-            # Evaluate best parameters on test data
-            try:
-                out_of_sample_score = objective_function(best_params)
-            except Exception as e:
-                logger.error(f"Error evaluating parameters on test data: {e}")
-                out_of_sample_score = None
-            
-            # Record results for this window
-            window_result = {
-                'window_idx': window_idx,
-                'train_start': window['train_start'],
-                'train_end': window['train_end'],
-                'test_start': window['test_start'],
-                'test_end': window['test_end'],
-                'best_parameters': best_params,
-                'in_sample_score': in_sample_score,
-                'out_of_sample_score': out_of_sample_score,
-                'optimization_results': window_opt_results
-            }
-            
             self.results.append(window_result)
             
             # Log window results
-            logger.info(f"Window {window_idx+1} results: "
-                      f"in-sample score: {in_sample_score:.6f}, "
-                      f"out-of-sample score: {out_of_sample_score:.6f}, "
-                      f"parameters: {best_params}")
+            out_of_sample_score = window_result['out_of_sample_score']
+            logger.info(f"Window {window_idx+1}/{len(self.windows)} "
+                      f"({window['train_start']} to {window['test_end']}) results: "
+                      f"in-sample score: {window_result['in_sample_score']:.6f}, "
+                      f"out-of-sample score: "
+                      f"{'n/a' if out_of_sample_score is None else f'{out_of_sample_score:.6f}'}, "
+                      f"parameters: {window_result['best_parameters']}, "
+                      f"{outcome['hits']} cached / {len(outcome['entries'])} new backtests")
+        
+        self.cache.save()
         
         # Calculate elapsed time
         elapsed_time = time.time() - start_time
         
+        # Chain the out-of-sample periods into one equity curve
+        initial_capital = getattr(self.backtest_runner, 'initial_capital', 100000)
+        self.oos_equity_curve = stitch_equity_curves(self.results, initial_capital)
+        oos_trades = [dict(trade, window_idx=result['window_idx'])
+                      for result in self.results
+                      for trade in (result.get('out_of_sample_result') or {}).get('trades', [])]
+        oos_statistics = {}
+        if len(self.oos_equity_curve) > 1:
+            oos_statistics = calculate_all_metrics(self.oos_equity_curve[['equity']], oos_trades)
+        
         # Analyze results
         analysis = self._analyze_results(maximize)
         
+        cache_stats = self.cache.get_stats()
+        logger.info(f"Walk-forward optimization of {len(self.windows)} windows completed in "
+                    f"{elapsed_time:.1f}s; cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        
         # Compile final results
         final_results = {
             'windows': len(self.windows),
@@ -171,7 +564,11 @@ class WalkForwardOptimizer:
             'best_window': analysis.get('best_window'),
             'best_parameters': analysis.get('best_parameters'),
             'parameter_stability': analysis.get('parameter_stability'),
-            'robustness_score': analysis.get('robustness_score')
+            'robustness_score': analysis.get('robustness_score'),
+            'oos_equity_curve': self.oos_equity_curve,
+            'oos_trades': oos_trades,
+            'oos_statistics': oos_statistics,
+            'cache': cache_stats
         }
         
         # Store best parameters
@@ -426,3 +823,12 @@ class WalkForwardOptimizer:
             Dictionary with parameter stability metrics
         """
         return self._calculate_parameter_stability()
+    
+    def get_oos_equity_curve(self) -> Optional[pd.DataFrame]:
+        """
+        Get the stitched out-of-sample equity curve.
+        
+        Returns:
+            DataFrame indexed by timestamp, or None if no optimization has been performed
+        """
+        return self.oos_equity_curve
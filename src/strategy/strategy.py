@@ -131,8 +131,11 @@ class Strategy(Component, ABC):
             if isinstance(event, Bar):
                 # Direct Bar object - use it as is
                 bar = event
+            elif isinstance(event.data, Bar):
+                # Data handlers publish the Bar itself
+                bar = event.data
             else:
-                # Assume it's an Event - extract bar data from event
+                # Legacy event with a bar dictionary
                 bar_data = event.data
                 
                 # Convert event data to Bar object
@@ -159,7 +162,7 @@ class Strategy(Component, ABC):
             symbol = bar.symbol
             
             # Log receipt of bar
-            self.logger.debug(f"Received bar for {symbol} at {bar.timestamp}")
+            self.hot_log.debug("Received bar for %s at %s", symbol, bar.timestamp)
             
             # Store the bar
             self.last_bar[symbol] = bar
@@ -320,11 +323,11 @@ class MultipleTimeframeStrategy(Strategy):
                 # Start new aggregation with this bar
                 new_bar = self._create_aggregated_bar(symbol, bar, tf)
                 current_bars.append(new_bar)
-                self.logger.debug(f"Created new aggregated bar for {symbol} at {tf}")
+                self.hot_log.debug("Created new aggregated bar for %s at %s", symbol, tf)
             else:
                 # Update existing aggregation
-                self._update_aggregated_bar(current_bars[-1], bar)
-                self.logger.debug(f"Updated aggregated bar for {symbol} at {tf}")
+                current_bars[-1] = self._update_aggregated_bar(current_bars[-1], bar)
+                self.hot_log.debug("Updated aggregated bar for %s at %s", symbol, tf)
                 
             # Signal calculation for this timeframe
             try:
@@ -444,15 +447,20 @@ class MultipleTimeframeStrategy(Strategy):
             timeframe=timeframe
         )
     
-    def _update_aggregated_bar(self, agg_bar: Bar, new_bar: Bar) -> None:
+    def _update_aggregated_bar(self, agg_bar: Bar, new_bar: Bar) -> Bar:
         """
-        Update an aggregated bar with a new lower timeframe bar.
+        Extend an aggregated bar with a new lower timeframe bar.
         
         Args:
-            agg_bar: Aggregated bar to update
+            agg_bar: Aggregated bar so far
             new_bar: New lower timeframe bar
-        """
-        agg_bar.high = max(agg_bar.high, new_bar.high)
-        agg_bar.low = min(agg_bar.low, new_bar.low)
-        agg_bar.close = new_bar.close
-        agg_bar.volume += new_bar.volume
\ No newline at end of file
+            
+        Returns:
+            Bar: Aggregated bar including new_bar
+        """
+        return agg_bar.replace(
+            high=max(agg_bar.high, new_bar.high),
+            low=min(agg_bar.low, new_bar.low),
+            close=new_bar.close,
+            volume=agg_bar.volume + new_bar.volume
+        )
\ No newline at end of file
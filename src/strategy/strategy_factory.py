@@ -12,8 +12,11 @@ import sys
 from pathlib import Path
 import logging
 
+from src.core.logging import refresh_hot_path_loggers
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
+refresh_hot_path_loggers()
 logger = logging.getLogger(__name__)
 
 class StrategyFactory:
@@ -161,16 +164,16 @@ class StrategyFactory:
         """
         return list(self.strategies.keys())
         
-    def create_strategy(self, strategy_name, **kwargs):
+    def get_strategy_class(self, strategy_name):
         """
-        Create a strategy instance with proper dependency handling.
+        Look up a strategy class by name.
         
         Args:
-            strategy_name (str): Name of the strategy to create
-            **kwargs: Arguments to pass to the strategy constructor
+            strategy_name (str): Name of the strategy, matched exactly, then
+                case-insensitively, then as a unique partial name
             
         Returns:
-            object: Strategy instance
+            type: Strategy class
             
         Raises:
             ValueError: If the strategy is not found
@@ -200,6 +203,24 @@ class StrategyFactory:
             available = ", ".join(self.get_strategy_names())
             raise ValueError(f"Strategy '{strategy_name}' not found. Available strategies: {available}")
             
+        return strategy_class
+        
+    def create_strategy(self, strategy_name, **kwargs):
+        """
+        Create a strategy instance with proper dependency handling.
+        
+        Args:
+            strategy_name (str): Name of the strategy to create
+            **kwargs: Arguments to pass to the strategy constructor
+            
+        Returns:
+            object: Strategy instance
+            
+        Raises:
+            ValueError: If the strategy is not found
+        """
+        strategy_class = self.get_strategy_class(strategy_name)
+            
         # Collect required arguments for this class
         import inspect
         sig = inspect.signature(strategy_class.__init__)
@@ -0,0 +1,93 @@
+"""
+Tests for the binary on-disk CSV cache.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.data.binary_cache import (
+    build_caches, cache_dir_for, invalidate_cache, parse_timestamps, read_csv_cached
+)
+
+
+def _frame(periods):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 09:30', periods=periods, freq='1min').strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': np.arange(periods, dtype=float),
+        'Close': np.arange(periods, dtype=float) + 0.5,
+        'Volume': np.arange(periods) + 100,
+        'note': ['a', None] * (periods // 2) + ['b'] * (periods % 2),
+    })
+
+
+class TestBinaryCache(unittest.TestCase):
+    """Test cases for read_csv_cached."""
+
+    FORMAT = '%Y-%m-%d %H:%M:%S'
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'SPY_1min.csv')
+        _frame(10).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _expected(self, nrows=None):
+        df = pd.read_csv(self.path, nrows=nrows)
+        df['timestamp'] = parse_timestamps(df['timestamp'], self.FORMAT)
+        return df
+
+    def test_round_trip_matches_csv(self):
+        first = read_csv_cached(self.path, 'timestamp', self.FORMAT)
+        self.assertTrue(os.path.isdir(cache_dir_for(self.path)))
+        second = read_csv_cached(self.path, 'timestamp', self.FORMAT)
+
+        pd.testing.assert_frame_equal(first, self._expected())
+        pd.testing.assert_frame_equal(second, self._expected())
+        self.assertTrue(second['note'].isna().iloc[1])
+
+    def test_row_limit(self):
+        read_csv_cached(self.path, 'timestamp', self.FORMAT)
+        pd.testing.assert_frame_equal(read_csv_cached(self.path, 'timestamp', self.FORMAT, nrows=4),
+                                      self._expected(nrows=4))
+
+    def test_stale_cache_is_rebuilt(self):
+        read_csv_cached(self.path, 'timestamp', self.FORMAT)
+        _frame(14).to_csv(self.path, index=False)
+
+        df = read_csv_cached(self.path, 'timestamp', self.FORMAT)
+        self.assertEqual(len(df), 14)
+        pd.testing.assert_frame_equal(df, self._expected())
+
+    def test_tz_aware_timestamps(self):
+        ts = pd.date_range('2024-01-02 09:30', periods=5, freq='1min', tz='America/New_York')
+        pd.DataFrame({'date': ts, 'close': 1.0}).to_csv(self.path, index=False)
+
+        read_csv_cached(self.path, ['timestamp', 'date'])
+        df = read_csv_cached(self.path, ['timestamp', 'date'])
+        self.assertEqual(list(df['date']), list(ts))
+
+    def test_coerce_and_raise_variants_are_separate(self):
+        frame = _frame(4)
+        frame.loc[2, 'timestamp'] = 'not a date'
+        frame.to_csv(self.path, index=False)
+
+        coerced = read_csv_cached(self.path, 'timestamp', self.FORMAT, date_errors='coerce')
+        self.assertTrue(coerced['timestamp'].isna().iloc[2])
+        with self.assertRaises(ValueError):
+            read_csv_cached(self.path, 'timestamp', self.FORMAT)
+
+    def test_build_and_invalidate(self):
+        results = build_caches(self.test_dir, 'timestamp', self.FORMAT)
+        self.assertEqual(results, {self.path: True})
+        self.assertTrue(invalidate_cache(self.path))
+        self.assertFalse(os.path.exists(cache_dir_for(self.path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
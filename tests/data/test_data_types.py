@@ -0,0 +1,96 @@
+"""
+Tests for the immutable Bar record and Timeframe lookups.
+"""
+import pickle
+import unittest
+
+import pandas as pd
+
+from src.core.events.event_bus import EventBus
+from src.core.events.event_types import Event, EventType
+from src.data.data_types import Bar, Timeframe
+from src.execution.broker.market_simulator import MarketSimulator
+from src.execution.broker.simulated_broker import SimulatedBroker
+
+
+def _bar(**changes):
+    fields = dict(timestamp=pd.Timestamp('2024-01-02 09:30'), symbol='SPY', open=100.0,
+                  high=101.0, low=99.0, close=100.5, volume=1000.0, timeframe=Timeframe.MINUTE_1)
+    fields.update(changes)
+    return Bar(**fields)
+
+
+class TestBar(unittest.TestCase):
+
+    def test_attributes_and_mapping_view(self):
+        bar = _bar()
+        self.assertEqual(bar.close, 100.5)
+        self.assertEqual(bar['close'], 100.5)
+        self.assertEqual(bar.get('volume'), 1000.0)
+        self.assertIsNone(bar.get('adj_close'))
+        self.assertEqual(bar['timeframe'], '1m')
+        self.assertIs(bar.timeframe, Timeframe.MINUTE_1)
+        self.assertIn('symbol', bar)
+        self.assertNotIn('extra', bar)
+        self.assertEqual(dict(bar), bar.to_dict())
+        with self.assertRaises(KeyError):
+            bar['vwap']
+
+    def test_immutable(self):
+        bar = _bar()
+        with self.assertRaises(AttributeError):
+            bar.close = 1.0
+        with self.assertRaises(AttributeError):
+            bar.other = 1.0
+        self.assertIs(bar.copy(), bar)
+
+        changed = bar.replace(close=102.0)
+        self.assertEqual((bar.close, changed.close), (100.5, 102.0))
+        self.assertEqual(changed.symbol, 'SPY')
+
+    def test_dict_round_trip_and_extra_fields(self):
+        data = _bar().to_dict()
+        data['adj_close'] = 100.25
+        bar = Bar.from_dict(data)
+
+        self.assertEqual(bar['adj_close'], 100.25)
+        self.assertEqual(bar, data)
+        self.assertEqual(len(bar), len(data))
+        self.assertEqual(pickle.loads(pickle.dumps(bar)), bar)
+
+    def test_timeframe_strings(self):
+        self.assertIs(Timeframe.from_string('15min'), Timeframe.MINUTE_15)
+        self.assertIs(Timeframe.from_string('15min'), Timeframe.MINUTE_15)
+        self.assertIs(Timeframe.from_string(Timeframe.HOUR_1), Timeframe.HOUR_1)
+        self.assertEqual(Timeframe.DAY_1.to_string(), '1d')
+        self.assertIs(_bar(timeframe='1h').timeframe, Timeframe.HOUR_1)
+        with self.assertRaises(ValueError):
+            Timeframe.from_string('7x')
+
+
+class TestBarConsumers(unittest.TestCase):
+
+    def test_broker_and_simulator_keep_the_published_bar(self):
+        event_bus = EventBus()
+        simulator = MarketSimulator(config={'max_history_bars': 2})
+        broker = SimulatedBroker('broker')
+        broker.market_simulator = simulator
+        broker.event_bus = event_bus
+
+        bars = [_bar(close=100.0 + i, timestamp=pd.Timestamp('2024-01-02 09:30') + pd.Timedelta(minutes=i))
+                for i in range(3)]
+        for bar in bars:
+            broker.on_bar(Event(EventType.BAR, bar))
+
+        self.assertIs(broker.latest_prices['SPY'], bars[-1])
+        self.assertIs(simulator.get_current_price('SPY'), bars[-1])
+        self.assertEqual(simulator.historical_prices['SPY'], bars[1:])
+
+    def test_legacy_dicts_still_accepted(self):
+        simulator = MarketSimulator()
+        simulator.update_price_data('SPY', {'open': '1', 'high': 2, 'low': 0.5, 'close': 1.5})
+        self.assertEqual(simulator.get_current_price('SPY')['close'], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,321 @@
+"""
+Tests for the array-backed replay in HistoricalDataHandler.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.events.event_bus import EventBus
+from src.core.events.event_types import EventType
+from src.data.bar_store import BarStore
+from src.data.data_types import Bar
+from src.data.historical_data_handler import HistoricalDataHandler
+from src.data.replay_scheduler import MergeScheduler
+
+
+def _make_frame(start, periods, base):
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=periods, freq='1min').strftime('%Y-%m-%d %H:%M:%S'),
+        'Open': np.arange(periods) + base,
+        'High': np.arange(periods) + base + 1.0,
+        'Low': np.arange(periods) + base - 1.0,
+        'Close': np.arange(periods) + base + 0.5,
+        'Volume': np.arange(periods) * 10 + 100,
+    })
+
+
+class TestBarStore(unittest.TestCase):
+    """Test cases for BarStore."""
+
+    def test_row_matches_dataframe(self):
+        df = _make_frame('2024-01-02 09:30', 5, 100.0)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df.columns = [c.lower() for c in df.columns]
+        store = BarStore.from_dataframe(df)
+
+        self.assertEqual(len(store), 5)
+        self.assertEqual(store.timestamps.dtype, np.int64)
+        for i in range(5):
+            self.assertEqual(store.row(i), df.iloc[i].to_dict())
+
+    def test_tz_aware_timestamps_round_trip(self):
+        ts = pd.date_range('2024-01-02 09:30', periods=3, freq='1min', tz='America/New_York')
+        df = pd.DataFrame({'timestamp': ts, 'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0})
+        store = BarStore.from_dataframe(df)
+
+        self.assertEqual(store.timestamp_at(1), ts[1])
+        self.assertEqual(store.searchsorted(ts[2]), 2)
+        self.assertEqual([bar.timestamp for bar in store.bars(0, 3, 'X')], list(ts))
+
+    def test_bars_carry_optional_columns_like_bar(self):
+        df = _make_frame('2024-01-02 09:30', 4, 100.0)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df.columns = [c.lower() for c in df.columns]
+        df['adj_close'] = df['close'] * 0.5
+        store = BarStore.from_dataframe(df)
+
+        for i in range(4):
+            sliced = store.bars(i, i + 1, 'SPY')[0]
+            single = store.bar(i, 'SPY')
+            self.assertEqual(sliced.extra, single.extra)
+            self.assertEqual(sliced.to_dict(), single.to_dict())
+            self.assertEqual(sliced['adj_close'], df['adj_close'].iloc[i])
+
+
+class TestMergeScheduler(unittest.TestCase):
+    """Test cases for MergeScheduler."""
+
+    def _store(self, minutes):
+        ts = pd.Timestamp('2024-01-02 09:30') + pd.to_timedelta(minutes, unit='min')
+        return BarStore.from_dataframe(pd.DataFrame({'timestamp': ts, 'close': 1.0}))
+
+    def test_slices_group_symbols_by_timestamp(self):
+        stores = {'A': self._store([0, 1, 3]), 'B': self._store([1, 2, 3]), 'C': self._store([3])}
+        scheduler = MergeScheduler(stores, {})
+
+        slices = []
+        while True:
+            ts_ns, entries = scheduler.pop_slice()
+            if ts_ns is None:
+                break
+            for symbol, idx in entries:
+                scheduler.advance(symbol, idx)
+            slices.append([symbol for symbol, _ in entries])
+
+        self.assertEqual(slices, [['A'], ['A', 'B'], ['B'], ['A', 'B', 'C']])
+
+    def test_starts_from_cursors(self):
+        stores = {'A': self._store([0, 1, 2])}
+        scheduler = MergeScheduler(stores, {'A': 1})
+        self.assertEqual(scheduler.pop_slice()[1], [('A', 2)])
+        self.assertEqual(len(scheduler), 0)
+
+
+class TestHistoricalDataHandlerReplay(unittest.TestCase):
+    """Test cases for HistoricalDataHandler replay over columnar stores."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.frames = {
+            'AAA': _make_frame('2024-01-02 09:30', 6, 100.0),
+            # BBB starts two minutes later so timestamps only partially overlap
+            'BBB': _make_frame('2024-01-02 09:32', 6, 200.0),
+        }
+        sources = []
+        for symbol, df in self.frames.items():
+            path = os.path.join(self.test_dir, f"{symbol}_1min.csv")
+            df.to_csv(path, index=False)
+            sources.append({'symbol': symbol, 'file': path})
+
+        self.data_config = {
+            'sources': sources,
+            'date_column': 'timestamp',
+            'date_format': '%Y-%m-%d %H:%M:%S',
+            'timeframe': '1min',
+        }
+        self.event_bus = EventBus()
+        self.bars = []
+        self.event_bus.subscribe(EventType.BAR, self._on_bar)
+
+        self.handler = HistoricalDataHandler('data_handler', self.data_config)
+        self.handler.initialize({'event_bus': self.event_bus})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _on_bar(self, event):
+        self.bars.append(event.get_data())
+
+    def test_timestamps_are_parsed(self):
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(self.handler.data['AAA']['timestamp']))
+
+    def test_update_bars_merges_symbols_in_time_order(self):
+        while self.handler.update_bars():
+            pass
+
+        self.assertEqual(len(self.bars), 12)
+        timestamps = [bar['timestamp'] for bar in self.bars]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertEqual(self.bars[0]['symbol'], 'AAA')
+        self.assertEqual(self.bars[0]['close'], 100.5)
+        self.assertEqual(self.bars[0]['timeframe'], self.handler.timeframe.to_string())
+        self.assertIsInstance(self.bars[0]['timestamp'], pd.Timestamp)
+
+    def test_update_publishes_bar_objects(self):
+        self.handler.set_active_split(None)
+        self.handler.update()
+
+        bar = self.bars[0]
+        self.assertIsInstance(bar, Bar)
+        self.assertIs(bar.timeframe, self.handler.timeframe)
+        self.assertIs(self.handler.current_bar, bar)
+        self.assertEqual((bar.symbol, bar.close), ('AAA', 100.5))
+
+    def test_time_slice_emitted_once_per_timestamp(self):
+        slices = []
+        self.event_bus.subscribe(EventType.TIME_SLICE, lambda event: slices.append(event.get_data()))
+
+        while self.handler.update_bars():
+            pass
+
+        # 6 AAA minutes + 6 BBB minutes with 4 shared -> 8 distinct timestamps
+        self.assertEqual(len(slices), 8)
+        self.assertEqual(sum(len(s['bars']) for s in slices), len(self.bars))
+        self.assertEqual(slices[2]['symbols'], ['AAA', 'BBB'])
+        self.assertEqual(slices[2]['timestamp'], self.bars[2]['timestamp'])
+
+    def test_reset_rewinds_replay(self):
+        for _ in range(3):
+            self.handler.update_bars()
+        self.handler.reset()
+        self.bars.clear()
+
+        while self.handler.update_bars():
+            pass
+        self.assertEqual(len(self.bars), 12)
+
+    def test_latest_bars_follow_cursor(self):
+        for _ in range(4):
+            self.handler.update_bars()
+
+        latest = self.handler.get_latest_bar('AAA')
+        self.assertEqual(latest.close, 103.5)
+        window = self.handler.get_latest_bars('AAA', 3)
+        self.assertEqual([bar.close for bar in window], [101.5, 102.5, 103.5])
+        self.assertEqual(self.handler.get_current_price('AAA'), 103.5)
+        self.assertEqual(len(self.handler.get_all_bars('BBB')), 6)
+
+    def test_split_replay_respects_time_range(self):
+        self.handler.setup_train_test_split(method='ratio', train_ratio=0.5, test_ratio=0.5)
+        self.handler.set_active_split('test')
+        test_df = self.handler.data_splits['AAA']['test']
+        self.handler._split_time_range = (test_df['timestamp'].min(), test_df['timestamp'].max())
+
+        while self.handler.update_bars():
+            pass
+
+        self.assertTrue(self.bars)
+        for bar in self.bars:
+            self.assertGreaterEqual(bar['timestamp'], self.handler._split_time_range[0])
+            self.assertLessEqual(bar['timestamp'], self.handler._split_time_range[1])
+
+    def test_store_rebuilt_when_frame_replaced(self):
+        store = self.handler.get_bar_store('AAA')
+        self.assertIs(self.handler.get_bar_store('AAA'), store)
+
+        self.handler.data['AAA'] = self.handler.data['AAA'].iloc[:3]
+        self.assertEqual(len(self.handler.get_bar_store('AAA')), 3)
+
+
+class TestWalkForwardWindows(unittest.TestCase):
+    """Test cases for walk-forward windows over the loaded data."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.frames = {
+            'AAA': _make_frame('2024-01-02 09:30', 20, 100.0),
+            'BBB': _make_frame('2024-01-02 09:32', 20, 200.0),
+        }
+        self.data_config = self._data_config(self.frames)
+        self.handler = HistoricalDataHandler('data_handler', self.data_config)
+        self.handler.initialize({'event_bus': EventBus()})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _data_config(self, frames, suffix=''):
+        sources = []
+        for symbol, df in frames.items():
+            path = os.path.join(self.test_dir, f"{symbol}{suffix}_1min.csv")
+            df.to_csv(path, index=False)
+            sources.append({'symbol': symbol, 'file': path})
+        return {'sources': sources, 'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S', 'timeframe': '1min'}
+
+    def test_rolling_bar_windows(self):
+        # 22 merged timestamps: windows start at bars 0, 5 and 10
+        windows = self.handler.create_walk_forward_windows(10, 5, test_size=2, unit='bars')
+
+        self.assertEqual(len(windows), 3)
+        first = windows[0]
+        self.assertEqual(first['train_start'], pd.Timestamp('2024-01-02 09:30'))
+        self.assertEqual(first['train_end'], pd.Timestamp('2024-01-02 09:38'))
+        self.assertEqual(first['test_start'], first['train_end'])
+        self.assertEqual(first['test_end'], pd.Timestamp('2024-01-02 09:40'))
+        self.assertEqual(first['ranges']['AAA'], {'train': (0, 8), 'test': (8, 10)})
+        self.assertEqual(first['ranges']['BBB'], {'train': (0, 6), 'test': (6, 8)})
+        self.assertEqual(windows[2]['train_start'], pd.Timestamp('2024-01-02 09:40'))
+
+    def test_expanding_windows_start_at_first_bar(self):
+        windows = self.handler.create_walk_forward_windows(10, 5, test_size=2, window_type='expanding', unit='bars')
+
+        self.assertEqual([w['ranges']['AAA']['train'] for w in windows], [(0, 8), (0, 13), (0, 18)])
+        self.assertTrue(all(w['train_start'] == windows[0]['train_start'] for w in windows))
+
+    def test_day_windows(self):
+        daily = _make_frame('2024-01-01', 30, 100.0)
+        daily['timestamp'] = pd.date_range('2024-01-01', periods=30, freq='D').strftime('%Y-%m-%d %H:%M:%S')
+        handler = HistoricalDataHandler('daily', self._data_config({'DAY': daily}, '_daily'))
+        handler.initialize({'event_bus': EventBus()})
+
+        windows = handler.create_walk_forward_windows(10, 5, test_size=3)
+
+        # The last window's test period ends with the last day
+        self.assertEqual(len(windows), 5)
+        self.assertEqual(windows[0]['ranges']['DAY'], {'train': (0, 7), 'test': (7, 10)})
+        self.assertEqual(windows[-1]['ranges']['DAY'], {'train': (20, 27), 'test': (27, 30)})
+
+    def test_windows_of_extended_data_start_with_earlier_windows(self):
+        short = {symbol: df.iloc[:15] for symbol, df in self.frames.items()}
+        handler = HistoricalDataHandler('short', self._data_config(short, '_short'))
+        handler.initialize({'event_bus': EventBus()})
+
+        fields = ('train_start', 'train_end', 'test_start', 'test_end')
+        earlier = handler.create_walk_forward_windows(10, 5, test_size=2, unit='bars')
+        later = self.handler.create_walk_forward_windows(10, 5, test_size=2, unit='bars')
+
+        self.assertEqual(len(earlier), 2)
+        self.assertEqual([[w[f] for f in fields] for w in earlier],
+                         [[w[f] for f in fields] for w in later[:2]])
+
+    def test_setup_window_split_uses_views(self):
+        window = self.handler.create_walk_forward_windows(10, 5, test_size=2, unit='bars')[1]
+        self.handler.setup_window_split(window)
+
+        full = self.handler.get_bar_store('AAA')
+        train = self.handler.get_bar_store('AAA', 'train')
+        test = self.handler.get_bar_store('AAA', 'test')
+        self.assertEqual((len(train), len(test)), (8, 2))
+        self.assertTrue(np.shares_memory(train.timestamps, full.timestamps))
+        self.assertEqual(self.handler.data_splits['AAA']['test']['timestamp'].iloc[0], window['test_start'])
+        self.assertEqual(self.handler.current_split, 'train')
+
+    def test_window_replay_survives_reload(self):
+        window = self.handler.create_walk_forward_windows(10, 5, test_size=2, unit='bars')[0]
+        self.handler.setup_window_split(window)
+        self.handler.set_active_split('test')
+        self.handler.load_data(['AAA', 'BBB'])
+
+        bars = []
+        self.handler.event_bus.subscribe(EventType.BAR, lambda event: bars.append(event.get_data()))
+        while self.handler.update_bars():
+            pass
+
+        self.assertEqual(len(bars), 4)
+        self.assertTrue(all(window['test_start'] <= bar['timestamp'] < window['test_end'] for bar in bars))
+
+    def test_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            self.handler.create_walk_forward_windows(10, 5, window_type='anchored')
+        with self.assertRaises(ValueError):
+            self.handler.create_walk_forward_windows(10, 5, unit='weeks')
+        with self.assertRaises(ValueError):
+            self.handler.create_walk_forward_windows(10, 5, test_size=10, unit='bars')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Tests for the process-wide market data cache.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.core.events.event_bus import EventBus
+from src.data.bar_store import BarStore
+from src.data.historical_data_handler import HistoricalDataHandler
+from src.data.market_data_cache import MarketDataCache, get_market_data_cache
+
+
+def _frame(periods):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 09:30', periods=periods, freq='1min'),
+        'open': np.arange(periods, dtype=float),
+        'high': np.arange(periods, dtype=float) + 1,
+        'low': np.arange(periods, dtype=float) - 1,
+        'close': np.arange(periods, dtype=float) + 0.5,
+        'volume': np.arange(periods) + 100,
+    })
+
+
+class TestMarketDataCache(unittest.TestCase):
+    """Test cases for MarketDataCache."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _write(self, name, periods=10):
+        path = os.path.join(self.test_dir, name)
+        _frame(periods).to_csv(path, index=False)
+        return path
+
+    def test_hits_and_misses(self):
+        cache = MarketDataCache()
+        key = cache.make_key(self._write('A_1min.csv'), '%Y-%m-%d', 'timestamp', None)
+        self.assertIsNone(cache.get(key))
+
+        df = _frame(10)
+        cache.put(key, df, BarStore.from_dataframe(df))
+        entry = cache.get(key)
+
+        pd.testing.assert_frame_equal(entry.df, df)
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_cached_store_is_read_only(self):
+        cache = MarketDataCache()
+        key = cache.make_key(self._write('A_1min.csv'))
+        df = _frame(10)
+        entry = cache.put(key, df, BarStore.from_dataframe(df))
+
+        with self.assertRaises(ValueError):
+            entry.store.columns['close'][0] = 1.0
+
+    def test_view_mutation_does_not_reach_cache(self):
+        cache = MarketDataCache()
+        key = cache.make_key(self._write('A_1min.csv'))
+        df = _frame(10)
+        entry = cache.put(key, df, BarStore.from_dataframe(df))
+        expected = _frame(10)
+
+        # In-place writes raise on the read-only arrays (or copy under pandas copy-on-write)
+        view = entry.view()
+        with contextlib.suppress(ValueError):
+            view['high'] *= 2
+        with contextlib.suppress(ValueError):
+            view.iloc[0, view.columns.get_loc('open')] = -1.0
+        view['close'] = view['close'] * 2
+        view['signal'] = 1
+
+        pd.testing.assert_frame_equal(entry.df, expected)
+        pd.testing.assert_frame_equal(entry.view(), expected)
+        self.assertEqual(view['close'].iloc[1], expected['close'].iloc[1] * 2)
+
+    def test_key_changes_when_file_changes(self):
+        path = self._write('A_1min.csv')
+        key = MarketDataCache.make_key(path)
+        _frame(12).to_csv(path, index=False)
+        self.assertNotEqual(MarketDataCache.make_key(path), key)
+
+    def test_lru_eviction_respects_memory_cap(self):
+        df = _frame(100)
+        store = BarStore.from_dataframe(df)
+        entry_size = int(df.memory_usage(deep=True).sum()) + store.nbytes
+        cache = MarketDataCache(max_bytes=int(entry_size * 2.5))
+
+        keys = [cache.make_key(self._write(f"{name}_1min.csv")) for name in 'ABC']
+        cache.put(keys[0], df, BarStore.from_dataframe(df))
+        cache.put(keys[1], df, BarStore.from_dataframe(df))
+        cache.get(keys[0])  # A is now more recently used than B
+        cache.put(keys[2], df, BarStore.from_dataframe(df))
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+
+    def test_invalidate_by_path(self):
+        cache = MarketDataCache()
+        path_a, path_b = self._write('A_1min.csv'), self._write('B_1min.csv')
+        df = _frame(10)
+        cache.put(cache.make_key(path_a), df, BarStore.from_dataframe(df))
+        cache.put(cache.make_key(path_b), df, BarStore.from_dataframe(df))
+
+        self.assertEqual(cache.invalidate(path_a), 1)
+        self.assertIsNone(cache.get(cache.make_key(path_a)))
+        self.assertIsNotNone(cache.get(cache.make_key(path_b)))
+        self.assertEqual(cache.invalidate(), 1)
+
+
+class TestHandlersShareCache(unittest.TestCase):
+    """Data handlers reuse parsed data but keep independent state."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        path = os.path.join(self.test_dir, 'SPY_1min.csv')
+        frame = _frame(20)
+        frame['timestamp'] = frame['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        frame.to_csv(path, index=False)
+        self.data_config = {
+            'sources': [{'symbol': 'SPY', 'file': path}],
+            'date_column': 'timestamp',
+            'date_format': '%Y-%m-%d %H:%M:%S',
+        }
+        self.cache = get_market_data_cache()
+
+    def tearDown(self):
+        self.cache.invalidate(os.path.join(self.test_dir, 'SPY_1min.csv'))
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _handler(self):
+        handler = HistoricalDataHandler('data_handler', self.data_config)
+        handler.initialize({'event_bus': EventBus()})
+        handler.setup_train_test_split(method='ratio', train_ratio=0.7, test_ratio=0.3)
+        return handler
+
+    def test_second_handler_hits_cache_with_isolated_cursors(self):
+        hits_before = self.cache.hits
+        first = self._handler()
+        second = self._handler()
+
+        self.assertEqual(self.cache.hits, hits_before + 1)
+        self.assertIs(first.get_bar_store('SPY').timestamps, second.get_bar_store('SPY').timestamps)
+        pd.testing.assert_frame_equal(first.data_splits['SPY']['test'], second.data_splits['SPY']['test'])
+
+        first.update_bars()
+        first.update_bars()
+        self.assertEqual(first.current_indices['SPY'], 1)
+        self.assertEqual(second.current_indices['SPY'], -1)
+
+    def test_cache_can_be_disabled_per_handler(self):
+        self.data_config['use_cache'] = False
+        lookups_before = self.cache.hits + self.cache.misses
+        self._handler()
+        self.assertEqual(self.cache.hits + self.cache.misses, lookups_before)
+
+
+if __name__ == '__main__':
+    unittest.main()
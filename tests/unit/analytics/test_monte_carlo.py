@@ -0,0 +1,143 @@
+"""
+Unit tests for the Monte Carlo simulator.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.robustness.monte_carlo import (
+    BATCH_PEAK_MATRICES, MonteCarloSimulator, calculate_path_metrics, simulate_returns
+)
+
+
+@pytest.fixture
+def trades():
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.002, 0.02, 200)
+    return [{'entry_price': 100.0, 'exit_price': 100.0 * (1 + r), 'direction': 'BUY'} for r in returns]
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+class TestVectorizedMonteCarlo:
+
+    def test_path_metrics_match_per_path_metrics(self, trades):
+        simulator = MonteCarloSimulator(trades, initial_capital=50000)
+        returns = simulate_returns(simulator.trade_returns, 20, rng=np.random.default_rng(0))
+        metrics, equity = calculate_path_metrics(returns, 50000, keep_equity=True)
+
+        for i, row in enumerate(returns):
+            equity_df = simulator._calculate_equity_curve(row.tolist())
+            np.testing.assert_array_equal(equity[i], equity_df['equity'].values)
+            expected = simulator._calculate_metrics(equity_df)
+            for name, value in expected.items():
+                assert metrics[name][i] == pytest.approx(value, rel=1e-12, abs=1e-15)
+
+    def test_path_metrics_peak_memory(self):
+        returns = np.random.default_rng(0).normal(0.0, 0.01, (500, 400))
+        tracemalloc.start()
+        try:
+            calculate_path_metrics(returns)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        # The returns themselves count as one of the matrices
+        assert peak < (BATCH_PEAK_MATRICES - 1) * returns.nbytes * 1.1
+
+    @pytest.mark.parametrize('method', ['bootstrap', 'block_bootstrap', 'random_returns'])
+    def test_shapes_and_sampling(self, method):
+        sample = np.arange(1, 11) / 1000.0
+        returns = simulate_returns(sample, 7, method, block_size=3, rng=np.random.default_rng(1))
+        assert returns.shape == (7, 10)
+        if method != 'random_returns':
+            assert np.isin(returns, sample).all()
+
+    def test_block_bootstrap_keeps_runs_together(self):
+        sample = np.arange(20, dtype=float)
+        returns = simulate_returns(sample, 50, 'block_bootstrap', block_size=4,
+                                   rng=np.random.default_rng(2))
+        blocks = returns[:, :20].reshape(50, 5, 4)
+        assert (np.diff(blocks, axis=2) == 1).all()
+
+    def test_t_distribution_matches_sample_moments(self, trades):
+        simulator = MonteCarloSimulator(trades)
+        sample = np.asarray(simulator.trade_returns)
+        returns = simulate_returns(sample, 5, 'random_returns', distribution='t',
+                                   rng=np.random.default_rng(4))
+        np.testing.assert_allclose(returns.std(axis=1), sample.std())
+
+    def test_unknown_options(self, trades):
+        with pytest.raises(ValueError):
+            MonteCarloSimulator(trades, simulation_method='jackknife')
+        with pytest.raises(ValueError):
+            MonteCarloSimulator(trades, engine='gpu')
+        with pytest.raises(ValueError):
+            simulate_returns([], 3)
+
+    @pytest.mark.parametrize('method', ['bootstrap', 'block_bootstrap', 'random_returns'])
+    def test_batches_are_reproducible(self, trades, method):
+        def run(batch_size):
+            simulator = MonteCarloSimulator(trades, num_simulations=250, simulation_method=method,
+                                            batch_size=batch_size, random_state=11)
+            results = simulator.run_simulations()
+            return simulator, results
+
+        simulator, results = run(64)
+        again, _ = run(64)
+        assert results['num_simulations'] == 250
+        assert results['elapsed_time'] < 60
+        np.testing.assert_array_equal(simulator.simulation_metrics['total_return'],
+                                      again.simulation_metrics['total_return'])
+        assert set(results['metrics']) == {'total_return', 'annualized_return', 'volatility',
+                                           'sharpe_ratio', 'max_drawdown', 'calmar_ratio'}
+        assert simulator.equity_paths is None
+
+    def test_engines_agree_statistically(self, trades):
+        np.random.seed(5)
+        vectorized = MonteCarloSimulator(trades, num_simulations=2000)
+        vectorized.run_simulations()
+        loop = MonteCarloSimulator(trades, num_simulations=300, engine='loop')
+        loop.run_simulations()
+
+        mean_return = np.mean(vectorized.trade_returns)
+        expected = (1 + mean_return) ** len(trades) - 1
+        for simulator in (vectorized, loop):
+            assert simulator.metrics['total_return']['median'] == pytest.approx(expected, rel=0.5)
+            assert 0 <= simulator.get_probability_of_profit() <= 1
+
+    def test_equity_bands(self, trades):
+        simulator = MonteCarloSimulator(trades, num_simulations=100, keep_paths=True,
+                                        batch_size=30, random_state=1)
+        simulator.run_simulations()
+        assert simulator.equity_paths.shape == (100, len(trades) + 1)
+        bands = simulator.get_equity_bands([5, 50, 95])
+        assert list(bands.columns) == ['percentile_5', 'percentile_50', 'percentile_95']
+        assert len(bands) == len(trades) + 1
+        assert (bands['percentile_5'] <= bands['percentile_95']).all()
+        assert bands.iloc[0].tolist() == [simulator.initial_capital] * 3
+
+        without = MonteCarloSimulator(trades, num_simulations=10)
+        without.run_simulations()
+        with pytest.raises(ValueError):
+            without.get_equity_bands()
+
+    def test_probabilities_and_intervals(self, trades):
+        simulator = MonteCarloSimulator(trades, num_simulations=500, random_state=2)
+        simulator.run_simulations()
+        total = simulator.simulation_metrics['total_return']
+        assert simulator.get_probability_of_profit() == np.mean(total > 0)
+        assert simulator.get_probability_of_max_drawdown(0.0) == 1.0
+        lower, upper = simulator.get_confidence_intervals('total_return', [0.9])[0.9]
+        assert lower == pytest.approx(np.percentile(total, 5))
+        assert upper == pytest.approx(np.percentile(total, 95))
+
+    def test_equity_curve_returns_are_resampled(self):
+        equity = pd.DataFrame({'equity': 100000 * np.cumprod(1 + np.full(50, 0.001))})
+        simulator = MonteCarloSimulator(equity_curve=equity, num_simulations=20, random_state=0)
+        results = simulator.run_simulations()
+        assert results['num_simulations'] == 20
+        assert simulator.metrics['total_return']['min'] == pytest.approx(1.001 ** 49 - 1)
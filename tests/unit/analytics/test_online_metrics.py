@@ -0,0 +1,107 @@
+"""
+Unit tests for the online metrics accumulator.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.metrics.functional import (
+    annualized_return, drawdown_stats, max_drawdown, sharpe_ratio, sortino_ratio
+)
+from src.analytics.metrics.online import MetricsAccumulator
+from src.analytics.metrics.trade import consecutive_wins_losses
+from src.execution.backtest.backtest_coordinator import calculate_backtest_statistics
+
+
+@pytest.fixture
+def equity_curve():
+    rng = np.random.default_rng(7)
+    equity = 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 400))
+    index = pd.date_range('2024-01-02', periods=len(equity), freq='D')
+    return pd.DataFrame({'equity': equity}, index=index)
+
+
+def _accumulate(equity_curve, pnls=()):
+    metrics = MetricsAccumulator()
+    for timestamp, value in equity_curve['equity'].items():
+        metrics.add_equity(value, timestamp)
+    for pnl in pnls:
+        metrics.add_trade(pnl)
+    return metrics
+
+
+@pytest.mark.unit
+@pytest.mark.analytics
+class TestMetricsAccumulator:
+
+    def test_equity_metrics_match_functional_metrics(self, equity_curve):
+        metrics = _accumulate(equity_curve)
+        stats = drawdown_stats(equity_curve)
+
+        assert metrics.sharpe_ratio == pytest.approx(sharpe_ratio(equity_curve), rel=1e-9)
+        assert metrics.sortino_ratio == pytest.approx(sortino_ratio(equity_curve), rel=1e-9)
+        assert metrics.annualized_return == pytest.approx(annualized_return(equity_curve), rel=1e-9)
+        assert metrics.max_drawdown == max_drawdown(equity_curve)
+        assert metrics.avg_drawdown == pytest.approx(stats['avg_drawdown'], rel=1e-12)
+        assert metrics.drawdown_duration == stats['max_drawdown_duration']
+        assert metrics.calmar_ratio == pytest.approx(metrics.annualized_return / metrics.max_drawdown)
+
+    def test_metrics_are_available_during_the_run(self, equity_curve):
+        metrics = MetricsAccumulator()
+        for i, (timestamp, value) in enumerate(equity_curve['equity'].items()):
+            metrics.add_equity(value, timestamp)
+            if i in (50, 200):
+                assert metrics.sharpe_ratio == pytest.approx(sharpe_ratio(equity_curve.iloc[:i + 1]), rel=1e-9)
+                assert metrics.max_drawdown == max_drawdown(equity_curve.iloc[:i + 1])
+
+    def test_trade_metrics(self):
+        pnls = [100, 50, -30, -40, 0, -20, -10, 80, None]
+        metrics = MetricsAccumulator()
+        for pnl in pnls:
+            metrics.add_trade(pnl)
+
+        assert (metrics.trade_count, metrics.winning_trades, metrics.losing_trades) == (8, 3, 4)
+        assert metrics.win_rate == 3 / 8
+        assert metrics.profit_factor == 230 / 100
+        streaks = consecutive_wins_losses([{'pnl': pnl} for pnl in pnls if pnl is not None])
+        assert {name: metrics.get_metrics()[name] for name in streaks} == streaks
+
+    def test_empty_and_flat(self):
+        metrics = MetricsAccumulator()
+        assert metrics.sharpe_ratio == 0.0 and metrics.profit_factor == 0.0
+        assert metrics.get_metrics()['max_drawdown_duration'] == 0
+
+        for _ in range(5):
+            metrics.add_equity(100.0)
+        assert metrics.sharpe_ratio == 0.0 and metrics.max_drawdown == 0.0
+        assert metrics.annualized_return == 0.0
+
+        metrics.add_trade(10.0)
+        assert metrics.profit_factor == float('inf')
+        metrics.reset()
+        assert metrics.count == 0 and metrics.trade_count == 0
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestBacktestStatistics:
+
+    def test_running_metrics_give_the_same_statistics(self, equity_curve):
+        curve = [{'timestamp': t, 'equity': v} for t, v in equity_curve['equity'].items()]
+        trades = [{'pnl': 120.0, 'closed': True}, {'pnl': -45.0, 'closed': True}]
+        final = curve[-1]['equity']
+
+        expected = calculate_backtest_statistics(curve, trades, 100000, final)
+        stats = calculate_backtest_statistics(curve, trades, 100000, final, metrics=_accumulate(equity_curve))
+
+        assert list(stats) == list(expected)
+        for name, value in expected.items():
+            assert stats[name] == pytest.approx(value, rel=1e-9)
+
+    def test_falls_back_when_the_points_differ(self, equity_curve):
+        curve = [{'timestamp': t, 'equity': v} for t, v in equity_curve['equity'].items()]
+        metrics = _accumulate(equity_curve.iloc[:10])
+
+        stats = calculate_backtest_statistics(curve, [], 100000, 100000, metrics=metrics)
+        assert stats['max_drawdown'] == max_drawdown(equity_curve) * 100
@@ -0,0 +1,125 @@
+"""
+Unit tests for the asynchronous log sink.
+"""
+
+import gzip
+import logging
+import os
+from logging.handlers import QueueHandler
+
+import pytest
+
+from src.core.logging import (
+    BatchedFileHandler, configure_logging, get_async_sink, start_async_logging, stop_async_logging
+)
+from src.core.logging.config import logging_config
+from src.strategy.optimization.parallel import ParallelEvaluator
+
+NAME = 'tests.async_logging'
+
+
+def _log_from_worker(i):
+    logging.getLogger(NAME).info("evaluated %d in %d", i, os.getpid())
+    return i
+
+
+def _file_handler(path, **kwargs):
+    handler = BatchedFileHandler(str(path), **kwargs)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    return handler
+
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    saved = vars(logging_config).copy()
+    root.setLevel(logging.INFO)
+    yield root
+    stop_async_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    vars(logging_config).update(saved)
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestBatchedFileHandler:
+
+    def test_writes_in_batches(self, tmp_path):
+        path = tmp_path / 'app.log'
+        handler = _file_handler(path, batch_size=3)
+        logger = logging.getLogger(NAME + '.batch')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning("one")
+            logger.warning("two")
+            assert path.read_text() == ''
+            logger.warning("three")
+            assert path.read_text() == 'WARNING one\nWARNING two\nWARNING three\n'
+            logger.warning("four")
+        finally:
+            logger.removeHandler(handler)
+            handler.close()
+        assert path.read_text().endswith('WARNING four\n')
+
+    def test_rotation_with_compression(self, tmp_path):
+        path = tmp_path / 'app.log'
+        handler = _file_handler(path, batch_size=1, max_bytes=40, backup_count=2, compress=True)
+        for i in range(4):
+            handler.handle(logging.makeLogRecord({'msg': 'x' * 40 + str(i), 'levelname': 'INFO'}))
+        handler.close()
+
+        assert sorted(os.listdir(tmp_path)) == ['app.log', 'app.log.1.gz', 'app.log.2.gz']
+        with gzip.open(tmp_path / 'app.log.1.gz', 'rt') as f:
+            assert f.read() == 'INFO ' + 'x' * 40 + '3\n'
+        assert path.read_text() == ''
+
+    def test_invalid_batch_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            BatchedFileHandler(str(tmp_path / 'app.log'), batch_size=0)
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestAsyncLogSink:
+
+    def test_records_are_written_by_the_sink(self, tmp_path, root_logger):
+        path = tmp_path / 'app.log'
+        sink = start_async_logging([_file_handler(path)])
+        assert get_async_sink() is sink
+        assert len(root_logger.handlers) == 1 and isinstance(root_logger.handlers[0], QueueHandler)
+
+        values = [1]
+        logging.getLogger(NAME).info("values %s", values)
+        values.append(2)
+        stop_async_logging()
+
+        assert path.read_text() == 'INFO values [1]\n'
+        assert get_async_sink() is None
+        assert not root_logger.handlers
+
+    def test_configure_logging_async(self, tmp_path, root_logger):
+        path = tmp_path / 'app.log'
+        configure_logging(log_file=str(path), console=False, async_logging=True)
+        assert get_async_sink() is not None
+        assert all(isinstance(h, QueueHandler) for h in root_logger.handlers)
+
+        logging.getLogger(NAME).info("queued")
+        configure_logging(log_file=str(path), console=False)
+        assert get_async_sink() is None
+        assert path.read_text().endswith(' - INFO - queued\n')
+
+    def test_process_pool_workers_log_to_the_sink(self, tmp_path, root_logger):
+        path = tmp_path / 'app.log'
+        start_async_logging([_file_handler(path)])
+
+        evaluator = ParallelEvaluator('process', max_workers=2, batch_size=1)
+        results = [result for _, result, _ in evaluator.map(_log_from_worker, range(6))]
+        stop_async_logging()
+
+        assert results == list(range(6))
+        lines = [line for line in path.read_text().splitlines() if line.startswith('INFO evaluated')]
+        assert sorted(int(line.split()[2]) for line in lines) == list(range(6))
+        assert all(int(line.split()[-1]) != os.getpid() for line in lines)
@@ -0,0 +1,160 @@
+"""
+Unit tests for the array-backed equity curve recorder.
+"""
+
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.backtest_state import BacktestState
+from src.core.equity_recorder import EquityRecorder
+from src.risk.portfolio.portfolio_manager import PortfolioManager
+
+
+def _timestamps(n, tz=None):
+    return pd.date_range('2024-01-02 09:30', periods=n, freq='min', tz=tz)
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestEquityRecorder:
+
+    def test_grows_past_initial_capacity(self):
+        recorder = EquityRecorder(capacity=4)
+        for i, ts in enumerate(_timestamps(10)):
+            recorder.record(ts, 100.0 + i, 50.0, 50.0 + i)
+
+        df = recorder.to_dataframe()
+        assert len(recorder) == 10
+        assert df['equity'].tolist() == [100.0 + i for i in range(10)]
+        assert df.index.name == 'timestamp' and df.index[-1] == _timestamps(10)[-1]
+
+    def test_dataframe_shares_memory_and_stays_valid(self):
+        recorder = EquityRecorder(capacity=4)
+        for ts in _timestamps(3):
+            recorder.record(ts, 1.0, 2.0, 3.0)
+
+        df = recorder.to_dataframe()
+        assert np.shares_memory(df.to_numpy(), recorder.get('equity'))
+
+        for ts in _timestamps(5):
+            recorder.record(ts, 9.0, 9.0, 9.0)
+        recorder.reset()
+        assert len(df) == 3 and df['equity'].tolist() == [1.0, 1.0, 1.0]
+
+    def test_behaves_like_a_list_of_dicts(self):
+        recorder = EquityRecorder()
+        points = [{'timestamp': ts, 'equity': float(i), 'cash': 1.0, 'positions_value': 2.0}
+                  for i, ts in enumerate(_timestamps(4))]
+        for point in points:
+            recorder.append(point)
+
+        assert recorder == points
+        assert recorder[-1] == points[-1] and recorder[1:3] == points[1:3]
+        assert [p['equity'] for p in recorder] == [0.0, 1.0, 2.0, 3.0]
+        with pytest.raises(IndexError):
+            recorder[4]
+        assert not EquityRecorder()
+
+    def test_downsampling_keeps_every_point_on_disk(self, tmp_path):
+        path = str(tmp_path / 'equity.bin')
+        recorder = EquityRecorder(every=3, path=path)
+        for i, ts in enumerate(_timestamps(10)):
+            recorder.record(ts, float(i), 0.0, float(i))
+
+        assert recorder.get('equity').tolist() == [0.0, 3.0, 6.0, 9.0]
+        assert recorder.latest['equity'] == 9.0 and recorder.total_points == 10
+        full = recorder.read_full()
+        assert full['equity'].tolist() == [float(i) for i in range(10)]
+        assert full.index.equals(pd.DatetimeIndex(_timestamps(10), name='timestamp'))
+
+    def test_on_change_skips_repeated_values(self):
+        recorder = EquityRecorder(on_change=True)
+        for value, ts in zip([1.0, 1.0, 2.0, 2.0, 1.0], _timestamps(5)):
+            recorder.record(ts, value, value, 0.0)
+        assert recorder.get('equity').tolist() == [1.0, 2.0, 1.0]
+
+    def test_timezones_and_missing_timestamps(self):
+        recorder = EquityRecorder()
+        for ts in _timestamps(2, tz='America/New_York'):
+            recorder.record(ts, 1.0, 1.0, 0.0)
+        assert recorder.to_dataframe().index.equals(
+            pd.DatetimeIndex(_timestamps(2, tz='America/New_York'), name='timestamp'))
+        assert recorder[0]['timestamp'] == _timestamps(1, tz='America/New_York')[0]
+
+        recorder = EquityRecorder()
+        recorder.record(None, 1.0, 1.0, 0.0)
+        assert recorder[0]['timestamp'] is None
+        assert pd.isna(recorder.to_dataframe().index[0])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            EquityRecorder(every=0)
+        with pytest.raises(ValueError):
+            EquityRecorder(capacity=0)
+
+
+@pytest.mark.unit
+@pytest.mark.risk
+class TestPortfolioEquityCurve:
+
+    def test_portfolio_manager_records_equity(self):
+        portfolio = PortfolioManager(initial_cash=10000.0)
+        portfolio.reset()
+        start = datetime.datetime(2024, 1, 2, 9, 30)
+        for minute in range(3):
+            portfolio.update_equity(start + datetime.timedelta(minutes=minute))
+
+        df = portfolio.get_equity_curve_df()
+        assert list(df.columns) == ['equity', 'cash', 'positions_value']
+        assert len(df) == 4 and (df['equity'] == 10000.0).all()
+        assert df.index[-1] == pd.Timestamp(start + datetime.timedelta(minutes=2))
+        assert portfolio.equity_curve[-1]['cash'] == 10000.0
+
+    def test_configured_downsampling(self):
+        portfolio = PortfolioManager(initial_cash=10000.0)
+        portfolio.configure({'initial_cash': 5000.0, 'equity_curve': {'every': 2}})
+        start = datetime.datetime(2024, 1, 2, 9, 30)
+        for minute in range(5):
+            portfolio.update_equity(start + datetime.timedelta(minutes=minute))
+
+        assert portfolio.equity_curve.every == 2
+        assert portfolio.equity_curve.total_points == 6 and len(portfolio.equity_curve) == 3
+
+    def test_configured_spill_file_is_per_thread(self, tmp_path):
+        config = {'initial_cash': 5000.0, 'equity_curve': {'every': 2, 'path': str(tmp_path / 'equity.bin')}}
+        portfolios = [PortfolioManager(initial_cash=10000.0) for _ in range(4)]
+        start = datetime.datetime(2024, 1, 2, 9, 30)
+        barrier = threading.Barrier(len(portfolios))
+
+        def run(portfolio, points):
+            portfolio.configure(config)
+            barrier.wait()
+            for minute in range(points):
+                portfolio.update_equity(start + datetime.timedelta(minutes=minute))
+            portfolio.equity_curve.flush()
+
+        threads = [threading.Thread(target=run, args=(portfolio, 100 * (i + 1)))
+                   for i, portfolio in enumerate(portfolios)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        paths = {portfolio.equity_curve.path for portfolio in portfolios}
+        assert len(paths) == len(portfolios)
+        assert all(path.startswith(str(tmp_path / 'equity.')) and path.endswith('.bin') for path in paths)
+        for i, portfolio in enumerate(portfolios):
+            assert len(portfolio.equity_curve.read_full()) == 100 * (i + 1) + 1
+
+    def test_backtest_state_equity_points(self):
+        state = BacktestState()
+        state.add_equity_point(datetime.datetime(2024, 1, 2), 100.0, 40.0, 60.0)
+
+        assert state.get_equity_curve() == [{'timestamp': pd.Timestamp('2024-01-02'), 'equity': 100.0,
+                                             'cash': 40.0, 'market_value': 60.0}]
+        state.reset()
+        assert len(state.get_equity_curve()) == 0
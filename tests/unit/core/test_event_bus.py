@@ -3,6 +3,7 @@ Unit tests for the EventBus class.
 """
 
 import pytest
+from datetime import datetime, timedelta
 from src.core.events.event_bus import EventBus
 from src.core.events.event_types import EventType, Event
 
@@ -197,3 +198,213 @@ class TestEventBus:
         # Verify call order
         assert call_order == ["high", "medium", "low"]
         assert results == ["high", "medium", "low"]
+
+    def test_subscribe_method_twice(self, event_bus):
+        """Test that subscribing the same bound method twice delivers events once."""
+        class Recorder:
+            def __init__(self):
+                self.events = []
+
+            def on_bar(self, event):
+                self.events.append(event)
+
+        recorder = Recorder()
+        event_bus.subscribe(EventType.BAR, recorder.on_bar)
+        event_bus.subscribe(EventType.BAR, recorder.on_bar)
+
+        event_bus.publish(Event(EventType.BAR, {'test': 'data'}))
+
+        assert len(recorder.events) == 1
+
+
+def _bar(day, hour=10, symbol='TEST'):
+    return Event(EventType.BAR, {'symbol': symbol, 'close': 100.0,
+                                 'timestamp': datetime(2024, 1, day, hour)})
+
+
+def _signal(rule_id, day, hour=10):
+    return Event(EventType.SIGNAL, {'symbol': 'TEST', 'direction': 'LONG', 'rule_id': rule_id,
+                                    'timestamp': datetime(2024, 1, day, hour)})
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestEventBusRetention:
+
+    def test_ring_retention_bounds_registry(self):
+        bus = EventBus(registry_size=5)
+        events = [_bar(1, hour) for hour in range(10)]
+        for event in events:
+            bus.publish(event)
+
+        assert list(bus.event_registry) == [event.get_id() for event in events[-5:]]
+        assert bus.get_event_by_id(events[0].get_id()) is None
+        assert bus.get_event_by_id(events[-1].get_id())['data']['symbol'] == 'TEST'
+        assert bus.get_stats()['memory']['registry_evicted'] == 5
+
+    def test_retention_off_keeps_no_registry(self):
+        bus = EventBus(registry_retention=EventBus.RETENTION_OFF)
+        for hour in range(3):
+            bus.publish(_bar(1, hour))
+        assert len(bus.event_registry) == 0
+
+    def test_ttl_retention_uses_simulated_time(self):
+        bus = EventBus(registry_retention=EventBus.RETENTION_TTL, registry_ttl=timedelta(days=1))
+        first, second, third = _bar(1), _bar(2, 11), _bar(3, 10)
+        for event in (first, second, third):
+            bus.publish(event)
+
+        assert first.get_id() not in bus.event_registry
+        assert second.get_id() in bus.event_registry
+        assert third.get_id() in bus.event_registry
+
+    def test_dedup_keeps_compact_keys(self, event_bus):
+        signal = _signal('rule_1', 1)
+        event_bus.publish(signal)
+        assert event_bus.processed_events[EventType.SIGNAL] == {'rule_1': signal.get_id()}
+
+    def test_signal_keys_expire_at_end_of_day(self):
+        received = []
+        bus = EventBus(dedup_expiry={'SIGNAL': EventBus.EXPIRE_END_OF_DAY})
+        bus.subscribe(EventType.SIGNAL, received.append)
+
+        bus.publish(_signal('rule_1', 1, 10))
+        bus.publish(_signal('rule_1', 1, 15))
+        assert len(received) == 1
+
+        bus.publish(_bar(2, 9))
+        bus.publish(_signal('rule_1', 2, 10))
+        assert len(received) == 2
+        assert bus.get_memory_stats()['dedup_expired'] == 1
+
+    def test_dedup_max_keys_evicts_oldest(self):
+        bus = EventBus(dedup_max_keys=3)
+        for i in range(5):
+            bus.publish(_signal(f"rule_{i}", 1))
+
+        assert list(bus.processed_events[EventType.SIGNAL]) == ['rule_2', 'rule_3', 'rule_4']
+        assert bus.get_memory_stats()['dedup_evicted'] == 2
+
+    def test_from_config(self):
+        bus = EventBus.from_config({'retention': 'ttl', 'registry_ttl': 3600,
+                                    'dedup_expiry': {'SIGNAL': 'day'}})
+        assert bus.registry_retention == EventBus.RETENTION_TTL
+        assert bus.registry_ttl == timedelta(hours=1)
+        assert bus.dedup_expiry == {EventType.SIGNAL: EventBus.EXPIRE_END_OF_DAY}
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            EventBus(registry_retention='forever')
+        with pytest.raises(ValueError):
+            EventBus(registry_retention=EventBus.RETENTION_TTL)
+        with pytest.raises(ValueError):
+            EventBus(dedup_expiry={'SIGNAL': 'week'})
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestCompiledDispatch:
+
+    def test_priority_order_and_consumption(self):
+        bus = EventBus(compiled_dispatch=True)
+        calls = []
+
+        def first(event):
+            calls.append('first')
+
+        def consumer(event):
+            calls.append('consumer')
+            event.consumed = True
+
+        def last(event):
+            calls.append('last')
+
+        bus.subscribe(EventType.BAR, last, priority=10)
+        bus.subscribe(EventType.BAR, first, priority=-10)
+        bus.subscribe(EventType.BAR, consumer)
+
+        assert bus.publish(_bar(1)) == 2
+        assert calls == ['first', 'consumer']
+
+    def test_cache_rebuilt_when_subscriptions_change(self):
+        bus = EventBus(compiled_dispatch=True)
+        calls = []
+
+        def handler_a(event):
+            calls.append('a')
+
+        def handler_b(event):
+            calls.append('b')
+
+        bus.subscribe(EventType.BAR, handler_a)
+        bus.publish(_bar(1, 1))
+        bus.subscribe(EventType.BAR, handler_b)
+        bus.publish(_bar(1, 2))
+        bus.unsubscribe(EventType.BAR, handler_a)
+        bus.publish(_bar(1, 3))
+
+        assert calls == ['a', 'a', 'b', 'b']
+
+    def test_dead_method_subscribers_are_dropped(self):
+        class Recorder:
+            def __init__(self, sink):
+                self.sink = sink
+
+            def on_bar(self, event):
+                self.sink.append(event)
+
+        bus = EventBus(compiled_dispatch=True)
+        received = []
+        keeper = Recorder(received)
+        transient = Recorder(received)
+        bus.subscribe(EventType.BAR, keeper.on_bar)
+        bus.subscribe(EventType.BAR, transient.on_bar)
+        bus.publish(_bar(1, 1))
+
+        del transient
+        bus.publish(_bar(1, 2))
+
+        assert len(received) == 3
+        assert len(bus.subscribers[EventType.BAR]) == 1
+
+    def test_handler_errors_do_not_stop_dispatch(self):
+        bus = EventBus(compiled_dispatch=True)
+        calls = []
+
+        def failing(event):
+            raise RuntimeError("boom")
+
+        bus.subscribe(EventType.BAR, failing, priority=-1)
+        bus.subscribe(EventType.BAR, calls.append)
+
+        assert bus.publish(_bar(1)) == 1
+        assert len(calls) == 1
+
+    def test_bars_untracked_signals_deduplicated(self):
+        bus = EventBus(compiled_dispatch=True)
+        received = []
+        bus.subscribe(EventType.SIGNAL, received.append)
+
+        bar = _bar(1)
+        bus.publish(bar)
+        bus.publish(bar)
+        bus.publish(_signal('rule_1', 1))
+        bus.publish(_signal('rule_1', 1))
+
+        assert bus.event_counts[EventType.BAR] == 2
+        assert EventType.BAR not in bus.processed_events
+        assert bar.get_id() not in bus.event_registry
+        assert len(received) == 1
+
+    def test_matches_standard_dispatch(self):
+        def run(**kwargs):
+            bus = EventBus(**kwargs)
+            seen = []
+            bus.subscribe(EventType.BAR, lambda event: seen.append(('bar', event.data['timestamp'])))
+            bus.subscribe(EventType.SIGNAL, lambda event: seen.append(('signal', event.data['rule_id'])))
+            for day in range(1, 4):
+                bus.publish(_bar(day))
+                bus.publish(_signal(f"rule_{day % 2}", day))
+            return seen
+
+        assert run(compiled_dispatch=True) == run()
@@ -0,0 +1,117 @@
+"""
+Unit tests for hot-path logging.
+"""
+
+import datetime
+import logging
+
+import pytest
+
+from src.core.logging import (
+    PROFILE_DEFAULT, PROFILE_PERFORMANCE, configure_logging, get_hot_path_logger,
+    get_hot_path_profile, refresh_hot_path_loggers, set_hot_path_profile
+)
+from src.core.logging.config import logging_config
+
+NAME = 'tests.hot_path'
+
+
+class _Unprintable:
+    """Argument that fails the test if it is ever formatted."""
+
+    def __str__(self):
+        raise AssertionError("argument formatted for a disabled message")
+
+
+@pytest.fixture
+def hot_log():
+    logger = logging.getLogger(NAME)
+    logger.setLevel(logging.INFO)
+    hot_log = get_hot_path_logger(NAME)
+    hot_log.refresh()
+    hot_log.reset_counters()
+    yield hot_log
+    set_hot_path_profile(PROFILE_DEFAULT)
+    logger.setLevel(logging.NOTSET)
+    refresh_hot_path_loggers()
+
+
+@pytest.mark.unit
+@pytest.mark.core
+class TestHotPathLogger:
+
+    def test_flags_follow_logger_level(self, hot_log):
+        assert get_hot_path_logger(NAME) is hot_log
+        assert hot_log.info_enabled and not hot_log.debug_enabled
+
+        logging.getLogger(NAME).setLevel(logging.DEBUG)
+        assert not hot_log.debug_enabled
+        refresh_hot_path_loggers()
+        assert hot_log.debug_enabled
+
+    def test_configure_logging_refreshes_flags(self, hot_log):
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        saved = vars(logging_config).copy()
+        try:
+            configure_logging(debug=True, debug_modules=[NAME], console=False)
+            assert hot_log.debug_enabled
+        finally:
+            root.handlers[:] = handlers
+            root.setLevel(level)
+            vars(logging_config).update(saved)
+
+    def test_bootstrap_debug_refreshes_flags(self, tmp_path):
+        from src.core.system_bootstrap import Bootstrap
+
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+        hot_log = get_hot_path_logger(NAME + '.bootstrap')
+        try:
+            root.setLevel(logging.INFO)
+            refresh_hot_path_loggers()
+            Bootstrap(log_file=str(tmp_path / 'bootstrap.log'), debug=True)._setup_logging()
+            assert hot_log.debug_enabled
+        finally:
+            for handler in root.handlers:
+                if handler not in handlers:
+                    handler.close()
+            root.handlers[:] = handlers
+            root.setLevel(level)
+            refresh_hot_path_loggers()
+
+    def test_disabled_messages_are_not_formatted(self, hot_log, caplog):
+        with caplog.at_level(logging.INFO, logger=NAME):
+            hot_log.debug("value %s", _Unprintable())
+            hot_log.hot("close=%.2f", 1.5)
+        assert [r.getMessage() for r in caplog.records] == ["close=1.50"]
+
+    def test_performance_profile_lowers_hot_messages(self, hot_log, caplog):
+        set_hot_path_profile(PROFILE_PERFORMANCE)
+        assert get_hot_path_profile() == PROFILE_PERFORMANCE
+        assert hot_log.hot_level == logging.DEBUG and not hot_log.hot_enabled
+
+        with caplog.at_level(logging.INFO, logger=NAME):
+            hot_log.hot("bar %s", _Unprintable())
+            hot_log.info("kept")
+        assert [r.getMessage() for r in caplog.records] == ["kept"]
+
+        with pytest.raises(ValueError):
+            set_hot_path_profile('silent')
+
+    def test_every_nth_occurrence(self, hot_log, caplog):
+        with caplog.at_level(logging.INFO, logger=NAME):
+            logged = [hot_log.every('drop', 3, logging.WARNING, "equity %d", i) for i in range(7)]
+        assert logged == [True, False, False, True, False, False, True]
+        assert [r.getMessage() for r in caplog.records] == [
+            "equity 0", "equity 3 (occurrence 4)", "equity 6 (occurrence 7)"]
+
+    def test_once_per_simulated_day(self, hot_log, caplog):
+        start = datetime.datetime(2024, 1, 2, 9, 30)
+        times = [start + datetime.timedelta(hours=h) for h in (0, 1, 2, 24, 25)]
+        with caplog.at_level(logging.INFO, logger=NAME):
+            logged = [hot_log.once_per_day('suspicious', t, logging.WARNING, "at %s", t) for t in times]
+        assert logged == [True, False, False, True, False]
+
+        hot_log.reset_counters()
+        assert hot_log.once_per_day('suspicious', times[-1], logging.WARNING, "again")
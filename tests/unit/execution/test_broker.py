@@ -8,6 +8,7 @@ This tests the following components:
 - Slippage Model
 """
 import pytest
+import random
 import datetime
 from unittest.mock import MagicMock
 
@@ -93,6 +94,18 @@ class TestSlippageModel:
         # Should have more slippage due to volatility and size
         assert price_with_slippage > 100.05
         
+    def test_variable_slippage_uses_run_generator(self):
+        """Test that a broker draws slippage from the run's seeded generator."""
+        prices = []
+        for _ in range(2):
+            broker = SimulatedBroker(config={'slippage': {'model': 'variable'}})
+            broker.initialize({'event_bus': MagicMock(), 'random': random.Random(7)})
+            random.seed()  # the global generator must not matter
+            prices.append([broker.slippage_model.apply_slippage(100.0, 100, 'BUY') for _ in range(5)])
+        
+        assert prices[0] == prices[1]
+        assert len(set(prices[0])) > 1
+        
     def test_slippage_configuration(self):
         """Test slippage model configuration."""
         model = FixedSlippageModel()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the rolling market statistics of the market simulator.
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.execution.broker.market_simulator import MarketSimulator
+from src.execution.broker.market_stats import RingBuffer, RollingMarketStats
+
+
+def _bars(count, seed=3):
+    rng = random.Random(seed)
+    close = 100.0
+    bars = []
+    for i in range(count):
+        close *= 1 + rng.gauss(0, 0.01)
+        bars.append({'timestamp': i, 'open': close, 'high': close * 1.002, 'low': close * 0.997,
+                     'close': close, 'volume': rng.randint(100, 5000)})
+    return bars
+
+
+def _window_stats(window):
+    """Statistics computed from scratch, as the simulator used to."""
+    closes = [bar['close'] for bar in window]
+    returns = [(closes[i] / closes[i - 1]) - 1.0 for i in range(1, len(closes))]
+    try:
+        volatility = statistics.stdev(returns)
+    except statistics.StatisticsError:
+        volatility = 0.01
+    return {
+        'volatility': volatility,
+        'liquidity': max(sum(bar['volume'] for bar in window) / len(window), 1.0),
+        'spread': sum((bar['high'] - bar['low']) / bar['close'] for bar in window) / len(window),
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestRingBuffer:
+
+    def test_keeps_the_most_recent_items(self):
+        buffer = RingBuffer(3)
+        assert [buffer.append(i) for i in range(5)] == [None, None, None, 0, 1]
+        assert buffer == [2, 3, 4] and len(buffer) == 3
+        assert (buffer[0], buffer[-1], buffer[1:]) == (2, 4, [3, 4])
+        with pytest.raises(IndexError):
+            buffer[3]
+        with pytest.raises(ValueError):
+            RingBuffer(0)
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestRollingMarketStats:
+
+    def test_matches_statistics_over_the_window(self):
+        bars = _bars(300)
+        stats = RollingMarketStats(window=20)
+        for i, bar in enumerate(bars):
+            stats.update(bar)
+            expected = _window_stats(bars[max(0, i - 19):i + 1])
+            for name, value in expected.items():
+                assert stats[name] == pytest.approx(value, rel=1e-9, abs=1e-15)
+        assert stats.bars == bars[-20:]
+
+    def test_resize_keeps_recent_bars(self):
+        bars = _bars(30)
+        stats = RollingMarketStats(window=10)
+        for bar in bars:
+            stats.update(bar)
+        stats.resize(4)
+        assert stats.bars == bars[-4:]
+        assert stats.volatility == pytest.approx(_window_stats(bars[-4:])['volatility'], rel=1e-12)
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestMarketSimulatorStats:
+
+    def test_per_symbol_windows(self):
+        simulator = MarketSimulator(config={'max_history_bars': 5, 'history_windows': {'BBB': 3}})
+        bars = _bars(12)
+        for bar in bars:
+            simulator.update_price_data('AAA', bar)
+            simulator.update_price_data('BBB', bar)
+
+        assert simulator.historical_prices['AAA'] == bars[-5:]
+        assert simulator.historical_prices['BBB'] == bars[-3:]
+        stats = simulator.get_market_stats('BBB')
+        assert stats.pop('last_update') is not None
+        assert stats == pytest.approx(_window_stats(bars[-3:]))
+
+        simulator.set_history_window('AAA', 2)
+        assert simulator.historical_prices['AAA'] == bars[-2:]
+        with pytest.raises(ValueError):
+            simulator.set_history_window('AAA', 0)
+
+    def test_stats_published_from_the_second_bar(self):
+        simulator = MarketSimulator()
+        bars = _bars(2)
+        simulator.update_price_data('AAA', bars[0])
+        assert simulator.get_market_stats('AAA') == {}
+        simulator.update_price_data('AAA', bars[1])
+        assert simulator.get_market_stats('AAA')['volatility'] == 0.01
+
+    def test_market_impact_uses_rolling_stats(self):
+        simulator = MarketSimulator(config={'max_history_bars': 10})
+        for bar in _bars(15):
+            simulator.update_price_data('AAA', bar)
+        stats = simulator.market_stats['AAA']
+
+        order = {'symbol': 'AAA', 'quantity': 500, 'direction': 'BUY'}
+        impact = min(500 / stats.liquidity, simulator.max_price_impact) * (1.0 + stats.volatility * 10.0)
+        assert simulator.calculate_market_impact(order, 100.0) == pytest.approx(100.0 * (1.0 + impact))
@@ -0,0 +1,128 @@
+"""
+Unit tests for the indexed pending-order book.
+"""
+
+import random
+
+import pytest
+
+from src.core.event_system.event import Event
+from src.core.event_system.event_types import EventType
+from src.core.events.event_bus import EventBus
+from src.execution.broker.market_simulator import MarketSimulator
+from src.execution.broker.order_book import OrderBook
+from src.execution.broker.simulated_broker import SimulatedBroker
+
+
+def _order(order_id, order_type, direction, price=None, symbol='AAA', **extra):
+    order = {'id': order_id, 'symbol': symbol, 'order_type': order_type, 'direction': direction,
+             'quantity': 10, 'status': 'CREATED'}
+    if price is not None:
+        order['price'] = price
+    order.update(extra)
+    return order
+
+
+class _ScanningBroker(SimulatedBroker):
+    """Broker that checks every pending order of a symbol, as before the index."""
+
+    def _candidate_orders(self, symbol, price_data):
+        return self.pending_orders.for_symbol(symbol)
+
+
+def _run(broker_class, with_simulator, orders_per_bar, seed):
+    rng = random.Random(seed)
+    event_bus = EventBus()
+    broker = broker_class('broker')
+    context = {'event_bus': event_bus}
+    if with_simulator:
+        context['market_simulator'] = MarketSimulator()
+    broker.initialize(context)
+    fills = []
+    event_bus.subscribe(EventType.FILL, lambda event: fills.append(
+        (event.data['order_id'], round(event.data['price'], 10))))
+
+    prices = {'AAA': 100.0, 'BBB': 50.0}
+    next_id = 0
+    for bar_index in range(60):
+        for symbol, close in list(prices.items()):
+            close *= 1 + rng.uniform(-0.01, 0.01)
+            prices[symbol] = close
+            bar = {'symbol': symbol, 'timestamp': bar_index, 'open': close * (1 + rng.uniform(-0.003, 0.003)),
+                   'high': close * 1.004, 'low': close * 0.996, 'close': close, 'volume': 1000}
+            broker.on_bar(Event(EventType.BAR, bar))
+            for _ in range(orders_per_bar):
+                order_type = rng.choice(['LIMIT', 'LIMIT', 'STOP', 'STOP', 'MARKET', 'STOP_LIMIT'])
+                price = round(close * (1 + rng.uniform(-0.03, 0.03)), 2)
+                order = _order(f"o{next_id}", order_type, rng.choice(['BUY', 'SELL']), price, symbol,
+                               stop_price=price, limit_price=price)
+                next_id += 1
+                broker.on_order(Event(EventType.ORDER, order))
+            if rng.random() < 0.2 and len(broker.pending_orders):
+                broker.cancel_order(rng.choice(list(broker.pending_orders))['id'])
+    return fills, [o['id'] for o in broker.pending_orders]
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestOrderBook:
+
+    def test_list_behaviour(self):
+        book = OrderBook()
+        first, second = _order('a', 'LIMIT', 'BUY', 10.0), _order('b', 'MARKET', 'SELL')
+        book.append(first)
+        book.append(second)
+
+        assert book == [first, second] and len(book) == 2 and book[0] is first
+        assert first in book and book.get('b') is second
+        book.remove(first)
+        assert book == [second]
+        with pytest.raises(ValueError):
+            book.remove(first)
+        assert book.pop_id('b') is second and book.pop_id('b') is None
+        assert book == [] and book.symbols() == []
+
+    def test_candidates_are_the_orders_the_range_can_fill(self):
+        orders = [
+            _order('buy_limit_hit', 'LIMIT', 'BUY', 99.0),
+            _order('buy_limit_miss', 'LIMIT', 'BUY', 97.0),
+            _order('sell_limit_hit', 'LIMIT', 'SELL', 101.0),
+            _order('sell_limit_miss', 'LIMIT', 'SELL', 103.0),
+            _order('buy_stop_hit', 'STOP', 'BUY', 102.0),
+            _order('buy_stop_miss', 'STOP', 'BUY', 102.5),
+            _order('sell_stop_hit', 'STOP', 'SELL', 98.0),
+            _order('sell_stop_miss', 'STOP', 'SELL', 97.9),
+            _order('market', 'MARKET', 'BUY'),
+            _order('no_price', 'LIMIT', 'BUY'),
+            _order('other_symbol', 'MARKET', 'BUY', symbol='BBB'),
+        ]
+        book = OrderBook(orders)
+
+        hit = [o['id'] for o in book.candidates('AAA', 98.0, 102.0)]
+        assert hit == ['buy_limit_hit', 'sell_limit_hit', 'buy_stop_hit', 'sell_stop_hit', 'market', 'no_price']
+        assert len(book.candidates('AAA', None, 102.0)) == 10
+        assert book.candidates('CCC', 98.0, 102.0) == []
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestIndexedBrokerFills:
+
+    @pytest.mark.parametrize('with_simulator', [False, True])
+    def test_fills_match_scanning_every_order(self, with_simulator):
+        for seed in range(3):
+            expected = _run(_ScanningBroker, with_simulator, orders_per_bar=4, seed=seed)
+            assert _run(SimulatedBroker, with_simulator, orders_per_bar=4, seed=seed) == expected
+            assert expected[0] and expected[1]
+
+    def test_custom_fill_handler_sees_every_order(self):
+        event_bus = EventBus()
+        simulator = MarketSimulator()
+        simulator.register_fill_handler('LIMIT', lambda order, price_data, stats: (True, order['price']))
+        broker = SimulatedBroker('broker')
+        broker.initialize({'event_bus': event_bus, 'market_simulator': simulator})
+
+        bar = {'symbol': 'AAA', 'timestamp': 0, 'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.0}
+        broker.on_bar(Event(EventType.BAR, bar))
+        broker.on_order(Event(EventType.ORDER, _order('far', 'LIMIT', 'BUY', 50.0)))
+        assert 'far' in broker.filled_orders and len(broker.pending_orders) == 0
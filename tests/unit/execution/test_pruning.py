@@ -0,0 +1,221 @@
+"""
+Unit tests for early termination of hopeless backtests.
+"""
+
+import os
+import pickle
+
+import pytest
+
+from src.core.events.event_bus import EventBus
+from src.core.trade_repository import TradeRepository
+from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+from src.execution.backtest.pruning import (
+    BacktestPruner, MaxDrawdownRule, MinTradesRule, PrunedRun, PruningState, ScoreBoundRule,
+    create_pruner, share_best_score
+)
+from src.strategy.optimization.fixed_optimizer import FixedOptimizer
+from src.strategy.optimization.grid_search import GridSearch
+from src.strategy.optimization.parameter_space import IntegerParameter, ParameterSpace
+from src.strategy.optimization.random_search import RandomSearch
+from src.strategy.strategy_factory import StrategyFactory
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'MINI_1min.csv')
+
+SPLIT = {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3}
+
+
+class _PruningObjective:
+    """Picklable objective that prunes points scoring below the best score it was given."""
+
+    def __init__(self):
+        self.best_score = None
+
+    def __call__(self, params):
+        score = -abs(params['fast_window'] - 10) - abs(params['slow_window'] - 40)
+        if self.best_score is not None and score < self.best_score:
+            raise PrunedRun(f"score {score} below {self.best_score}", bar=100)
+        return score
+
+
+def _curve(*values):
+    return [{'equity': value} for value in values]
+
+
+@pytest.fixture
+def parameter_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 5, 20, step=5))
+    space.add_parameter(IntegerParameter('slow_window', 20, 60, step=10))
+    return space
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestPruningRules:
+
+    def test_max_drawdown(self):
+        rule = MaxDrawdownRule(0.2)
+        assert rule.check(PruningState(100, 90.0, 100.0, 0.1, 3)) is None
+        assert 'drawdown' in rule.check(PruningState(100, 100.0, 100.0, 0.25, 3))
+
+    def test_min_trades(self):
+        rule = MinTradesRule(2, by_bar=500)
+        assert rule.check(PruningState(400, None, None, 0.0, 0)) is None
+        assert rule.check(PruningState(500, None, None, 0.0, 2)) is None
+        assert '1 trades after 500 bars' in rule.check(PruningState(500, None, None, 0.0, 1))
+
+    def test_score_bound_computes_statistics_lazily(self):
+        calls = []
+
+        def statistics():
+            calls.append(1)
+            return {'sharpe_ratio': 0.5}
+
+        rule = ScoreBoundRule(lambda r: r['statistics']['sharpe_ratio'], 1.0, min_bars=200)
+        assert rule.check(PruningState(100, None, None, 0.0, 0, statistics)) is None
+        assert calls == []
+        assert 'running score' in rule.check(PruningState(200, None, None, 0.0, 0, statistics))
+        assert ScoreBoundRule(lambda r: 0.5, lambda: None).check(PruningState(200, None, None, 0.0, 0)) is None
+        assert ScoreBoundRule(lambda r: 0.5, 1.0, maximize=False).check(PruningState(200, None, None, 0.0, 0)) is None
+
+    def test_pruned_run_pickles(self):
+        error = pickle.loads(pickle.dumps(PrunedRun('too deep', bar=300)))
+        assert (error.reason, error.bar) == ('too deep', 300)
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestBacktestPruner:
+
+    def test_drawdown_is_tracked_across_checks(self):
+        pruner = BacktestPruner([MaxDrawdownRule(0.3)], check_interval=50)
+        curve = _curve(100.0, 120.0, 90.0)
+
+        assert not pruner.should_check(49) and pruner.should_check(100)
+        assert pruner.check(50, curve, 1) is None
+
+        # The trough has been recovered from, but the drawdown it caused remains
+        curve += _curve(130.0, 80.0, 125.0)
+        assert pruner.check(100, curve, 2) is not None
+
+    def test_first_firing_rule_wins(self):
+        pruner = BacktestPruner([MinTradesRule(1, 0), MaxDrawdownRule(0.1)])
+        assert 'trades' in pruner.check(100, _curve(100.0, 50.0), 0)
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            BacktestPruner([], check_interval=0)
+
+    def test_create_pruner(self):
+        assert create_pruner(None) is None
+        assert create_pruner({'check_interval': 10}) is None
+        assert create_pruner({'max_drawdown': 0.5, 'enabled': False}) is None
+        # The score rule needs an objective and a best score
+        assert create_pruner({'score_margin': 1.0}, lambda r: 0.0) is None
+
+        pruner = create_pruner({'max_drawdown': 0.5, 'min_trades': 2, 'score_margin': 1.0,
+                                'check_interval': 25}, lambda r: 0.0, lambda: 2.0)
+        assert pruner.check_interval == 25
+        assert [type(rule) for rule in pruner.rules] == [MaxDrawdownRule, MinTradesRule, ScoreBoundRule]
+        assert pruner.rules[2].bound() == 1.0
+
+    def test_share_best_score(self):
+        objective = _PruningObjective()
+        share_best_score(objective, 3.0)
+        share_best_score(len, 3.0)
+        assert objective.best_score == 3.0
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestSearchPruning:
+
+    @pytest.mark.parametrize('executor', ['serial', 'thread'])
+    def test_grid_search_counts_pruned_runs(self, parameter_space, executor):
+        results = GridSearch(parameter_space).search(_PruningObjective(), executor=executor, max_workers=2)
+
+        assert results['best_params'] == {'fast_window': 10, 'slow_window': 40}
+        assert results['pruned'] > 0
+        assert results['evaluations'] + results['pruned'] == 20
+
+    def test_random_search_counts_pruned_runs(self, parameter_space):
+        results = RandomSearch(parameter_space, seed=1).search(_PruningObjective(), num_samples=20)
+
+        assert results['pruned'] > 0
+        assert results['evaluations'] + results['pruned'] == 20
+
+
+@pytest.mark.integration
+@pytest.mark.execution
+class TestBacktestPruning:
+
+    @staticmethod
+    def _run(pruning, split='train', bound=None):
+        config = {
+            'initial_capital': 100000,
+            'data': {
+                'source_type': 'csv',
+                'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S',
+                'sources': [{'symbol': 'SPY', 'file': DATA_FILE}],
+                'train_test_split': SPLIT,
+            },
+            'optimization': {'pruning': pruning},
+        }
+        backtest = OptimizingBacktest('optimizing_backtest', config, None)
+        backtest.initialize({
+            'event_bus': EventBus(),
+            'trade_repository': TradeRepository(),
+            'strategy_factory': StrategyFactory(),
+            'config': config,
+        })
+        backtest.prune_objective = lambda r: r['statistics'].get('sharpe_ratio', 0)
+        backtest.prune_score_bound = bound
+        return backtest._run_backtest_with_params('simple_ma_crossover',
+                                                  {'fast_period': 3, 'slow_period': 8}, split, SPLIT)
+
+    def test_training_run_stops_early(self):
+        results = self._run({'check_interval': 5, 'score_margin': 0.0}, bound=1e9)
+
+        assert results['pruned']['bar'] == 5
+        assert 'running score' in results['pruned']['reason']
+
+    def test_test_run_is_never_pruned(self):
+        assert 'pruned' not in self._run({'check_interval': 5, 'score_margin': 0.0}, 'test', bound=1e9)
+        assert 'pruned' not in self._run({'check_interval': 5, 'score_margin': 0.0})
+
+
+class _PruningOptimizer(FixedOptimizer):
+    """Optimizer whose evaluations are pruned when worse than the best so far."""
+
+    def _evaluate_combination(self, idx, params, bootstrap=None):
+        score = -abs(params['fast_window'] - 10) - abs(params['slow_window'] - 40)
+        if self.prune_score_bound is not None and score < self.prune_score_bound:
+            return self._pruned_result(params, {'statistics': {}, 'pruned': {'reason': 'worse', 'bar': 10}})
+        return {
+            'parameters': params,
+            'train_score': score,
+            'test_score': score,
+            'train_result': {'statistics': {'sharpe_ratio': score}, 'trades': []},
+            'test_result': {'statistics': {'sharpe_ratio': score}, 'trades': []}
+        }
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestOptimizerPruning:
+
+    def test_pruned_combinations_never_win(self, tmp_path, parameter_space):
+        config = {
+            'output_dir': str(tmp_path),
+            'data': {'train_test_split': SPLIT},
+            'optimization': {'method': 'grid', 'checkpoint': False}
+        }
+        results = _PruningOptimizer('simple_ma_crossover', config, parameter_space).optimize()
+
+        assert results['best_parameters'] == {'fast_window': 10, 'slow_window': 40}
+        assert results['pruned_count'] > 0
+        pruned = [r for r in results['all_results'] if r.get('pruned')]
+        assert len(pruned) == results['pruned_count']
+        assert all(r['train_score'] == float('-inf') and r['test_result'] is None for r in pruned)
@@ -0,0 +1,170 @@
+"""
+Unit tests for the persistent backtest result cache.
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.events.event_bus import EventBus
+from src.core.trade_repository import TradeRepository
+from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+from src.execution.backtest.result_cache import (
+    ResultCache, get_data_fingerprint, get_result_cache
+)
+from src.strategy.implementations.ma_crossover import MovingAverageCrossover
+from src.strategy.implementations.simple_ma_crossover import SimpleMACrossoverStrategy
+from src.strategy.strategy_factory import StrategyFactory
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'MINI_1min.csv')
+
+SPLIT = {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3}
+
+
+def _results():
+    return {
+        'final_capital': 1010.0,
+        'statistics': {'sharpe_ratio': np.float64(1.5), 'trades_executed': np.int64(1),
+                       'profit_factor': float('inf')},
+        'trades': [{'pnl': 10.0, 'closed': True}],
+        'positions': {'SPY': 0},
+        'equity_curve': [{'timestamp': pd.Timestamp('2024-01-02'), 'equity': 1000.0},
+                         {'timestamp': pd.Timestamp('2024-01-03'), 'equity': 1010.0}],
+        'parameters': {'fast_period': 3},
+        'data_split': 'train'
+    }
+
+
+def _key(**overrides):
+    parts = {
+        'data_fingerprint': {'SPY': 'abc'},
+        'data_split': 'train',
+        'split_config': SPLIT,
+        'strategy_class': SimpleMACrossoverStrategy,
+        'params': {'fast_period': 3, 'slow_period': 8},
+        'run_config': {'initial_capital': 1000, 'broker': {'commission': {'rate': 0.001}}}
+    }
+    parts.update(overrides)
+    return ResultCache.make_key(**parts)
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestResultCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = ResultCache(str(tmp_path / 'results.sqlite'))
+        key = _key()
+        assert cache.get(key) is None
+
+        cache.put(key, _results(), 'simple_ma_crossover')
+        cached = ResultCache(cache.path).get(key)
+
+        expected = _results()
+        del expected['parameters'], expected['data_split']
+        assert cached == expected
+        assert cache.get_stats()['hit_rate'] == 0.0
+        assert len(cache) == 1
+
+    def test_equity_curve_is_optional(self, tmp_path):
+        cache = ResultCache(str(tmp_path / 'results.sqlite'), store_equity_curve=False)
+        cache.put(_key(), _results())
+
+        cached = cache.get(_key())
+        assert 'equity_curve' not in cached
+        assert cached['trades'] == _results()['trades']
+        assert cache.get_stats() == {'hits': 1, 'misses': 0, 'hit_rate': 1.0, 'writes': 1,
+                                     'path': cache.path}
+
+    def test_key_covers_run_inputs(self):
+        key = _key()
+        assert _key(params={'slow_period': 8, 'fast_period': np.int64(3)}) == key
+        assert _key(params={'fast_period': 3, 'slow_period': 9}) != key
+        assert _key(data_fingerprint={'SPY': 'abd'}) != key
+        assert _key(data_split='test') != key
+        assert _key(split_config=dict(SPLIT, train_ratio=0.6)) != key
+        assert _key(strategy_class=MovingAverageCrossover) != key
+        assert _key(run_config={'initial_capital': 1000, 'broker': {'commission': {'rate': 0.002}}}) != key
+        assert _key(run_config={'initial_capital': 1000, 'broker': {'commission': {'rate': 0.001}},
+                                'optimization': {'engine': 'vectorized'}}) != key
+        # Settings that do not change results are ignored
+        assert _key(run_config={'initial_capital': 1000, 'broker': {'commission': {'rate': 0.001}},
+                                'output_dir': 'elsewhere'}) == key
+
+    def test_data_fingerprint(self):
+        df = pd.DataFrame({'close': np.arange(20.0)})
+        changed = df.copy()
+        changed.loc[10, 'close'] = -1.0
+
+        assert get_data_fingerprint(df) != get_data_fingerprint(changed)
+        # The sampled diagnostic fingerprint only sees the first and last rows
+        assert get_data_fingerprint(df, sample_rows=5) == get_data_fingerprint(changed, sample_rows=5)
+        assert get_data_fingerprint(df.iloc[:0]) == "empty_dataframe"
+
+    def test_pickles_without_connection(self, tmp_path):
+        cache = ResultCache(str(tmp_path / 'results.sqlite'))
+        cache.put(_key(), _results())
+
+        restored = pickle.loads(pickle.dumps(cache))
+        assert restored.get(_key())['final_capital'] == 1010.0
+
+    def test_configuration(self, tmp_path):
+        assert get_result_cache(None) is None
+        assert get_result_cache({'enabled': False, 'path': str(tmp_path / 'a.sqlite')}) is None
+
+        cache = get_result_cache(True, str(tmp_path))
+        assert cache.path == os.path.join(str(tmp_path), 'result_cache.sqlite')
+        assert get_result_cache({'path': cache.path}) is cache
+        assert get_result_cache(str(tmp_path / 'b.sqlite')).path == str(tmp_path / 'b.sqlite')
+
+
+@pytest.mark.integration
+@pytest.mark.execution
+class TestOptimizingBacktestResultCache:
+
+    @staticmethod
+    def _run(tmp_path, params, split='train', **overrides):
+        config = {
+            'initial_capital': 100000,
+            'data': {
+                'source_type': 'csv',
+                'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S',
+                'sources': [{'symbol': 'SPY', 'file': DATA_FILE}],
+                'train_test_split': SPLIT,
+            },
+            'optimization': {'result_cache': str(tmp_path / 'results.sqlite')},
+        }
+        config.update(overrides)
+        backtest = OptimizingBacktest('optimizing_backtest', config, None)
+        backtest.initialize({
+            'event_bus': EventBus(),
+            'trade_repository': TradeRepository(),
+            'strategy_factory': StrategyFactory(),
+            'config': config,
+        })
+        return backtest._run_backtest_with_params('simple_ma_crossover', params, split, SPLIT)
+
+    def test_repeated_run_is_served_from_cache(self, tmp_path):
+        params = {'fast_period': 3, 'slow_period': 8}
+        first = self._run(tmp_path, params)
+        second = self._run(tmp_path, params)
+
+        assert 'cache_hit' not in first
+        assert second['cache_hit'] is True
+        assert second['parameters'] == params and second['data_split'] == 'train'
+        assert second['statistics'] == first['statistics']
+        assert second['final_capital'] == first['final_capital']
+        assert second['equity_curve'] == first['equity_curve']
+        assert len(second['trades']) == len(first['trades'])
+
+    def test_changed_inputs_run_again(self, tmp_path):
+        params = {'fast_period': 3, 'slow_period': 8}
+        self._run(tmp_path, params)
+
+        assert 'cache_hit' not in self._run(tmp_path, params, split='test')
+        assert 'cache_hit' not in self._run(tmp_path, {'fast_period': 2, 'slow_period': 8})
+        assert 'cache_hit' not in self._run(tmp_path, params, initial_capital=50000)
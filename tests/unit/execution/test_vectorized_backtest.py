@@ -0,0 +1,307 @@
+"""
+Unit tests for the vectorized backtest engine and the strategy hooks it uses.
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.metrics.functional import calculate_all_metrics
+from src.core.events.event_bus import EventBus
+from src.core.events.event_types import EventType, Event
+from src.core.trade_repository import TradeRepository
+from src.data.bar_store import BarStore
+from src.data.data_types import Timeframe
+from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+from src.execution.backtest.vectorized import (
+    VectorizedBacktester, compare_results, equity_curve_frame, supports_vectorized
+)
+from src.execution.broker.commission_model import CommissionModel
+from src.execution.broker.slippage_model import FixedSlippageModel
+from src.strategy.components.indicators.streaming import RollingStd, RollingSum, SMA
+from src.strategy.components.indicators.vectorized import (
+    crossovers, hold_signals, rolling_mean, rolling_std, rolling_sum
+)
+from src.strategy.implementations import ma_crossover_strategy, mean_reversion
+from src.strategy.implementations.ma_crossover import MovingAverageCrossover
+from src.strategy.implementations.simple_ma_crossover import SimpleMACrossoverStrategy
+from src.strategy.implementations.simple_regime_ensemble import SimpleRegimeEnsembleStrategy
+from src.strategy.strategy_factory import StrategyFactory
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data')
+
+# Bundled datasets: file name -> (date column, date format)
+DATASETS = {
+    'HEAD_1min.csv': ('timestamp', '%Y-%m-%d %H:%M:%S'),
+    'MINI_1min.csv': ('timestamp', '%Y-%m-%d %H:%M:%S'),
+    'SYNTH_1min.csv': ('timestamp', '%Y-%m-%d %H:%M:%S'),
+    'AAPL_1d.csv': ('date', '%Y-%m-%d'),
+}
+
+
+def _load_bars(name):
+    df = pd.read_csv(os.path.join(DATA_DIR, name))
+    df.columns = [c.lower() for c in df.columns]
+    df = df.rename(columns={'date': 'timestamp'})
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return BarStore.from_dataframe(df[['timestamp', 'open', 'high', 'low', 'close', 'volume']])
+
+
+def _bars(bars, symbol='SPY'):
+    for i in range(len(bars)):
+        yield i, bars.bar(i, symbol, Timeframe.MINUTE_1)
+
+
+class _Recorder:
+    """Event bus stand-in that keeps published events."""
+
+    def __init__(self):
+        self.events = []
+        self.index = 0
+
+    def publish(self, event):
+        self.events.append((self.index, event.get_data()))
+
+
+def _replay_positions(n, signals, to_position):
+    positions = np.zeros(n)
+    position = 0.0
+    signals = iter(signals)
+    pending = next(signals, None)
+    for i in range(n):
+        while pending is not None and pending[0] == i:
+            position = to_position(position, pending[1])
+            pending = next(signals, None)
+        positions[i] = position
+    return positions
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestVectorizedIndicators:
+
+    def test_rolling_windows_match_streaming_indicators(self):
+        values = _load_bars('HEAD_1min.csv').get('close')
+        mean, std, total = rolling_mean(values, 7), rolling_std(values, 7), rolling_sum(values, 7)
+        sma, rolling_stdev, running_sum = SMA(7), RollingStd(7), RollingSum(7)
+
+        assert np.isnan(mean[:6]).all() and np.isnan(total[:6]).all()
+        for i, value in enumerate(values):
+            expected = (sma.update(value), rolling_stdev.update(value), running_sum.update(value))
+            if i < 6:
+                assert expected == (None, None, None)
+                continue
+            assert (mean[i], std[i], total[i]) == expected
+
+            window = values[i - 6:i + 1]
+            assert mean[i] == pytest.approx(np.mean(window), rel=1e-12)
+            assert std[i] == pytest.approx(np.std(window), rel=1e-8, abs=1e-12)
+
+    def test_leading_nan_is_warm_up(self):
+        values = np.array([np.nan, 1.0, 2.0, 4.0, 8.0])
+        assert np.isnan(rolling_sum(values, 2)[:2]).all()
+        assert rolling_sum(values, 2)[2:].tolist() == [3.0, 6.0, 12.0]
+        assert rolling_std(values, 2)[2:].tolist() == [0.5, 1.0, 2.0]
+
+    def test_short_input_is_all_nan(self):
+        assert np.isnan(rolling_mean([1.0, 2.0], 3)).all()
+        assert np.isnan(rolling_sum([1.0, 2.0], 3)).all()
+
+    def test_hold_signals(self):
+        held = hold_signals([np.nan, 1.0, np.nan, -1.0, np.nan, 0.0])
+        assert held.tolist() == [0.0, 1.0, 1.0, -1.0, -1.0, 0.0]
+
+    def test_crossovers(self):
+        up, down = crossovers([1.0, 2.0, 3.0, 2.0], [2.0, 2.0, 2.0, 2.5])
+        assert up.tolist() == [False, False, True, False]
+        assert down.tolist() == [False, False, False, True]
+
+
+@pytest.mark.unit
+@pytest.mark.execution
+class TestVectorizedBacktester:
+
+    @pytest.fixture
+    def bars(self):
+        return BarStore.from_dataframe(pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=6, freq='D'),
+            'open': [100.0, 101.0, 102.0, 103.0, 104.0, 105.0],
+            'high': [101.0, 102.0, 103.0, 104.0, 105.0, 106.0],
+            'low': [99.0, 100.0, 101.0, 102.0, 103.0, 104.0],
+            'close': [100.0, 102.0, 104.0, 103.0, 101.0, 100.0],
+            'volume': [1000] * 6,
+        }))
+
+    def test_fills_use_broker_cost_models(self, bars):
+        backtester = VectorizedBacktester(initial_capital=10000, symbol='TEST')
+        results = backtester.run_positions([0, 10, 10, 0, -10, -10], bars)
+
+        slippage, commission = FixedSlippageModel(), CommissionModel()
+        buy = slippage.apply_slippage(102.0, 10, 'LONG')
+        sell = slippage.apply_slippage(103.0, 10, 'SHORT')
+        short = slippage.apply_slippage(101.0, 10, 'SHORT')
+
+        trades = results['trades']
+        assert [t['direction'] for t in trades] == ['LONG', 'SHORT']
+        assert trades[0]['entry_price'] == buy
+        assert trades[0]['close_price'] == sell
+        assert trades[0]['pnl'] == pytest.approx((sell - buy) * 10)
+        assert trades[1]['entry_price'] == short
+
+        # Like Portfolio.close_all_positions, the open short is closed at the
+        # latest close price in the trade list, without a cash flow
+        assert trades[1]['closed'] and trades[1]['close_price'] == sell
+        expected_cash = (10000 - buy * 10 + sell * 10 + short * 10
+                         - commission.calculate(buy, 10) - commission.calculate(sell, 10)
+                         - commission.calculate(short, 10))
+        assert results['final_capital'] == pytest.approx(expected_cash)
+        assert results['positions'] == {'TEST': 0.0}
+        assert results['statistics']['trades_executed'] == 2
+
+    def test_previous_close_fills(self, bars):
+        results = VectorizedBacktester(fill_on='previous_close').run_positions([0, 0, 10, 0, 0, 0], bars)
+        trade = results['trades'][0]
+        assert trade['entry_time'] == bars.timestamp_at(1)
+        assert trade['entry_price'] == FixedSlippageModel().apply_slippage(102.0, 10, 'LONG')
+
+    def test_results_feed_analytics(self, bars):
+        results = VectorizedBacktester().run_positions([0, 10, 10, 0, 10, 0], bars)
+        equity = equity_curve_frame(results['equity_curve'])
+
+        assert list(equity.index) == [p['timestamp'] for p in results['equity_curve']]
+        metrics = calculate_all_metrics(equity, results['trades'])
+        assert metrics['trade_count'] == 2
+
+    def test_rejects_unsupported_strategies(self, bars):
+        assert not supports_vectorized(SimpleNamespace())
+        with pytest.raises(ValueError):
+            VectorizedBacktester().run(SimpleNamespace(), bars)
+        with pytest.raises(ValueError):
+            VectorizedBacktester(fill_on='open')
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestVectorizedPositions:
+    """Each hook must reproduce the positions implied by the strategy's bar-by-bar signals."""
+
+    @pytest.mark.parametrize('dataset', sorted(DATASETS))
+    @pytest.mark.parametrize('module', [ma_crossover_strategy, None])
+    def test_simple_ma_crossover(self, dataset, module):
+        strategy_class = module.SimpleMACrossoverStrategy if module else SimpleMACrossoverStrategy
+        bars = _load_bars(dataset)
+        strategy = strategy_class('ma', fast_period=3, slow_period=8)
+        strategy.event_bus = recorder = _Recorder()
+        for i, bar in _bars(bars):
+            recorder.index = i
+            strategy.on_bar(Event(EventType.BAR, bar.to_dict()))
+
+        signals = [(i, data['quantity'] if data['direction'] == 'LONG' else -data['quantity'])
+                   for i, data in recorder.events]
+        expected = _replay_positions(len(bars), signals, lambda position, change: position + change)
+        np.testing.assert_array_equal(strategy.vectorized_positions(bars), expected)
+
+    @pytest.mark.parametrize('dataset', sorted(DATASETS))
+    def test_moving_average_crossover(self, dataset):
+        bars = _load_bars(dataset)
+        strategy = MovingAverageCrossover('ma', fast_period=3, slow_period=8)
+        strategy.event_bus = recorder = _Recorder()
+        for i, bar in _bars(bars):
+            recorder.index = i
+            strategy.on_bar(bar)
+
+        signals = [(i, data['direction']) for i, data in recorder.events]
+        expected = _replay_positions(len(bars), signals, lambda position, direction: direction * 50)
+        np.testing.assert_array_equal(strategy.vectorized_positions(bars, position_size=50), expected)
+
+    @pytest.mark.parametrize('dataset', sorted(DATASETS))
+    @pytest.mark.parametrize('use_atr', [False, True])
+    def test_mean_reversion(self, dataset, use_atr, monkeypatch):
+        bars = _load_bars(dataset)
+        strategy = mean_reversion.MeanReversionStrategy(None, None, parameters={
+            'window': 10, 'std_dev_multiplier': 1.0, 'use_atr': use_atr, 'atr_period': 5,
+            'atr_multiplier': 0.5
+        })
+        strategy.symbols = ['SPY']
+        monkeypatch.setattr(mean_reversion, 'create_signal_event',
+                            lambda **kwargs: SimpleNamespace(data=dict(kwargs)))
+
+        signals = []
+        for i, bar in _bars(bars):
+            event = SimpleNamespace(get_symbol=lambda: 'SPY', get_close=lambda: bar.close,
+                                    get_timestamp=lambda: bar.timestamp, get_high=lambda: bar.high,
+                                    get_low=lambda: bar.low)
+            signal = strategy.on_bar(event)
+            if signal is not None:
+                signals.append((i, signal.data['signal_value']))
+
+        assert signals
+        expected = _replay_positions(len(bars), signals, lambda position, direction: direction * 100)
+        np.testing.assert_array_equal(strategy.vectorized_positions(bars), expected)
+
+    @pytest.mark.parametrize('dataset', sorted(DATASETS))
+    def test_simple_regime_ensemble(self, dataset):
+        bars = _load_bars(dataset)
+        strategy = SimpleRegimeEnsembleStrategy(
+            'ensemble', volatility_window=10, volatility_threshold=0.001, trend_ma_window=15,
+            trend_threshold=0.002, fast_ma_window=3, slow_ma_window=8, rsi_window=6,
+            breakout_window=10, breakout_multiplier=0.2
+        )
+        strategy.event_bus = recorder = _Recorder()
+        for i, bar in _bars(bars):
+            recorder.index = i
+            strategy.on_bar(bar)
+
+        signals = [(i, data['direction']) for i, data in recorder.events]
+        expected = _replay_positions(len(bars), signals, lambda position, direction: direction * 100)
+        np.testing.assert_array_equal(strategy.vectorized_positions(bars), expected)
+
+
+@pytest.mark.integration
+@pytest.mark.execution
+class TestEngineConsistency:
+    """The vectorized engine must reproduce event-driven backtests on the bundled data."""
+
+    @staticmethod
+    def _config(dataset, engine):
+        date_column, date_format = DATASETS[dataset]
+        return {
+            'initial_capital': 100000,
+            'data': {
+                'source_type': 'csv',
+                'date_column': date_column,
+                'date_format': date_format,
+                'sources': [{'symbol': 'SPY', 'file': os.path.join(DATA_DIR, dataset)}],
+                'train_test_split': {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3},
+            },
+            'optimization': {'engine': engine},
+        }
+
+    def _run(self, dataset, engine, params, split):
+        config = self._config(dataset, engine)
+        backtest = OptimizingBacktest('optimizing_backtest', config, None)
+        backtest.initialize({
+            'event_bus': EventBus(),
+            'trade_repository': TradeRepository(),
+            'strategy_factory': StrategyFactory(),
+            'config': config,
+        })
+        return backtest._run_backtest_with_params(
+            'simple_ma_crossover', params, split, config['data']['train_test_split']
+        )
+
+    @pytest.mark.parametrize('dataset', sorted(DATASETS))
+    @pytest.mark.parametrize('split', ['train', 'test'])
+    @pytest.mark.parametrize('params', [
+        {'fast_period': 3, 'slow_period': 8},
+        {'fast_period': 2, 'slow_period': 5},
+    ])
+    def test_matches_event_driven_engine(self, dataset, split, params):
+        event_driven = self._run(dataset, 'event', params, split)
+        vectorized = self._run(dataset, 'vectorized', params, split)
+
+        assert vectorized['engine'] == 'vectorized'
+        assert compare_results(vectorized, event_driven) == []
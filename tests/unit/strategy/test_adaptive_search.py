@@ -0,0 +1,165 @@
+"""
+Unit tests for successive halving, Hyperband and Bayesian (TPE) search.
+"""
+
+import random
+
+import pytest
+
+from src.core.exceptions import OptimizationError
+from src.execution.backtest.pruning import PrunedRun
+from src.strategy.optimization.bayesian_search import BayesianSearch
+from src.strategy.optimization.parameter_space import (
+    CategoricalParameter, ConditionalParameter, FloatParameter, IntegerParameter, ParameterSpace
+)
+from src.strategy.optimization.successive_halving import SuccessiveHalving
+
+MAX_BUDGET = 810
+
+
+def _budgeted_objective(params, budget):
+    """Picklable objective: short runs favour fast_window=5, full runs fast_window=30."""
+    if budget is None:
+        return -abs(params['fast_window'] - 30)
+    if budget < 100:
+        return -abs(params['fast_window'] - 5)
+    return -abs(params['fast_window'] - 25)
+
+
+def _objective(params):
+    """Picklable objective with a single maximum at fast=70, ratio=0.3, kind=b, level=4."""
+    score = -abs(params['fast_window'] - 70) - 10 * abs(params['ratio'] - 0.3)
+    score -= 0 if params['kind'] == 'b' else 20
+    return score - abs(params['level'] - 4)
+
+
+@pytest.fixture
+def halving_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 1, 40))
+    return space
+
+
+@pytest.fixture
+def mixed_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 0, 100))
+    space.add_parameter(FloatParameter('ratio', 0.0, 1.0))
+    kind = CategoricalParameter('kind', ['a', 'b', 'c'])
+    space.add_parameter(kind)
+    space.add_parameter(ConditionalParameter('level', kind, {'a': [1, 2], 'b': [3, 4], 'c': [5]}))
+    return space
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestSuccessiveHalving:
+
+    def test_brackets(self):
+        assert SuccessiveHalving.get_brackets(30, MAX_BUDGET, eta=3) == [(27, [30, 90, 270, None])]
+        assert SuccessiveHalving.get_brackets(30, MAX_BUDGET, eta=3, hyperband=True) == [
+            (27, [30, 90, 270, None]), (12, [90, 270, None]), (6, [270, None]), (4, [None])
+        ]
+        with pytest.raises(OptimizationError):
+            SuccessiveHalving.get_brackets(0, MAX_BUDGET)
+        with pytest.raises(OptimizationError):
+            SuccessiveHalving.get_brackets(30, MAX_BUDGET, eta=1)
+
+    def test_promotes_best_candidates_to_longer_runs(self, halving_space):
+        search = SuccessiveHalving(halving_space, seed=1)
+        results = search.search(_budgeted_objective, max_budget=MAX_BUDGET, min_budget=30)
+
+        budgets = [r['budget'] for r in results['results']]
+        assert budgets == [30] * 27 + [90] * 9 + [270] * 3 + [None]
+        # The survivors of each rung are the best of the previous one
+        survivors = {r['params']['fast_window'] for r in results['results'] if r['budget'] == 90}
+        first_rung = sorted(results['results'][:27], key=lambda r: r['score'], reverse=True)
+        assert survivors == {r['params']['fast_window'] for r in first_rung[:9]}
+        # Only the full-data run competes for the best result
+        assert results['best_score'] == results['results'][-1]['score']
+
+    def test_hyperband_runs_every_bracket(self, halving_space):
+        best = []
+        results = SuccessiveHalving(halving_space, seed=2).search(
+            _budgeted_objective, max_budget=MAX_BUDGET, min_budget=30, hyperband=True,
+            callback=lambda params, score, is_best: best.append(is_best))
+
+        assert results['evaluations'] == 27 + 9 + 3 + 1 + 12 + 4 + 1 + 6 + 2 + 4
+        assert {r['bracket'] for r in results['results']} == {0, 1, 2, 3}
+        assert len(best) == results['evaluations']
+        full_runs = [r for r in results['results'] if r['budget'] is None]
+        assert results['best_score'] == max(r['score'] for r in full_runs)
+
+    def test_thread_executor_matches_serial(self, halving_space):
+        serial = SuccessiveHalving(halving_space, seed=3).search(
+            _budgeted_objective, max_budget=MAX_BUDGET, hyperband=True)
+        threaded = SuccessiveHalving(halving_space, seed=3).search(
+            _budgeted_objective, max_budget=MAX_BUDGET, hyperband=True, executor='thread', max_workers=3)
+
+        assert [(r['params'], r['budget']) for r in threaded['results']] == \
+            [(r['params'], r['budget']) for r in serial['results']]
+        assert threaded['best_params'] == serial['best_params']
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestBayesianSearch:
+
+    def test_beats_random_search(self, mixed_space):
+        wins = 0
+        for seed in range(5):
+            tpe = BayesianSearch(mixed_space, seed=seed).search(_objective, num_samples=60)
+            random.seed(seed)
+            best_random = max(_objective(mixed_space.get_random_point()) for _ in range(60))
+            wins += tpe['best_score'] >= best_random
+        assert wins >= 4
+
+    def test_points_are_valid_and_distinct(self, mixed_space):
+        results = BayesianSearch(mixed_space, seed=0).search(_objective, num_samples=40)
+
+        keys = [repr(sorted(r['params'].items())) for r in results['results']]
+        assert len(set(keys)) == len(keys) == 40
+        for result in results['results']:
+            params = result['params']
+            assert mixed_space.get_parameter('fast_window').validate(params['fast_window'])
+            assert 0.0 <= params['ratio'] <= 1.0
+            assert mixed_space.get_parameter('level').validate(params['level'], params['kind'])
+
+    def test_stops_when_space_is_exhausted(self):
+        space = ParameterSpace()
+        space.add_parameter(IntegerParameter('fast_window', 5, 20, step=5))
+        results = BayesianSearch(space, seed=0).search(lambda p: -p['fast_window'], num_samples=10,
+                                                       maximize=False)
+
+        assert results['evaluations'] == 4
+        assert results['best_params'] == {'fast_window': 20}
+
+    def test_reproducible_and_parallel(self, mixed_space):
+        serial = BayesianSearch(mixed_space, seed=7).search(_objective, num_samples=20)
+        again = BayesianSearch(mixed_space, seed=7).search(_objective, num_samples=20)
+        threaded = BayesianSearch(mixed_space, seed=7).search(_objective, num_samples=20,
+                                                              executor='thread', max_workers=4)
+
+        assert [r['params'] for r in again['results']] == [r['params'] for r in serial['results']]
+        assert threaded['evaluations'] == 20
+
+    def test_pruned_runs_are_counted_separately(self):
+        space = ParameterSpace()
+        space.add_parameter(IntegerParameter('fast_window', 5, 40, step=5))
+
+        def objective(params):
+            if params['fast_window'] > 20:
+                raise PrunedRun('running score below best', 10)
+            if params['fast_window'] == 5:
+                raise ValueError("invalid window")
+            return params['fast_window']
+
+        results = BayesianSearch(space, seed=0).search(objective, num_samples=8)
+
+        assert results['pruned'] == 4
+        assert results['evaluations'] == 3
+        assert results['best_params'] == {'fast_window': 20}
+
+    def test_invalid_gamma(self, mixed_space):
+        with pytest.raises(OptimizationError):
+            BayesianSearch(mixed_space).search(_objective, num_samples=5, gamma=1.5)
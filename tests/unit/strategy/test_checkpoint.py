@@ -0,0 +1,237 @@
+"""
+Unit tests for the optimization checkpoint journal and resume.
+"""
+
+import os
+
+import pytest
+
+from src.strategy.optimization.checkpoint import (
+    JOURNAL_FILENAME, OptimizationJournal, get_journal, get_run_fingerprint
+)
+from src.strategy.optimization import runner
+from src.strategy.optimization.fixed_optimizer import FixedOptimizer
+from src.strategy.optimization.parameter_space import CategoricalParameter, IntegerParameter, ParameterSpace
+
+SPLIT = {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3}
+
+
+def _result(params):
+    score = -abs(params['fast_window'] - 10) - abs(params['slow_window'] - 40)
+    return {
+        'parameters': params,
+        'train_score': score,
+        'test_score': score - 1,
+        'train_result': {'statistics': {'sharpe_ratio': score}, 'trades': []},
+        'test_result': {'statistics': {'sharpe_ratio': score - 1}, 'trades': []}
+    }
+
+
+class _RecordingOptimizer(FixedOptimizer):
+    """Optimizer whose evaluations are computed from the parameters."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evaluated = []
+
+    def _evaluate_combination(self, idx, params, bootstrap=None):
+        self.evaluated.append(idx)
+        return _result(params)
+
+
+@pytest.fixture
+def parameter_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 5, 20, step=5))
+    space.add_parameter(IntegerParameter('slow_window', 20, 60, step=10))
+    return space
+
+
+def _optimizer(parameter_space, output_dir, resume=False):
+    config = {
+        'output_dir': str(output_dir),
+        'data': {'train_test_split': SPLIT},
+        'optimization': {'method': 'grid', 'resume': resume}
+    }
+    return _RecordingOptimizer('simple_ma_crossover', config, parameter_space)
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestOptimizationJournal:
+
+    def test_round_trip(self, tmp_path, parameter_space):
+        grid = parameter_space.get_grid()
+        journal = OptimizationJournal(str(tmp_path / 'journal.jsonl'),
+                                      get_run_fingerprint('s', grid, SPLIT))
+        journal.open()
+        journal.record(3, _result(grid[3]))
+        journal.record(0, {'parameters': grid[0], 'train_score': float('-inf'),
+                           'test_score': float('-inf'), 'error': 'boom'})
+        journal.close()
+
+        records = journal.load()
+        assert sorted(records) == [0, 3]
+        restored = OptimizationJournal.to_result(records[3])
+        assert restored['parameters'] == grid[3]
+        assert restored['train_score'] == _result(grid[3])['train_score']
+        assert restored['test_result'] == {'statistics': _result(grid[3])['test_result']['statistics']}
+        assert OptimizationJournal.to_result(records[0])['error'] == 'boom'
+
+    def test_truncated_line_is_ignored(self, tmp_path, parameter_space):
+        grid = parameter_space.get_grid()
+        journal = OptimizationJournal(str(tmp_path / 'journal.jsonl'), 'run')
+        journal.open()
+        journal.record(0, _result(grid[0]))
+        journal.close()
+        with open(journal.path, 'a') as f:
+            f.write('{"index": 1, "param')
+
+        assert list(journal.load()) == [0]
+
+        # Resuming appends after the partial line
+        journal.open(resume=True)
+        journal.record(1, _result(grid[1]))
+        journal.close()
+        assert sorted(journal.load()) == [0, 1]
+
+    def test_other_run_is_not_resumed(self, tmp_path, parameter_space):
+        path = str(tmp_path / 'journal.jsonl')
+        journal = OptimizationJournal(path, 'run-a')
+        journal.open()
+        journal.record(0, _result(parameter_space.get_grid()[0]))
+        journal.close()
+
+        other = OptimizationJournal(path, 'run-b')
+        assert other.load() == {}
+        other.open(resume=True)
+        other.close()
+        assert journal.load() == {}
+
+    def test_fingerprint_covers_run(self, parameter_space):
+        grid = parameter_space.get_grid()
+        fingerprint = get_run_fingerprint('s', grid, SPLIT)
+        parameter_space.add_parameter(IntegerParameter('stop', 1, 2))
+
+        assert get_run_fingerprint('s', grid, SPLIT) == fingerprint
+        assert get_run_fingerprint('t', grid, SPLIT) != fingerprint
+        assert get_run_fingerprint('s', grid, dict(SPLIT, train_ratio=0.6)) != fingerprint
+        assert get_run_fingerprint('s', parameter_space.get_grid(), SPLIT) != fingerprint
+
+    def test_fingerprint_covers_every_grid_value(self):
+        grids = []
+        for middle in (20, 30):
+            space = ParameterSpace()
+            space.add_parameter(CategoricalParameter('window', [10, middle, 50]))
+            grids.append(space.get_grid())
+
+        assert len(grids[0]) == len(grids[1]) and grids[0][0] == grids[1][0] and grids[0][-1] == grids[1][-1]
+        assert get_run_fingerprint('s', grids[0], SPLIT) != get_run_fingerprint('s', grids[1], SPLIT)
+        assert get_run_fingerprint('s', list(grids[0]), SPLIT) != get_run_fingerprint('s', list(grids[1]), SPLIT)
+
+    def test_fingerprint_covers_data_and_costs(self, tmp_path, parameter_space):
+        grid = parameter_space.get_grid()
+        data_file = tmp_path / 'SPY_1min.csv'
+        data_file.write_text('timestamp,open,high,low,close,volume\n')
+        config = {
+            'data': {'sources': [{'symbol': 'SPY', 'file': str(data_file)}], 'date_format': '%Y-%m-%d'},
+            'broker': {'slippage': {'model': 'fixed', 'slippage_percent': 0.1}},
+            'max_bars': 1000
+        }
+        fingerprint = get_run_fingerprint('s', grid, SPLIT, config)
+
+        assert get_run_fingerprint('s', grid, SPLIT, dict(config)) == fingerprint
+        assert get_run_fingerprint('s', grid, SPLIT, dict(config, max_bars=500)) != fingerprint
+        assert get_run_fingerprint('s', grid, SPLIT, dict(config, commission={'rate': 0.2})) != fingerprint
+        assert get_run_fingerprint('s', grid, SPLIT, dict(
+            config, broker={'slippage': {'model': 'variable'}})) != fingerprint
+        assert get_run_fingerprint('s', grid, SPLIT, dict(
+            config, data=dict(config['data'], sources=[{'symbol': 'QQQ', 'file': str(data_file)}]))) != fingerprint
+
+        # Rewriting the file changes its size and modification time
+        data_file.write_text('timestamp,open,high,low,close,volume\n2024-01-02,1,1,1,1,1\n')
+        assert get_run_fingerprint('s', grid, SPLIT, config) != fingerprint
+
+    def test_configuration(self, tmp_path):
+        assert get_journal(False, str(tmp_path), 'run') is None
+        assert get_journal(None, None, 'run') is None
+        assert get_journal(None, str(tmp_path), 'run').path == os.path.join(str(tmp_path), JOURNAL_FILENAME)
+        assert get_journal(str(tmp_path / 'j.jsonl'), None, 'run').path == str(tmp_path / 'j.jsonl')
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestOptimizerResume:
+
+    def test_resume_skips_completed_points(self, tmp_path, parameter_space):
+        full = _optimizer(parameter_space, tmp_path / 'full').optimize()
+
+        # Interrupt a run after 8 of 20 points, mid-way through writing the ninth
+        path = os.path.join(str(tmp_path / 'full'), JOURNAL_FILENAME)
+        with open(path) as f:
+            lines = f.readlines()
+        os.makedirs(str(tmp_path / 'resumed'))
+        with open(os.path.join(str(tmp_path / 'resumed'), JOURNAL_FILENAME), 'w') as f:
+            f.writelines(lines[:9])
+            f.write(lines[9][:20])
+
+        optimizer = _optimizer(parameter_space, tmp_path / 'resumed', resume=True)
+        resumed = optimizer.optimize()
+
+        # The remaining points run, then the journaled best point runs again for its full results
+        assert optimizer.evaluated == list(range(9, 21)) + [8]
+        assert resumed['resumed_count'] == 8
+        assert resumed['best_parameters'] == full['best_parameters'] == {'fast_window': 10, 'slow_window': 40}
+        assert resumed['train_results'] == full['train_results']
+        assert [(r['parameters'], r['train_score']) for r in resumed['all_results']] == \
+            [(r['parameters'], r['train_score']) for r in full['all_results']]
+
+    def test_without_resume_journal_restarts(self, tmp_path, parameter_space):
+        _optimizer(parameter_space, tmp_path).optimize()
+        optimizer = _optimizer(parameter_space, tmp_path)
+        optimizer.optimize()
+
+        assert optimizer.evaluated == list(range(1, 21))
+        assert len(optimizer.results['all_results']) == 20
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestRunnerCommandLine:
+
+    def test_flags_reach_run_optimization(self, tmp_path, monkeypatch):
+        config_file = tmp_path / 'config.yaml'
+        config_file.write_text("strategy:\n  name: simple_ma_crossover\n")
+        calls = []
+        monkeypatch.setattr(runner, 'setup_logging', lambda **kwargs: None)
+        monkeypatch.setattr(runner, 'run_optimization',
+                            lambda config, **kwargs: calls.append((config, kwargs)) or (True, 'done', {}))
+
+        exit_code = runner.main(['--config', str(config_file), '--method', 'hyperband', '--workers', '4',
+                                 '--executor', 'thread', '--resume', '--output-dir', str(tmp_path)])
+
+        assert exit_code == 0
+        config, kwargs = calls[0]
+        assert config == {'strategy': {'name': 'simple_ma_crossover'}}
+        assert kwargs['method'] == 'hyperband'
+        assert kwargs['workers'] == 4
+        assert kwargs['executor'] == 'thread'
+        assert kwargs['resume'] is True
+        assert kwargs['output_dir'] == str(tmp_path)
+
+    def test_overrides_reach_optimizer_config(self, tmp_path, monkeypatch):
+        configs = []
+
+        class _Optimizer:
+            def __init__(self, strategy_name, config, parameter_space):
+                configs.append(config)
+
+            def optimize(self):
+                return None
+
+        monkeypatch.setattr(runner, 'StrategyOptimizer', _Optimizer)
+        args = runner.parse_arguments(['--config', 'unused.yaml', '--workers', '2',
+                                       '--executor', 'process', '--resume'])
+        runner.run_optimization({}, workers=args.workers, executor=args.executor, resume=args.resume)
+
+        assert configs[0]['optimization'] == {'max_workers': 2, 'executor': 'process', 'resume': True}
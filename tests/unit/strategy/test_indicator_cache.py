@@ -0,0 +1,176 @@
+"""
+Unit tests for indicator series shared across the runs of an optimization.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.events.event_bus import EventBus
+from src.core.trade_repository import TradeRepository
+from src.data.bar_store import BarStore
+from src.execution.backtest.optimizing_backtest import OptimizingBacktest
+from src.strategy.components.indicators.indicator_cache import (
+    CachedIndicator, IndicatorCache, IndicatorSource, create_indicator, get_indicator_cache,
+    indicator_session
+)
+from src.strategy.components.indicators.streaming import RSI, SMA, RollingStd
+from src.strategy.components.indicators.vectorized import rsi
+from src.strategy.strategy_factory import StrategyFactory
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'MINI_1min.csv')
+
+SPLIT = {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3}
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(3)
+    return 100 + np.cumsum(rng.normal(0, 1, 300))
+
+
+class _Handler:
+    """Data handler holding one store per split."""
+
+    def __init__(self, stores):
+        self.stores = stores
+
+    def get_bar_store(self, symbol, split_name=None):
+        return self.stores.get((symbol, split_name))
+
+
+def _store(prices, start='2024-01-02'):
+    return BarStore.from_dataframe(pd.DataFrame({
+        'timestamp': pd.date_range(start, periods=len(prices), freq='min'),
+        'close': prices
+    }))
+
+
+def _trace(indicator, values):
+    return [(indicator.update(v), indicator.previous) for v in values]
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestCachedIndicators:
+
+    def test_vectorized_rsi_matches_streaming(self, prices):
+        streaming = RSI(14, wilder=False)
+        expected = [streaming.update(p) for p in prices]
+        values = rsi(prices, 14)
+
+        assert np.isnan(values[:14]).all() and expected[:14] == [None] * 14
+        assert values[14:].tolist() == expected[14:]
+
+    @pytest.mark.parametrize('indicator, streaming, returns', [
+        ('sma', lambda: SMA(20), False),
+        ('return_std', lambda: RollingStd(10), True),
+        ('simple_rsi', lambda: RSI(14, wilder=False), False),
+    ])
+    def test_values_match_streaming_indicators(self, prices, indicator, streaming, returns):
+        source = IndicatorSource(IndicatorCache(), _Handler({('SPY', 'train'): _store(prices)}), 'train')
+        cached = create_indicator(source, 'SPY', indicator, streaming().window)
+        inputs = (prices[1:] / prices[:-1] - 1).tolist() if returns else prices.tolist()
+
+        assert isinstance(cached, CachedIndicator)
+        assert _trace(cached, inputs) == _trace(streaming(), inputs)
+        assert cached.cached
+
+    def test_switches_to_streaming_on_other_inputs(self, prices):
+        source = IndicatorSource(IndicatorCache(), _Handler({('SPY', 'train'): _store(prices)}), 'train')
+        cached = create_indicator(source, 'SPY', 'sma', 5)
+        inputs = prices.tolist()[:50] + [1.0] + prices.tolist()[51:80]
+
+        assert _trace(cached, inputs) == _trace(SMA(5), inputs)
+        assert not cached.cached
+
+    def test_without_source_or_data(self, prices):
+        assert type(create_indicator(None, 'SPY', 'sma', 5)) is SMA
+        source = IndicatorSource(IndicatorCache(), _Handler({}), 'train')
+        assert type(create_indicator(source, 'SPY', 'simple_rsi', 5)) is RSI
+        with pytest.raises(ValueError):
+            create_indicator(IndicatorSource(IndicatorCache(), _Handler({('SPY', 'train'): _store(prices)}),
+                                             'train'), 'SPY', 'sma', 0)
+
+    def test_series_are_computed_once_per_split_and_window(self, prices):
+        cache = IndicatorCache()
+        handler = _Handler({('SPY', 'train'): _store(prices[:200]),
+                            ('SPY', 'test'): _store(prices[200:], start='2024-02-01')})
+        for fast, slow in [(5, 20), (10, 20), (5, 30)]:
+            for split in ('train', 'test'):
+                source = IndicatorSource(cache, handler, split)
+                create_indicator(source, 'SPY', 'sma', fast)
+                create_indicator(source, 'SPY', 'sma', slow)
+
+        # Per split: the closes and the 5, 10, 20 and 30-bar averages
+        assert cache.get_stats()['series'] == 10
+        assert cache.get_stats()['misses'] == 10
+
+    def test_key_covers_data(self, prices):
+        cache = IndicatorCache()
+        first = IndicatorSource(cache, _Handler({('SPY', 'train'): _store(prices[:100])}), 'train')
+        second = IndicatorSource(cache, _Handler({('SPY', 'train'): _store(prices[50:150])}), 'train')
+        a = create_indicator(first, 'SPY', 'sma', 5)
+        b = create_indicator(second, 'SPY', 'sma', 5)
+
+        assert a.update(prices[0]) is None and b.update(prices[50]) is None
+        assert cache.get_stats()['hits'] == 0
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        cache = IndicatorCache(max_bytes=2 * 8 * 10)
+        for key in ('a', 'b', 'a', 'c'):
+            series = cache.get(key, lambda: np.zeros(10))
+        assert not series.flags.writeable
+        assert cache.get_stats()['evictions'] == 1
+        assert cache.get('a', lambda: None) is not None
+        assert cache.get_stats()['hits'] == 2
+
+    def test_sessions(self):
+        assert get_indicator_cache() is None
+        with indicator_session() as cache:
+            assert get_indicator_cache() is cache
+            with indicator_session() as inner:
+                assert inner is cache
+            assert get_indicator_cache() is cache
+        assert get_indicator_cache() is None
+        with indicator_session(enabled=False) as cache:
+            assert cache is None and get_indicator_cache() is None
+
+
+@pytest.mark.integration
+@pytest.mark.strategy
+class TestOptimizingBacktestIndicatorCache:
+
+    @staticmethod
+    def _run():
+        config = {
+            'initial_capital': 100000,
+            'data': {
+                'source_type': 'csv',
+                'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S',
+                'sources': [{'symbol': 'SPY', 'file': DATA_FILE}],
+                'train_test_split': SPLIT,
+            },
+        }
+        backtest = OptimizingBacktest('optimizing_backtest', config, None)
+        backtest.initialize({
+            'event_bus': EventBus(),
+            'trade_repository': TradeRepository(),
+            'strategy_factory': StrategyFactory(),
+            'config': config,
+        })
+        return backtest._run_backtest_with_params('simple_ma_crossover',
+                                                  {'fast_period': 3, 'slow_period': 8}, 'train', SPLIT)
+
+    def test_cached_run_matches_uncached_run(self):
+        uncached = self._run()
+        with indicator_session() as cache:
+            cached = self._run()
+            again = self._run()
+
+            assert cache.get_stats()['hits'] > 0
+        assert cached['statistics'] == uncached['statistics'] == again['statistics']
+        assert cached['equity_curve'] == uncached['equity_curve']
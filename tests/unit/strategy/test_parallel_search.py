@@ -0,0 +1,173 @@
+"""
+Unit tests for parallel evaluation of parameter searches.
+"""
+
+import os
+
+import pytest
+
+from src.strategy.optimization.fixed_optimizer import FixedOptimizer
+from src.strategy.optimization.grid_search import GridSearch
+from src.strategy.optimization.parallel import ParallelEvaluator
+from src.strategy.optimization.parameter_space import IntegerParameter, ParameterSpace
+from src.strategy.optimization.random_search import RandomSearch
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'MINI_1min.csv')
+
+
+def _objective(params):
+    """Picklable objective with a single maximum at fast=10, slow=40."""
+    if params['fast_window'] == 15:
+        raise ValueError("invalid window")
+    return -abs(params['fast_window'] - 10) - abs(params['slow_window'] - 40)
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.fixture
+def parameter_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 5, 20, step=5))
+    space.add_parameter(IntegerParameter('slow_window', 20, 60, step=10))
+    return space
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestParallelEvaluator:
+
+    @pytest.mark.parametrize('executor', ['serial', 'thread', 'process'])
+    def test_results_in_submission_order(self, executor):
+        evaluator = ParallelEvaluator(executor, max_workers=2, batch_size=3)
+        outcomes = list(evaluator.map(_square, range(10)))
+
+        assert [item for item, _, _ in outcomes] == list(range(10))
+        assert [result for _, result, _ in outcomes] == [x * x for x in range(10)]
+        assert all(error is None for _, _, error in outcomes)
+
+    def test_errors_are_returned_per_item(self):
+        evaluator = ParallelEvaluator('process', max_workers=2)
+        items = [{'fast_window': w, 'slow_window': 40} for w in (10, 15, 20)]
+        errors = [error for _, _, error in evaluator.map(_objective, items)]
+
+        assert errors[0] is None and errors[2] is None
+        assert isinstance(errors[1], ValueError)
+
+    def test_generator_is_consumed_lazily(self):
+        drawn = []
+
+        def items():
+            for x in range(1000):
+                drawn.append(x)
+                yield x
+
+        evaluator = ParallelEvaluator('thread', max_workers=2, batch_size=5)
+        outcomes = evaluator.map(_square, items())
+        first = [next(outcomes) for _ in range(3)]
+        outcomes.close()
+
+        assert [item for item, _, _ in first] == [0, 1, 2]
+        assert len(drawn) < 100
+
+    def test_unpicklable_function_falls_back_to_threads(self):
+        offset = 3
+        evaluator = ParallelEvaluator('process', max_workers=2)
+        results = [result for _, result, _ in evaluator.map(lambda x: x + offset, range(5))]
+        assert results == [3, 4, 5, 6, 7]
+
+    def test_fallback_logs_effective_executor(self, caplog):
+        evaluator = ParallelEvaluator('process', max_workers=2)
+        with caplog.at_level('INFO', logger='src.strategy.optimization.parallel'):
+            list(evaluator.map(lambda x: x, range(4)))
+        assert any('thread workers' in message for message in caplog.messages)
+        assert not any('process workers' in message for message in caplog.messages)
+
+    def test_from_config(self):
+        assert ParallelEvaluator.from_config({'max_workers': 4}).executor == 'process'
+        assert ParallelEvaluator.from_config({}).is_serial
+        with pytest.raises(ValueError):
+            ParallelEvaluator('gpu')
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestParallelSearch:
+
+    def test_grid_search_matches_serial(self, parameter_space):
+        serial = GridSearch(parameter_space).search(_objective)
+        parallel = GridSearch(parameter_space).search(_objective, executor='process', max_workers=2)
+
+        assert parallel['best_params'] == serial['best_params'] == {'fast_window': 10, 'slow_window': 40}
+        assert parallel['evaluations'] == serial['evaluations'] == 15
+        assert [r['params'] for r in parallel['results']] == [r['params'] for r in serial['results']]
+
+    def test_grid_search_respects_max_evaluations(self, parameter_space):
+        results = GridSearch(parameter_space).search(_objective, max_evaluations=4, executor='thread')
+        assert results['evaluations'] == 4
+
+    def test_grid_search_replaces_failed_points_up_to_max_evaluations(self, parameter_space):
+        # fast_window=15 fails, so the first 12 points hold fewer than 12 evaluations
+        serial = GridSearch(parameter_space).search(_objective, max_evaluations=12)
+        parallel = GridSearch(parameter_space).search(
+            _objective, max_evaluations=12, executor='thread', max_workers=2
+        )
+
+        assert parallel['evaluations'] == serial['evaluations'] == 12
+        assert [r['params'] for r in parallel['results']] == [r['params'] for r in serial['results']]
+
+    def test_callback_runs_in_order(self, parameter_space):
+        seen = []
+        GridSearch(parameter_space).search(
+            _objective, executor='process', max_workers=2,
+            callback=lambda params, score, is_best: seen.append(params)
+        )
+        expected = [p for p in parameter_space.get_all_grid_points() if p['fast_window'] != 15]
+        assert seen == expected
+
+    def test_random_search_is_seeded(self, parameter_space):
+        serial = RandomSearch(parameter_space, seed=7).search(_objective, num_samples=12)
+        parallel = RandomSearch(parameter_space, seed=7).search(
+            _objective, num_samples=12, executor='process', max_workers=2
+        )
+        assert [r['params'] for r in parallel['results']] == [r['params'] for r in serial['results']]
+        assert parallel['best_score'] == serial['best_score']
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestParallelFixedOptimizer:
+
+    @staticmethod
+    def _optimize(tmp_path, executor):
+        space = ParameterSpace()
+        space.add_parameter(IntegerParameter('fast_period', 2, 4, step=2))
+        space.add_parameter(IntegerParameter('slow_period', 6, 10, step=4))
+        config = {
+            'initial_capital': 100000,
+            'output_dir': str(tmp_path / executor),
+            'data': {
+                'source_type': 'csv',
+                'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S',
+                'sources': [{'symbol': 'SPY', 'file': DATA_FILE}],
+                'train_test_split': {'method': 'ratio', 'train_ratio': 0.7, 'test_ratio': 0.3},
+            },
+            'optimization': {'method': 'grid', 'checkpoint': False}
+        }
+        optimizer = FixedOptimizer('simple_ma_crossover', config, space, executor=executor, max_workers=2)
+        return optimizer.optimize()
+
+    def test_executors_give_identical_results(self, tmp_path):
+        serial = self._optimize(tmp_path, 'serial')
+
+        def scores(results):
+            return [(sorted(r['parameters'].items()), r['train_score'], r['test_score'])
+                    for r in results['all_results']]
+
+        for executor in ('thread', 'process'):
+            results = self._optimize(tmp_path, executor)
+            assert results['best_parameters'] == serial['best_parameters']
+            assert scores(results) == scores(serial)
+            assert all('error' not in r for r in results['all_results'])
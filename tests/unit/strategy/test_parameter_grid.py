@@ -0,0 +1,92 @@
+"""
+Unit tests for lazy parameter grid enumeration.
+"""
+
+from itertools import product
+
+import pytest
+
+from src.strategy.optimization.parameter_space import (
+    CategoricalParameter, ConditionalParameter, IntegerParameter, ParameterGrid, ParameterSpace
+)
+
+
+@pytest.fixture
+def flat_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 5, 25, step=5))
+    space.add_parameter(IntegerParameter('slow_window', 20, 60, step=10))
+    space.add_parameter(CategoricalParameter('mode', ['long', 'short']))
+    return space
+
+
+@pytest.fixture
+def conditional_space():
+    space = ParameterSpace()
+    space.add_parameter(IntegerParameter('fast_window', 1, 3))
+    kind = CategoricalParameter('kind', ['a', 'b', 'c'])
+    space.add_parameter(kind)
+    level = ConditionalParameter('level', kind, {'a': [1, 2], 'b': [3]})
+    space.add_parameter(level)
+    space.add_parameter(ConditionalParameter('depth', level, {1: ['x', 'y'], 3: ['z']}))
+    space.add_parameter(IntegerParameter('slow_window', 0, 1))
+    return space
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestParameterGrid:
+
+    def test_flat_grid_matches_product(self, flat_space):
+        grid = flat_space.get_grid()
+        expected = [
+            {'fast_window': f, 'slow_window': s, 'mode': m}
+            for f, s, m in product(range(5, 30, 5), range(20, 70, 10), ['long', 'short'])
+        ]
+
+        assert isinstance(grid, ParameterGrid)
+        assert len(grid) == flat_space.get_combination_count() == 50
+        assert list(grid) == expected
+        assert [grid[i] for i in range(len(grid))] == expected
+        assert flat_space.get_combinations() == expected
+
+    def test_random_access(self, flat_space):
+        grid = flat_space.get_grid()
+        points = list(grid)
+
+        assert grid[-1] == points[-1]
+        assert grid[10:20:3] == points[10:20:3]
+        assert list(grid.iter_range(45)) == points[45:]
+        assert all(grid.index(point) == i for i, point in enumerate(points))
+        with pytest.raises(IndexError):
+            grid[50]
+        with pytest.raises(ValueError):
+            grid.index({'fast_window': 7, 'slow_window': 20, 'mode': 'long'})
+
+    def test_conditional_parameters_only_take_valid_values(self, conditional_space):
+        grid = conditional_space.get_grid()
+        points = list(grid)
+
+        # Per fast_window and slow_window: a -> level 1 (x, y) or 2; b -> level 3 (z); c -> none
+        assert len(grid) == 3 * (3 + 1 + 1) * 2 == len(points)
+        assert len({repr(sorted(p.items())) for p in points}) == len(points)
+        level = conditional_space.get_parameter('level')
+        depth = conditional_space.get_parameter('depth')
+        for point in points:
+            assert ('level' in point) == (point['kind'] != 'c')
+            if 'level' in point:
+                assert level.validate(point['level'], point['kind'])
+            assert ('depth' in point) == (point.get('level') in (1, 3))
+            if 'depth' in point:
+                assert depth.validate(point['depth'], point['level'])
+        assert {p.get('depth') for p in points if p['kind'] == 'a'} == {'x', 'y', None}
+        assert [grid.index(p) for p in points] == list(range(len(points)))
+
+    def test_shards_cover_grid(self, conditional_space):
+        grid = conditional_space.get_grid()
+        shards = 4
+        size = -(-len(grid) // shards)
+        sharded = [p for shard in range(shards)
+                   for p in grid.iter_range(shard * size, (shard + 1) * size)]
+
+        assert sharded == list(grid)
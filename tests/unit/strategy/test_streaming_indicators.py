@@ -0,0 +1,153 @@
+"""
+Unit tests for the streaming indicator library.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategy.components.indicators.streaming import (
+    ADX, ATR, EMA, RSI, SMA, BollingerBands, RollingMax, RollingMin,
+    RollingStd, RollingSum, RollingVariance, TrueRange
+)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    return 100 + np.cumsum(rng.normal(0, 1, 500))
+
+
+@pytest.fixture
+def ohlc(prices):
+    rng = np.random.default_rng(11)
+    spread = np.abs(rng.normal(0, 0.5, len(prices)))
+    return prices + spread, prices - spread, prices
+
+
+def _feed(indicator, values):
+    return [indicator.update(v) for v in values]
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestStreamingIndicators:
+
+    @pytest.mark.parametrize('window', [1, 5, 20])
+    def test_sma_and_sum_match_numpy(self, prices, window):
+        sma = _feed(SMA(window), prices)
+        sums = _feed(RollingSum(window), prices)
+        assert sma[:window - 1] == [None] * (window - 1)
+        for i in range(window - 1, len(prices)):
+            expected = prices[i - window + 1:i + 1]
+            assert sma[i] == pytest.approx(expected.mean(), rel=1e-12)
+            assert sums[i] == pytest.approx(expected.sum(), rel=1e-12)
+
+    def test_previous_value(self, prices):
+        sma = SMA(3)
+        _feed(sma, prices[:3])
+        assert sma.previous is None
+        first = sma.value
+        sma.update(prices[3])
+        assert sma.previous == first
+
+    def test_ema_matches_pandas_after_seed(self, prices):
+        window = 10
+        values = _feed(EMA(window), prices)
+        series = pd.Series(prices)
+        seeded = pd.concat([pd.Series([series[:window].mean()]), series[window:]])
+        expected = seeded.ewm(alpha=2 / (window + 1), adjust=False).mean().to_numpy()
+        assert values[:window - 1] == [None] * (window - 1)
+        np.testing.assert_allclose(values[window - 1:], expected, rtol=1e-12)
+
+    @pytest.mark.parametrize('ddof', [0, 1])
+    def test_variance_and_std_match_numpy(self, prices, ddof):
+        window = 20
+        variance = _feed(RollingVariance(window, ddof=ddof), prices)
+        std = _feed(RollingStd(window, ddof=ddof), prices)
+        for i in range(window - 1, len(prices)):
+            expected = prices[i - window + 1:i + 1]
+            assert variance[i] == pytest.approx(np.var(expected, ddof=ddof), rel=1e-8)
+            assert std[i] == pytest.approx(np.std(expected, ddof=ddof), rel=1e-8)
+
+    def test_std_of_constant_series_is_zero(self):
+        assert _feed(RollingStd(5), [1e6] * 50)[-1] == 0.0
+
+    def test_bollinger_bands(self, prices):
+        bands = BollingerBands(20, num_std=2.0)
+        _feed(bands, prices)
+        window = prices[-20:]
+        assert bands.value == pytest.approx(window.mean(), rel=1e-12)
+        assert bands.upper == pytest.approx(window.mean() + 2 * window.std(), rel=1e-9)
+        assert bands.lower == pytest.approx(window.mean() - 2 * window.std(), rel=1e-9)
+
+    def test_rolling_max_and_min(self, prices):
+        window = 7
+        highs = _feed(RollingMax(window), prices)
+        lows = _feed(RollingMin(window), prices)
+        for i in range(window - 1, len(prices)):
+            assert highs[i] == prices[i - window + 1:i + 1].max()
+            assert lows[i] == prices[i - window + 1:i + 1].min()
+
+    def test_rsi_simple_average(self, prices):
+        window = 14
+        values = _feed(RSI(window, wilder=False), prices)
+        assert values[:window] == [None] * window
+        changes = np.diff(prices[-window - 1:])
+        gains = np.maximum(changes, 0).mean()
+        losses = np.maximum(-changes, 0).mean()
+        assert values[-1] == pytest.approx(100 - 100 / (1 + gains / losses), rel=1e-9)
+
+    def test_wilder_rsi_bounds_and_extremes(self, prices):
+        values = [v for v in _feed(RSI(14), prices) if v is not None]
+        assert len(values) == len(prices) - 14
+        assert all(0 <= v <= 100 for v in values)
+        assert _feed(RSI(5), range(20))[-1] == 100
+
+    def test_true_range_and_atr(self, ohlc):
+        high, low, close = ohlc
+        tr = TrueRange()
+        ranges = [tr.update(h, l, c) for h, l, c in zip(high, low, close)]
+        assert ranges[0] is None
+        expected = np.maximum(np.maximum(high[1:] - low[1:], np.abs(high[1:] - close[:-1])),
+                              np.abs(low[1:] - close[:-1]))
+        np.testing.assert_allclose(ranges[1:], expected)
+
+        atr = ATR(14, wilder=False)
+        values = [atr.update(h, l, c) for h, l, c in zip(high, low, close)]
+        assert values[14] == pytest.approx(expected[:14].mean(), rel=1e-12)
+        assert values[-1] == pytest.approx(expected[-14:].mean(), rel=1e-9)
+
+        wilder = ATR(14)
+        values = [wilder.update(h, l, c) for h, l, c in zip(high, low, close)]
+        assert values[14] == pytest.approx(expected[:14].mean(), rel=1e-12)
+        assert values[15] == pytest.approx((values[14] * 13 + expected[14]) / 14, rel=1e-12)
+
+    def test_adx_trend(self):
+        adx = ADX(14)
+        for i in range(100):
+            adx.update(101.0 + i, 99.0 + i, 100.0 + i)
+        assert adx.value == pytest.approx(100.0)
+        assert adx.plus_di > adx.minus_di
+
+    def test_adx_warm_up(self, ohlc):
+        adx = ADX(14)
+        values = [adx.update(h, l, c) for h, l, c in zip(*ohlc)]
+        assert values[:27] == [None] * 27
+        assert 0 <= values[27] <= 100
+
+    def test_reset(self, prices):
+        indicators = [SMA(5), EMA(5), RollingStd(5), RollingMax(5), RSI(5), BollingerBands(5)]
+        for indicator in indicators:
+            first = _feed(indicator, prices[:50])
+            indicator.reset()
+            assert indicator.value is None and indicator.count == 0
+            assert _feed(indicator, prices[:50]) == first
+
+    @pytest.mark.parametrize('window', [0, -1, 2.5, True, None])
+    def test_invalid_window(self, window):
+        with pytest.raises(ValueError):
+            SMA(window)
+
+    def test_numpy_integer_window(self):
+        assert SMA(np.int64(3)).window == 3
@@ -0,0 +1,249 @@
+"""
+Unit tests for walk-forward optimization.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.events.event_bus import EventBus
+from src.core.exceptions import OptimizationError
+from src.data.historical_data_handler import HistoricalDataHandler
+from src.strategy.optimization.fixed_optimizer import FixedOptimizer
+from src.strategy.optimization.parameter_space import IntegerParameter, ParameterSpace
+from src.strategy.optimization.walk_forward import (
+    WalkForwardCache, WalkForwardOptimizer, WindowBacktest, stitch_equity_curves
+)
+
+INITIAL_CAPITAL = 1000.0
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'MINI_1min.csv')
+
+
+class _Runner:
+    """Backtest stand-in: window i is best at fast_window = 10 + 5 * i, test runs gain 10%."""
+
+    initial_capital = INITIAL_CAPITAL
+    cache_namespace = ('fake',)
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, params, window, split):
+        self.calls.append((window['window_idx'], split, params['fast_window']))
+        score = -abs(params['fast_window'] - 10 - 5 * window['window_idx'])
+        growth = 1.1 if split == 'test' else 1.0
+        last_bar = window[f'{split}_end'] - pd.Timedelta(minutes=1)
+        return {
+            'statistics': {'sharpe_ratio': score},
+            'equity_curve': [{'timestamp': window[f'{split}_start'], 'equity': INITIAL_CAPITAL},
+                             {'timestamp': last_bar, 'equity': INITIAL_CAPITAL * growth}],
+            'trades': [{'pnl': 1.0, 'closed': True}]
+        }
+
+
+class _PruningRunner(_Runner):
+    """Runner whose train runs with fast_window above 20 are stopped early."""
+
+    def __call__(self, params, window, split):
+        result = super().__call__(params, window, split)
+        if split == 'train' and params['fast_window'] > 20:
+            result['pruned'] = {'reason': 'drawdown', 'bar': 5}
+        return result
+
+
+def _handler(tmp_path, periods):
+    path = tmp_path / f"AAA_{periods}_1min.csv"
+    pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-02 09:30', periods=periods, freq='1min').strftime('%Y-%m-%d %H:%M:%S'),
+        'close': np.linspace(100.0, 110.0, periods),
+    }).to_csv(path, index=False)
+    handler = HistoricalDataHandler('data_handler', {
+        'sources': [{'symbol': 'AAA', 'file': str(path)}],
+        'date_column': 'timestamp',
+        'date_format': '%Y-%m-%d %H:%M:%S',
+    })
+    handler.initialize({'event_bus': EventBus()})
+    return handler
+
+
+def _optimize(optimizer, space):
+    # Windows of 20 bars stepping by their 10-bar test period
+    return optimizer.optimize(space, window_size=20, step_size=10, test_size=10, unit='bars')
+
+
+@pytest.fixture
+def space():
+    parameter_space = ParameterSpace()
+    parameter_space.add_parameter(IntegerParameter('fast_window', 5, 35, step=5))
+    return parameter_space
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestWalkForwardOptimizer:
+
+    def test_optimizes_each_window(self, tmp_path, space):
+        runner = _Runner()
+        results = _optimize(WalkForwardOptimizer(_handler(tmp_path, 60), runner), space)
+
+        assert results['windows'] == 5
+        assert [r['best_parameters']['fast_window'] for r in results['results']] == [10, 15, 20, 25, 30]
+        assert all(r['in_sample_score'] == 0 for r in results['results'])
+        # One train run per grid point and one test run per window
+        assert len(runner.calls) == 5 * (len(space.get_all_grid_points()) + 1)
+        assert results['cache'] == {'windows': 5, 'entries': 40, 'hits': 0, 'misses': 40, 'hit_rate': 0.0}
+
+    def test_pruned_train_runs_are_not_scored_or_cached(self, tmp_path, space):
+        cache = WalkForwardCache()
+        results = _optimize(WalkForwardOptimizer(_handler(tmp_path, 60), _PruningRunner(), cache=cache), space)
+
+        assert [r['best_parameters']['fast_window'] for r in results['results']] == [10, 15, 20, 20, 20]
+        assert [r['optimization_results']['pruned'] for r in results['results']] == [3] * 5
+        # Only the 4 complete train runs and the test run of each window are cached
+        assert results['cache']['entries'] == 5 * 5
+
+    def test_out_of_sample_equity_is_continuous(self, tmp_path, space):
+        results = _optimize(WalkForwardOptimizer(_handler(tmp_path, 60), _Runner()), space)
+
+        curve = results['oos_equity_curve']
+        assert curve.index.is_monotonic_increasing
+        assert list(curve['window_idx'].unique()) == [0, 1, 2, 3, 4]
+        assert curve['equity'].iloc[-1] == pytest.approx(INITIAL_CAPITAL * 1.1 ** 5)
+        # Each window starts where the previous one ended
+        starts = curve.groupby('window_idx')['equity'].first().to_numpy()
+        ends = curve.groupby('window_idx')['equity'].last().to_numpy()
+        np.testing.assert_allclose(starts[1:], ends[:-1])
+        assert len(results['oos_trades']) == 5
+        assert results['oos_statistics']['trade_count'] == 5
+
+    def test_extended_data_only_runs_new_windows(self, tmp_path, space):
+        cache = WalkForwardCache()
+        _optimize(WalkForwardOptimizer(_handler(tmp_path, 40), _Runner(), cache=cache), space)
+
+        runner = _Runner()
+        results = _optimize(WalkForwardOptimizer(_handler(tmp_path, 60), runner, cache=cache), space)
+
+        assert results['windows'] == 5
+        assert {window_idx for window_idx, _, _ in runner.calls} == {3, 4}
+        assert [r['best_parameters']['fast_window'] for r in results['results']] == [10, 15, 20, 25, 30]
+
+    def test_cache_file_round_trip(self, tmp_path, space):
+        path = str(tmp_path / 'cache' / 'walk_forward.pkl')
+        handler = _handler(tmp_path, 60)
+        first = _optimize(WalkForwardOptimizer(handler, _Runner(), cache=WalkForwardCache(path)), space)
+
+        runner = _Runner()
+        second = _optimize(WalkForwardOptimizer(handler, runner, cache=WalkForwardCache(path)), space)
+
+        assert runner.calls == []
+        assert second['cache']['hit_rate'] == 1.0
+        pd.testing.assert_frame_equal(first['oos_equity_curve'], second['oos_equity_curve'])
+
+    def test_unnamed_objectives_are_not_cached(self, tmp_path, space):
+        handler = _handler(tmp_path, 60)
+        cache = WalkForwardCache()
+        optimizer = WalkForwardOptimizer(handler, _Runner(), cache=cache)
+        objectives = [lambda result: result['statistics']['sharpe_ratio'],
+                      lambda result: -result['statistics']['sharpe_ratio']]
+        runs = [optimizer.optimize(space, window_size=20, step_size=10, test_size=10, unit='bars',
+                                   objective_function=objective)
+                for objective in objectives]
+
+        # The second lambda is scored on its own instead of reusing the first one's scores
+        assert [r['best_parameters']['fast_window'] for r in runs[0]['results']] == [10, 15, 20, 25, 30]
+        assert [r['best_parameters']['fast_window'] for r in runs[1]['results']] == [35, 35, 5, 5, 5]
+        assert cache.get_stats()['entries'] == 0
+
+    def test_thread_executor_matches_serial(self, tmp_path, space):
+        handler = _handler(tmp_path, 60)
+        serial = _optimize(WalkForwardOptimizer(handler, _Runner()), space)
+        threaded = _optimize(WalkForwardOptimizer(handler, _Runner(), executor='thread', max_workers=3), space)
+
+        assert [r['best_parameters'] for r in threaded['results']] == \
+            [r['best_parameters'] for r in serial['results']]
+        pd.testing.assert_frame_equal(threaded['oos_equity_curve'], serial['oos_equity_curve'])
+
+    def test_random_search_is_reproducible(self, tmp_path, space):
+        handler = _handler(tmp_path, 60)
+        runs = [WalkForwardOptimizer(handler, _Runner(), optimization_method='random').optimize(
+                    space, window_size=20, step_size=10, test_size=10, unit='bars',
+                    random_samples=4, random_seed=3)
+                for _ in range(2)]
+
+        assert [r['best_parameters'] for r in runs[0]['results']] == \
+            [r['best_parameters'] for r in runs[1]['results']]
+
+    def test_invalid_settings(self, tmp_path, space):
+        handler = _handler(tmp_path, 30)
+        with pytest.raises(OptimizationError):
+            WalkForwardOptimizer(handler, _Runner(), optimization_method='genetic').optimize(
+                space, window_size=20, step_size=10, unit='bars')
+        with pytest.raises(OptimizationError):
+            WalkForwardOptimizer(handler, _Runner()).optimize(space, window_size=50, step_size=10, unit='bars')
+
+    def test_stitch_overlapping_test_periods(self):
+        times = pd.date_range('2024-01-02', periods=4, freq='D')
+        results = [
+            {'window_idx': 0, 'out_of_sample_result': {'equity_curve': [
+                {'timestamp': times[0], 'equity': 100.0}, {'timestamp': times[1], 'equity': 110.0},
+                {'timestamp': times[2], 'equity': 121.0}]}},
+            {'window_idx': 1, 'out_of_sample_result': {'equity_curve': [
+                {'timestamp': times[1], 'equity': 100.0}, {'timestamp': times[2], 'equity': 50.0},
+                {'timestamp': times[3], 'equity': 100.0}]}},
+        ]
+
+        curve = stitch_equity_curves(results, 100.0)
+
+        # Window 1 continues from its own equity at window 0's last timestamp
+        assert list(curve.index) == list(times[:3]) + [times[3]]
+        assert curve['equity'].tolist() == pytest.approx([100.0, 110.0, 121.0, 242.0])
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestWindowBacktest:
+
+    def test_cache_namespace_covers_run_settings(self, monkeypatch):
+        config = {'data': {'sources': [{'symbol': 'AAA', 'file': 'AAA.csv'}]}, 'initial_capital': 1000,
+                  'broker': {'slippage': 0.0}, 'strategy': {'name': 'ma_crossover'}}
+        namespace = WindowBacktest('ma_crossover', config).cache_namespace
+
+        assert WindowBacktest('ma_crossover', dict(config)).cache_namespace == namespace
+        for key, value in [('broker', {'slippage': 0.01}), ('commission', {'rate': 0.001}),
+                           ('risk', {'max_position': 0.5}), ('strategy', {'name': 'ma_crossover', 'fast': 3}),
+                           ('optimization', {'engine': 'vectorized'})]:
+            assert WindowBacktest('ma_crossover', dict(config, **{key: value})).cache_namespace != namespace
+
+        # A change to the strategy code
+        monkeypatch.setattr('src.strategy.optimization.walk_forward.get_code_fingerprint', lambda cls: 'edited')
+        assert WindowBacktest('ma_crossover', config).cache_namespace != namespace
+
+
+@pytest.mark.unit
+@pytest.mark.strategy
+class TestFixedOptimizerWalkForward:
+
+    def test_max_evaluations_per_window_from_config(self, tmp_path):
+        space = ParameterSpace()
+        space.add_parameter(IntegerParameter('fast_period', 2, 4, step=1))
+        space.add_parameter(IntegerParameter('slow_period', 6, 10, step=2))
+        config = {
+            'initial_capital': 100000,
+            'output_dir': str(tmp_path),
+            'data': {
+                'source_type': 'csv',
+                'date_column': 'timestamp',
+                'date_format': '%Y-%m-%d %H:%M:%S',
+                'sources': [{'symbol': 'SPY', 'file': DATA_FILE}],
+            },
+            'optimization': {'method': 'walk_forward', 'checkpoint': False, 'window_size': 20,
+                             'step_size': 10, 'test_size': 10, 'window_unit': 'bars',
+                             'max_evaluations_per_window': 2}
+        }
+        results = FixedOptimizer('simple_ma_crossover', config, space).optimize()
+
+        windows = results['walk_forward']['results']
+        assert windows
+        assert all(w['optimization_results']['evaluations'] == 2 for w in windows)